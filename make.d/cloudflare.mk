@@ -40,6 +40,12 @@ remove-cloudflare-dns-entry: sietch-build ## remove the cloudflare DNS entry via
 list-cloudflare-dns: sietch-build ## list cloudflare DNS records
 	$(SIETCH_RUN) python /scripts/cloudflare.py dns list
 
+plan-cloudflare-dns: sietch-build ## show the DNS changes sync-cloudflare-dns would make
+	$(SIETCH_RUN) python /scripts/cloudflare.py dns sync --dry-run
+
+sync-cloudflare-dns: sietch-build ## reconcile cloudflare DNS with enabled services and externals
+	$(SIETCH_RUN) python /scripts/cloudflare.py dns sync
+
 show-tunnel: ## show the status of the cloudflare tunnel
 	@echo "Checking Cloudflared Tunnel $(CLOUDFLARE_TUNNEL_URL)"
 	-$(COMPOSE_COMMAND) $(FLAGS) run --rm cloudflared tunnel info $(CLOUDFLARE_TUNNEL_NAME) || echo $$?
@@ -128,6 +128,14 @@ scaffold-list: sietch-build ## List available scaffolds
 scaffold-check: sietch-build ## Check if a service has scaffold files
 	$(SIETCH_RUN) python /scripts/scaffold.py check $(SERVICE_PASSED_DNCASED)
 
+scaffold-plan: sietch-build ## Show a service's manifest plan and what would be skipped
+ifdef SERVICE_PASSED_DNCASED
+	$(SIETCH_RUN) python /scripts/scaffold.py plan $(SERVICE_PASSED_DNCASED)
+else
+	@echo "Usage: make scaffold-plan <service>"
+	@echo "Example: make scaffold-plan radarr"
+endif
+
 # Manual utility: Fix etc directory ownership if any files are root-owned
 # Usage: make fix-etc-ownership <service>
 # Note: This is NOT run automatically - containers own their etc/ directories
@@ -11,4 +11,7 @@
 traefik-sync-dns: sietch-build ## Sync Traefik external hosts to Joyride DNS
 	$(SIETCH_RUN) python /scripts/traefik_hosts.py sync
 
-.PHONY: traefik-sync-dns
+traefik-watch-dns: sietch-build ## Keep Joyride DNS in sync as externals and .env change
+	$(SIETCH_RUN) python /scripts/traefik_hosts.py sync --watch
+
+.PHONY: traefik-sync-dns traefik-watch-dns
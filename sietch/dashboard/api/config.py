@@ -1,5 +1,6 @@
 """Environment variable and configuration management API."""
 
+import asyncio
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, Request
@@ -85,7 +86,7 @@ async def get_service_env_template(request: Request, name: str):
 @router.get("/service/{name}/variables")
 async def get_service_variables(request: Request, name: str):
     """Parse and return variables from service env template."""
-    import re
+    from ..core.env import template_variables
 
     services_scaffold = request.app.state.services._manager.base_dir / "services-scaffold" / name
     template_path = services_scaffold / "env.template"
@@ -94,16 +95,26 @@ async def get_service_variables(request: Request, name: str):
 
     if template_path.exists():
         content = template_path.read_text(encoding="utf-8")
-        # Parse VAR=value or VAR=${DEFAULT:-value} patterns
-        for line in content.splitlines():
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                var_name = line.split("=", 1)[0]
-                var_value = line.split("=", 1)[1] if "=" in line else ""
-                variables.append({
-                    "name": var_name,
-                    "default": var_value,
-                    "required": "${" not in var_value,  # Has default if uses ${VAR:-default}
-                })
+        for line in template_variables(content):
+            variables.append({
+                "name": line.name,
+                "default": line.raw,
+                "required": "${" not in line.raw,  # Has default if uses ${VAR:-default}
+            })
 
     return {"service": name, "variables": variables}
+
+
+@router.get("/effective")
+async def get_effective_env(request: Request):
+    """Effective value of every variable, with the env file it comes from.
+
+    Files are layered in the Makefile's --env-file order; later files win,
+    and the files they shadow are listed.
+    """
+    from ..core.env import effective_env
+
+    base_dir = request.app.state.services._manager.base_dir
+    # Stats and may parse every env file; keep it off the event loop
+    variables = await asyncio.to_thread(effective_env, base_dir)
+    return {"variables": variables}
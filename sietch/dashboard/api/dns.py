@@ -1,12 +1,17 @@
-"""Cloudflare DNS management API."""
+"""Cloudflare DNS management API.
+
+Uses the AsyncCloudflareAPI created at startup (app.state.cloudflare), so
+requests share its keep-alive connections and cached zone IDs and never
+block the event loop. /hosts lists the hosts of enabled services and
+externals, from the same index the Joyride and Cloudflare syncs use.
+"""
+
+import asyncio
+from urllib.error import URLError
 
-import sys
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
-# Import existing cloudflare module
-sys.path.insert(0, "/scripts")
-
 router = APIRouter()
 
 
@@ -19,64 +24,63 @@ class DNSRecordCreate(BaseModel):
     proxied: bool = False
 
 
+def _cloudflare(request: Request):
+    """The shared Cloudflare client, or 503 when it is not configured."""
+    api = getattr(request.app.state, "cloudflare", None)
+    if api is None:
+        raise HTTPException(status_code=503, detail="Cloudflare API not configured")
+    return api
+
+
+@router.get("/hosts")
+async def list_hosts(request: Request):
+    """List the hosts Traefik routes, with the files declaring each one."""
+    from ..core.hosts import build_host_index
+
+    # Reads compose and external files; keep it off the event loop
+    index = await asyncio.to_thread(build_host_index, request.app.state.services.base_dir)
+    return index.to_dict()
+
+
 @router.get("/zones")
 async def list_zones(request: Request):
     """List Cloudflare zones."""
+    api = _cloudflare(request)
     try:
-        from cloudflare import CloudflareAPI
-        api = CloudflareAPI()
-        zones = api.list_zones()
+        zones = await api.list_zones()
         return {"zones": zones}
-    except ImportError:
-        raise HTTPException(status_code=501, detail="Cloudflare module not available")
-    except Exception as e:
+    except (RuntimeError, URLError) as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/zones/{zone_id}/records")
 async def list_dns_records(request: Request, zone_id: str, type: str = None, name: str = None):
     """List DNS records for a zone."""
+    api = _cloudflare(request)
     try:
-        from cloudflare import CloudflareAPI
-        api = CloudflareAPI()
-        records = api.list_dns_records(zone_id, record_type=type, name=name)
+        records = await api.list_dns_records(record_type=type, name=name, zone_id=zone_id)
         return {"records": records, "count": len(records)}
-    except ImportError:
-        raise HTTPException(status_code=501, detail="Cloudflare module not available")
-    except Exception as e:
+    except (RuntimeError, URLError) as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/zones/{zone_id}/records")
 async def create_dns_record(request: Request, zone_id: str, record: DNSRecordCreate):
     """Create a new DNS record."""
+    api = _cloudflare(request)
     try:
-        from cloudflare import CloudflareAPI
-        api = CloudflareAPI()
-        result = api.create_dns_record(
-            zone_id,
-            record_type=record.type,
-            name=record.name,
-            content=record.content,
-            ttl=record.ttl,
-            proxied=record.proxied,
-        )
+        result = await api.create_dns_record(record.model_dump(), zone_id=zone_id)
         return {"success": True, "record": result}
-    except ImportError:
-        raise HTTPException(status_code=501, detail="Cloudflare module not available")
-    except Exception as e:
+    except (RuntimeError, URLError) as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.delete("/zones/{zone_id}/records/{record_id}")
 async def delete_dns_record(request: Request, zone_id: str, record_id: str):
     """Delete a DNS record."""
+    api = _cloudflare(request)
     try:
-        from cloudflare import CloudflareAPI
-        api = CloudflareAPI()
-        result = api.delete_dns_record(zone_id, record_id)
+        await api.delete_dns_record_by_id(record_id, zone_id=zone_id)
         return {"success": True, "deleted": record_id}
-    except ImportError:
-        raise HTTPException(status_code=501, detail="Cloudflare module not available")
-    except Exception as e:
+    except (RuntimeError, URLError) as e:
         raise HTTPException(status_code=500, detail=str(e))
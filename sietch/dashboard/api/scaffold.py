@@ -1,13 +1,28 @@
 """Scaffold management API."""
 
 import subprocess
+import sys
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
+sys.path.insert(0, "/scripts")
+
 router = APIRouter()
 
+IGNORED_FILE_TYPES = {"scaffold.yml": "manifest", "MESSAGE.txt": "message"}
+
+
+@router.get("")
+async def get_scaffold_overview(request: Request):
+    """Summarize scaffold contents for every service (one walk per directory)."""
+    from scaffold import Scaffolder
+
+    base_dir = request.app.state.services._manager.base_dir
+    scaffolds = Scaffolder(str(base_dir)).scaffold_overview()
+    return {"scaffolds": scaffolds, "count": len(scaffolds)}
+
 
 @router.get("/{name}")
 async def get_scaffold_info(request: Request, name: str):
@@ -24,29 +39,33 @@ async def get_scaffold_info(request: Request, name: str):
             "message": None,
         }
 
-    files = []
-    for f in scaffold_dir.rglob("*"):
-        if f.is_file():
-            rel_path = f.relative_to(scaffold_dir)
-            file_type = "template" if f.suffix == ".template" else "static"
-            if f.name == "scaffold.yml":
-                file_type = "manifest"
-            elif f.name == "MESSAGE.txt":
-                file_type = "message"
-            files.append({
-                "path": str(rel_path),
-                "type": file_type,
-                "size": f.stat().st_size,
-            })
+    from scaffold import Scaffolder
+
+    tree = Scaffolder(str(base_dir)).scan_scaffold(name)
+    classified = [(f, "template") for f in tree.templates]
+    classified += [(f, "static") for f in tree.statics]
+    # Nested scaffold.yml / MESSAGE.txt are not used, but keep their type
+    classified += [(f, IGNORED_FILE_TYPES.get(f.name, "static")) for f in tree.ignored]
+    if tree.manifest:
+        classified.append((tree.manifest, "manifest"))
+    if tree.message:
+        classified.append((tree.message, "message"))
+
+    files = [
+        {
+            "path": str(f.relative_to(scaffold_dir)),
+            "type": file_type,
+            "size": f.stat().st_size,
+        }
+        for f, file_type in sorted(classified)
+    ]
 
-    # Check for manifest
-    has_manifest = (scaffold_dir / "scaffold.yml").exists()
+    has_manifest = tree.manifest is not None
 
     # Get MESSAGE.txt if exists
     message = None
-    message_path = scaffold_dir / "MESSAGE.txt"
-    if message_path.exists():
-        message = message_path.read_text(encoding="utf-8")
+    if tree.message:
+        message = tree.message.read_text(encoding="utf-8")
 
     return {
         "service": name,
@@ -73,6 +73,8 @@ async def get_service(request: Request, name: str):
     if not info:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
 
+    info["overrides"] = services_mgr.get_overrides(name)
+
     # Add container status if enabled
     if info.get("enabled"):
         container = docker.get_container(name)
@@ -4,26 +4,31 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from .config import settings
+from .core.icons import get_icon_href
+from .core.static_files import CachedStaticFiles
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown."""
     # Startup: Initialize clients and state
+    from .core.cloudflare_client import create_cloudflare_client
     from .core.docker_client import DockerClient
     from .core.service_manager import ServiceManager
 
     app.state.docker = DockerClient(settings.docker_host)
     app.state.services = ServiceManager(str(settings.base_dir))
+    # One client for all DNS requests: keeps its connections and zone IDs
+    app.state.cloudflare = create_cloudflare_client(settings.etc_dir)
 
     yield
 
-    # Shutdown: Cleanup if needed
-    pass
+    # Shutdown: Close pooled connections
+    if app.state.cloudflare is not None:
+        await app.state.cloudflare.aclose()
 
 
 def create_app() -> FastAPI:
@@ -35,14 +40,15 @@ def create_app() -> FastAPI:
         redoc_url="/api/redoc" if settings.debug else None,
     )
 
-    # Static files
+    # Static files (hashed names such as the icon sprite are cached for good)
     static_dir = Path(__file__).parent / "static"
     if static_dir.exists():
-        app.mount("/static", StaticFiles(directory=static_dir), name="static")
+        app.mount("/static", CachedStaticFiles(directory=static_dir), name="static")
 
     # Templates
     templates_dir = Path(__file__).parent / "templates"
     app.state.templates = Jinja2Templates(directory=templates_dir)
+    app.state.templates.env.globals["icon_href"] = get_icon_href
 
     # Include API routers
     from .api import services, docker, system, config, scaffold, backup, dns, database, events
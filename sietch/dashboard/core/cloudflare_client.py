@@ -0,0 +1,33 @@
+"""Cloudflare client for OnRamp Dashboard.
+
+Creates the one AsyncCloudflareAPI the dashboard shares across requests.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+# Add scripts directory to path to import the existing cloudflare module
+sys.path.insert(0, "/scripts")
+
+logger = logging.getLogger(__name__)
+
+
+def create_cloudflare_client(etc_dir: Path, **kwargs):
+    """Create the shared AsyncCloudflareAPI, or None if unavailable.
+
+    The zone ID cache lives beside the one the CLI uses, so the dashboard
+    and `make` commands look each zone up once between them.
+    """
+    try:
+        from cloudflare import AsyncCloudflareAPI
+    except ImportError:
+        logger.warning("Cloudflare module not available")
+        return None
+
+    kwargs.setdefault("zone_cache_path", etc_dir / ".cache" / "cloudflare_zones.json")
+    try:
+        return AsyncCloudflareAPI(**kwargs)
+    except (ValueError, RuntimeError) as e:
+        logger.info(f"Cloudflare DNS management disabled: {e}")
+        return None
@@ -0,0 +1,41 @@
+"""Effective environment for OnRamp Dashboard.
+
+Wraps the sietch env_files.py resolution, so the dashboard shows the values
+docker compose gets and the file each one comes from.
+"""
+
+import sys
+from pathlib import Path
+
+# Add scripts directory to path to import the existing env module
+sys.path.insert(0, "/scripts")
+
+from env_files import EnvLine, LayeredEnv, parse_env_text
+
+# One LayeredEnv per tree, so unchanged files are not re-read per request
+_layers: dict[Path, LayeredEnv] = {}
+
+
+def effective_env(base_dir: Path) -> list[dict]:
+    """Every variable's effective value, source file and shadowed files."""
+    base_dir = Path(base_dir)
+    env = _layers.setdefault(base_dir, LayeredEnv(base_dir))
+
+    def relative(path: Path | None) -> str | None:
+        return str(path.relative_to(base_dir)) if path else None
+
+    return [
+        {
+            "name": entry.name,
+            "value": entry.value,
+            "raw": entry.raw,
+            "source": relative(entry.source),
+            "shadowed": [relative(path) for path in entry.shadowed],
+        }
+        for entry in sorted(env.values().values(), key=lambda entry: entry.name)
+    ]
+
+
+def template_variables(content: str) -> list[EnvLine]:
+    """Variable lines of an env.template."""
+    return [line for line in parse_env_text(content) if line.kind == "var"]
@@ -0,0 +1,20 @@
+"""Host index for OnRamp Dashboard.
+
+Wraps the sietch traefik_hosts.py extraction, so the dashboard lists the
+same hosts Joyride and the Cloudflare sync use.
+"""
+
+import sys
+from pathlib import Path
+
+# Add scripts directory to path to import the existing extractor
+sys.path.insert(0, "/scripts")
+
+from traefik_hosts import HostIndex, TraefikHostsExtractor
+
+
+def build_host_index(base_dir: Path) -> HostIndex:
+    """Index the Traefik hosts of enabled services and externals."""
+    extractor = TraefikHostsExtractor(base_dir=Path(base_dir))
+    extractor.load_env_files()
+    return extractor.build_host_index()
@@ -5,8 +5,13 @@ references. Icons are downloaded by scripts/download_icons.py and served locally
 from static/icons/<service>.svg. The runtime template code only needs to
 reference the local path; the mapping here is used at build/download time to
 fetch the correct icon files.
+
+The download script also packs the icons into one content-hashed SVG sprite.
+Templates draw icons from it with <use href> (see get_icon_href), so a page
+makes one icon request however many services it lists.
 """
 
+import json
 from pathlib import Path
 
 # selfh.st icons index (lists every available reference and supported formats)
@@ -14,6 +19,14 @@ SELFH_ICONS_INDEX = (
     "https://raw.githubusercontent.com/selfhst/icons/main/index.json"
 )
 
+# Where the icons are stored and served from
+ICONS_DIR = Path(__file__).resolve().parent.parent / "static" / "icons"
+ICONS_URL = "/static/icons"
+
+# Written next to the icons by download_icons.py: the sprite's file name and
+# the sprite symbol of every icon
+SPRITE_MANIFEST = "sprite.json"
+
 # Icon used when no specific match can be found or when the upstream icon has no
 # SVG variant. selfhst/icons provides an SVG for docker.
 FALLBACK_ICON = "docker"
@@ -302,6 +315,54 @@ def get_icon_url(service_name: str) -> str:
     return f"/static/icons/{normalized}.svg"
 
 
+_sprite_cache: dict[Path, tuple[int, dict]] = {}
+
+
+def load_sprite_manifest(icons_dir: Path = ICONS_DIR) -> dict:
+    """Return the sprite manifest, re-read only when it changes.
+
+    Returns an empty dict when no sprite has been built.
+    """
+    path = Path(icons_dir) / SPRITE_MANIFEST
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return {}
+    cached = _sprite_cache.get(path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        manifest = json.loads(path.read_text())
+    except (OSError, ValueError):
+        manifest = {}
+    if not isinstance(manifest.get("icons"), dict) or not manifest.get("sprite"):
+        manifest = {}
+    _sprite_cache[path] = (mtime_ns, manifest)
+    return manifest
+
+
+def get_icon_href(icon_url: str, icons_dir: Path = ICONS_DIR) -> str | None:
+    """Return the <use href> reference of an icon in the sprite.
+
+    Icons without a file of their own get the fallback symbol, as <img>
+    elements get the fallback icon when theirs fails to load. Returns None
+    when the icon should be shown as an <img>: there is no sprite, the URL
+    is not a local icon, or the icon was left out of the sprite.
+    """
+    manifest = load_sprite_manifest(icons_dir)
+    if not manifest or not icon_url.startswith(f"{ICONS_URL}/"):
+        return None
+    name = icon_url[len(ICONS_URL) + 1 :].removesuffix(".svg")
+    symbol = manifest["icons"].get(name)
+    if symbol is None:
+        if (Path(icons_dir) / f"{name}.svg").is_file():
+            return None
+        symbol = manifest["icons"].get(FALLBACK_ICON)
+        if symbol is None:
+            return None
+    return f"{ICONS_URL}/{manifest['sprite']}#{symbol}"
+
+
 def get_local_icon_path(service_name: str, base_dir: str = "/app") -> Path:
     """Return the filesystem path where the service icon should be stored."""
     normalized = _normalize(service_name)
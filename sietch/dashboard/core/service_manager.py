@@ -58,6 +58,10 @@ class ServiceManager:
             info["icon_url"] = get_icon_url(name)
         return info
 
+    def get_overrides(self, name: str) -> list[dict]:
+        """Get the overrides that apply to a service, with enabled status."""
+        return self._manager.get_overrides(name)
+
     def get_enabled_names(self) -> list[str]:
         """Get just the names of enabled services."""
         return self._manager.list_enabled()
@@ -0,0 +1,37 @@
+"""Static file serving with cache headers for OnRamp Dashboard.
+
+Starlette's StaticFiles already sends ETag and Last-Modified and answers
+conditional requests with 304. This adds Cache-Control: files whose name
+carries a content hash (like the icon sprite, sprite.<hash>.svg) never
+change, so browsers may keep them for a year without asking again; every
+other file must be revalidated, which costs a 304 while it is unchanged.
+"""
+
+import os
+import re
+
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+# name.<hex content hash>.ext
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles sending Cache-Control for content-hashed and other files."""
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        hashed = HASHED_NAME.search(os.fspath(full_path))
+        response.headers["Cache-Control"] = IMMUTABLE if hashed else REVALIDATE
+        return response
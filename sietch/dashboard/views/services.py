@@ -135,6 +135,7 @@ async def service_detail(request: Request, name: str):
         service["core"] = False
 
     container = docker.get_container(name)
+    overrides = [] if service["core"] else services_mgr.get_overrides(name)
 
     return templates.TemplateResponse(
         request,
@@ -142,5 +143,6 @@ async def service_detail(request: Request, name: str):
         {
             "service": service,
             "container": container,
+            "overrides": overrides,
         },
     )
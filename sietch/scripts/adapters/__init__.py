@@ -1,7 +1,10 @@
 """Adapter implementations for port interfaces."""
 
 from adapters.urllib_http import UrllibHttpClient
+from adapters.pooled_http import PooledHttpClient
+from adapters.httpx_http import HttpxAsyncHttpClient
 from adapters.subprocess_cmd import SubprocessCommandExecutor
 from adapters.docker_subprocess import SubprocessDockerExecutor
+from adapters.docker_api import DockerApiClient, DockerApiError
 
-__all__ = ["UrllibHttpClient", "SubprocessCommandExecutor", "SubprocessDockerExecutor"]
+__all__ = ["UrllibHttpClient", "PooledHttpClient", "HttpxAsyncHttpClient", "SubprocessCommandExecutor", "SubprocessDockerExecutor", "DockerApiClient", "DockerApiError"]
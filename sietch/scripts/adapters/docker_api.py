@@ -0,0 +1,67 @@
+"""Docker Engine API client using http.client (no SDK required)."""
+
+import http.client
+import json
+import os
+import socket
+from urllib.parse import urlparse
+
+DEFAULT_DOCKER_HOST = "unix:///var/run/docker.sock"
+
+
+class DockerApiError(Exception):
+    """The Docker Engine API returned an error response."""
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket."""
+
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class DockerApiClient:
+    """Minimal Docker Engine API client.
+
+    Talks to the socket (or tcp:// host) in DOCKER_HOST, defaulting to
+    /var/run/docker.sock.
+    """
+
+    def __init__(self, host: str | None = None, timeout: float = 10):
+        self.host = host or os.environ.get("DOCKER_HOST") or DEFAULT_DOCKER_HOST
+        self.timeout = timeout
+
+    def _connection(self) -> http.client.HTTPConnection:
+        parsed = urlparse(self.host)
+        if parsed.scheme == "unix":
+            return _UnixHTTPConnection(parsed.path, self.timeout)
+        if parsed.scheme in ("tcp", "http"):
+            return http.client.HTTPConnection(parsed.hostname, parsed.port or 2375, timeout=self.timeout)
+        raise DockerApiError(f"Unsupported DOCKER_HOST: {self.host}")
+
+    def _get_json(self, path: str):
+        conn = self._connection()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            body = response.read()
+        finally:
+            conn.close()
+        if response.status != 200:
+            raise DockerApiError(f"GET {path} returned {response.status}: {body[:200]!r}")
+        return json.loads(body)
+
+    def list_containers(self, all: bool = True) -> list[dict]:
+        """List containers with one GET /containers/json request.
+
+        Raises:
+            OSError: If the Docker daemon cannot be reached
+            DockerApiError: If the API returns an error
+        """
+        return self._get_json(f"/containers/json?all={int(all)}")
@@ -0,0 +1,97 @@
+"""Async HTTP client on a shared httpx connection pool."""
+
+import asyncio
+from urllib.error import URLError
+
+from adapters.pooled_http import IDEMPOTENT_METHODS, RETRY_ANY_METHOD, RETRY_IDEMPOTENT, _retry_after
+
+try:
+    import httpx
+
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+class HttpxAsyncHttpClient:
+    """Async HTTP client backed by one long-lived httpx.AsyncClient.
+
+    Implements the AsyncHttpClient port. The underlying client keeps
+    connections alive per host and is safe to share between concurrent
+    tasks, so an instance should live as long as the application and be
+    closed with aclose() on shutdown. Responses are gzip-decoded by httpx;
+    429 and 5xx responses are retried the same way PooledHttpClient does.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        sleep=asyncio.sleep,
+    ):
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx not installed")
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def __aenter__(self) -> "HttpxAsyncHttpClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close every pooled connection."""
+        await self._client.aclose()
+
+    def _delay(self, attempt: int, headers) -> float:
+        retry_after = _retry_after(headers.get("retry-after"))
+        if retry_after is None:
+            retry_after = self.backoff * 2**attempt
+        return min(retry_after, self.max_backoff)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        data: bytes | None = None,
+        timeout: float = 30,
+    ) -> tuple[int, bytes]:
+        """Make HTTP request over a pooled connection.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE, etc.)
+            url: Full URL to request
+            headers: Optional request headers
+            data: Optional request body
+            timeout: Request timeout in seconds
+
+        Returns:
+            Tuple of (status_code, response_body), body decoded
+
+        Raises:
+            URLError: On network errors
+        """
+        method = method.upper()
+        retry_statuses = RETRY_ANY_METHOD | (RETRY_IDEMPOTENT if method in IDEMPOTENT_METHODS else frozenset())
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.request(method, url, headers=headers, content=data, timeout=timeout)
+            except httpx.TransportError as e:
+                raise URLError(e) from e
+
+            if response.status_code not in retry_statuses or attempt >= self.retries:
+                return response.status_code, response.content
+
+            await self._sleep(self._delay(attempt, response.headers))
+            attempt += 1
@@ -0,0 +1,297 @@
+"""HTTP client with keep-alive connection pooling, gzip and retries."""
+
+import base64
+import gzip
+import http.client
+import threading
+import time
+import urllib.request
+import zlib
+from email.utils import parsedate_to_datetime
+from urllib.error import URLError
+from urllib.parse import unquote, urlsplit
+
+# Statuses retried with backoff. 429 means the request was not processed,
+# so it is retried for any method; 5xx only for idempotent methods.
+RETRY_ANY_METHOD = frozenset({429})
+RETRY_IDEMPOTENT = frozenset({500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Errors meaning a kept-alive connection was closed by the server while idle
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+def _retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _decode(body: bytes, encoding: str | None) -> bytes:
+    """Undo a gzip or deflate Content-Encoding."""
+    encoding = (encoding or "").strip().lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            # Some servers send raw deflate without the zlib header
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+class PooledHttpClient:
+    """HTTP client that reuses persistent connections per host.
+
+    Implements the HttpClient port. Idle connections are kept per
+    (scheme, host, port) and reused by later requests, so a run of API
+    calls pays for one TCP and TLS handshake instead of one per request.
+    Safe to share between threads; each request uses a connection of its
+    own.
+
+    Responses are requested with Accept-Encoding: gzip and decoded
+    transparently. 429 and 5xx responses are retried with exponential
+    backoff, waiting for Retry-After when the server sends one.
+
+    Proxies are taken from the environment as urllib does (HTTP_PROXY,
+    HTTPS_PROXY, NO_PROXY): https requests are tunnelled with CONNECT,
+    http requests are sent to the proxy in absolute form. Only plain HTTP
+    proxies are supported (an https:// proxy URL is spoken to in plain
+    HTTP, as urllib does), and the proxy for a host is looked up once per
+    client, so environment changes apply to new clients only.
+    """
+
+    def __init__(
+        self,
+        max_idle_per_host: int = 4,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        sleep=time.sleep,
+    ):
+        self.max_idle_per_host = max_idle_per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._proxies: dict[tuple[str, str, int], tuple[str, int, dict[str, str]] | None] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "PooledHttpClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    def _proxy(self, key: tuple[str, str, int]) -> tuple[str, int, dict[str, str]] | None:
+        """(host, port, headers) of the environment proxy for a host, or None."""
+        with self._lock:
+            if key in self._proxies:
+                return self._proxies[key]
+        scheme, host, _ = key
+        proxy_url = urllib.request.getproxies().get(scheme)
+        proxy = None
+        if proxy_url and not urllib.request.proxy_bypass(host):
+            parts = urlsplit(proxy_url if "://" in proxy_url else f"http://{proxy_url}")
+            headers = {}
+            if parts.username:
+                credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+                headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+            proxy = (parts.hostname, parts.port or 80, headers)
+        with self._lock:
+            self._proxies[key] = proxy
+        return proxy
+
+    def _acquire(self, key: tuple[str, str, int], timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        """Return (connection, reused) for a host."""
+        with self._lock:
+            connections = self._idle.get(key)
+            conn = connections.pop() if connections else None
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+
+        scheme, host, port = key
+        proxy = self._proxy(key)
+        if proxy is None:
+            if scheme == "https":
+                return http.client.HTTPSConnection(host, port, timeout=timeout), False
+            return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+        proxy_host, proxy_port, proxy_headers = proxy
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=timeout)
+            conn.set_tunnel(host, port, headers=proxy_headers)
+            return conn, False
+        return http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout), False
+
+    def _release(self, key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            connections = self._idle.setdefault(key, [])
+            if len(connections) < self.max_idle_per_host:
+                connections.append(conn)
+                return
+        conn.close()
+
+    def _send(
+        self,
+        key: tuple[str, str, int],
+        method: str,
+        target: str,
+        headers: dict[str, str],
+        data: bytes | None,
+        timeout: float,
+    ) -> tuple[int, dict[str, str], bytes]:
+        """One request/response exchange, retrying once on a stale connection.
+
+        A request that was fully sent may have been processed before the
+        connection dropped, so it is only resent for idempotent methods.
+        """
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            sent = False
+            try:
+                conn.request(method, target, body=data, headers=headers)
+                sent = True
+                response = conn.getresponse()
+                body = response.read()
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                if reused and (not sent or method in IDEMPOTENT_METHODS):
+                    continue
+                raise
+            except http.client.IncompleteRead as e:
+                # Keep the headers with the partial body, for resuming
+                e.headers = dict(response.headers.items())
+                conn.close()
+                raise
+            except BaseException:
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return response.status, dict(response.headers.items()), body
+
+    def _delay(self, attempt: int, headers: dict[str, str]) -> float:
+        retry_after = _retry_after(
+            next((v for k, v in headers.items() if k.lower() == "retry-after"), None)
+        )
+        if retry_after is None:
+            retry_after = self.backoff * 2**attempt
+        return min(retry_after, self.max_backoff)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        data: bytes | None = None,
+        timeout: float = 30,
+    ) -> tuple[int, bytes]:
+        """Make HTTP request over a pooled connection.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE, etc.)
+            url: Full URL to request
+            headers: Optional request headers
+            data: Optional request body
+            timeout: Request timeout in seconds
+
+        Returns:
+            Tuple of (status_code, response_body), body decoded
+
+        Raises:
+            URLError: On network errors
+        """
+        status, _, body = self.request_with_headers(method, url, headers, data, timeout)
+        return status, body
+
+    def request_with_headers(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        data: bytes | None = None,
+        timeout: float = 30,
+    ) -> tuple[int, dict[str, str], bytes]:
+        """Like request(), also returning the response headers.
+
+        Needed for conditional requests (ETag, Last-Modified). Header
+        names are as sent by the server. When the body is cut short, the
+        URLError's reason is the http.client.IncompleteRead, holding the
+        bytes received (partial) and the response headers (headers).
+
+        Returns:
+            Tuple of (status_code, response_headers, response_body), body decoded
+
+        Raises:
+            URLError: On network errors
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise URLError(f"Unsupported URL: {url}")
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+
+        headers = dict(headers or {})
+        if not any(k.lower() == "accept-encoding" for k in headers):
+            headers["Accept-Encoding"] = "gzip"
+        proxy = self._proxy(key) if scheme == "http" else None
+        if proxy is not None:
+            # Plain HTTP goes to the proxy with the absolute URL
+            target = f"http://{parts.netloc.rpartition('@')[2]}{target}"
+            headers.update(proxy[2])
+
+        method = method.upper()
+        retry_statuses = RETRY_ANY_METHOD | (RETRY_IDEMPOTENT if method in IDEMPOTENT_METHODS else frozenset())
+
+        attempt = 0
+        while True:
+            try:
+                status, response_headers, body = self._send(key, method, target, headers, data, timeout)
+            except OSError as e:
+                raise URLError(e) from e
+            except http.client.HTTPException as e:
+                raise URLError(e) from e
+
+            if status not in retry_statuses or attempt >= self.retries:
+                encoding = next((v for k, v in response_headers.items() if k.lower() == "content-encoding"), None)
+                try:
+                    return status, response_headers, _decode(body, encoding)
+                except (OSError, EOFError, zlib.error) as e:
+                    raise URLError(f"Could not decode {encoding} response: {e}") from e
+
+            self._sleep(self._delay(attempt, response_headers))
+            attempt += 1
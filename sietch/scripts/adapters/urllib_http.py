@@ -27,6 +27,25 @@ class UrllibHttpClient:
         Returns:
             Tuple of (status_code, response_body)
 
+        Raises:
+            URLError: On network errors
+        """
+        status, _, body = self.request_with_headers(method, url, headers, data, timeout)
+        return status, body
+
+    def request_with_headers(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        data: bytes | None = None,
+        timeout: float = 30,
+    ) -> tuple[int, dict[str, str], bytes]:
+        """Like request(), also returning the response headers.
+
+        Returns:
+            Tuple of (status_code, response_headers, response_body)
+
         Raises:
             URLError: On network errors
         """
@@ -34,6 +53,6 @@ class UrllibHttpClient:
 
         try:
             with urlopen(req, timeout=timeout) as response:
-                return response.status, response.read()
+                return response.status, dict(response.headers.items()), response.read()
         except HTTPError as e:
-            return e.code, e.read()
+            return e.code, dict(e.headers.items()), e.read()
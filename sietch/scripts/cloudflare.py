@@ -5,12 +5,23 @@ cloudflare.py - Cloudflare API operations for OnRamp
 Commands:
   dns list
   dns delete --name <subdomain>
+  dns sync [--dry-run]
   zone info
 
 Features:
 - Proper API client with error handling
 - Structured error messages
 - Credential handling via environment variables
+- Zone IDs cached in memory and in etc/.cache/cloudflare_zones.json
+  (24h TTL), so each operation costs only its own request
+- DNS record listings follow every page, 5000 records per request, and
+  can be streamed with iter_dns_records()
+- `dns sync` reconciles the zone with the hosts of enabled services and
+  externals: the zone is listed once, diffed locally, and the changes sent
+  through the batch endpoint (or a bounded worker pool with --no-batch).
+  Only records carrying the OnRamp comment are ever updated or deleted.
+- AsyncCloudflareAPI: the same client for asyncio code (the dashboard),
+  over an AsyncHttpClient, meant to live as long as the process
 
 Note: Tunnel creation/deletion is handled via cloudflared CLI (docker compose).
 This script handles the DNS API operations that were done via curl/jq.
@@ -20,54 +31,121 @@ from logging_config import get_logger, setup_logging
 logger = get_logger(__name__)
 
 import argparse
+import asyncio
+import ipaddress
 import json
 import os
 import sys
-from typing import TYPE_CHECKING
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Iterator
+from urllib.parse import urlencode
 
 if TYPE_CHECKING:
-    from ports.http import HttpClient
+    from ports.http import AsyncHttpClient, HttpClient
 
 
-class CloudflareAPI:
-    """Cloudflare API client."""
+ZONE_CACHE_PATH = Path("/app/etc/.cache/cloudflare_zones.json")
+ZONE_CACHE_TTL = 24 * 3600
+
+# Records per page when listing DNS records
+DNS_PAGE_SIZE = 5000
+
+# Changes per request to the batch endpoint
+DNS_BATCH_SIZE = 200
+
+# Comment marking the records `dns sync` owns
+DNS_MANAGED_COMMENT = "managed by onramp"
+
+
+class ZoneCache:
+    """Zone IDs by domain, persisted to a JSON file with a TTL.
+
+    The file is only written when the etc/ directory it belongs to exists,
+    so running outside an OnRamp tree leaves no cache behind.
+    """
+
+    def __init__(self, path: Path | None, ttl: float = ZONE_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+
+    def _load(self) -> dict[str, dict]:
+        if self.path is None:
+            return {}
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, domain: str) -> str | None:
+        """Cached zone ID for a domain, if present and not expired."""
+        entry = self._load().get(domain)
+        if not isinstance(entry, dict) or entry.get("expires", 0) <= time.time():
+            return None
+        return entry.get("id")
+
+    def put(self, domain: str, zone_id: str | None) -> None:
+        """Record (or with None, forget) a domain's zone ID."""
+        if self.path is None or not self.path.parent.parent.is_dir():
+            return
+        now = time.time()
+        zones = {d: e for d, e in self._load().items() if isinstance(e, dict) and e.get("expires", 0) > now}
+        if zone_id is None:
+            zones.pop(domain, None)
+        else:
+            zones[domain] = {"id": zone_id, "expires": now + self.ttl}
+        try:
+            self.path.parent.mkdir(exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(zones, indent=1))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save zone cache: {e}", extra={"path": str(self.path)})
+
+
+class _CloudflareClientBase:
+    """Configuration, zone ID caching and response handling shared by the
+    blocking and async API clients."""
 
     BASE_URL = "https://api.cloudflare.com/client/v4"
 
     def __init__(
         self,
-        api_token: str | None = None,
-        domain: str | None = None,
-        http_client: "HttpClient | None" = None,
+        api_token: str | None,
+        domain: str | None,
+        zone_cache_path: Path | None,
+        base_url: str | None,
     ):
         self.api_token = api_token or os.environ.get("CF_DNS_API_TOKEN", "")
+        self.base_url = base_url or self.BASE_URL
         self.domain = domain or os.environ.get("HOST_DOMAIN", "")
+        self.zone_cache = ZoneCache(zone_cache_path)
+        self._zone_id: str | None = None
+        # False while the zone ID comes from the disk cache and has not been
+        # confirmed by the API in this process
+        self._zone_id_verified = False
 
         if not self.api_token:
             raise ValueError("CF_DNS_API_TOKEN environment variable not set")
         if not self.domain:
             raise ValueError("HOST_DOMAIN environment variable not set")
 
-        # Use injected client or create default
-        if http_client is not None:
-            self._http = http_client
-        else:
-            from adapters.urllib_http import UrllibHttpClient
-
-            self._http = UrllibHttpClient()
-
-    def _request(self, method: str, endpoint: str, data: dict | None = None) -> dict:
-        """Make API request."""
-        url = f"{self.BASE_URL}{endpoint}"
+    def _prepare(self, endpoint: str, data: dict | None) -> tuple[str, dict[str, str], bytes | None]:
+        """URL, headers and body for an API request."""
+        url = f"{self.base_url}{endpoint}"
         headers = {
             "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json",
         }
-
         body = json.dumps(data).encode() if data else None
+        return url, headers, body
 
-        status, response_body = self._http.request(method, url, headers, body, timeout=30)
-
+    @staticmethod
+    def _parse(status: int, response_body: bytes) -> dict:
+        """Decode an API response, raising RuntimeError on HTTP errors."""
         try:
             result = json.loads(response_body.decode())
         except json.JSONDecodeError:
@@ -81,79 +159,512 @@ class CloudflareAPI:
 
         return result
 
-    def get_zone_id(self) -> str:
-        """Get zone ID for the configured domain."""
-        result = self._request("GET", f"/zones?name={self.domain}")
-
+    @staticmethod
+    def _check(result: dict, action: str):
+        """The result of a successful response, else RuntimeError."""
         if not result.get("success"):
-            raise RuntimeError(f"Failed to get zone: {result.get('errors', 'Unknown error')}")
-
-        zones = result.get("result", [])
+            raise RuntimeError(f"Failed to {action}: {result.get('errors', 'Unknown error')}")
+        return result.get("result")
+
+    def _cached_zone_id(self) -> str | None:
+        """Zone ID from memory, or failing that the disk cache."""
+        if self._zone_id is None:
+            self._zone_id = self.zone_cache.get(self.domain)
+            self._zone_id_verified = False
+        return self._zone_id
+
+    def _remember_zone_id(self, zone_id: str) -> str:
+        self._zone_id = zone_id
+        self._zone_id_verified = True
+        self.zone_cache.put(self.domain, zone_id)
+        return zone_id
+
+    def _zone_from(self, result: dict) -> str:
+        zones = self._check(result, "get zone") or []
         if not zones:
             raise RuntimeError(f"Zone not found for domain: {self.domain}")
-
         return zones[0]["id"]
 
-    def get_zone_info(self) -> dict:
-        """Get zone information."""
-        zone_id = self.get_zone_id()
-        result = self._request("GET", f"/zones/{zone_id}")
+    def invalidate_zone_id(self) -> None:
+        """Forget the cached zone ID (memory and disk)."""
+        self._zone_id = None
+        self.zone_cache.put(self.domain, None)
 
-        if not result.get("success"):
-            raise RuntimeError(f"Failed to get zone info: {result.get('errors', 'Unknown error')}")
+    @staticmethod
+    def _records_endpoint(params: dict, per_page: int, page: int, cursor: str | None) -> str:
+        query = {**params, "per_page": per_page}
+        if cursor:
+            query["cursor"] = cursor
+        else:
+            query["page"] = page
+        return f"/dns_records?{urlencode(query)}"
 
-        return result.get("result", {})
+    @staticmethod
+    def _record_filters(record_type: str | None, name: str | None) -> dict:
+        params = {}
+        if record_type:
+            params["type"] = record_type
+        if name:
+            params["name"] = name
+        return params
+
+    @staticmethod
+    def _next_page(result: dict, records: list, page: int) -> tuple[int, str | None] | None:
+        """(page, cursor) of the page after this one, or None after the last."""
+        info = result.get("result_info") or {}
+        cursor = (info.get("cursors") or {}).get("after")
+        if not records or (not cursor and page >= info.get("total_pages", 0)):
+            return None
+        return page + 1, cursor
+
+
+class CloudflareAPI(_CloudflareClientBase):
+    """Cloudflare API client."""
 
-    def list_dns_records(self, record_type: str | None = None) -> list[dict]:
-        """List DNS records for the zone."""
-        zone_id = self.get_zone_id()
+    def __init__(
+        self,
+        api_token: str | None = None,
+        domain: str | None = None,
+        http_client: "HttpClient | None" = None,
+        zone_cache_path: Path | None = ZONE_CACHE_PATH,
+        base_url: str | None = None,
+    ):
+        super().__init__(api_token, domain, zone_cache_path, base_url)
 
-        endpoint = f"/zones/{zone_id}/dns_records"
-        if record_type:
-            endpoint += f"?type={record_type}"
+        # Use injected client or create default
+        if http_client is not None:
+            self._http = http_client
+        else:
+            from adapters.pooled_http import PooledHttpClient
 
-        result = self._request("GET", endpoint)
+            # Keep-alive: the zone lookup, listing and changes share a connection
+            self._http = PooledHttpClient()
 
-        if not result.get("success"):
-            raise RuntimeError(f"Failed to list DNS records: {result.get('errors', 'Unknown error')}")
+    def _request(self, method: str, endpoint: str, data: dict | None = None) -> dict:
+        """Make API request."""
+        url, headers, body = self._prepare(endpoint, data)
+        status, response_body = self._http.request(method, url, headers, body, timeout=30)
+        return self._parse(status, response_body)
+
+    def get_zone_id(self) -> str:
+        """Get zone ID for the configured domain (cached)."""
+        zone_id = self._cached_zone_id()
+        if zone_id is None:
+            zone_id = self._remember_zone_id(self._fetch_zone_id())
+        return zone_id
+
+    def _fetch_zone_id(self) -> str:
+        return self._zone_from(self._request("GET", f"/zones?{urlencode({'name': self.domain})}"))
+
+    def _zone_request(self, method: str, path: str, data: dict | None = None) -> dict:
+        """Request /zones/{zone_id}{path}.
+
+        A zone ID taken from the disk cache may be stale (zone re-added);
+        if the request fails with it, the ID is looked up again and the
+        request retried once.
+        """
+        zone_id = self.get_zone_id()
+        try:
+            return self._request(method, f"/zones/{zone_id}{path}", data)
+        except RuntimeError:
+            if self._zone_id_verified:
+                raise
+            self.invalidate_zone_id()
+            if self.get_zone_id() == zone_id:
+                raise
+            return self._request(method, f"/zones/{self._zone_id}{path}", data)
+
+    def get_zone_info(self) -> dict:
+        """Get zone information."""
+        return self._check(self._zone_request("GET", ""), "get zone info") or {}
 
-        return result.get("result", [])
+    def iter_dns_records(
+        self,
+        record_type: str | None = None,
+        name: str | None = None,
+        per_page: int = DNS_PAGE_SIZE,
+    ) -> Iterator[dict]:
+        """Yield every DNS record of the zone, one page per request.
+
+        Follows result_info cursors when the API returns them, and page
+        numbers up to total_pages otherwise.
+        """
+        params = self._record_filters(record_type, name)
+        position = (1, None)
+        while position:
+            page, cursor = position
+            result = self._zone_request("GET", self._records_endpoint(params, per_page, page, cursor))
+            records = self._check(result, "list DNS records") or []
+            yield from records
+            position = self._next_page(result, records, page)
+
+    def list_dns_records(self, record_type: str | None = None) -> list[dict]:
+        """List all DNS records for the zone."""
+        return list(self.iter_dns_records(record_type=record_type))
 
     def find_dns_record(self, name: str, record_type: str = "CNAME") -> dict | None:
         """Find a specific DNS record by name and type."""
-        zone_id = self.get_zone_id()
-
         # Ensure FQDN
         if not name.endswith(self.domain):
             name = f"{name}.{self.domain}"
 
-        endpoint = f"/zones/{zone_id}/dns_records?type={record_type}&name={name}"
-        result = self._request("GET", endpoint)
+        result = self._zone_request("GET", f"/dns_records?{urlencode({'type': record_type, 'name': name})}")
 
-        if not result.get("success"):
-            raise RuntimeError(f"Failed to find DNS record: {result.get('errors', 'Unknown error')}")
-
-        records = result.get("result", [])
+        records = self._check(result, "find DNS record") or []
         return records[0] if records else None
 
     def delete_dns_record(self, name: str, record_type: str = "CNAME") -> bool:
         """Delete a DNS record by name."""
-        zone_id = self.get_zone_id()
-
         # Find the record first
         record = self.find_dns_record(name, record_type)
         if not record:
             logger.info(f"DNS record not found: {name} ({record_type})")
             return False
 
-        record_id = record["id"]
+        self.delete_dns_record_by_id(record["id"])
+        return True
 
-        result = self._request("DELETE", f"/zones/{zone_id}/dns_records/{record_id}")
+    def create_dns_record(self, record: dict) -> dict:
+        """Create a DNS record (type, name, content, ...)."""
+        return self._check(self._zone_request("POST", "/dns_records", record), "create DNS record") or {}
 
-        if not result.get("success"):
-            raise RuntimeError(f"Failed to delete DNS record: {result.get('errors', 'Unknown error')}")
+    def update_dns_record(self, record_id: str, changes: dict) -> dict:
+        """Update fields of a DNS record."""
+        result = self._zone_request("PATCH", f"/dns_records/{record_id}", changes)
+        return self._check(result, "update DNS record") or {}
+
+    def delete_dns_record_by_id(self, record_id: str) -> None:
+        """Delete a DNS record by ID."""
+        self._check(self._zone_request("DELETE", f"/dns_records/{record_id}"), "delete DNS record")
+
+    def batch_dns_records(
+        self,
+        deletes: list[dict] | None = None,
+        patches: list[dict] | None = None,
+        posts: list[dict] | None = None,
+    ) -> dict:
+        """Apply record changes in one request.
+
+        Cloudflare applies a batch atomically, in the order deletes,
+        patches, posts.
+        """
+        body = {"deletes": deletes or [], "patches": patches or [], "posts": posts or []}
+        return self._check(self._zone_request("POST", "/dns_records/batch", body), "apply DNS batch") or {}
 
-        return True
+
+class AsyncCloudflareAPI(_CloudflareClientBase):
+    """Cloudflare API client for asyncio code such as the dashboard.
+
+    Meant to be long-lived: one instance keeps its HTTP connections and
+    the zone ID for the life of the process. Methods working on records
+    take an optional zone_id for zones other than the configured domain.
+    """
+
+    def __init__(
+        self,
+        api_token: str | None = None,
+        domain: str | None = None,
+        http_client: "AsyncHttpClient | None" = None,
+        zone_cache_path: Path | None = ZONE_CACHE_PATH,
+        base_url: str | None = None,
+    ):
+        super().__init__(api_token, domain, zone_cache_path, base_url)
+        # Concurrent first requests share one zone lookup
+        self._zone_lock = asyncio.Lock()
+
+        if http_client is not None:
+            self._http = http_client
+        else:
+            from adapters.httpx_http import HttpxAsyncHttpClient
+
+            self._http = HttpxAsyncHttpClient()
+
+    async def aclose(self) -> None:
+        """Close the HTTP client's connections."""
+        close = getattr(self._http, "aclose", None)
+        if close is not None:
+            await close()
+
+    async def _request(self, method: str, endpoint: str, data: dict | None = None) -> dict:
+        """Make API request."""
+        url, headers, body = self._prepare(endpoint, data)
+        status, response_body = await self._http.request(method, url, headers, body, timeout=30)
+        return self._parse(status, response_body)
+
+    async def get_zone_id(self) -> str:
+        """Get zone ID for the configured domain (cached)."""
+        zone_id = self._cached_zone_id()
+        if zone_id is not None:
+            return zone_id
+        async with self._zone_lock:
+            zone_id = self._cached_zone_id()
+            if zone_id is None:
+                result = await self._request("GET", f"/zones?{urlencode({'name': self.domain})}")
+                zone_id = self._remember_zone_id(self._zone_from(result))
+        return zone_id
+
+    async def _zone_request(
+        self, method: str, path: str, data: dict | None = None, zone_id: str | None = None
+    ) -> dict:
+        """Request /zones/{zone_id}{path}, retrying once on a stale cached zone ID."""
+        if zone_id is not None:
+            return await self._request(method, f"/zones/{zone_id}{path}", data)
+
+        zone_id = await self.get_zone_id()
+        try:
+            return await self._request(method, f"/zones/{zone_id}{path}", data)
+        except RuntimeError:
+            if self._zone_id_verified:
+                raise
+            self.invalidate_zone_id()
+            if await self.get_zone_id() == zone_id:
+                raise
+            return await self._request(method, f"/zones/{self._zone_id}{path}", data)
+
+    async def list_zones(self) -> list[dict]:
+        """List the zones the API token can access."""
+        zones = []
+        position = (1, None)
+        while position:
+            page, cursor = position
+            result = await self._request("GET", f"/zones?{urlencode({'page': page, 'per_page': 50})}")
+            found = self._check(result, "list zones") or []
+            zones.extend(found)
+            position = self._next_page(result, found, page)
+        return zones
+
+    async def get_zone_info(self, zone_id: str | None = None) -> dict:
+        """Get zone information."""
+        result = await self._zone_request("GET", "", zone_id=zone_id)
+        return self._check(result, "get zone info") or {}
+
+    async def iter_dns_records(
+        self,
+        record_type: str | None = None,
+        name: str | None = None,
+        per_page: int = DNS_PAGE_SIZE,
+        zone_id: str | None = None,
+    ) -> AsyncIterator[dict]:
+        """Yield every DNS record of the zone, one page per request."""
+        params = self._record_filters(record_type, name)
+        position = (1, None)
+        while position:
+            page, cursor = position
+            endpoint = self._records_endpoint(params, per_page, page, cursor)
+            result = await self._zone_request("GET", endpoint, zone_id=zone_id)
+            records = self._check(result, "list DNS records") or []
+            for record in records:
+                yield record
+            position = self._next_page(result, records, page)
+
+    async def list_dns_records(
+        self, record_type: str | None = None, name: str | None = None, zone_id: str | None = None
+    ) -> list[dict]:
+        """List all DNS records for the zone."""
+        return [record async for record in self.iter_dns_records(record_type, name, zone_id=zone_id)]
+
+    async def create_dns_record(self, record: dict, zone_id: str | None = None) -> dict:
+        """Create a DNS record (type, name, content, ...)."""
+        result = await self._zone_request("POST", "/dns_records", record, zone_id=zone_id)
+        return self._check(result, "create DNS record") or {}
+
+    async def update_dns_record(self, record_id: str, changes: dict, zone_id: str | None = None) -> dict:
+        """Update fields of a DNS record."""
+        result = await self._zone_request("PATCH", f"/dns_records/{record_id}", changes, zone_id=zone_id)
+        return self._check(result, "update DNS record") or {}
+
+    async def delete_dns_record_by_id(self, record_id: str, zone_id: str | None = None) -> None:
+        """Delete a DNS record by ID."""
+        result = await self._zone_request("DELETE", f"/dns_records/{record_id}", zone_id=zone_id)
+        self._check(result, "delete DNS record")
+
+
+@dataclass
+class DnsChange:
+    """One change planned by `dns sync`."""
+
+    action: str  # create, update or delete
+    name: str
+    record: dict = field(default_factory=dict)  # Desired type/name/content/...
+    record_id: str = ""
+
+    def describe(self) -> str:
+        if self.action == "delete":
+            return f"delete {self.name}"
+        return f"{self.action} {self.name} {self.record['type']} {self.record['content']}"
+
+
+@dataclass
+class DnsPlan:
+    """Result of diffing desired records against the zone."""
+
+    changes: list[DnsChange] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    # Names held by records `dns sync` does not own
+    conflicts: list[str] = field(default_factory=list)
+
+
+def desired_dns_records(
+    hosts: list[str], domain: str, target: str, proxied: bool = True
+) -> dict[str, dict]:
+    """Build the desired record for every host inside the zone.
+
+    Hosts point at target: an A record when it is an IP address, a CNAME
+    otherwise. The target's own name is left alone.
+    """
+    try:
+        ipaddress.ip_address(target)
+        record_type = "A"
+    except ValueError:
+        record_type = "CNAME"
+
+    desired: dict[str, dict] = {}
+    for host in hosts:
+        name = host.lower().rstrip(".")
+        if name == target.lower():
+            continue
+        if name != domain and not name.endswith(f".{domain}"):
+            logger.warning(f"Skipped {name}: not in zone {domain}")
+            continue
+        desired[name] = {
+            "type": record_type,
+            "name": name,
+            "content": target,
+            "proxied": proxied,
+            "ttl": 1,
+            "comment": DNS_MANAGED_COMMENT,
+        }
+    return desired
+
+
+def plan_dns_sync(desired: dict[str, dict], current: list[dict]) -> DnsPlan:
+    """Diff desired records against the zone's current records."""
+    plan = DnsPlan()
+    by_name: dict[str, list[dict]] = {}
+    for record in current:
+        by_name.setdefault(record["name"].lower(), []).append(record)
+
+    for name, want in sorted(desired.items()):
+        existing = by_name.get(name, [])
+        managed = [r for r in existing if r.get("comment") == DNS_MANAGED_COMMENT]
+        same = [r for r in existing if r["type"] == want["type"] and r.get("content") == want["content"]]
+
+        if managed and len(existing) == 1:
+            record = managed[0]
+            if record["type"] != want["type"]:
+                # A and CNAME cannot be patched into each other's type
+                plan.changes.append(DnsChange("delete", name, record_id=record["id"]))
+                plan.changes.append(DnsChange("create", name, want))
+            elif record.get("content") != want["content"] or record.get("proxied") != want["proxied"]:
+                plan.changes.append(DnsChange("update", name, want, record["id"]))
+            else:
+                plan.unchanged.append(name)
+        elif not existing:
+            plan.changes.append(DnsChange("create", name, want))
+        elif same:
+            plan.unchanged.append(name)
+        else:
+            plan.conflicts.append(name)
+
+    for name, records in sorted(by_name.items()):
+        if name in desired:
+            continue
+        for record in records:
+            if record.get("comment") == DNS_MANAGED_COMMENT:
+                plan.changes.append(DnsChange("delete", name, record_id=record["id"]))
+
+    return plan
+
+
+def apply_dns_plan(
+    api: CloudflareAPI, plan: DnsPlan, batch: bool = True, jobs: int = 4
+) -> tuple[int, int]:
+    """Apply a plan's changes. Returns (applied, failed).
+
+    With batch, changes go out DNS_BATCH_SIZE at a time through the batch
+    endpoint (a failed batch applies nothing). Otherwise each change is a
+    request of its own, at most jobs in flight.
+    """
+    changes = plan.changes
+    if not changes:
+        return 0, 0
+
+    # Resolve the zone once, before any concurrent requests
+    api.get_zone_id()
+
+    applied = failed = 0
+    if batch:
+        for start in range(0, len(changes), DNS_BATCH_SIZE):
+            chunk = changes[start : start + DNS_BATCH_SIZE]
+            try:
+                api.batch_dns_records(
+                    deletes=[{"id": c.record_id} for c in chunk if c.action == "delete"],
+                    patches=[{"id": c.record_id, **c.record} for c in chunk if c.action == "update"],
+                    posts=[c.record for c in chunk if c.action == "create"],
+                )
+                applied += len(chunk)
+            except RuntimeError as e:
+                logger.error(f"DNS batch failed: {e}", extra={"changes": len(chunk)})
+                failed += len(chunk)
+        return applied, failed
+
+    def apply(change: DnsChange) -> bool:
+        try:
+            if change.action == "create":
+                api.create_dns_record(change.record)
+            elif change.action == "update":
+                api.update_dns_record(change.record_id, change.record)
+            else:
+                api.delete_dns_record_by_id(change.record_id)
+            return True
+        except RuntimeError as e:
+            logger.error(f"DNS change failed: {change.describe()}: {e}", extra={"record": change.name})
+            return False
+
+    # Deletes first, so a name freed by a delete can be re-created
+    deletes = [c for c in changes if c.action == "delete"]
+    others = [c for c in changes if c.action != "delete"]
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for group in (deletes, others):
+            for ok in pool.map(apply, group):
+                applied += ok
+                failed += not ok
+    return applied, failed
+
+
+def dns_sync(api: CloudflareAPI, args: argparse.Namespace) -> int:
+    """Run `dns sync`: plan, print, and (unless --dry-run) apply."""
+    from traefik_hosts import TraefikHostsExtractor
+
+    extractor = TraefikHostsExtractor(base_dir=args.base_dir)
+    extractor.load_env_files()
+    hosts = extractor.build_host_index().fqdns()
+
+    target = args.target
+    if not target:
+        host_name = extractor.env_vars.get("HOST_NAME", "")
+        if not host_name:
+            logger.error("HOST_NAME not set; pass --target")
+            return 1
+        target = f"{host_name}.{api.domain}"
+
+    desired = desired_dns_records(hosts, api.domain, target, proxied=not args.no_proxy)
+    plan = plan_dns_sync(desired, list(api.iter_dns_records()))
+
+    for change in plan.changes:
+        logger.info(f"  {change.describe()}")
+    for name in plan.conflicts:
+        logger.warning(f"  skip {name}: held by a record not managed by OnRamp")
+    logger.info(
+        f"{len(plan.changes)} change(s), {len(plan.unchanged)} unchanged, {len(plan.conflicts)} conflict(s)"
+    )
+
+    if args.dry_run or not plan.changes:
+        return 0
+
+    applied, failed = apply_dns_plan(api, plan, batch=not args.no_batch, jobs=args.jobs)
+    logger.info(f"Applied {applied} change(s), {failed} failed")
+    return 1 if failed else 0
 
 
 def main():
@@ -169,6 +680,7 @@ Examples:
   cloudflare.py dns list                    # List all DNS records
   cloudflare.py dns list --type CNAME       # List only CNAME records
   cloudflare.py dns delete --name tunnel    # Delete tunnel.example.com
+  cloudflare.py dns sync --dry-run          # Show DNS changes for enabled services
   cloudflare.py zone info                   # Show zone information
         """,
     )
@@ -186,6 +698,14 @@ Examples:
     dns_delete.add_argument("--name", "-n", required=True, help="Record name (subdomain or FQDN)")
     dns_delete.add_argument("--type", "-t", default="CNAME", help="Record type (default: CNAME)")
 
+    dns_sync_parser = dns_subparsers.add_parser("sync", help="Reconcile DNS with enabled services and externals")
+    dns_sync_parser.add_argument("--dry-run", action="store_true", help="Show the plan without changing anything")
+    dns_sync_parser.add_argument("--target", help="CNAME target or IP for every host (default: HOST_NAME.HOST_DOMAIN)")
+    dns_sync_parser.add_argument("--no-proxy", action="store_true", help="Create DNS-only records (not proxied)")
+    dns_sync_parser.add_argument("--no-batch", action="store_true", help="Send one request per change instead of batches")
+    dns_sync_parser.add_argument("--jobs", "-j", type=int, default=4, help="Concurrent requests with --no-batch (default: 4)")
+    dns_sync_parser.add_argument("--base-dir", type=Path, default=None, help="Repository root directory (default: /app)")
+
     # Zone commands
     zone_parser = subparsers.add_parser("zone", help="Zone operations")
     zone_subparsers = zone_parser.add_subparsers(dest="zone_action", help="Zone action")
@@ -210,15 +730,15 @@ Examples:
     try:
         if args.command == "dns":
             if args.dns_action == "list":
-                records = api.list_dns_records(record_type=args.type)
-                if not records:
-                    logger.info("No DNS records found")
-                    return 0
-
-                logger.info(f"{'Name':<40} {'Type':<8} {'Content':<50}")
-                logger.info("-" * 100)
-                for r in records:
+                count = 0
+                for r in api.iter_dns_records(record_type=args.type):
+                    if not count:
+                        logger.info(f"{'Name':<40} {'Type':<8} {'Content':<50}")
+                        logger.info("-" * 100)
                     logger.info(f"{r['name']:<40} {r['type']:<8} {r['content']:<50}")
+                    count += 1
+                if not count:
+                    logger.info("No DNS records found")
                 return 0
 
             if args.dns_action == "delete":
@@ -227,6 +747,9 @@ Examples:
                     return 0
                 return 1
 
+            if args.dns_action == "sync":
+                return dns_sync(api, args)
+
         if args.command == "zone":
             if args.zone_action == "info":
                 info = api.get_zone_info()
@@ -0,0 +1,534 @@
+#!/usr/bin/env python
+"""
+compose_model.py - Shared, cached model of the OnRamp compose files
+
+Every tool that inspects service or override YAML (scaffold, services
+linter, healthcheck audit, service docs, env extraction) loads it through
+ComposeModel, so each file is parsed at most once:
+
+- Documents are parsed with libyaml's CSafeLoader when available.
+- Parsed documents, together with the ${VAR} references found in the raw
+  text, are kept in memory and pickled to etc/.cache/compose.pickle, keyed
+  by path, mtime and size. Running the tools back to back re-parses only
+  files that changed in between.
+
+Cached documents are shared between callers and must be treated as
+read-only.
+
+Typed accessors cover what the tools need: services (ComposeService with
+image, labels, environment, volumes, healthcheck), top-level named volumes
+and networks, bind mounts in short (`./etc/app:/config:ro`) and long
+(`{type: bind, ...}`) syntax, and variable references. Host paths written
+as `${VAR:-./etc/app}` resolve to their default, which is the path compose
+uses when the variable is unset.
+
+OverrideIndex maps services to their overrides in overrides-available/
+from a single directory listing, replacing a glob per service.
+"""
+
+import atexit
+import os
+import pickle
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_VERSION = 2
+
+# Directory listings younger than this may miss a change in the same mtime tick
+RACY_WINDOW_NS = 1_000_000_000
+
+# Matches ${VAR} and ${VAR<op>value} for the compose operators :- - := = :? ?
+# :+ +, allowing one level of nested ${...} in the value
+VARIABLE_REFERENCE_PATTERN = re.compile(
+    r"\$\{([A-Z_][A-Z0-9_]*)(?:(:?[-=?+])((?:[^{}]|\$\{[^}]*\})*))?\}"
+)
+
+
+def variable_references(text: str) -> list[tuple[str, str | None]]:
+    """(name, default) of every ${...} reference, including those nested in values.
+
+    Only :- - := = give a default; the value of :? ? is an error message
+    and that of :+ + an alternate value.
+    """
+    references = []
+    for match in VARIABLE_REFERENCE_PATTERN.finditer(text):
+        name, operator, value = match.groups()
+        default = value if operator and operator[-1] in "-=" else None
+        references.append((name, default or None))
+        if value:
+            references.extend(variable_references(value))
+    return references
+
+
+def _parse_yaml(text: str) -> Any:
+    """Parse YAML with the fastest available safe loader."""
+    import yaml
+
+    return yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+@dataclass
+class CachedDocument:
+    """A parsed compose file as stored in the cache."""
+
+    mtime_ns: int
+    size: int
+    data: Any
+    # (name, default) of every ${VAR} reference in the raw text, comments included
+    variables: list[tuple[str, str | None]]
+
+
+class ComposeCache:
+    """Parsed documents keyed by path, persisted as a pickle.
+
+    Use get_cache() to share one instance per cache file within a process.
+    """
+
+    def __init__(self, path: Path | None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, CachedDocument] | None = None
+        self._dirty = False
+
+    def _load(self) -> dict[str, CachedDocument]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path is not None:
+                try:
+                    with open(self.path, "rb") as f:
+                        version, entries = pickle.load(f)
+                    if version == CACHE_VERSION:
+                        self._entries = entries
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    logger.debug(
+                        f"Ignoring unreadable compose cache: {e}",
+                        extra={"path": str(self.path)},
+                    )
+        return self._entries
+
+    def get(self, path: Path) -> CachedDocument:
+        """Return the parsed document for path, parsing it only if changed.
+
+        Raises:
+            OSError: If the file cannot be read
+            yaml.YAMLError: If the file is not valid YAML
+        """
+        st = path.stat()
+        key = str(path)
+        with self._lock:
+            cached = self._load().get(key)
+        if cached and (cached.mtime_ns, cached.size) == (st.st_mtime_ns, st.st_size):
+            return cached
+
+        text = path.read_text(encoding="utf-8")
+        document = CachedDocument(
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            data=_parse_yaml(text),
+            variables=variable_references(text),
+        )
+        with self._lock:
+            self._load()[key] = document
+            self._dirty = True
+        return document
+
+    def save(self) -> None:
+        """Atomically write the cache file if anything was parsed."""
+        with self._lock:
+            if not self._dirty or self.path is None or self._entries is None:
+                return
+            if not self.path.parent.parent.is_dir():
+                return  # No etc/ (tree removed, or not an OnRamp tree)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                with open(tmp, "wb") as f:
+                    pickle.dump(
+                        (CACHE_VERSION, self._entries),
+                        f,
+                        protocol=pickle.HIGHEST_PROTOCOL,
+                    )
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.debug(
+                    f"Could not save compose cache: {e}",
+                    extra={"path": str(self.path)},
+                )
+
+
+_caches: dict[Path | None, ComposeCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(path: Path | None) -> ComposeCache:
+    """Return the process-wide cache for a cache file (None = memory only).
+
+    Caches backed by a file are saved when the process exits.
+    """
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = ComposeCache(path)
+            if path is not None:
+                atexit.register(cache.save)
+        return cache
+
+
+def interpolate_defaults(value: str) -> str:
+    """Replace ${VAR:-default} and ${VAR-default} with their defaults.
+
+    References without a default are kept as written. Nested references in
+    defaults (`${A:-${B:-x}}`) are resolved the same way.
+    """
+    result = []
+    i = 0
+    while i < len(value):
+        start = value.find("${", i)
+        if start == -1:
+            result.append(value[i:])
+            break
+        result.append(value[i:start])
+
+        # Find the matching closing brace
+        depth, end = 0, start
+        while end < len(value):
+            if value.startswith("${", end):
+                depth += 1
+                end += 2
+                continue
+            if value[end] == "}":
+                depth -= 1
+                if depth == 0:
+                    break
+            end += 1
+        if end >= len(value):
+            result.append(value[start:])
+            break
+
+        body = value[start + 2 : end]
+        for separator in (":-", "-"):
+            name, found, default = body.partition(separator)
+            if found and "${" not in name:
+                result.append(interpolate_defaults(default))
+                break
+        else:
+            result.append(value[start : end + 1])
+        i = end + 1
+
+    return "".join(result)
+
+
+@dataclass(frozen=True)
+class BindMount:
+    """A host path mounted into a compose service."""
+
+    file: Path
+    service: str
+    source: str
+    target: str
+    read_only: bool = False
+
+    @property
+    def host_path(self) -> str:
+        """Host side with ${VAR:-default} references resolved to defaults."""
+        return interpolate_defaults(self.source)
+
+    def resolve(self, base_dir: Path) -> Path | None:
+        """Return the normalized absolute host path (None if not a path)."""
+        host = self.host_path
+        if "${" in host:
+            return None
+        if not host.startswith((".", "/")):
+            return None  # Named volume
+        return Path(os.path.normpath(base_dir / host))
+
+
+def _parse_volume(entry: Any) -> tuple[str, str, bool] | None:
+    """Split a volume entry into (source, target, read_only)."""
+    if isinstance(entry, dict):
+        if entry.get("type", "volume") != "bind" or not entry.get("source"):
+            return None
+        return (
+            str(entry["source"]),
+            str(entry.get("target", "")),
+            bool(entry.get("read_only")),
+        )
+
+    if not isinstance(entry, str):
+        return None
+
+    # Split on ':' outside ${...} so defaults like ${X:-./etc/app} stay whole
+    parts, depth, current = [], 0, []
+    for char in entry:
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        if char == ":" and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+
+    if len(parts) < 2:
+        return None  # Anonymous volume
+    options = parts[2].split(",") if len(parts) > 2 else []
+    return parts[0], parts[1], "ro" in options
+
+
+def _as_mapping(value: Any) -> dict[str, str | None]:
+    """Normalize a compose list ("KEY=value" / "KEY") or mapping to a dict."""
+    if isinstance(value, dict):
+        return {
+            str(key): None if item is None else str(item) for key, item in value.items()
+        }
+
+    result: dict[str, str | None] = {}
+    for item in value or []:
+        if isinstance(item, dict):
+            result.update(_as_mapping(item))
+        elif isinstance(item, str):
+            key, found, item_value = item.partition("=")
+            result[key.strip()] = item_value if found else None
+    return result
+
+
+@dataclass(frozen=True)
+class ComposeService:
+    """Typed view of one service definition in a compose file."""
+
+    name: str
+    config: dict
+
+    @property
+    def image(self) -> str | None:
+        return self.config.get("image")
+
+    @property
+    def labels(self) -> dict[str, str | None]:
+        """Labels as a dict, from either list or mapping syntax."""
+        return _as_mapping(self.config.get("labels"))
+
+    @property
+    def environment(self) -> dict[str, str | None]:
+        """Environment as a dict (None for pass-through "- KEY" entries)."""
+        return _as_mapping(self.config.get("environment"))
+
+    @property
+    def volumes(self) -> list[Any]:
+        """Volume entries as written (short strings or long-syntax dicts)."""
+        return list(self.config.get("volumes") or [])
+
+    @property
+    def healthcheck(self) -> dict | None:
+        """The healthcheck block, if the service defines one."""
+        healthcheck = self.config.get("healthcheck")
+        return healthcheck if isinstance(healthcheck, dict) else None
+
+
+@dataclass
+class ComposeFile:
+    """One parsed compose file."""
+
+    path: Path
+    data: dict = field(default_factory=dict)
+    variables: list[tuple[str, str | None]] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Raw file content (for comment-based metadata)."""
+        return self.path.read_text(encoding="utf-8")
+
+    @property
+    def services(self) -> dict[str, ComposeService]:
+        """Compose services defined (or extended) by this file."""
+        services = self.data.get("services") or {}
+        return {
+            name: ComposeService(name, config or {})
+            for name, config in services.items()
+            if isinstance(config, dict) or config is None
+        }
+
+    @property
+    def named_volumes(self) -> dict[str, Any]:
+        """Top-level named volume definitions."""
+        return self.data.get("volumes") or {}
+
+    @property
+    def networks(self) -> dict[str, Any]:
+        """Top-level network definitions."""
+        return self.data.get("networks") or {}
+
+    def bind_mounts(self) -> list[BindMount]:
+        """Every bind mount declared by this file's services."""
+        mounts = []
+        for service in self.services.values():
+            for entry in service.volumes:
+                parsed = _parse_volume(entry)
+                if parsed:
+                    mounts.append(BindMount(self.path, service.name, *parsed))
+        return mounts
+
+
+class OverrideIndex:
+    """Overrides in overrides-available/, indexed by every prefix of their name.
+
+    An override applies to a service when its name starts with the service
+    name (plex.yml and plex-nfs.yml for plex), the same rule as the
+    `{service}*.yml` glob it replaces. The index is built from one listing
+    and rebuilt only when the directory's mtime changes, so long-lived
+    callers (the dashboard) can query it on every request. A listing taken
+    within a second of the last change is not trusted, since a file added
+    in the same timestamp tick would not move the mtime.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._mtime_ns: int | None = -1
+        self._by_prefix: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> dict[str, list[str]]:
+        try:
+            mtime_ns = self.directory.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+
+        with self._lock:
+            if mtime_ns != self._mtime_ns:
+                by_prefix: dict[str, list[str]] = {}
+                if mtime_ns is not None:
+                    with os.scandir(self.directory) as it:
+                        # Sorted by file name, as the glob it replaces was
+                        files = sorted(
+                            entry.name
+                            for entry in it
+                            if entry.name.endswith(".yml")
+                            and not entry.name.startswith(".")
+                            and entry.is_file()
+                        )
+                    for name in (file[:-4] for file in files):
+                        for end in range(1, len(name) + 1):
+                            by_prefix.setdefault(name[:end], []).append(name)
+                racy = (
+                    mtime_ns is not None and time.time_ns() - mtime_ns < RACY_WINDOW_NS
+                )
+                self._by_prefix, self._mtime_ns = by_prefix, -1 if racy else mtime_ns
+            return self._by_prefix
+
+    def names_for(self, service: str) -> list[str]:
+        """Names of the overrides that apply to a service, sorted.
+
+        A games- prefix on the service name is ignored.
+        """
+        base_name = service.replace("games-", "")
+        if not base_name:
+            return []
+        return list(self._refresh().get(base_name, []))
+
+    def paths_for(self, service: str) -> list[Path]:
+        """Paths of the overrides that apply to a service, sorted."""
+        return [self.directory / f"{name}.yml" for name in self.names_for(service)]
+
+
+class ComposeModel:
+    """Service and override compose files of an OnRamp tree."""
+
+    def __init__(self, base_dir: Path, cache_path: Path | None = None):
+        self.base_dir = Path(base_dir)
+        self.services_available = self.base_dir / "services-available"
+        self.services_enabled = self.base_dir / "services-enabled"
+        self.overrides_available = self.base_dir / "overrides-available"
+        self.overrides_enabled = self.base_dir / "overrides-enabled"
+        self.override_index = OverrideIndex(self.overrides_available)
+        if cache_path is None:
+            cache_path = self.base_dir / "etc" / ".cache" / "compose.pickle"
+        self.cache = get_cache(cache_path)
+
+    def read(self, path: Path) -> ComposeFile:
+        """Load one compose file.
+
+        Raises:
+            OSError: If the file cannot be read
+            yaml.YAMLError: If the file is not valid YAML
+        """
+        document = self.cache.get(path)
+        data = document.data if isinstance(document.data, dict) else {}
+        return ComposeFile(path, data, document.variables)
+
+    def load(self, path: Path) -> ComposeFile | None:
+        """Load one compose file (None if missing or unparseable)."""
+        try:
+            return self.read(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(
+                f"Failed to parse compose file: {e}", extra={"file": str(path)}
+            )
+            return None
+
+    def _load_dir(self, directory: Path) -> list[ComposeFile]:
+        try:
+            with os.scandir(directory) as it:
+                paths = sorted(
+                    Path(entry.path) for entry in it if entry.name.endswith(".yml")
+                )
+        except FileNotFoundError:
+            return []
+        return [f for f in map(self.load, paths) if f is not None]
+
+    def available_services(self) -> list[ComposeFile]:
+        """Compose files in services-available/."""
+        return self._load_dir(self.services_available)
+
+    def enabled_services(self) -> list[ComposeFile]:
+        """Compose files in services-enabled/."""
+        return self._load_dir(self.services_enabled)
+
+    def enabled_overrides(self) -> list[ComposeFile]:
+        """Compose files in overrides-enabled/."""
+        return self._load_dir(self.overrides_enabled)
+
+    def enabled_names(self) -> set[str]:
+        """Names of enabled services (services-enabled/*.yml stems)."""
+        try:
+            with os.scandir(self.services_enabled) as it:
+                return {entry.name[:-4] for entry in it if entry.name.endswith(".yml")}
+        except FileNotFoundError:
+            return set()
+
+    def service_file(self, service: str) -> ComposeFile | None:
+        """A service's compose file, preferring services-enabled/."""
+        for directory in (self.services_enabled, self.services_available):
+            compose_file = self.load(directory / f"{service}.yml")
+            if compose_file is not None:
+                return compose_file
+        return None
+
+    def bind_mounts(self, service: str | None = None) -> list[BindMount]:
+        """Bind mounts from a service's file (or all enabled services) plus
+        all enabled overrides."""
+        if service is None:
+            files = self.enabled_services()
+        else:
+            service_file = self.service_file(service)
+            files = [service_file] if service_file else []
+        files += self.enabled_overrides()
+        return [mount for f in files for mount in f.bind_mounts()]
+
+    def save(self) -> None:
+        """Persist newly parsed documents now rather than at exit."""
+        self.cache.save()
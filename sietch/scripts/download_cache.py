@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+"""
+download_cache.py - Shared on-disk cache for scaffold manifest downloads
+
+Downloads are fetched through an HttpClient (by default the keep-alive,
+retrying PooledHttpClient) and kept under etc/.cache/downloads, keyed by
+the sha256 of the URL:
+
+- <key>       the last complete body
+- <key>.json  URL, ETag, Last-Modified, size and sha256 of the body
+- <key>.part  an interrupted transfer, resumed with a Range request
+              (validators in <key>.part.json)
+
+A cached body is revalidated with If-None-Match / If-Modified-Since, so an
+unchanged artifact costs a single 304. When the manifest pins a sha256 and
+the cached body already matches it, no request is made at all. If the
+server cannot be reached, a previously cached body is used with a warning.
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import shutil
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.error import URLError
+
+from logging_config import get_logger
+
+if TYPE_CHECKING:
+    from ports.http import HttpClient
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+# One lock per cache key, so parallel fetches of the same URL share a transfer
+_key_locks: dict[str, threading.Lock] = {}
+_key_locks_guard = threading.Lock()
+
+
+class DownloadError(Exception):
+    """Raised when a download cannot be fetched or fails verification."""
+
+
+@dataclass
+class CacheEntry:
+    """Metadata recorded for a cached (or partially cached) download."""
+
+    url: str
+    etag: str = ""
+    last_modified: str = ""
+    size: int = 0
+    sha256: str = ""
+
+
+def file_sha256(path: Path) -> str:
+    """Return the sha256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadCache:
+    """URL-keyed download cache with conditional and resumable fetches."""
+
+    def __init__(self, root: Path, timeout: float = 60, http_client: "HttpClient | None" = None):
+        """Initialize download cache.
+
+        Args:
+            root: Cache directory
+            timeout: Request timeout in seconds
+            http_client: HTTP client for requests (default: PooledHttpClient)
+        """
+        self.root = root
+        self.timeout = timeout
+        if http_client is not None:
+            self._http = http_client
+        else:
+            from adapters.pooled_http import PooledHttpClient
+
+            # Keep-alive: downloads from one host share a connection
+            self._http = PooledHttpClient()
+
+    def _paths(self, url: str) -> tuple[Path, Path, Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return (
+            self.root / key,
+            self.root / f"{key}.json",
+            self.root / f"{key}.part",
+            self.root / f"{key}.part.json",
+        )
+
+    @staticmethod
+    def _lock(url: str) -> threading.Lock:
+        with _key_locks_guard:
+            return _key_locks.setdefault(url, threading.Lock())
+
+    @staticmethod
+    def _read_entry(meta_path: Path) -> CacheEntry | None:
+        try:
+            return CacheEntry(**json.loads(meta_path.read_text()))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(
+                f"Ignoring unreadable download cache entry: {e}",
+                extra={"path": str(meta_path)},
+            )
+            return None
+
+    @staticmethod
+    def _write_entry(meta_path: Path, entry: CacheEntry) -> None:
+        tmp = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(asdict(entry), indent=2))
+        os.replace(tmp, meta_path)
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        """Return the entry for a completely cached url, if any."""
+        body_path, meta_path, _, _ = self._paths(url)
+        return self._read_entry(meta_path) if body_path.exists() else None
+
+    def fetch(self, url: str, sha256: str | None = None) -> Path:
+        """Return the path of an up-to-date cached copy of url.
+
+        Args:
+            url: URL to download
+            sha256: Optional expected sha256 of the body
+
+        Returns:
+            Path to the cached body (do not modify it)
+
+        Raises:
+            DownloadError: If the body cannot be fetched or fails verification
+        """
+        sha256 = sha256.lower() if sha256 else None
+        paths = self._paths(url)
+        body_path = paths[0]
+
+        with self._lock(url):
+            self.root.mkdir(parents=True, exist_ok=True)
+            entry = self._read_entry(paths[1]) if body_path.exists() else None
+
+            if entry and sha256:
+                # A pinned body that is already cached cannot change
+                if entry.sha256 == sha256:
+                    logger.debug("Download cache hit (pinned)", extra={"url": url})
+                    return body_path
+                # The pin moved - a 304 for the old body would not help
+                entry = None
+
+            try:
+                return self._fetch(url, sha256, entry, *paths)
+            except (URLError, OSError, http.client.HTTPException) as e:
+                if entry and not sha256:
+                    logger.warning(
+                        f"Download failed, using cached copy: {e}",
+                        extra={"url": url},
+                    )
+                    return body_path
+                raise DownloadError(str(e)) from e
+
+    def _fetch(
+        self,
+        url: str,
+        sha256: str | None,
+        entry: CacheEntry | None,
+        body_path: Path,
+        meta_path: Path,
+        part_path: Path,
+        part_meta_path: Path,
+    ) -> Path:
+        # Ranges and digests are of the body as stored, so never compressed
+        headers = {"Accept-Encoding": "identity"}
+        partial = self._read_entry(part_meta_path)
+        offset = part_path.stat().st_size if part_path.exists() else 0
+
+        if offset and partial and (partial.etag or partial.last_modified):
+            # Resume only if the resource is unchanged (If-Range)
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = partial.etag or partial.last_modified
+        else:
+            offset = 0
+            if entry:
+                if entry.etag:
+                    headers["If-None-Match"] = entry.etag
+                if entry.last_modified:
+                    headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            status, response_headers, body = self._http.request_with_headers(
+                "GET", url, headers=headers, timeout=self.timeout
+            )
+        except URLError as e:
+            interrupted = e.reason
+            if isinstance(interrupted, http.client.IncompleteRead) and hasattr(interrupted, "headers"):
+                # Keep the partial body for the next attempt to resume
+                self._store(url, offset, interrupted.headers, interrupted.partial, part_path, part_meta_path)
+            raise
+
+        if status == 304 and entry:
+            logger.debug("Download cache hit (not modified)", extra={"url": url})
+            return body_path
+        if status == 416:
+            # Stale partial that no longer fits the resource - start over
+            part_path.unlink(missing_ok=True)
+        if status not in (200, 206):
+            raise DownloadError(f"HTTP {status} for {url}")
+
+        new_entry, resumed = self._store(url, offset, response_headers, body, part_path, part_meta_path)
+
+        digest = hashlib.sha256()
+        with open(part_path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+        new_entry.sha256 = digest.hexdigest()
+        new_entry.size = part_path.stat().st_size
+        if sha256 and new_entry.sha256 != sha256:
+            part_path.unlink(missing_ok=True)
+            part_meta_path.unlink(missing_ok=True)
+            raise DownloadError(
+                f"sha256 mismatch for {url}: expected {sha256}, got {new_entry.sha256}"
+            )
+
+        os.replace(part_path, body_path)
+        self._write_entry(meta_path, new_entry)
+        part_meta_path.unlink(missing_ok=True)
+        logger.debug(
+            "Downloaded into cache",
+            extra={"url": url, "size": new_entry.size, "resumed": resumed},
+        )
+        return body_path
+
+    def _store(
+        self,
+        url: str,
+        offset: int,
+        response_headers: dict[str, str],
+        body: bytes,
+        part_path: Path,
+        part_meta_path: Path,
+    ) -> tuple[CacheEntry, bool]:
+        """Write a (possibly partial) response body to the .part file.
+
+        Returns:
+            (entry with the response validators, whether the body continued
+            an earlier partial transfer)
+        """
+        headers = {name.lower(): value for name, value in response_headers.items()}
+        new_entry = CacheEntry(
+            url=url,
+            etag=headers.get("etag", ""),
+            last_modified=headers.get("last-modified", ""),
+        )
+        resumed = bool(offset) and "content-range" in headers
+        if resumed:
+            logger.debug(
+                "Resuming partial download",
+                extra={"url": url, "offset": offset},
+            )
+        self._write_entry(part_meta_path, new_entry)
+        with open(part_path, "ab" if resumed else "wb") as f:
+            f.write(body)
+        return new_entry, resumed
+
+    def install(self, url: str, output: Path, sha256: str | None = None) -> bool:
+        """Fetch url through the cache and place a copy at output.
+
+        Returns:
+            True if output was written, False if it already had the content
+        """
+        body_path = self.fetch(url, sha256)
+        body_size = body_path.stat().st_size
+        if output.is_file() and output.stat().st_size == body_size:
+            if file_sha256(output) == file_sha256(body_path):
+                return False
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+        shutil.copyfile(body_path, tmp)
+        os.replace(tmp, output)
+        return True
@@ -2,7 +2,7 @@
 """Download selfhst/icons SVG icons for all OnRamp services.
 
 Usage:
-    python scripts/download_icons.py
+    python scripts/download_icons.py [--force] [--workers N] [--sprite-only]
 
 This script fetches the icon index from the selfhst/icons repository, resolves
 each OnRamp service name to an upstream SVG icon reference, and saves the icon as
@@ -12,41 +12,99 @@ generic docker icon so that every service has a local icon file.
 Every downloaded SVG is normalized: the artwork is measured and the file is
 rewritten with a transform that centers the artwork and scales it to fill the
 canvas uniformly. Without this step the upstream icons render at visibly
-different sizes because their internal padding varies widely.
+different sizes because their internal padding varies widely. Artwork is
+measured with NumPy when it is installed (pure Python otherwise), and the
+downloaded icons are normalized across a process pool (--jobs).
+
+Icons are fetched in parallel over kept-alive connections. The ETag,
+Last-Modified and hashes of each icon are recorded in etc/.cache/icons.json,
+so a re-run only revalidates: unchanged icons cost a 304 and are not
+rewritten. --index-url and --cdn-url point the script at another server.
+
+Finally all icons are packed into one SVG sprite, sprite.<hash>.svg, listed
+in sprite.json, so a dashboard page fetches a single, immutable file for
+all its icons (--sprite-only rebuilds just the sprite).
 """
 
+import argparse
+import hashlib
 import json
 import math
+import os
 import re
 import shutil
 import sys
-import urllib.request
 import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import chain, compress
+from operator import not_
 from pathlib import Path
+from concurrent.futures.process import BrokenProcessPool
+from urllib.error import URLError
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 # Add parent directories so we can import dashboard modules both in Docker and standalone
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
 
+from adapters.pooled_http import PooledHttpClient
 from dashboard.core.icons import (
     FALLBACK_ICON,
     SELFH_ICONS_INDEX,
+    SPRITE_MANIFEST,
     resolve_icon_filename,
 )
 
 SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
 
 # Fraction of the canvas the artwork should fill after normalization.
 ARTWORK_FILL = 0.90
 
+CDN_BASE_URL = "https://cdn.jsdelivr.net/gh/selfhst/icons@main/svg"
+
+# Parallel downloads; each keeps its connection to the CDN alive
+DOWNLOAD_WORKERS = 16
+
+MANIFEST_VERSION = 1
+
+# Below this many downloaded icons, normalizing serially beats starting a pool
+PARALLEL_THRESHOLD = 8
+
+# Path data (characters) from which the NumPy bounds engine is faster
+NUMPY_MIN_PATH_DATA = 4000
+
+# sprite.<content hash>.svg
+SPRITE_FILE = re.compile(r"sprite\.[0-9a-f]{12}\.svg")
+
+# Root attributes that size the document rather than style its artwork
+SYMBOL_SKIPPED_ATTRIBUTES = {"width", "height", "x", "y", "id", "version"}
+
+CSS_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+CLASS_SELECTOR = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+ID_REFERENCE = re.compile(r"url\(\s*['\"]?#([^)'\"\s]+)['\"]?\s*\)")
+
 
 # ---------------------------------------------------------------------------
-# SVG geometry helpers (pure Python, no external dependencies)
+# SVG geometry helpers (NumPy when available, pure Python otherwise)
 # ---------------------------------------------------------------------------
 
 Matrix = tuple[float, float, float, float, float, float]
 IDENTITY: Matrix = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
 
+# Number of arguments each path command takes
+PATH_ARGS = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7, "Z": 0}
+PATH_TOKEN = re.compile(r"[MmLlHhVvCcSsQqTtAaZz]|-?\d*\.?\d+(?:e[+-]?\d+)?")
+# Path commands by code, for the vectorized engine
+PATH_CODES = {c: i for i, c in enumerate("MLHVCSQTAZ")}
+
 
 def mat_mul(m1: Matrix, m2: Matrix) -> Matrix:
     """Compose two affine matrices (apply m2 first, then m1)."""
@@ -86,7 +144,7 @@ def parse_transform(value: str) -> Matrix:
     return m
 
 
-def arc_sample_points(
+def arc_parameters(
     x1: float,
     y1: float,
     rx: float,
@@ -96,11 +154,11 @@ def arc_sample_points(
     sweep: float,
     x2: float,
     y2: float,
-    n: int = 12,
-) -> list[tuple[float, float]]:
-    """Sample an SVG elliptical arc (endpoint -> center parameterization)."""
-    if rx == 0 or ry == 0:
-        return [(x2, y2)]
+) -> tuple[float, float, float, float, float, float, float, float]:
+    """Convert an SVG arc to center parameterization.
+
+    Returns (cx, cy, rx, ry, cos_phi, sin_phi, theta1, dtheta).
+    """
     rx, ry = abs(rx), abs(ry)
     phi = math.radians(phi_deg % 360)
     cos_p, sin_p = math.cos(phi), math.sin(phi)
@@ -142,6 +200,27 @@ def arc_sample_points(
         dtheta -= 2 * math.pi
     elif sweep and dtheta < 0:
         dtheta += 2 * math.pi
+    return cx, cy, rx, ry, cos_p, sin_p, theta1, dtheta
+
+
+def arc_sample_points(
+    x1: float,
+    y1: float,
+    rx: float,
+    ry: float,
+    phi_deg: float,
+    large_arc: float,
+    sweep: float,
+    x2: float,
+    y2: float,
+    n: int = 12,
+) -> list[tuple[float, float]]:
+    """Sample an SVG elliptical arc (endpoint -> center parameterization)."""
+    if rx == 0 or ry == 0:
+        return [(x2, y2)]
+    cx, cy, rx, ry, cos_p, sin_p, theta1, dtheta = arc_parameters(
+        x1, y1, rx, ry, phi_deg, large_arc, sweep, x2, y2
+    )
 
     pts = []
     for k in range(n + 1):
@@ -155,18 +234,46 @@ def arc_sample_points(
     return pts
 
 
+def arc_sample_points_numpy(
+    x1: float,
+    y1: float,
+    rx: float,
+    ry: float,
+    phi_deg: float,
+    large_arc: float,
+    sweep: float,
+    x2: float,
+    y2: float,
+    n: int = 12,
+) -> "np.ndarray":
+    """arc_sample_points, sampling every angle in one vectorized step."""
+    if rx == 0 or ry == 0:
+        return np.array([(x2, y2)])
+    cx, cy, rx, ry, cos_p, sin_p, theta1, dtheta = arc_parameters(
+        x1, y1, rx, ry, phi_deg, large_arc, sweep, x2, y2
+    )
+
+    t = theta1 + dtheta * np.arange(n + 1) / n
+    cos_t, sin_t = np.cos(t), np.sin(t)
+    return np.column_stack(
+        (
+            cx + rx * cos_t * cos_p - ry * sin_t * sin_p,
+            cy + rx * cos_t * sin_p + ry * sin_t * cos_p,
+        )
+    )
+
+
 def path_points(d: str) -> list[tuple[float, float]]:
     """Return bounding-relevant points from SVG path data.
 
     Includes segment endpoints, curve control points (the curve lies within the
     convex hull of its control polygon) and sampled arc points.
     """
-    tokens = re.findall(r"[MmLlHhVvCcSsQqTtAaZz]|-?\d*\.?\d+(?:e[+-]?\d+)?", d)
+    tokens = PATH_TOKEN.findall(d)
     i = 0
     cx = cy = sx = sy = 0.0
     pts: list[tuple[float, float]] = []
     cmd = ""
-    nargs = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7, "Z": 0}
 
     def read(n: int) -> list[float]:
         nonlocal i
@@ -181,7 +288,7 @@ def path_points(d: str) -> list[tuple[float, float]]:
             if cmd in "Zz":
                 cx, cy = sx, sy
                 continue
-        n = nargs[cmd.upper()]
+        n = PATH_ARGS[cmd.upper()]
         vals = read(n)
         rel = cmd.islower()
         u = cmd.upper()
@@ -232,6 +339,120 @@ def path_points(d: str) -> list[tuple[float, float]]:
     return pts
 
 
+def _reset_cumsum(values: "np.ndarray", resets: "np.ndarray") -> "np.ndarray":
+    """Running sum of values that restarts from the value at each reset."""
+    total = np.cumsum(values)
+    last_reset = np.maximum.accumulate(np.where(resets, np.arange(len(values)), 0))
+    return total - (total - values)[last_reset]
+
+
+def path_points_numpy(paths: list[str]) -> tuple["np.ndarray", "np.ndarray"]:
+    """path_points for many paths at once.
+
+    Rather than stepping through the commands, every segment's current
+    point is derived with running sums: relative coordinates accumulate,
+    absolute ones restart the sum, and closepath returns to the start of its
+    subpath (itself found with a running sum over the subpaths). All paths
+    of a document go through one pass, as NumPy's per-call overhead would
+    outweigh the work for a single small path.
+
+    Returns:
+        (points, owner): an (N, 2) array of points and, for each point, the
+        index of the path it came from
+    """
+    token_lists = []
+    for d in paths:
+        tokens = PATH_TOKEN.findall(d)
+        if tokens and not tokens[0].isalpha():
+            # Numbers before the first command belong to no command
+            first = next((i for i, t in enumerate(tokens) if t.isalpha()), len(tokens))
+            tokens = tokens[first:]
+        token_lists.append(tokens)
+    tokens = list(chain.from_iterable(token_lists))
+    flags = list(map(str.isalpha, tokens))
+    is_cmd = np.array(flags, dtype=bool)
+    nums = np.array(list(map(float, compress(tokens, map(not_, flags)))))
+    if not len(nums):
+        return np.empty((0, 2)), np.empty(0, dtype=int)
+    token_path = np.repeat(np.arange(len(token_lists)), list(map(len, token_lists)))
+
+    # One row per segment: a command repeats for each group of its arguments
+    cmds = list(compress(tokens, flags))
+    codes = np.array([PATH_CODES[c.upper()] for c in cmds])
+    nargs = np.array([PATH_ARGS[c.upper()] for c in cmds])
+    counts = np.bincount(np.cumsum(is_cmd)[~is_cmd] - 1, minlength=len(cmds))
+    repeats = np.where(nargs > 0, counts // np.maximum(nargs, 1), 1)
+    group = np.repeat(np.arange(len(cmds)), repeats)
+    cmd, n = codes[group], nargs[group]
+    rel = np.array(list(map(str.islower, cmds)), dtype=bool)[group]
+    owner = token_path[is_cmd][group]
+    index_in_group = np.arange(len(group)) - (np.cumsum(repeats) - repeats)[group]
+    offset = (np.cumsum(counts) - counts)[group] + index_in_group * n
+
+    # Every path starts from (0, 0) with a subpath of its own
+    path_start = np.concatenate(([True], owner[1:] != owner[:-1]))
+    is_moveto = ((cmd == PATH_CODES["M"]) & (index_in_group == 0)) | path_start
+    is_close = cmd == PATH_CODES["Z"]
+    last = np.clip(offset + n - 1, 0, len(nums) - 1)
+    end_x = np.where(cmd == PATH_CODES["H"], nums[last], nums[np.maximum(last - 1, 0)])
+    end_y = nums[last]
+    subpath = np.cumsum(is_moveto) - 1
+    movetos = np.flatnonzero(is_moveto)
+    segments = np.arange(len(group))
+
+    def current(end: "np.ndarray", moves: "np.ndarray") -> "np.ndarray":
+        """Current point on one axis after every segment."""
+        absolute = moves & ~rel & ~is_moveto
+        resets = absolute | is_close | is_moveto
+        # Offset from the subpath start (after closepath or moveto) or from 0
+        offset_from = _reset_cumsum(np.where(moves & ~is_moveto, end, 0.0), resets)
+        last_reset = np.maximum.accumulate(np.where(resets, segments, 0))
+        from_start = ~absolute[last_reset]
+
+        # A relative moveto continues from the previous segment
+        chained = rel[movetos] & ~path_start[movetos]
+        before = movetos[chained] - 1
+        start_values = end[movetos].copy()
+        start_values[chained] += offset_from[before]
+        continues = np.zeros(len(movetos), dtype=bool)
+        continues[chained] = from_start[before]
+        starts = _reset_cumsum(start_values, ~continues)
+        return offset_from + from_start * starts[subpath]
+
+    x = current(end_x, (cmd != PATH_CODES["V"]) & ~is_close)
+    y = current(end_y, (cmd != PATH_CODES["H"]) & ~is_close)
+    start_x = np.where(path_start, 0.0, np.concatenate(([0.0], x[:-1])))
+    start_y = np.where(path_start, 0.0, np.concatenate(([0.0], y[:-1])))
+
+    is_arc = cmd == PATH_CODES["A"]
+    endpoints = ~is_close & ~is_arc
+    chunks = [np.column_stack((x[endpoints], y[endpoints]))]
+    owners = [owner[endpoints]]
+    # Control points: two for C, one for S and Q
+    for command, pairs in (("C", 2), ("S", 1), ("Q", 1)):
+        selected = cmd == PATH_CODES[command]
+        for pair in range(pairs):
+            at = offset[selected] + 2 * pair
+            shift = rel[selected]
+            chunks.append(
+                np.column_stack(
+                    (
+                        nums[at] + start_x[selected] * shift,
+                        nums[at + 1] + start_y[selected] * shift,
+                    )
+                )
+            )
+            owners.append(owner[selected])
+    for segment in np.flatnonzero(is_arc).tolist():
+        rx, ry, rot, laf, swp = nums[offset[segment] : offset[segment] + 5].tolist()
+        start = start_x[segment], start_y[segment]
+        end = x[segment], y[segment]
+        samples = arc_sample_points_numpy(*start, rx, ry, rot, laf, swp, *end)
+        chunks.append(samples)
+        owners.append(np.full(len(samples), owner[segment]))
+    return np.concatenate(chunks), np.concatenate(owners)
+
+
 def shape_points(elem: ET.Element, tag: str) -> list[tuple[float, float]]:
     """Return bounding-relevant points for a single SVG shape element."""
     if tag == "path":
@@ -264,8 +485,24 @@ def shape_points(elem: ET.Element, tag: str) -> list[tuple[float, float]]:
     return []
 
 
-def svg_artwork_bounds(root: ET.Element) -> tuple[float, float, float, float] | None:
-    """Compute the bounding box of all artwork in an SVG document."""
+def svg_artwork_bounds(
+    root: ET.Element, use_numpy: bool | None = None
+) -> tuple[float, float, float, float] | None:
+    """Compute the bounding box of all artwork in an SVG document.
+
+    The NumPy engine parses every path of the document in one pass and
+    transforms and reduces all points in a single batched step. Its fixed
+    cost only pays off for large artwork, so by default it is used for
+    documents with at least NUMPY_MIN_PATH_DATA characters of path data;
+    the pure-Python engine gives the same result for the rest.
+    """
+    if use_numpy is None:
+        use_numpy = NUMPY_AVAILABLE and (
+            sum(len(elem.get("d", "")) for elem in root.iter()) >= NUMPY_MIN_PATH_DATA
+        )
+    if use_numpy:
+        return _artwork_bounds_numpy(root)
+
     all_pts: list[tuple[float, float]] = []
 
     def walk(elem: ET.Element, matrix: Matrix) -> None:
@@ -284,6 +521,48 @@ def svg_artwork_bounds(root: ET.Element) -> tuple[float, float, float, float] |
     return min(xs), min(ys), max(xs), max(ys)
 
 
+def _artwork_bounds_numpy(root: ET.Element) -> tuple[float, float, float, float] | None:
+    matrices: list[Matrix] = []
+    path_data: list[str] = []
+    path_matrix: list[int] = []
+    shape_pts: list[tuple[float, float]] = []
+    shape_matrix: list[int] = []
+
+    def walk(elem: ET.Element, matrix: Matrix) -> None:
+        m = mat_mul(matrix, parse_transform(elem.get("transform", "")))
+        tag = elem.tag.split("}")[-1]
+        if tag == "path":
+            path_data.append(elem.get("d", ""))
+            path_matrix.append(len(matrices))
+            matrices.append(m)
+        else:
+            pts = shape_points(elem, tag)
+            if pts:
+                shape_pts.extend(pts)
+                shape_matrix.extend([len(matrices)] * len(pts))
+                matrices.append(m)
+        for child in elem:
+            walk(child, m)
+
+    walk(root, IDENTITY)
+    points, owner = path_points_numpy(path_data)
+    points = np.concatenate((points, np.array(shape_pts, dtype=float).reshape(-1, 2)))
+    if not len(points):
+        return None
+    matrix_index = np.concatenate(
+        (np.array(path_matrix, dtype=int)[owner], np.array(shape_matrix, dtype=int))
+    )
+
+    # Each point's affine matrix as [[a, b], [c, d], [e, f]], so that
+    # [x, y, 1] @ matrix is the transformed point
+    per_point = np.array(matrices).reshape(-1, 3, 2)[matrix_index]
+    homogeneous = np.column_stack((points, np.ones(len(points))))
+    transformed = np.einsum("ni,nij->nj", homogeneous, per_point)
+
+    (x0, y0), (x1, y1) = transformed.min(axis=0), transformed.max(axis=0)
+    return float(x0), float(y0), float(x1), float(y1)
+
+
 # ---------------------------------------------------------------------------
 # Normalization
 # ---------------------------------------------------------------------------
@@ -337,22 +616,146 @@ def normalize_svg(svg_path: Path, fill: float = ARTWORK_FILL) -> bool:
     return True
 
 
+def _normalize_in_worker(svg_path: str) -> bool:
+    """Process pool entry point."""
+    return normalize_svg(Path(svg_path))
+
+
+def normalize_icons(paths: list[Path], jobs: int | None = None) -> list[bool]:
+    """Normalize SVGs in order, across a process pool when there are enough.
+
+    Measuring artwork is CPU-bound, so threads would serialize on the GIL.
+    """
+    workers = min(jobs or os.cpu_count() or 1, len(paths))
+    if workers > 1 and len(paths) >= PARALLEL_THRESHOLD:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(
+                    pool.map(
+                        _normalize_in_worker,
+                        [str(path) for path in paths],
+                        chunksize=max(1, len(paths) // (workers * 4)),
+                    )
+                )
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            print(
+                f"  WARNING: Parallel normalization unavailable, normalizing serially: {e}"
+            )
+
+    return [normalize_svg(path) for path in paths]
+
+
 # ---------------------------------------------------------------------------
 # Downloading
 # ---------------------------------------------------------------------------
 
 
-def fetch_icon_index() -> dict:
-    """Fetch the selfhst/icons index and return a mapping of reference to metadata."""
-    print(f"Fetching icon index from {SELFH_ICONS_INDEX}...")
-    with urllib.request.urlopen(SELFH_ICONS_INDEX, timeout=60) as response:  # noqa: S310
-        data = json.loads(response.read().decode())
+class IconManifest:
+    """Validators and hashes of downloaded icons, keyed by URL.
+
+    Each entry holds the ETag and Last-Modified the CDN sent, the sha256 of
+    the upstream SVG and the sha256 of the normalized file written from it.
+    The icon index is kept as well, so an unchanged index costs one 304.
+    """
 
-    index = {}
-    for item in data:
-        ref = item.get("Reference")
-        if ref:
-            index[ref] = item
+    def __init__(self, path: Path | None):
+        self.path = path
+        self.icons: dict[str, dict] = {}
+        self.index: dict = {}
+        if path is None:
+            return
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == MANIFEST_VERSION:
+            self.icons = data.get("icons", {})
+            self.index = data.get("index", {})
+
+    def save(self) -> None:
+        """Write the manifest, if the directory above its own exists."""
+        if self.path is None or not self.path.parent.parent.is_dir():
+            return
+        self.path.parent.mkdir(exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {"version": MANIFEST_VERSION, "index": self.index, "icons": self.icons}
+            )
+        )
+        os.replace(tmp, self.path)
+
+
+@dataclass
+class IconResult:
+    """Outcome of syncing one upstream icon."""
+
+    url: str
+    status: str  # downloaded, unchanged or error
+    entry: dict | None = None
+    error: str = ""
+
+
+def _header(headers: dict[str, str], name: str) -> str:
+    return next((v for k, v in headers.items() if k.lower() == name.lower()), "")
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_sha256(path: Path) -> str | None:
+    return _sha256(path.read_bytes()) if path.is_file() else None
+
+
+def conditional_headers(entry: dict | None) -> dict[str, str]:
+    """If-None-Match / If-Modified-Since headers from a manifest entry."""
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def fetch_icon_index(
+    client: PooledHttpClient, manifest: IconManifest, url: str = SELFH_ICONS_INDEX
+) -> dict:
+    """Fetch the selfhst/icons index and return a mapping of reference to metadata.
+
+    Revalidates the copy in the manifest, falling back to it if the index
+    cannot be fetched.
+    """
+    print(f"Fetching icon index from {url}...")
+    cached = manifest.index if manifest.index.get("url") == url else None
+    try:
+        status, headers, body = client.request_with_headers(
+            "GET", url, conditional_headers(cached), timeout=60
+        )
+        if status not in (200, 304):
+            raise URLError(f"HTTP {status} for {url}")
+    except URLError as e:
+        if cached is None:
+            raise
+        print(f"  WARNING: Could not fetch icon index ({e.reason}), using cached copy")
+        status = 304
+
+    if status == 304 and cached is not None:
+        index = {
+            ref: {"Reference": ref, "SVG": svg} for ref, svg in cached["refs"].items()
+        }
+    else:
+        index = {}
+        for item in json.loads(body.decode()):
+            ref = item.get("Reference")
+            if ref:
+                index[ref] = item
+        manifest.index = {
+            "url": url,
+            "etag": _header(headers, "ETag"),
+            "last_modified": _header(headers, "Last-Modified"),
+            "refs": {ref: item.get("SVG") for ref, item in index.items()},
+        }
 
     print(f"Found {len(index)} upstream icons.")
     return index
@@ -379,88 +782,344 @@ def discover_services(base_dir: Path) -> list[str]:
     return sorted(set(services))
 
 
-def download_icon(url: str, dest: Path) -> bool:
-    """Download a single icon and save it to dest. Returns True on success."""
+def sync_icon(
+    client: PooledHttpClient,
+    url: str,
+    dests: list[Path],
+    entry: dict | None,
+    force: bool = False,
+) -> IconResult:
+    """Download one upstream icon, unnormalized, into the first dest using it.
+
+    While every dest still holds the file last written from the entry, the
+    icon is revalidated and a 304 (or an unchanged body) writes nothing.
+    Downloaded icons are finished by finish_icons().
+    """
+    current = (
+        entry is not None
+        and not force
+        and all(_file_sha256(d) == entry["normalized"] for d in dests)
+    )
     try:
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        with urllib.request.urlopen(url, timeout=30) as response:  # noqa: S310
-            data = response.read()
-        dest.write_bytes(data)
-        return True
-    except Exception as e:
-        print(f"  WARNING: Failed to download {url}: {e}")
-        return False
+        status, headers, body = client.request_with_headers(
+            "GET", url, conditional_headers(entry) if current else {}
+        )
+    except URLError as e:
+        return IconResult(url, "error", entry, str(e.reason))
+    if status == 304 and current:
+        return IconResult(url, "unchanged", entry)
+    if status != 200:
+        return IconResult(url, "error", entry, f"HTTP {status}")
+
+    validators = {
+        "etag": _header(headers, "ETag"),
+        "last_modified": _header(headers, "Last-Modified"),
+    }
+    if current and _sha256(body) == entry["sha256"]:
+        # New validators for the same SVG
+        return IconResult(url, "unchanged", {**entry, **validators})
+
+    dests[0].write_bytes(body)
+    return IconResult(url, "downloaded", {**validators, "sha256": _sha256(body)})
+
+
+def finish_icons(
+    results: list[IconResult], downloads: dict[str, list[Path]], jobs: int | None = None
+) -> None:
+    """Normalize downloaded icons and copy each to every dest using it."""
+    downloaded = [result for result in results if result.status == "downloaded"]
+    normalized = normalize_icons([downloads[r.url][0] for r in downloaded], jobs)
+    for result, ok in zip(downloaded, normalized):
+        dests = downloads[result.url]
+        if not ok:
+            print(f"  WARNING: Could not normalize {dests[0].name}")
+        data = dests[0].read_bytes()
+        for dest in dests[1:]:
+            dest.write_bytes(data)
+        result.entry["normalized"] = _sha256(data)
+
+
+def copy_icon(source: Path, dest: Path) -> None:
+    """Copy an icon unless dest already has the same content."""
+    if not dest.is_file() or dest.read_bytes() != source.read_bytes():
+        shutil.copy2(source, dest)
+
+
+# ---------------------------------------------------------------------------
+# Sprite
+# ---------------------------------------------------------------------------
+
+
+def _local(tag: str) -> str:
+    return tag.split("}")[-1]
+
+
+def inline_styles(root: ET.Element) -> bool:
+    """Move <style> rules onto the elements they select and drop the sheets.
+
+    A sheet in the sprite would apply to every icon, so class rules are
+    folded into each element's style attribute, where they keep winning over
+    presentation attributes and losing to the element's own style. Only
+    plain class selectors are understood; returns False for anything else.
+    """
+    parents = {child: parent for parent in root.iter() for child in parent}
+    sheets = [elem for elem in root.iter() if _local(elem.tag) == "style"]
+    rules: list[tuple[str, str]] = []
+    for sheet in sheets:
+        css = re.sub(r"/\*.*?\*/", "", sheet.text or "", flags=re.S)
+        if CSS_RULE.sub("", css).strip():
+            return False
+        for selectors, declarations in CSS_RULE.findall(css):
+            declarations = declarations.strip().rstrip(";")
+            for selector in selectors.split(","):
+                match = CLASS_SELECTOR.fullmatch(selector.strip())
+                if not match:
+                    return False
+                if declarations:
+                    rules.append((match.group(1), declarations))
+
+    for elem in root.iter():
+        classes = set((elem.get("class") or "").split())
+        matched = [decl for name, decl in rules if name in classes]
+        if matched:
+            own = elem.get("style", "").strip().rstrip(";")
+            elem.set("style", ";".join(matched + ([own] if own else [])))
+    for sheet in sheets:
+        parents[sheet].remove(sheet)
+    return True
+
+
+def prefix_ids(root: ET.Element, prefix: str) -> None:
+    """Prefix every id, and the references to it, so icons cannot collide."""
+    ids = {elem.get("id") for elem in root.iter() if elem.get("id")}
+    if not ids:
+        return
+
+    def reference(match: re.Match) -> str:
+        if match.group(1) not in ids:
+            return match.group(0)
+        return f"url(#{prefix}-{match.group(1)})"
+
+    for elem in root.iter():
+        for name, value in list(elem.attrib.items()):
+            if name == "id":
+                value = f"{prefix}-{value}"
+            elif _local(name) == "href" and value.startswith("#") and value[1:] in ids:
+                value = f"#{prefix}-{value[1:]}"
+            else:
+                value = ID_REFERENCE.sub(reference, value)
+            elem.set(name, value)
+
+
+def icon_symbol(data: bytes, symbol_id: str) -> ET.Element | None:
+    """Turn an SVG document into a sprite <symbol>, or None if it cannot be."""
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError:
+        return None
+    if _local(root.tag) != "svg" or not root.get("viewBox"):
+        return None
+    if not inline_styles(root):
+        return None
+    prefix_ids(root, symbol_id)
+
+    symbol = ET.Element(f"{{{SVG_NS}}}symbol")
+    symbol.set("id", symbol_id)
+    for name, value in root.attrib.items():
+        # Presentation attributes carry over; sizing belongs to the <use>
+        if name not in SYMBOL_SKIPPED_ATTRIBUTES:
+            symbol.set(name, value)
+    symbol.extend(root)
+    return symbol
 
 
-def main() -> int:
+def build_icon_sprite(icons_dir: Path) -> Path | None:
+    """Pack the icons into one SVG sprite with a content-hashed name.
+
+    Each icon becomes a <symbol> whose id is its service name; services
+    with identical icons share one symbol. The manifest (sprite.json)
+    records the sprite file and the symbol of every service, for the
+    dashboard to reference as <use href="sprite.<hash>.svg#symbol">.
+    Icons that cannot be packed are left out and served as files.
+
+    Returns:
+        Path of the sprite, or None if there were no icons
+    """
+    ET.register_namespace("", SVG_NS)
+    ET.register_namespace("xlink", XLINK_NS)
+    sprite = ET.Element(f"{{{SVG_NS}}}svg")
+    symbols: dict[str, str] = {}
+    by_content: dict[bytes, str] = {}
+    # The fallback icon first, so the services using it share its symbol
+    paths = sorted(
+        icons_dir.glob("*.svg"), key=lambda p: (p.stem != FALLBACK_ICON, p.name)
+    )
+    for path in paths:
+        if SPRITE_FILE.fullmatch(path.name):
+            continue
+        data = path.read_bytes()
+        if data in by_content:
+            symbols[path.stem] = by_content[data]
+            continue
+        symbol = icon_symbol(data, path.stem)
+        if symbol is None:
+            print(f"  WARNING: {path.name} left out of the sprite")
+            continue
+        sprite.append(symbol)
+        by_content[data] = symbols[path.stem] = path.stem
+    if not symbols:
+        return None
+
+    body = ET.tostring(sprite, encoding="unicode").encode()
+    sprite_path = icons_dir / f"sprite.{_sha256(body)[:12]}.svg"
+    if not sprite_path.exists():
+        sprite_path.write_bytes(body)
+    for old in icons_dir.glob("sprite.*.svg"):
+        if old != sprite_path and SPRITE_FILE.fullmatch(old.name):
+            old.unlink()
+
+    manifest_path = icons_dir / SPRITE_MANIFEST
+    manifest = {"sprite": sprite_path.name, "icons": symbols}
+    content = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    if not manifest_path.is_file() or manifest_path.read_text() != content:
+        manifest_path.write_text(content)
+    return sprite_path
+
+
+def main(argv: list[str] | None = None) -> int:
     """Download and normalize SVG icons for all services."""
+    parser = argparse.ArgumentParser(
+        description="Download dashboard icons for all OnRamp services"
+    )
+    parser.add_argument(
+        "--index-url", default=SELFH_ICONS_INDEX, help="selfhst/icons index.json URL"
+    )
+    parser.add_argument(
+        "--cdn-url", default=CDN_BASE_URL, help="Base URL of the upstream SVG files"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=DOWNLOAD_WORKERS, help="Parallel downloads"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Download every icon, ignoring the manifest",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="Worker processes for normalization (default: CPU count)",
+    )
+    parser.add_argument(
+        "--repo-root", type=Path, help="Repository root (default: detected)"
+    )
+    parser.add_argument(
+        "--sprite-only",
+        action="store_true",
+        help="Only rebuild the icon sprite from the icons on disk",
+    )
+    args = parser.parse_args(argv)
+
     # The script is typically run from the repository root (e.g. make download-icons).
     # Use the current working directory if it looks like the repo root, otherwise
     # fall back to the location of this script (sietch/scripts/download_icons.py).
     cwd = Path.cwd()
     script_fallback = Path(__file__).resolve().parent.parent.parent
-    repo_root = cwd if (cwd / "services-available").exists() else script_fallback
+    repo_root = args.repo_root or (
+        cwd if (cwd / "services-available").exists() else script_fallback
+    )
 
     icons_dir = repo_root / "sietch" / "dashboard" / "static" / "icons"
     icons_dir.mkdir(parents=True, exist_ok=True)
+    if args.sprite_only:
+        sprite = build_icon_sprite(icons_dir)
+        print(f"Sprite: {sprite.name if sprite else 'no icons'}")
+        return 0
+    manifest = IconManifest(repo_root / "etc" / ".cache" / "icons.json")
+
+    with PooledHttpClient(max_idle_per_host=args.workers) as client:
+        try:
+            index = fetch_icon_index(client, manifest, args.index_url)
+        except (URLError, ValueError) as e:
+            print(f"ERROR: Could not fetch icon index: {getattr(e, 'reason', e)}")
+            return 1
+        upstream_icons = set(index.keys())
+        services = discover_services(repo_root)
+        print(f"Discovered {len(services)} services.")
+
+        # Determine which upstream refs have an SVG variant available
+        refs_with_svg = {ref for ref, meta in index.items() if meta.get("SVG") == "Yes"}
+
+        # Every upstream SVG is fetched once, however many services use it;
+        # the fallback icon is always kept up to date
+        fallback_source = icons_dir / f"{FALLBACK_ICON}.svg"
+        fallback_url = f"{args.cdn_url}/{FALLBACK_ICON}.svg"
+        downloads: dict[str, list[Path]] = {fallback_url: [fallback_source]}
+        services_by_url: dict[str, list[str]] = {}
+        fallback_services = []
+        for service in services:
+            upstream_name = resolve_icon_filename(service, upstream_icons)
+            if upstream_name == FALLBACK_ICON or upstream_name not in refs_with_svg:
+                # No specific SVG available; the generic fallback icon is copied
+                fallback_services.append(service)
+                continue
+            url = f"{args.cdn_url}/{upstream_name}.svg"
+            downloads.setdefault(url, []).append(icons_dir / f"{service}.svg")
+            services_by_url.setdefault(url, []).append(service)
+
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            results = list(
+                pool.map(
+                    lambda url: sync_icon(
+                        client, url, downloads[url], manifest.icons.get(url), args.force
+                    ),
+                    downloads,
+                )
+            )
+    finish_icons(results, downloads, args.jobs)
 
-    index = fetch_icon_index()
-    upstream_icons = set(index.keys())
-    services = discover_services(repo_root)
-    print(f"Discovered {len(services)} services.")
-
-    # Determine which upstream refs have an SVG variant available
-    refs_with_svg = {
-        ref for ref, meta in index.items() if meta.get("SVG") == "Yes"
+    stats = {
+        "downloaded": 0,
+        "unchanged": 0,
+        "fallback": len(fallback_services),
+        "errors": 0,
     }
-
-    # Ensure the fallback icon is present
-    fallback_source = icons_dir / f"{FALLBACK_ICON}.svg"
-    fallback_cdn = (
-        "https://cdn.jsdelivr.net/gh/selfhst/icons@main/svg/"
-        f"{FALLBACK_ICON}.svg"
-    )
-    fallback_downloaded = download_icon(fallback_cdn, fallback_source)
-    if fallback_downloaded:
-        normalize_svg(fallback_source)
-        print(f"fallback: {FALLBACK_ICON}.svg")
-    else:
-        print(f"  WARNING: Could not download fallback icon {FALLBACK_ICON}.svg")
-
-    stats = {"downloaded": 0, "fallback": 0, "errors": 0}
-
-    for service in services:
-        upstream_name = resolve_icon_filename(service, upstream_icons)
-        has_svg = upstream_name in refs_with_svg
-        dest = icons_dir / f"{service}.svg"
-
-        if upstream_name == FALLBACK_ICON or not has_svg:
-            # No specific SVG available; copy the generic fallback icon
-            stats["fallback"] += 1
-            print(f"{service}: using fallback '{FALLBACK_ICON}'")
-            if fallback_source.exists():
-                shutil.copy2(fallback_source, dest)
+    failed_services = []
+    manifest.icons = {}
+    for result in results:
+        if result.entry is not None:
+            manifest.icons[result.url] = result.entry
+        names = services_by_url.get(result.url, [])
+        if result.status == "error":
+            print(f"  WARNING: Failed to download {result.url}: {result.error}")
+            stats["errors"] += len(names)
+            failed_services.extend(names)
             continue
+        stats[result.status] += len(names)
+        if result.status == "downloaded":
+            print(f"{', '.join(names) or 'fallback'}: {result.url.rsplit('/', 1)[-1]}")
+    manifest.save()
 
-        cdn_url = (
-            "https://cdn.jsdelivr.net/gh/selfhst/icons@main/svg/"
-            f"{upstream_name}.svg"
-        )
-
-        print(f"{service}: {upstream_name}.svg")
-
-        if download_icon(cdn_url, dest):
-            if not normalize_svg(dest):
-                print(f"  WARNING: Could not normalize {dest.name}")
-            stats["downloaded"] += 1
-        else:
-            stats["errors"] += 1
-            if fallback_source.exists():
-                shutil.copy2(fallback_source, dest)
+    if not fallback_source.exists():
+        print(f"  WARNING: Could not download fallback icon {FALLBACK_ICON}.svg")
+    else:
+        for service in fallback_services:
+            copy_icon(fallback_source, icons_dir / f"{service}.svg")
+        for service in failed_services:
+            # Keep an icon from an earlier run rather than the generic one
+            dest = icons_dir / f"{service}.svg"
+            if not dest.exists():
+                copy_icon(fallback_source, dest)
                 print(f"{service}: copied fallback icon")
 
+    sprite = build_icon_sprite(icons_dir)
+    if sprite is not None:
+        print(f"Sprite: {sprite.name}")
+
     print(
-        f"\nDone: {stats['downloaded']} downloaded, "
+        f"\nDone: {stats['downloaded']} downloaded, {stats['unchanged']} unchanged, "
         f"{stats['fallback']} fallback, {stats['errors']} errors"
     )
     return 0 if stats["errors"] == 0 else 1
@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+"""
+env_files.py - Shared parsing and layered resolution of OnRamp .env files
+
+Every tool that reads .env files (env wizard, env migrations, Joyride host
+sync, the dashboard) goes through this module, so they agree on the rules:
+
+- `KEY=value` lines; whitespace around the key, `=` and value is ignored.
+  Blank lines and `#` comments are kept for tools that rewrite files.
+- Values may be double-quoted (\\n, \\", \\\\ escapes), single-quoted (taken
+  literally, never interpolated) or bare (a ` #` starts a comment).
+- Parsed files are cached in memory by path, mtime and size. Files changed
+  within the last second are re-read, as their mtime may not change again.
+
+LayeredEnv merges the files in the order of the Makefile's ENV_FILES
+(services-enabled/.env, .env.*, *.env, later files winning like repeated
+--env-file flags), resolves ${VAR}, ${VAR:-default} and ${VAR-default}
+references with cycle detection, and records the file each effective value
+came from.
+
+Commands:
+  show [--global] [NAME ...]   Print effective values and their source file
+"""
+
+import argparse
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from compose_model import RACY_WINDOW_NS
+from logging_config import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+# KEY=value, the key as compose accepts it
+VAR_LINE_PATTERN = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*$")
+
+# ${VAR}, ${VAR-default} or ${VAR:-default}; the default may nest one level
+REFERENCE_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)(?:(:?-)((?:[^{}]|\$\{[^{}]*\})*))?\}")
+
+DOUBLE_QUOTE_ESCAPES = {"n": "\n", "t": "\t", '"': '"', "\\": "\\", "$": "$"}
+
+
+@dataclass(frozen=True)
+class EnvLine:
+    """One line of an env file."""
+
+    kind: str  # var, comment or empty
+    text: str  # the line as written, without newline
+    name: str | None = None
+    raw: str = ""  # value as written, quotes included
+    value: str = ""  # value with quotes and inline comment removed
+    quoted: str = ""  # the quote character, if any
+
+
+@dataclass
+class EnvValue:
+    """The effective value of a variable and where it came from."""
+
+    name: str
+    value: str
+    raw: str
+    # File defining the effective value; None for an override (environment)
+    source: Path | None
+    # Earlier files whose definitions this one replaced
+    shadowed: list[Path] = field(default_factory=list)
+
+
+def _unquote(raw: str) -> tuple[str, str]:
+    """(value, quote character) of a raw value."""
+    if len(raw) >= 2 and raw[0] == raw[-1] == "'":
+        return raw[1:-1], "'"
+    if len(raw) >= 2 and raw[0] == raw[-1] == '"':
+        return re.sub(r"\\(.)", lambda m: DOUBLE_QUOTE_ESCAPES.get(m.group(1), m.group(0)), raw[1:-1]), '"'
+    # Bare values end at an inline comment
+    value = re.split(r"\s+#", raw, maxsplit=1)[0]
+    return value.rstrip(), ""
+
+
+def parse_env_text(text: str) -> list[EnvLine]:
+    """Parse env file content into lines."""
+    lines = []
+    for text_line in text.splitlines():
+        stripped = text_line.strip()
+        if not stripped:
+            lines.append(EnvLine("empty", text_line))
+            continue
+        match = None if stripped.startswith("#") else VAR_LINE_PATTERN.match(text_line)
+        if match is None:
+            # Comments, and lines that are not assignments, are kept as-is
+            lines.append(EnvLine("comment", text_line))
+            continue
+        name, raw = match.groups()
+        value, quoted = _unquote(raw)
+        lines.append(EnvLine("var", text_line, name, raw, value, quoted))
+    return lines
+
+
+@dataclass
+class _CachedFile:
+    mtime_ns: int
+    size: int
+    trusted: bool
+    lines: list[EnvLine]
+
+
+_cache: dict[Path, _CachedFile] = {}
+_cache_lock = threading.Lock()
+
+
+def parse_env_file(path: Path) -> list[EnvLine]:
+    """Parse an env file (cached by mtime and size).
+
+    Returns:
+        Lines of the file; empty if it does not exist
+    """
+    path = Path(path)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return []
+    with _cache_lock:
+        cached = _cache.get(path)
+    if cached and cached.trusted and (cached.mtime_ns, cached.size) == (st.st_mtime_ns, st.st_size):
+        return cached.lines
+
+    lines = parse_env_text(path.read_text(encoding="utf-8"))
+    # A file written in the last moments may change again without its mtime
+    # moving, so only entries for older files are reused
+    trusted = time.time_ns() - st.st_mtime_ns > RACY_WINDOW_NS
+    with _cache_lock:
+        _cache[path] = _CachedFile(st.st_mtime_ns, st.st_size, trusted, lines)
+    return lines
+
+
+def read_env_file(path: Path) -> dict[str, str]:
+    """Variables of an env file, unquoted, last definition winning."""
+    return {line.name: line.value for line in parse_env_file(path) if line.kind == "var"}
+
+
+def env_files(services_enabled: Path, global_only: bool = False) -> list[Path]:
+    """Env files in the order the Makefile passes them to docker.
+
+    ENV_FILES is .env, .env.*, then *.env; GLOBAL_ENV_FILES (global_only)
+    stops before the per-service *.env files.
+    """
+    if not services_enabled.is_dir():
+        return []
+    files = [services_enabled / ".env"] if (services_enabled / ".env").is_file() else []
+    files += sorted(p for p in services_enabled.glob(".env.*") if p.is_file())
+    if not global_only:
+        files += sorted(p for p in services_enabled.glob("*.env") if p.is_file() and p.name != ".env")
+    return files
+
+
+class LayeredEnv:
+    """The effective environment of an OnRamp tree, with provenance.
+
+    Results are cached and recomputed only when an env file is added,
+    removed or changed.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        overrides: dict[str, str] | None = None,
+        global_only: bool = False,
+    ):
+        """Initialize layered environment.
+
+        Args:
+            base_dir: Repository root directory
+            overrides: Variables that win over every file (e.g. the CLI)
+            global_only: Only .env and .env.* (the Makefile's GLOBAL_ENV_FILES)
+        """
+        self.base_dir = Path(base_dir)
+        self.services_enabled = self.base_dir / "services-enabled"
+        self.overrides = dict(overrides or {})
+        self.global_only = global_only
+        self._key: tuple | None = None
+        self._values: dict[str, EnvValue] = {}
+
+    def files(self) -> list[Path]:
+        """Env files, lowest priority first."""
+        return env_files(self.services_enabled, self.global_only)
+
+    def _state(self, files: list[Path]) -> tuple:
+        state = []
+        for path in files:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            state.append((path, st.st_mtime_ns, st.st_size))
+        return tuple(state)
+
+    def _merge(self, files: list[Path]) -> dict[str, EnvValue]:
+        merged: dict[str, EnvValue] = {}
+        for path in files:
+            for line in parse_env_file(path):
+                if line.kind != "var":
+                    continue
+                previous = merged.get(line.name)
+                shadowed = previous.shadowed + [previous.source] if previous else []
+                # Single-quoted values are literal; mark them so they are not interpolated
+                raw = line.value if line.quoted != "'" else line.value.replace("$", "\0")
+                merged[line.name] = EnvValue(line.name, raw, line.raw, path, shadowed)
+        for name, value in self.overrides.items():
+            previous = merged.get(name)
+            shadowed = previous.shadowed + [previous.source] if previous else []
+            merged[name] = EnvValue(name, value.replace("$", "\0"), value, None, shadowed)
+        return merged
+
+    def _resolve(self, merged: dict[str, EnvValue]) -> None:
+        """Interpolate every value in place."""
+        done: set[str] = set()
+
+        def resolve(name: str, chain: list[str]) -> str | None:
+            entry = merged.get(name)
+            if entry is None:
+                return None
+            if name in done:
+                return entry.value
+            if name in chain:
+                cycle = " -> ".join(chain[chain.index(name) :] + [name])
+                logger.warning(f"Variable cycle: {cycle}", extra={"variable": name})
+                return ""
+            entry.value = interpolate(entry.value, lambda ref: resolve(ref, chain + [name]))
+            done.add(name)
+            return entry.value
+
+        for name in merged:
+            resolve(name, [])
+        for entry in merged.values():
+            entry.value = entry.value.replace("\0", "$")
+
+    def values(self) -> dict[str, EnvValue]:
+        """Every variable's effective value and source."""
+        files = self.files()
+        key = self._state(files)
+        if key != self._key:
+            merged = self._merge(files)
+            self._resolve(merged)
+            self._values, self._key = merged, key
+        return self._values
+
+    def as_dict(self) -> dict[str, str]:
+        """Effective values by name."""
+        return {name: entry.value for name, entry in self.values().items()}
+
+    def get(self, name: str, default: str | None = None) -> str | None:
+        entry = self.values().get(name)
+        return entry.value if entry else default
+
+    def source(self, name: str) -> Path | None:
+        """File the effective value of a variable came from."""
+        entry = self.values().get(name)
+        return entry.source if entry else None
+
+
+def interpolate(template: str, lookup) -> str:
+    """Replace ${VAR} references using lookup(name) -> str | None.
+
+    Unset variables without a default become empty, as in compose.
+    """
+
+    def replace(match: re.Match) -> str:
+        name, operator, default = match.groups()
+        value = lookup(name)
+        if operator == ":-" and not value or operator == "-" and value is None:
+            return interpolate(default or "", lookup)
+        return value or ""
+
+    return REFERENCE_PATTERN.sub(replace, template)
+
+
+def main() -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Show the effective OnRamp environment")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    show = subparsers.add_parser("show", help="Print effective values and their source file")
+    show.add_argument("names", nargs="*", help="Variables to show (default: all)")
+    show.add_argument("--global", dest="global_only", action="store_true", help="Only .env and .env.* files")
+    parser.add_argument("--base-dir", type=Path, default=Path("/app"), help="Repository root directory")
+
+    args = parser.parse_args()
+    setup_logging(level="INFO", enable_colors=True)
+
+    values = LayeredEnv(args.base_dir, global_only=args.global_only).values()
+    names = args.names or sorted(values)
+    missing = [name for name in names if name not in values]
+    for name in names:
+        if name in values:
+            entry = values[name]
+            source = entry.source.relative_to(args.base_dir) if entry.source else "environment"
+            print(f"{name}={entry.value}  # {source}")
+    for name in missing:
+        logger.warning(f"{name} is not set")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
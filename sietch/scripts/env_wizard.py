@@ -17,11 +17,12 @@ logger = get_logger(__name__)
 import argparse
 import getpass
 import os
-import re
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from env_files import parse_env_file, read_env_file
+
 
 @dataclass
 class EnvVariable:
@@ -125,23 +126,7 @@ class EnvWizard:
 
     def load_env_file(self, path: Path) -> dict[str, str]:
         """Load an env file and return a dict of var_name -> value."""
-        variables: dict[str, str] = {}
-        if not path.exists():
-            return variables
-
-        with open(path, "r") as f:
-            for line in f:
-                line = line.strip()
-                # Skip empty lines and comments
-                if not line or line.startswith("#"):
-                    continue
-                # Parse KEY=value
-                match = re.match(r"^([A-Z][A-Z0-9_]*)=(.*)$", line)
-                if match:
-                    var_name, value = match.groups()
-                    variables[var_name] = value
-
-        return variables
+        return read_env_file(path)
 
     def get_existing_value(self, var_name: str, env_vars: dict[str, str]) -> str | None:
         """Get an existing value for a variable, returns None if empty or missing."""
@@ -162,29 +147,17 @@ class EnvWizard:
 
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Read existing content
-        lines: list[str] = []
-        if path.exists():
-            with open(path, "r") as f:
-                lines = f.readlines()
-
         # Track which variables we've updated
         updated: set[str] = set()
 
         # Update existing lines
         new_lines: list[str] = []
-        for line in lines:
-            stripped = line.rstrip("\n\r")
-            match = re.match(r"^([A-Z][A-Z0-9_]*)=", stripped)
-            if match:
-                var_name = match.group(1)
-                if var_name in updates:
-                    new_lines.append(f"{var_name}={updates[var_name]}\n")
-                    updated.add(var_name)
-                else:
-                    new_lines.append(line if line.endswith("\n") else line + "\n")
+        for line in parse_env_file(path):
+            if line.kind == "var" and line.name in updates:
+                new_lines.append(f"{line.name}={updates[line.name]}\n")
+                updated.add(line.name)
             else:
-                new_lines.append(line if line.endswith("\n") else line + "\n")
+                new_lines.append(line.text + "\n")
 
         # Append any new variables that weren't in the file
         for var_name, value in updates.items():
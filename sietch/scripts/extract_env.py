@@ -20,11 +20,12 @@ from logging_config import get_logger, setup_logging
 logger = get_logger(__name__)
 
 import argparse
-import re
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from compose_model import ComposeModel, variable_references
+
 
 @dataclass
 class ExtractedVar:
@@ -44,6 +45,7 @@ class EnvExtractor:
     def __post_init__(self) -> None:
         self.services_available = self.base_dir / "services-available"
         self.scaffold_dir = self.base_dir / "services-scaffold"
+        self.model = ComposeModel(self.base_dir)
 
     def find_compose_file(self, service: str) -> Path | None:
         """Find the compose file for a service."""
@@ -61,19 +63,16 @@ class EnvExtractor:
 
     def extract_variables(self, content: str, service: str) -> dict[str, ExtractedVar]:
         """Extract all environment variables from compose file content."""
+        return self.select_variables(variable_references(content), service)
+
+    def select_variables(
+        self, references: list[tuple[str, str | None]], service: str
+    ) -> dict[str, ExtractedVar]:
+        """Keep the service-specific (name, default) variable references."""
         variables: dict[str, ExtractedVar] = {}
         service_upper = service.upper().replace("-", "_")
 
-        # Pattern to match ${VAR} or ${VAR:-default} or ${VAR:=default}
-        # Handles nested ${...} in default values by matching balanced braces
-        var_pattern = re.compile(
-            r"\$\{([A-Z_][A-Z0-9_]*)(?::-|:=)?((?:[^{}]|\$\{[^}]*\})*)\}"
-        )
-
-        for match in var_pattern.finditer(content):
-            var_name = match.group(1)
-            default_value = match.group(2) if match.group(2) else None
-
+        for var_name, default_value in references:
             # Skip global/common variables that shouldn't be in service env
             if var_name in ("PUID", "PGID", "TZ", "HOST_DOMAIN", "HOST_NAME"):
                 continue
@@ -180,8 +179,13 @@ class EnvExtractor:
         if not compose_file:
             return False, f"Compose file not found for service: {service}"
 
-        content = compose_file.read_text()
-        variables = self.extract_variables(content, service)
+        # Variable references are cached with the parsed file; fall back to
+        # scanning the text when the file is not valid YAML
+        parsed = self.model.load(compose_file)
+        if parsed is not None:
+            variables = self.select_variables(parsed.variables, service)
+        else:
+            variables = self.extract_variables(compose_file.read_text(), service)
 
         if not variables:
             return False, f"No service-specific variables found in {compose_file}"
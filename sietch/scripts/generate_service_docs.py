@@ -9,14 +9,54 @@ This script:
 4. Scans overrides-available/ for service-specific override configurations
 5. Analyzes override files to document alternative configurations
 6. Generates detailed markdown documentation for each service
+
+Generation is incremental: each doc's inputs (service yml, scaffold
+env.template, matching override files, and this generator) are hashed
+and recorded in etc/.cache/service_docs.json. Only docs whose inputs
+changed are regenerated, and a doc is only written when its content
+differs. Use --force to regenerate everything.
+
+Matching overrides come from a one-pass override index (compose_model.
+OverrideIndex) rather than a glob per service, and docs that need
+regenerating are rendered across a process pool (--jobs).
 """
 
+import argparse
+import functools
+import hashlib
+import json
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-import yaml
+
+from compose_model import ComposeModel
+
+
+DOCS_MANIFEST_VERSION = 1
+
+# Below this many docs to regenerate, a process pool costs more than it saves
+PARALLEL_THRESHOLD = 8
+
+
+@functools.cache
+def _generator_fingerprint() -> bytes:
+    """Hash of this script, so every doc is regenerated when it changes."""
+    return hashlib.sha256(Path(__file__).read_bytes()).digest()
+
+
+_worker_generator: Optional["ServiceDocGenerator"] = None
+
+
+def _render_in_worker(root_dir: str, service_name: str, yml_path: str) -> Tuple[Optional[str], str]:
+    """Process pool entry point; reuses one generator per worker process."""
+    global _worker_generator
+    if _worker_generator is None or str(_worker_generator.root_dir) != root_dir:
+        _worker_generator = ServiceDocGenerator(Path(root_dir))
+    return _worker_generator.render(service_name, Path(yml_path))
 
 
 class ServiceDocGenerator:
@@ -26,6 +66,10 @@ class ServiceDocGenerator:
         self.services_scaffold_dir = root_dir / "services-scaffold"
         self.services_docs_dir = root_dir / "services-docs"
         self.overrides_available_dir = root_dir / "overrides-available"
+        # Shared parse cache with the linter, audit and scaffold tools
+        self.compose = ComposeModel(root_dir)
+        # Input hashes of each generated doc, for incremental generation
+        self.manifest_path = root_dir / "etc" / ".cache" / "service_docs.json"
 
         # Create docs directory if it doesn't exist
         self.services_docs_dir.mkdir(exist_ok=True)
@@ -69,15 +113,7 @@ class ServiceDocGenerator:
     def parse_yaml_content(self, yml_path: Path) -> Optional[Dict]:
         """Parse YAML content to extract service configuration."""
         try:
-            with open(yml_path, 'r', encoding='utf-8') as f:
-                # Remove comment lines starting with #
-                content = []
-                for line in f:
-                    if not line.strip().startswith('#'):
-                        content.append(line)
-
-                yaml_content = ''.join(content)
-                return yaml.safe_load(yaml_content)
+            return self.compose.read(yml_path).data
 
         except Exception as e:
             print(f"Warning: Could not parse YAML from {yml_path}: {e}")
@@ -88,15 +124,9 @@ class ServiceDocGenerator:
         env_vars = set()
 
         try:
-            with open(yml_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-                # Find all ${VAR_NAME} or ${VAR_NAME:-default} patterns
-                pattern = r'\$\{([A-Z_][A-Z0-9_]*)(:-[^}]*)?\}'
-                matches = re.findall(pattern, content)
-
-                for match in matches:
-                    env_vars.add(match[0])
+            # ${VAR_NAME} / ${VAR_NAME:-default} references, found when the file was parsed
+            for name, _ in self.compose.read(yml_path).variables:
+                env_vars.add(name)
 
         except Exception as e:
             print(f"Warning: Could not extract env vars from {yml_path}: {e}")
@@ -270,18 +300,8 @@ class ServiceDocGenerator:
         return info
 
     def find_service_overrides(self, service_name: str) -> List[Path]:
-        """Find all override files for a given service."""
-        if not self.overrides_available_dir.exists():
-            return []
-
-        # Strip games- prefix if present
-        base_service_name = service_name.replace('games-', '')
-
-        # Find all overrides matching the pattern {service}*.yml
-        pattern = f"{base_service_name}*.yml"
-        overrides = sorted(self.overrides_available_dir.glob(pattern))
-
-        return overrides
+        """Find all override files ({service}*.yml) for a given service."""
+        return self.compose.override_index.paths_for(service_name)
 
     def analyze_override(self, override_path: Path) -> Dict:
         """Analyze an override file to determine what it modifies."""
@@ -638,8 +658,60 @@ class ServiceDocGenerator:
 
         return '\n'.join(md)
 
-    def generate_all_docs(self):
-        """Generate documentation for all services."""
+    def doc_inputs(self, service_name: str, yml_path: Path) -> List[Path]:
+        """Files a service's documentation is generated from."""
+        return [
+            yml_path,
+            self.services_scaffold_dir / service_name / "env.template",
+            *self.find_service_overrides(service_name),
+        ]
+
+    def inputs_digest(self, inputs: List[Path]) -> str:
+        """Hash the names and contents of a doc's inputs."""
+        digest = hashlib.sha256(_generator_fingerprint())
+        for path in inputs:
+            digest.update(str(path.relative_to(self.root_dir)).encode() + b"\0")
+            try:
+                digest.update(hashlib.sha256(path.read_bytes()).digest())
+            except FileNotFoundError:
+                digest.update(b"missing")
+        return digest.hexdigest()
+
+    def load_manifest(self) -> Dict[str, str]:
+        """Load recorded input hashes (service name -> digest)."""
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != DOCS_MANIFEST_VERSION:
+            return {}
+        return data.get('docs', {})
+
+    def save_manifest(self, docs: Dict[str, str]) -> None:
+        """Record input hashes of the generated docs (only inside an OnRamp tree with etc/)."""
+        if not self.manifest_path.parent.parent.is_dir():
+            return
+        try:
+            self.manifest_path.parent.mkdir(exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps({'version': DOCS_MANIFEST_VERSION, 'docs': docs}, indent=1), encoding='utf-8')
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            print(f"Warning: Could not save docs manifest {self.manifest_path}: {e}")
+
+    def write_if_changed(self, output_path: Path, content: str) -> bool:
+        """Write content unless the file already holds it. Returns True if written."""
+        try:
+            if output_path.read_text(encoding='utf-8') == content:
+                return False
+        except FileNotFoundError:
+            pass
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return True
+
+    def service_files(self) -> List[Tuple[str, Path]]:
+        """(service name, yml path) for every service, including games."""
         # Get main services
         yml_files = sorted(self.services_available_dir.glob("*.yml"))
 
@@ -649,47 +721,109 @@ class ServiceDocGenerator:
             game_files = sorted(games_dir.glob("*.yml"))
             yml_files.extend(game_files)
 
-        print(f"Found {len(yml_files)} service files")
+        services = []
+        for yml_path in yml_files:
+            # Handle subdirectory services (e.g., games/minecraft.yml -> games-minecraft)
+            if yml_path.parent.name == "games":
+                services.append((f"games-{yml_path.stem}", yml_path))
+            else:
+                services.append((yml_path.stem, yml_path))
+        return services
+
+    def render(self, service_name: str, yml_path: Path) -> Tuple[Optional[str], str]:
+        """Generate one doc, returning (markdown, "") or (None, error)."""
+        try:
+            return self.generate_markdown(service_name, yml_path), ""
+        except Exception as e:
+            return None, str(e)
+
+    def render_many(self, services: List[Tuple[str, Path]], jobs: Optional[int] = None) -> List[Tuple[Optional[str], str]]:
+        """Render docs in order, across a process pool when there are enough."""
+        workers = min(jobs or os.cpu_count() or 1, len(services))
+        if workers > 1 and len(services) >= PARALLEL_THRESHOLD:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    return list(pool.map(
+                        _render_in_worker,
+                        [str(self.root_dir)] * len(services),
+                        [name for name, _ in services],
+                        [str(path) for _, path in services],
+                        chunksize=max(1, len(services) // (workers * 4)),
+                    ))
+            except (OSError, NotImplementedError, BrokenProcessPool) as e:
+                print(f"Warning: Parallel generation unavailable, generating serially: {e}")
+
+        return [self.render(name, path) for name, path in services]
+
+    def generate_all_docs(self, force: bool = False, jobs: Optional[int] = None):
+        """Generate documentation for all services whose inputs changed."""
+        services = self.service_files()
+
+        print(f"Found {len(services)} service files")
         print(f"Generating documentation in: {self.services_docs_dir}")
         print("")
 
+        previous = {} if force else self.load_manifest()
+        manifest = {}
         success_count = 0
+        written_count = 0
+        unchanged_count = 0
         error_count = 0
 
-        for yml_path in yml_files:
-            # Handle subdirectory services (e.g., games/minecraft.yml -> games-minecraft)
-            if yml_path.parent.name == "games":
-                service_name = f"games-{yml_path.stem}"
+        pending = []
+        for service_name, yml_path in services:
+            output_path = self.services_docs_dir / f"{service_name}.md"
+            digest = self.inputs_digest(self.doc_inputs(service_name, yml_path))
+
+            if previous.get(service_name) == digest and output_path.exists():
+                manifest[service_name] = digest
+                unchanged_count += 1
             else:
-                service_name = yml_path.stem
+                pending.append((service_name, yml_path, digest))
 
-            try:
-                print(f"Processing: {service_name}...", end=' ')
+        rendered = self.render_many([(name, path) for name, path, _ in pending], jobs=jobs)
 
-                # Generate markdown
-                markdown = self.generate_markdown(service_name, yml_path)
+        for (service_name, yml_path, digest), (markdown, error) in zip(pending, rendered):
+            print(f"Processing: {service_name}...", end=' ')
+            if markdown is None:
+                print(f"ERROR: {error}")
+                error_count += 1
+                continue
 
-                # Write to file
-                output_path = self.services_docs_dir / f"{service_name}.md"
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(markdown)
+            # Write to file (only if the content changed)
+            output_path = self.services_docs_dir / f"{service_name}.md"
+            try:
+                written = self.write_if_changed(output_path, markdown)
+            except OSError as e:
+                print(f"ERROR: {e}")
+                error_count += 1
+                continue
 
+            if written:
+                written_count += 1
                 print("OK")
-                success_count += 1
+            else:
+                print("unchanged")
+            manifest[service_name] = digest
+            success_count += 1
 
-            except Exception as e:
-                print(f"ERROR: {e}")
-                error_count += 1
+        self.save_manifest(manifest)
 
         print("")
         print(f"Documentation generation complete!")
-        print(f"  Success: {success_count}")
+        print(f"  Regenerated: {success_count} ({written_count} written)")
+        print(f"  Up to date: {unchanged_count}")
         print(f"  Errors: {error_count}")
         print(f"  Output directory: {self.services_docs_dir}")
 
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Generate markdown documentation for OnRamp services")
+    parser.add_argument("--force", action="store_true", help="Regenerate every doc, even if its inputs are unchanged")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Worker processes for regeneration (default: CPU count)")
+    args = parser.parse_args()
+
     # Determine project root (go up 2 levels from scripts directory)
     script_dir = Path(__file__).parent
     root_dir = script_dir.parent.parent
@@ -700,7 +834,7 @@ def main():
     print("")
 
     generator = ServiceDocGenerator(root_dir)
-    generator.generate_all_docs()
+    generator.generate_all_docs(force=args.force, jobs=args.jobs)
 
 
 if __name__ == "__main__":
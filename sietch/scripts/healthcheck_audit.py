@@ -7,8 +7,18 @@ Scans service YAML files to identify:
 - Services lacking health checks entirely
 - Health check coverage statistics
 
+With --runtime, also lists all containers in one Docker Engine API call
+(GET /containers/json) and joins their live state with the static results:
+- Unhealthy and restart-looping containers
+- Autoheal coverage gaps (healthcheck without autoheal, autoheal without
+  a healthcheck at runtime)
+- Enabled services without a running container
+
+Health and autoheal are only checked for running containers: stopped ones
+have no health state. Containers in other states are listed separately.
+
 Usage:
-  healthcheck_audit.py [--enabled-only] [--format=text|json]
+  healthcheck_audit.py [--enabled-only] [--runtime] [--format=text|json]
 """
 
 from logging_config import get_logger, setup_logging
@@ -18,15 +28,27 @@ import argparse
 import json
 import re
 import sys
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
+from compose_model import ComposeModel
+from ports.docker import ContainerLister
+
+# Restarts at or above this count (when the engine reports it) mean a restart loop
+RESTART_LOOP_THRESHOLD = 3
+
+# Health suffix of the container list Status, e.g. "Up 2 hours (unhealthy)"
+STATUS_HEALTH_PATTERN = re.compile(r"\((healthy|unhealthy|health: starting)\)")
+
 
-def parse_service_yaml(filepath: Path) -> dict:
+def parse_service_yaml(filepath: Path, model: ComposeModel | None = None) -> dict:
     """Parse service YAML to extract health check and autoheal info.
 
-    Uses simple regex parsing to avoid yaml dependency for basic analysis.
+    Reads the file through the shared compose model, so a file parsed by
+    another tool (or an earlier run) is not parsed again.
     """
-    content = filepath.read_text()
+    if model is None:
+        model = ComposeModel(filepath.parent.parent)
 
     result = {
         "file": filepath.name,
@@ -37,22 +59,18 @@ def parse_service_yaml(filepath: Path) -> dict:
         "services": [],
     }
 
-    # Check for healthcheck block
-    if re.search(r"healthcheck:", content):
-        result["has_healthcheck"] = True
+    compose_file = model.load(filepath)
+    if compose_file is None:
+        return result
 
-    # Check for autoheal label
-    autoheal_match = re.search(r"autoheal[=:](\S+)", content)
-    if autoheal_match:
-        result["has_autoheal"] = True
-        result["autoheal_value"] = autoheal_match.group(1).strip("\"'")
-
-    # Extract service names (basic parsing)
-    services_match = re.search(r"services:\s*\n((?:\s+\S+:.*\n?)+)", content)
-    if services_match:
-        service_lines = services_match.group(1)
-        for match in re.finditer(r"^\s{2}(\w[\w-]*):", service_lines, re.MULTILINE):
-            result["services"].append(match.group(1))
+    for name, service in compose_file.services.items():
+        result["services"].append(name)
+        if service.healthcheck is not None:
+            result["has_healthcheck"] = True
+        autoheal = service.labels.get("autoheal")
+        if autoheal is not None and not result["has_autoheal"]:
+            result["has_autoheal"] = True
+            result["autoheal_value"] = autoheal.strip("\"'")
 
     return result
 
@@ -65,8 +83,8 @@ def audit_services(
     Returns:
         Tuple of (service_results, statistics)
     """
-    services_available = base_dir / "services-available"
-    services_enabled = base_dir / "services-enabled"
+    model = ComposeModel(base_dir)
+    services_available = model.services_available
 
     results = []
     stats = {
@@ -77,10 +95,7 @@ def audit_services(
     }
 
     # Get list of enabled services
-    enabled_services = set()
-    if services_enabled.exists():
-        for yml in services_enabled.glob("*.yml"):
-            enabled_services.add(yml.stem)
+    enabled_services = model.enabled_names()
 
     # Scan available services
     if not services_available.exists():
@@ -93,7 +108,7 @@ def audit_services(
         if enabled_only and service_name not in enabled_services:
             continue
 
-        result = parse_service_yaml(yml_file)
+        result = parse_service_yaml(yml_file, model)
         result["enabled"] = service_name in enabled_services
 
         results.append(result)
@@ -109,7 +124,124 @@ def audit_services(
     return results, stats
 
 
-def print_text_report(results: list[dict], stats: dict) -> None:
+@dataclass
+class ContainerHealth:
+    """Live state of one container, from the container list."""
+
+    name: str
+    service: str  # Compose service label, or the container name
+    state: str  # running, restarting, exited, ...
+    health: str | None  # healthy, unhealthy or starting; None without a healthcheck
+    autoheal: bool
+    # Only reported in the list by some engines (e.g. Podman "Restarts")
+    restart_count: int | None = None
+    failing_streak: int | None = None
+
+    @property
+    def restart_looping(self) -> bool:
+        return self.state == "restarting" or (self.restart_count or 0) >= RESTART_LOOP_THRESHOLD
+
+
+def parse_container(summary: dict) -> ContainerHealth:
+    """Build ContainerHealth from a GET /containers/json entry."""
+    labels = summary.get("Labels") or {}
+    names = summary.get("Names") or []
+    name = names[0].lstrip("/") if names else summary.get("Id", "")[:12]
+
+    health_info = summary.get("Health") or {}
+    health = health_info.get("Status")
+    if health is None:
+        match = STATUS_HEALTH_PATTERN.search(summary.get("Status", ""))
+        health = match.group(1).removeprefix("health: ") if match else None
+    if health == "none":
+        health = None
+
+    restart_count = summary.get("RestartCount", summary.get("Restarts"))
+    return ContainerHealth(
+        name=name,
+        service=labels.get("com.docker.compose.service", name),
+        state=summary.get("State", ""),
+        health=health,
+        autoheal=labels.get("autoheal", "").strip("\"'").lower() == "true",
+        restart_count=restart_count if isinstance(restart_count, int) else None,
+        failing_streak=health_info.get("FailingStreak"),
+    )
+
+
+def audit_runtime(results: list[dict], containers: list[dict]) -> tuple[list[dict], dict]:
+    """Join live container state with static audit results.
+
+    Args:
+        results: Static results from audit_services()
+        containers: Container summaries from one ContainerLister call
+
+    Returns:
+        Tuple of (container_results, runtime_statistics)
+    """
+    by_compose_service = {name: result for result in results for name in result["services"]}
+
+    rows = []
+    stats = {
+        "containers": 0,
+        "healthy": 0,
+        "unhealthy": 0,
+        "starting": 0,
+        "no_healthcheck": 0,
+        "restart_looping": 0,
+        "autoheal_gaps": 0,
+        "not_running": 0,
+        "enabled_not_running": [],
+    }
+    running_files = set()
+
+    for summary in containers:
+        container = parse_container(summary)
+        static = by_compose_service.get(container.service)
+        running = container.state == "running"
+        if static and running:
+            running_files.add(static["service"])
+
+        issues = []
+        if running and container.health == "unhealthy":
+            issues.append("unhealthy")
+        if container.restart_looping:
+            issues.append("restart_loop")
+        if running and container.autoheal and container.health is None:
+            issues.append("autoheal_without_healthcheck")
+        if running and container.health is not None and not container.autoheal:
+            issues.append("healthcheck_without_autoheal")
+        if not running:
+            issues.append("not_running")
+
+        row = asdict(container)
+        row["file"] = static["file"] if static else None
+        row["issues"] = issues
+        rows.append(row)
+
+        stats["containers"] += 1
+        if not running:
+            stats["not_running"] += 1
+        elif container.health in ("healthy", "unhealthy", "starting"):
+            stats[container.health] += 1
+        else:
+            stats["no_healthcheck"] += 1
+        if container.restart_looping:
+            stats["restart_looping"] += 1
+        if "autoheal_without_healthcheck" in issues or "healthcheck_without_autoheal" in issues:
+            stats["autoheal_gaps"] += 1
+
+    stats["enabled_not_running"] = sorted(
+        r["service"] for r in results if r.get("enabled") and r["service"] not in running_files
+    )
+    return rows, stats
+
+
+def runtime_audit(results: list[dict], lister: ContainerLister) -> tuple[list[dict], dict]:
+    """List all containers in one API call and join them with results."""
+    return audit_runtime(results, lister.list_containers(all=True))
+
+
+def print_text_report(results: list[dict], stats: dict, runtime: tuple[list[dict], dict] | None = None) -> None:
     """Print human-readable audit report."""
     logger.info("=" * 60)
     logger.info("HEALTH CHECK AUDIT REPORT")
@@ -162,8 +294,50 @@ def print_text_report(results: list[dict], stats: dict) -> None:
             logger.info(f"  {status} {r['service']}")
         logger.info("")
 
+    if runtime is not None:
+        print_runtime_report(*runtime)
+
+
+def print_runtime_report(containers: list[dict], stats: dict) -> None:
+    """Print the live container section of the text report."""
+    logger.info("RUNTIME")
+    logger.info("-" * 40)
+    logger.info(f"Containers: {stats['containers']}")
+    logger.info(f"Healthy: {stats['healthy']}")
+    logger.info(f"Unhealthy: {stats['unhealthy']}")
+    logger.info(f"Starting: {stats['starting']}")
+    logger.info(f"Without healthcheck: {stats['no_healthcheck']}")
+    logger.info(f"Restart looping: {stats['restart_looping']}")
+    logger.info(f"Autoheal gaps: {stats['autoheal_gaps']}")
+    logger.info(f"Not running: {stats['not_running']}")
+    logger.info("")
+
+    sections = [
+        ("UNHEALTHY containers", "unhealthy"),
+        ("RESTART LOOPING containers", "restart_loop"),
+        ("Autoheal enabled but NO healthcheck at runtime", "autoheal_without_healthcheck"),
+        ("Healthcheck WITHOUT autoheal (unhealthy state is not acted on)", "healthcheck_without_autoheal"),
+        ("Containers NOT RUNNING (health not checked)", "not_running"),
+    ]
+    for title, issue in sections:
+        affected = [c for c in containers if issue in c["issues"]]
+        if affected:
+            logger.info(title)
+            logger.info("-" * 40)
+            for c in affected:
+                restarts = f" (restarts: {c['restart_count']})" if c["restart_count"] is not None else ""
+                logger.info(f"  {c['name']} [{c['state']}]{restarts}")
+            logger.info("")
+
+    if stats["enabled_not_running"]:
+        logger.info("ENABLED services without a running container")
+        logger.info("-" * 40)
+        for service in stats["enabled_not_running"]:
+            logger.info(f"  {service}")
+        logger.info("")
+
 
-def print_json_report(results: list[dict], stats: dict) -> None:
+def print_json_report(results: list[dict], stats: dict, runtime: tuple[list[dict], dict] | None = None) -> None:
     """Print JSON audit report."""
     report = {
         "statistics": stats,
@@ -174,6 +348,9 @@ def print_json_report(results: list[dict], stats: dict) -> None:
             if r["has_autoheal"] and not r["has_healthcheck"]
         ],
     }
+    if runtime is not None:
+        containers, runtime_stats = runtime
+        report["runtime"] = {"statistics": runtime_stats, "containers": containers}
     logger.info(json.dumps(report, indent=2))
 
 
@@ -192,6 +369,16 @@ def main() -> int:
         default="text",
         help="Output format (default: text)",
     )
+    parser.add_argument(
+        "--runtime",
+        action="store_true",
+        help="Also audit running containers via the Docker API",
+    )
+    parser.add_argument(
+        "--docker-host",
+        default=None,
+        help="Docker API endpoint (default: $DOCKER_HOST or unix:///var/run/docker.sock)",
+    )
     parser.add_argument(
         "--base-dir",
         default="/app",
@@ -206,13 +393,26 @@ def main() -> int:
 
     results, stats = audit_services(base_dir, args.enabled_only)
 
+    runtime = None
+    if args.runtime:
+        from adapters.docker_api import DockerApiClient, DockerApiError
+
+        try:
+            runtime = runtime_audit(results, DockerApiClient(args.docker_host))
+        except (OSError, DockerApiError) as e:
+            logger.error("Docker API unavailable", extra={"error": str(e)})
+            return 1
+
     if args.format == "json":
-        print_json_report(results, stats)
+        print_json_report(results, stats, runtime)
     else:
-        print_text_report(results, stats)
+        print_text_report(results, stats, runtime)
 
     # Return non-zero if there are critical issues
-    return 1 if stats["autoheal_no_healthcheck"] > 0 else 0
+    critical = stats["autoheal_no_healthcheck"] > 0
+    if runtime is not None:
+        critical = critical or runtime[1]["unhealthy"] > 0 or runtime[1]["restart_looping"] > 0
+    return 1 if critical else 0
 
 
 if __name__ == "__main__":
@@ -12,7 +12,7 @@ Provides structured logging with:
 import logging
 import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 # Try to import colorama for colored output (optional)
 try:
@@ -85,6 +85,7 @@ def setup_logging(
     log_file: Path | None = None,
     enable_colors: bool = True,
     structured: bool = False,
+    stream: TextIO | None = None,
 ) -> None:
     """
     Configure logging for OnRamp scripts.
@@ -94,6 +95,8 @@ def setup_logging(
         log_file: Optional path to write logs to file
         enable_colors: Enable colored output in console (if colorama available)
         structured: Use structured logging format (key=value pairs)
+        stream: Console stream (default: stdout); stderr keeps logs out of
+            data written to stdout
     """
     # Get root logger
     root_logger = logging.getLogger()
@@ -104,7 +107,7 @@ def setup_logging(
         root_logger.removeHandler(handler)
 
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = logging.StreamHandler(stream or sys.stdout)
     console_handler.setLevel(logging.DEBUG)
 
     if structured:
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""
+manifest_plan.py - Dependency-ordered execution plans for scaffold manifests
+
+A scaffold.yml manifest is compiled into a DAG using the paths each
+operation declares (Operation.write_keys, plus the path its condition
+reads). Operation B depends on an earlier operation A when A writes a path
+that overlaps a path B reads or writes, or A's condition reads a path B
+writes. Paths overlap when one equals or contains the other, so
+`chown ./ recursive` waits for everything before it, while two `mkdir`s of
+sibling directories do not wait for each other.
+
+Operations are grouped into stages (longest dependency chain); operations
+in the same stage are independent and run in parallel. Conditions are still
+evaluated when an operation runs, after everything it depends on.
+
+Unknown operation types are treated as barriers: they depend on, and are
+depended on by, every other operation.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from logging_config import get_logger
+from operations import OPERATIONS, Operation, OperationContext, execute_operation
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PlanStep:
+    """One manifest operation placed in the plan."""
+
+    index: int  # 1-based position in the manifest
+    config: dict[str, Any]
+    operation: Operation | None  # None for unknown operation types
+    reads: set[Path] = field(default_factory=set)
+    writes: set[Path] = field(default_factory=set)
+    depends_on: set[int] = field(default_factory=set)
+    stage: int = 0
+
+    @property
+    def op_type(self) -> str:
+        return self.config.get("type", "unknown")
+
+    @property
+    def target(self) -> str:
+        """The path the operation acts on, as written in the manifest."""
+        for key in ("path", "output"):
+            if self.config.get(key):
+                return self.config[key]
+        return ""
+
+
+@dataclass
+class ManifestPlan:
+    """Operations of a manifest grouped into parallel stages."""
+
+    steps: list[PlanStep]
+
+    @property
+    def stages(self) -> list[list[PlanStep]]:
+        stages: list[list[PlanStep]] = []
+        for step in self.steps:
+            while len(stages) <= step.stage:
+                stages.append([])
+            stages[step.stage].append(step)
+        return stages
+
+
+@dataclass
+class StepPreview:
+    """Dry-run prediction for one plan step."""
+
+    step: PlanStep
+    would_run: bool
+    detail: str
+    # Outcome depends on earlier operations in the plan
+    deferred: bool = False
+
+
+def paths_overlap(a: set[Path], b: set[Path]) -> bool:
+    """Check whether any path in a equals or contains any path in b."""
+    return any(x == y or x in y.parents or y in x.parents for x in a for y in b)
+
+
+def compile_plan(
+    operations: list[dict[str, Any]], ctx: OperationContext
+) -> ManifestPlan:
+    """Compile manifest operations into a staged dependency plan."""
+    steps: list[PlanStep] = []
+
+    for index, config in enumerate(operations, 1):
+        op_class = OPERATIONS.get(config.get("type", ""))
+        step = PlanStep(index, config, op_class(config, ctx) if op_class else None)
+        if step.operation is not None:
+            step.reads, step.writes = step.operation.declared_paths()
+
+        for earlier in steps:
+            barrier = step.operation is None or earlier.operation is None
+            if (
+                barrier
+                or not step.writes
+                or not earlier.writes
+                or paths_overlap(earlier.writes, step.reads | step.writes)
+                or paths_overlap(earlier.reads, step.writes)
+            ):
+                step.depends_on.add(earlier.index)
+                step.stage = max(step.stage, earlier.stage + 1)
+
+        steps.append(step)
+
+    return ManifestPlan(steps)
+
+
+def execute_plan(
+    plan: ManifestPlan, ctx: OperationContext, max_workers: int = 4
+) -> bool:
+    """Run a plan stage by stage, parallelizing within each stage.
+
+    Stops after the first stage with a failed operation.
+    """
+
+    def run(step: PlanStep) -> bool:
+        return execute_operation(step.config, ctx)
+
+    for stage in plan.stages:
+        if len(stage) == 1:
+            results = [run(stage[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(stage))) as pool:
+                results = list(pool.map(run, stage))
+
+        failed = [step for step, ok in zip(stage, results) if not ok]
+        for step in failed:
+            logger.error(
+                "Manifest operation failed",
+                extra={
+                    "operation_num": step.index,
+                    "type": step.op_type,
+                    "service": ctx.service,
+                },
+            )
+        if failed:
+            return False
+
+    return True
+
+
+def preview_plan(plan: ManifestPlan) -> list[StepPreview]:
+    """Predict, without side effects, which steps would run or be skipped.
+
+    Steps that touch paths written by earlier operations (including their
+    condition) can only be decided at run time; they are previewed against
+    the current state and reported as deferred when that predicts a skip.
+    """
+    previews = []
+    written: set[Path] = set()
+
+    for step in plan.steps:
+        if step.operation is None:
+            preview = StepPreview(step, True, "unknown operation type (would fail)")
+        elif paths_overlap(written, step.reads | step.writes):
+            would_run, detail = step.operation.preview()
+            if not would_run:
+                detail = "depends on earlier operations"
+            preview = StepPreview(step, True, detail, deferred=True)
+        elif not step.operation.should_execute():
+            preview = StepPreview(step, False, "condition not met")
+        else:
+            preview = StepPreview(step, *step.operation.preview())
+        previews.append(preview)
+        written |= step.writes
+
+    return previews
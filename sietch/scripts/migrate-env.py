@@ -16,12 +16,12 @@ Detection logic:
 """
 
 import argparse
-import re
 import shutil
 import sys
 from datetime import datetime
 from pathlib import Path
 
+from env_files import parse_env_file
 from logging_config import get_logger, setup_logging
 
 logger = get_logger(__name__)
@@ -239,24 +239,13 @@ class EnvMigrator:
         variables: dict[str, tuple[str, list[str]]] = {}
         current_comments: list[str] = []
 
-        with open(path, "r") as f:
-            for line in f:
-                line = line.rstrip("\n\r")
-
-                # Empty line or comment
-                if not line or line.startswith("#"):
-                    current_comments.append(line)
-                    continue
-
-                # Variable assignment
-                match = re.match(r"^([A-Z][A-Z0-9_]*)=(.*)$", line)
-                if match:
-                    var_name, value = match.groups()
-                    variables[var_name] = (value, current_comments.copy())
-                    current_comments = []
-                else:
-                    # Keep non-matching lines as comments
-                    current_comments.append(line)
+        for line in parse_env_file(path):
+            if line.kind == "var":
+                variables[line.name] = (line.raw, current_comments.copy())
+                current_comments = []
+            else:
+                # Empty lines, comments and non-assignments are kept as comments
+                current_comments.append(line.text if line.kind == "comment" else "")
 
         return variables
 
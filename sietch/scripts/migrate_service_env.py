@@ -13,13 +13,14 @@ logger = get_logger(__name__)
 
 import argparse
 import json
-import re
 import shutil
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Callable
 
+from env_files import parse_env_file
+
 # Migration registry: service -> list of migrations
 # Each migration has: version, description, transform function
 SERVICE_MIGRATIONS: dict[str, list[dict]] = {
@@ -234,23 +235,13 @@ class ServiceEnvMigrator:
         line_type: 'comment', 'empty', 'var'
         """
         lines = []
-        if not path.exists():
-            return lines
-
-        with open(path) as f:
-            for line in f:
-                line = line.rstrip("\n\r")
-                if not line:
-                    lines.append(("empty", None, ""))
-                elif line.startswith("#"):
-                    lines.append(("comment", None, line))
-                else:
-                    match = re.match(r"^([A-Z][A-Z0-9_]*)=(.*)$", line)
-                    if match:
-                        var_name, value = match.groups()
-                        lines.append(("var", var_name, value))
-                    else:
-                        lines.append(("comment", None, line))
+        for line in parse_env_file(path):
+            if line.kind == "var":
+                lines.append(("var", line.name, line.raw))
+            elif line.kind == "empty":
+                lines.append(("empty", None, ""))
+            else:
+                lines.append(("comment", None, line.text))
         return lines
 
     def write_env_file(self, path: Path, lines: list[tuple[str, str | None, str]]) -> None:
@@ -5,21 +5,36 @@ operations.py - Declarative operations for OnRamp scaffold manifests
 Implements operation handlers for scaffold.yml manifests:
 - mkdir: Create directories
 - touch: Create empty file
-- generate_rsa_key: Generate RSA keypair via OpenSSL
+- generate_rsa_key: Generate RSA keypair (cryptography, or OpenSSL fallback)
 - generate_random: Generate random bytes (base64/hex)
-- download: Download file from URL
+- download: Download file from URL (cached, see download_cache.py)
 - delete: Delete file
 - chown: Change file ownership
 - chmod: Change file permissions
+
+chown, chmod and mkdir modes are applied natively (os.scandir + os.chown /
+os.chmod, never following symlinks) and entries that already have the
+requested owner or mode are skipped, so no-op rebuilds write no metadata.
 """
 
+import base64
+import functools
+import grp
 import os
+import pwd
+import re
+import secrets
 import shutil
+import stat
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from download_cache import DownloadCache, DownloadError
 from logging_config import get_logger
 
 if TYPE_CHECKING:
@@ -27,6 +42,30 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# Generate RSA keys in-process when cryptography is installed
+try:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    CRYPTOGRAPHY_AVAILABLE = False
+
+
+@dataclass
+class MetadataCounts:
+    """Owner/mode updates applied vs. skipped across a manifest."""
+
+    changed: int = 0
+    skipped: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, changed: int = 0, skipped: int = 0) -> None:
+        """Add counts (operations in a plan stage may run concurrently)."""
+        with self._lock:
+            self.changed += changed
+            self.skipped += skipped
+
 
 @dataclass
 class OperationContext:
@@ -38,19 +77,141 @@ class OperationContext:
     etc_dir: Path
     services_enabled: Path
     command_executor: "CommandExecutor | None" = field(default=None)
+    download_cache: DownloadCache | None = field(default=None)
+    metadata: MetadataCounts = field(default_factory=MetadataCounts)
 
     def __post_init__(self):
-        """Initialize command executor if not provided."""
+        """Initialize command executor and download cache if not provided."""
         if self.command_executor is None:
             from adapters.subprocess_cmd import SubprocessCommandExecutor
 
             self.command_executor = SubprocessCommandExecutor()
+        if self.download_cache is None:
+            self.download_cache = DownloadCache(self.etc_dir / ".cache" / "downloads")
 
     def resolve_path(self, path: str) -> Path:
         """Resolve a path relative to etc/<service>/."""
         return self.etc_dir / self.service / path
 
 
+def dir_has_entries(path: Path) -> bool | None:
+    """Check whether a directory has any entry, reading at most one.
+
+    Returns None if path is not an existing directory.
+    """
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def walk_tree(path: Path, recursive: bool) -> Iterator[tuple[str, os.stat_result]]:
+    """Yield (path, lstat) for path and, if recursive, everything below it.
+
+    Uses os.scandir and never follows symlinks, like `chown -R`/`chmod -R`.
+    """
+    root = str(path)
+    root_stat = os.lstat(root)
+    yield root, root_stat
+    if not recursive or not stat.S_ISDIR(root_stat.st_mode):
+        return
+
+    pending = [root]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            for entry in it:
+                yield entry.path, entry.stat(follow_symlinks=False)
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+
+
+@functools.cache
+def _process_umask() -> int:
+    """Return the process umask (applied to symbolic modes without a who)."""
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+# Permission bits per "who" for symbolic modes (u/g/o; a = all three)
+_SYMBOLIC_BITS = {
+    "u": {"r": 0o400, "w": 0o200, "x": 0o100, "s": 0o4000},
+    "g": {"r": 0o040, "w": 0o020, "x": 0o010, "s": 0o2000},
+    "o": {"r": 0o004, "w": 0o002, "x": 0o001, "t": 0o1000},
+}
+_SYMBOLIC_CLAUSE = re.compile(r"([ugoa]*)((?:[-+=][rwxXst]*)+)")
+_SYMBOLIC_ACTION = re.compile(r"([-+=])([rwxXst]*)")
+
+
+def parse_mode(mode: str | int) -> Callable[[int], int]:
+    """Parse an octal ("0755") or symbolic ("g+s", "u+rwX,o-w") mode.
+
+    Returns a function mapping an entry's current st_mode to the permission
+    bits it should have.
+
+    Raises:
+        ValueError: If the mode cannot be parsed
+    """
+    mode = str(mode).strip()
+    if re.fullmatch(r"[0-7]{1,4}", mode):
+        bits = int(mode, 8)
+        return lambda st_mode: bits
+
+    clauses = []
+    for clause in mode.split(","):
+        match = _SYMBOLIC_CLAUSE.fullmatch(clause)
+        if not match:
+            raise ValueError(f"Invalid mode: {mode!r}")
+        who = match.group(1).replace("a", "ugo")
+        clauses.append((who, _SYMBOLIC_ACTION.findall(match.group(2))))
+
+    def apply(st_mode: int) -> int:
+        current = stat.S_IMODE(st_mode)
+        is_dir = stat.S_ISDIR(st_mode)
+        for who, actions in clauses:
+            targets = set(who or "ugo")
+            for action, perms in actions:
+                bits = 0
+                for target in targets:
+                    table = _SYMBOLIC_BITS[target]
+                    for perm in perms:
+                        if perm == "X":
+                            if is_dir or current & 0o111:
+                                bits |= table["x"]
+                        else:
+                            bits |= table.get(perm, 0)
+                if not who:
+                    bits &= ~_process_umask()
+                if action == "+":
+                    current |= bits
+                elif action == "-":
+                    current &= ~bits
+                else:
+                    cleared = 0
+                    for target in targets:
+                        cleared |= sum(_SYMBOLIC_BITS[target].values())
+                    current = (current & ~cleared) | bits
+        return current
+
+    return apply
+
+
+def resolve_owner(user: str, group: str) -> tuple[int, int]:
+    """Resolve user/group names or numeric ids (-1 = leave unchanged).
+
+    Raises:
+        KeyError: If a user or group name does not exist
+    """
+    uid = -1
+    if user:
+        uid = int(user) if user.isdigit() else pwd.getpwnam(user).pw_uid
+    gid = -1
+    if group:
+        gid = int(group) if group.isdigit() else grp.getgrnam(group).gr_gid
+    return uid, gid
+
+
 class Condition:
     """Evaluates conditional execution logic."""
 
@@ -70,13 +231,9 @@ class Condition:
         elif cond_type == "dir_empty":
             # Non-existent directory is NOT empty - it doesn't exist
             # Operations using this condition likely assume the directory exists
-            if not path.exists() or not path.is_dir():
-                return False
-            return len(list(path.iterdir())) == 0
+            return dir_has_entries(path) is False
         elif cond_type == "dir_not_empty":
-            if not path.exists() or not path.is_dir():
-                return False
-            return len(list(path.iterdir())) > 0
+            return dir_has_entries(path) is True
         else:
             logger.warning("Unknown condition type", extra={"type": cond_type})
             return False
@@ -85,6 +242,11 @@ class Condition:
 class Operation(ABC):
     """Base class for scaffold operations."""
 
+    # Config keys naming the paths this operation writes. The manifest
+    # planner orders operations whose paths overlap and runs the rest in
+    # parallel.
+    write_keys: tuple[str, ...] = ("path",)
+
     def __init__(self, config: dict[str, Any], ctx: OperationContext):
         self.config = config
         self.ctx = ctx
@@ -105,6 +267,34 @@ class Operation(ABC):
         """Resolve output path relative to etc/<service>/."""
         return self.ctx.resolve_path(path)
 
+    def declared_paths(self) -> tuple[set[Path], set[Path]]:
+        """Return (reads, writes): the condition path and the written paths."""
+        writes = {
+            Path(os.path.normpath(self.resolve_path(self.config[key])))
+            for key in self.write_keys
+            if self.config.get(key)
+        }
+        reads = set()
+        if "condition" in self.config:
+            condition_path = self.resolve_path(self.config["condition"].get("path", ""))
+            reads.add(Path(os.path.normpath(condition_path)))
+        return reads, writes
+
+    def preview(self) -> tuple[bool, str]:
+        """Predict what execute() would do, without changing anything.
+
+        Returns:
+            (would_run, detail) - whether execute() would do any work and a
+            short description of it (or of why it would be skipped)
+        """
+        return True, "run"
+
+    def _preview_existing(self, key: str, default: bool, action: str) -> tuple[bool, str]:
+        """Preview for operations that honour skip_if_exists on config[key]."""
+        if self.config.get("skip_if_exists", default) and self.resolve_path(self.config[key]).exists():
+            return False, "output exists"
+        return True, action
+
     def expand_env(self, value: str) -> str:
         """Expand environment variables in a string."""
         return os.path.expandvars(value)
@@ -113,13 +303,25 @@ class Operation(ABC):
 class MkdirOp(Operation):
     """Create directory."""
 
+    def preview(self) -> tuple[bool, str]:
+        path = self.resolve_path(self.config["path"])
+        if not path.is_dir():
+            return True, "create"
+        if stat.S_IMODE(path.stat().st_mode) != int(self.config.get("mode", "0755"), 8):
+            return True, "set mode"
+        return False, "exists"
+
     def execute(self) -> bool:
         path = self.resolve_path(self.config["path"])
         mode = int(self.config.get("mode", "0755"), 8)
 
         try:
             path.mkdir(parents=True, exist_ok=True)
-            path.chmod(mode)
+            if stat.S_IMODE(path.stat().st_mode) != mode:
+                path.chmod(mode)
+                self.ctx.metadata.add(changed=1)
+            else:
+                self.ctx.metadata.add(skipped=1)
             logger.info("Created directory", extra={"path": str(path), "mode": oct(mode)})
             return True
         except Exception as e:
@@ -128,7 +330,12 @@ class MkdirOp(Operation):
 
 
 class GenerateRsaKeyOp(Operation):
-    """Generate RSA keypair using OpenSSL."""
+    """Generate RSA keypair in-process, falling back to OpenSSL."""
+
+    write_keys = ("output", "public_key")
+
+    def preview(self) -> tuple[bool, str]:
+        return self._preview_existing("output", True, f"generate {self.config.get('bits', 2048)}-bit key")
 
     def execute(self) -> bool:
         private_path = self.resolve_path(self.config["output"])
@@ -146,40 +353,21 @@ class GenerateRsaKeyOp(Operation):
             # Ensure parent directory exists
             private_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Generate private key
-            executor = self.ctx.command_executor
-            result = executor.run(
-                [
-                    "openssl",
-                    "genpkey",
-                    "-algorithm",
-                    "RSA",
-                    "-pkeyopt",
-                    f"rsa_keygen_bits:{bits}",
-                ],
-                capture_output=True,
-                check=True,
-            )
-            if result.returncode != 0:
-                logger.error("OpenSSL key generation failed", extra={"stderr": result.stderr, "path": str(private_path)})
-                return False
+            if CRYPTOGRAPHY_AVAILABLE:
+                private_pem, public_pem = self._generate_native(bits)
+            else:
+                keys = self._generate_openssl(bits, bool(public_path))
+                if keys is None:
+                    return False
+                private_pem, public_pem = keys
 
-            private_path.write_text(result.stdout)
+            private_path.write_text(private_pem)
             private_path.chmod(0o644)
             logger.info("Generated RSA private key", extra={"path": str(private_path), "bits": bits})
 
-            # Extract public key if requested
             if public_path:
-                result = executor.run(
-                    ["openssl", "rsa", "-pubout"],
-                    input=private_path.read_text(),
-                    capture_output=True,
-                    check=True,
-                )
-                if result.returncode != 0:
-                    logger.error("OpenSSL public key extraction failed", extra={"stderr": result.stderr})
-                    return False
-                public_path.write_text(result.stdout)
+                public_path.parent.mkdir(parents=True, exist_ok=True)
+                public_path.write_text(public_pem)
                 public_path.chmod(0o644)
                 logger.info("Extracted RSA public key", extra={"path": str(public_path)})
 
@@ -188,13 +376,70 @@ class GenerateRsaKeyOp(Operation):
             logger.error(f"Failed to generate RSA key: {e}", extra={"path": str(private_path)}, exc_info=True)
             return False
 
+    def _generate_native(self, bits: int) -> tuple[str, str]:
+        """Generate a PKCS#8 private key and SPKI public key with cryptography."""
+        key = rsa.generate_private_key(public_exponent=65537, key_size=bits)
+        private_pem = key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        public_pem = key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        return private_pem.decode(), public_pem.decode()
+
+    def _generate_openssl(self, bits: int, with_public: bool) -> tuple[str, str] | None:
+        """Generate the keypair with the openssl CLI (same PEM formats)."""
+        executor = self.ctx.command_executor
+        result = executor.run(
+            [
+                "openssl",
+                "genpkey",
+                "-algorithm",
+                "RSA",
+                "-pkeyopt",
+                f"rsa_keygen_bits:{bits}",
+            ],
+            capture_output=True,
+            check=True,
+        )
+        if result.returncode != 0:
+            logger.error("OpenSSL key generation failed", extra={"stderr": result.stderr})
+            return None
+        private_pem = result.stdout
+
+        if not with_public:
+            return private_pem, ""
+
+        result = executor.run(
+            ["openssl", "rsa", "-pubout"],
+            input=private_pem,
+            capture_output=True,
+            check=True,
+        )
+        if result.returncode != 0:
+            logger.error("OpenSSL public key extraction failed", extra={"stderr": result.stderr})
+            return None
+        return private_pem, result.stdout
+
 
 class GenerateRandomOp(Operation):
-    """Generate random bytes using OpenSSL."""
+    """Generate random bytes with the secrets module.
+
+    Output matches `openssl rand -base64|-hex`: base64 wrapped at 64
+    characters per line, or lowercase hex, each with a trailing newline.
+    """
+
+    write_keys = ("output",)
+
+    def preview(self) -> tuple[bool, str]:
+        return self._preview_existing("output", True, f"generate {self.config.get('bytes', 32)} bytes")
 
     def execute(self) -> bool:
         output_path = self.resolve_path(self.config["output"])
-        num_bytes = self.config.get("bytes", 32)
+        num_bytes = int(self.config.get("bytes", 32))
         encoding = self.config.get("encoding", "base64")
         skip_if_exists = self.config.get("skip_if_exists", True)
 
@@ -202,20 +447,13 @@ class GenerateRandomOp(Operation):
             logger.debug("Skipped existing random data file", extra={"path": str(output_path)})
             return True
 
+        if encoding not in ("base64", "hex"):
+            logger.error("Unsupported random data encoding", extra={"encoding": encoding})
+            return False
+
         try:
             output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            executor = self.ctx.command_executor
-            result = executor.run(
-                ["openssl", "rand", f"-{encoding}", str(num_bytes)],
-                capture_output=True,
-                check=True,
-            )
-            if result.returncode != 0:
-                logger.error("OpenSSL random generation failed", extra={"stderr": result.stderr})
-                return False
-
-            output_path.write_text(result.stdout)
+            output_path.write_text(self.encode(secrets.token_bytes(num_bytes), encoding))
             output_path.chmod(0o644)
             logger.info("Generated random data", extra={"path": str(output_path), "bytes": num_bytes, "encoding": encoding})
             return True
@@ -223,9 +461,37 @@ class GenerateRandomOp(Operation):
             logger.error(f"Failed to generate random data: {e}", extra={"path": str(output_path)}, exc_info=True)
             return False
 
+    @staticmethod
+    def encode(data: bytes, encoding: str) -> str:
+        """Encode random bytes the way `openssl rand` prints them."""
+        if encoding == "hex":
+            return data.hex() + "\n"
+        encoded = base64.b64encode(data).decode()
+        return "".join(encoded[i : i + 64] + "\n" for i in range(0, len(encoded), 64))
+
 
 class DownloadOp(Operation):
-    """Download file from URL."""
+    """Download file from URL through the shared download cache."""
+
+    write_keys = ("output",)
+
+    def preview(self) -> tuple[bool, str]:
+        would_run, detail = self._preview_existing("output", False, "")
+        if not would_run:
+            return would_run, detail
+        entry = self.ctx.download_cache.lookup(self.config["url"])
+        if entry is None:
+            return True, f"fetch {self.config['url']}"
+        sha256 = self.config.get("sha256")
+        if sha256 and entry.sha256 == sha256.lower():
+            return True, "install from cache (pinned)"
+        return True, f"revalidate cached copy ({entry.size} bytes)"
+
+    def needs_fetch(self) -> bool:
+        """Check whether execute() would fetch (condition met, not skipped)."""
+        if self.config.get("skip_if_exists", False) and self.resolve_path(self.config["output"]).exists():
+            return False
+        return self.should_execute()
 
     def execute(self) -> bool:
         url = self.config["url"]
@@ -238,25 +504,19 @@ class DownloadOp(Operation):
             return True
 
         try:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Use wget for downloads (more reliable with redirects)
-            executor = self.ctx.command_executor
-            result = executor.run(
-                ["wget", "-q", "-O", str(output_path), url],
-                capture_output=True,
-                check=True,
-            )
-            if result.returncode != 0:
-                logger.error("Download failed", extra={"url": url, "stderr": result.stderr or "unknown error"})
-                return False
-
-            logger.info("Downloaded file", extra={"url": url, "path": str(output_path)})
+            written = self.ctx.download_cache.install(url, output_path, self.config.get("sha256"))
+            if written:
+                logger.info("Downloaded file", extra={"url": url, "path": str(output_path)})
+            else:
+                logger.debug("Download unchanged", extra={"url": url, "path": str(output_path)})
 
-            if mode:
+            if mode and stat.S_IMODE(output_path.stat().st_mode) != int(mode, 8):
                 output_path.chmod(int(mode, 8))
 
             return True
+        except DownloadError as e:
+            logger.error("Download failed", extra={"url": url, "stderr": str(e)})
+            return False
         except Exception as e:
             logger.error(f"Failed to download file: {e}", extra={"url": url}, exc_info=True)
             return False
@@ -265,6 +525,11 @@ class DownloadOp(Operation):
 class DeleteOp(Operation):
     """Delete file or directory."""
 
+    def preview(self) -> tuple[bool, str]:
+        if not self.resolve_path(self.config["path"]).exists():
+            return False, "path not found"
+        return True, "delete"
+
     def execute(self) -> bool:
         path = self.resolve_path(self.config["path"])
 
@@ -285,47 +550,98 @@ class DeleteOp(Operation):
             return False
 
 
+def _preview_walk(path: Path, recursive: bool, needs_change: Callable[[os.stat_result], bool]) -> tuple[bool, str]:
+    """Preview a chown/chmod by counting entries that would change."""
+    if not path.exists():
+        return False, "path not found"
+    total = pending = 0
+    for _, st in walk_tree(path, recursive):
+        total += 1
+        pending += needs_change(st)
+    if not pending:
+        return False, f"{total} entries already match"
+    return True, f"{pending} of {total} entries"
+
+
 class ChownOp(Operation):
     """Change file/directory ownership."""
 
+    def preview(self) -> tuple[bool, str]:
+        try:
+            user = self.expand_env(self.config.get("user", ""))
+            uid, gid = resolve_owner(user, self.expand_env(self.config.get("group", "")))
+        except (KeyError, ValueError):
+            return False, "unknown owner"
+        return _preview_walk(
+            self.resolve_path(self.config["path"]),
+            self.config.get("recursive", False),
+            lambda st: not self._matches(st, uid, gid),
+        )
+
+    @staticmethod
+    def _matches(st: os.stat_result, uid: int, gid: int) -> bool:
+        return (uid == -1 or st.st_uid == uid) and (gid == -1 or st.st_gid == gid)
+
     def execute(self) -> bool:
         path = self.resolve_path(self.config["path"])
         user = self.expand_env(self.config.get("user", ""))
         group = self.expand_env(self.config.get("group", ""))
         recursive = self.config.get("recursive", False)
+        ownership = f"{user}:{group}" if group else user
 
         if not path.exists():
             logger.debug("Skipped chown - path not found", extra={"path": str(path)})
             return True
 
         try:
-            # Build chown command
-            ownership = f"{user}:{group}" if group else user
-            cmd = ["chown"]
-            if recursive:
-                cmd.append("-R")
-            cmd.extend([ownership, str(path)])
-
-            executor = self.ctx.command_executor
-            result = executor.run(cmd, capture_output=True, check=True)
-            if result.returncode != 0:
-                # chown may fail in containers - treat as warning
-                logger.warning(
-                    "chown failed (may be expected in container)",
-                    extra={"path": str(path), "ownership": ownership, "stderr": result.stderr}
-                )
-                return True
-
-            logger.info("Changed ownership", extra={"path": str(path), "ownership": ownership})
+            uid, gid = resolve_owner(user, group)
+        except (KeyError, ValueError) as e:
+            # Unknown names may be expected in container - treat as warning
+            logger.warning(
+                f"chown skipped, unknown owner: {e}",
+                extra={"path": str(path), "ownership": ownership},
+            )
             return True
-        except Exception as e:
-            logger.error(f"Failed to change ownership: {e}", extra={"path": str(path)}, exc_info=True)
-            return False
+
+        changed = skipped = 0
+        try:
+            for entry_path, st in walk_tree(path, recursive):
+                if self._matches(st, uid, gid):
+                    skipped += 1
+                    continue
+                os.chown(entry_path, uid, gid, follow_symlinks=False)
+                changed += 1
+        except OSError as e:
+            # chown may fail in containers - treat as warning
+            logger.warning(
+                "chown failed (may be expected in container)",
+                extra={"path": str(path), "ownership": ownership, "stderr": str(e)},
+            )
+            return True
+        finally:
+            self.ctx.metadata.add(changed, skipped)
+
+        logger.info(
+            "Changed ownership",
+            extra={"path": str(path), "ownership": ownership, "changed": changed, "skipped": skipped},
+        )
+        return True
 
 
 class ChmodOp(Operation):
     """Change file/directory permissions."""
 
+    def preview(self) -> tuple[bool, str]:
+        try:
+            target_mode = parse_mode(self.config["mode"])
+        except ValueError:
+            return True, "invalid mode (would fail)"
+        return _preview_walk(
+            self.resolve_path(self.config["path"]),
+            self.config.get("recursive", False),
+            lambda st: not stat.S_ISLNK(st.st_mode) and target_mode(st.st_mode) != stat.S_IMODE(st.st_mode),
+        )
+
     def execute(self) -> bool:
         path = self.resolve_path(self.config["path"])
         mode = self.config["mode"]
@@ -336,27 +652,42 @@ class ChmodOp(Operation):
             return True
 
         try:
-            cmd = ["chmod"]
-            if recursive:
-                cmd.append("-R")
-            cmd.extend([mode, str(path)])
-
-            executor = self.ctx.command_executor
-            result = executor.run(cmd, capture_output=True, check=True)
-            if result.returncode != 0:
-                logger.error("chmod failed", extra={"path": str(path), "mode": mode, "stderr": result.stderr})
-                return False
-
-            logger.info("Changed permissions", extra={"path": str(path), "mode": mode})
-            return True
-        except Exception as e:
-            logger.error(f"Failed to change permissions: {e}", extra={"path": str(path)}, exc_info=True)
+            target_mode = parse_mode(mode)
+        except ValueError as e:
+            logger.error(f"chmod failed: {e}", extra={"path": str(path), "mode": mode})
             return False
 
+        changed = skipped = 0
+        try:
+            for entry_path, st in walk_tree(path, recursive):
+                # Symlink permissions are meaningless; chmod -R skips them too
+                if stat.S_ISLNK(st.st_mode):
+                    continue
+                new_mode = target_mode(st.st_mode)
+                if new_mode == stat.S_IMODE(st.st_mode):
+                    skipped += 1
+                    continue
+                os.chmod(entry_path, new_mode)
+                changed += 1
+        except OSError as e:
+            logger.error("chmod failed", extra={"path": str(path), "mode": mode, "stderr": str(e)})
+            return False
+        finally:
+            self.ctx.metadata.add(changed, skipped)
+
+        logger.info(
+            "Changed permissions",
+            extra={"path": str(path), "mode": mode, "changed": changed, "skipped": skipped},
+        )
+        return True
+
 
 class TouchOp(Operation):
     """Create empty file (like touch command)."""
 
+    def preview(self) -> tuple[bool, str]:
+        return self._preview_existing("path", True, "create")
+
     def execute(self) -> bool:
         path = self.resolve_path(self.config["path"])
         skip_if_exists = self.config.get("skip_if_exists", True)
@@ -389,6 +720,39 @@ OPERATIONS: dict[str, type[Operation]] = {
 }
 
 
+def prefetch_downloads(operations: list[dict[str, Any]], ctx: OperationContext, max_workers: int = 4) -> int:
+    """Fetch a manifest's downloads into the cache in parallel.
+
+    Only downloads whose condition currently holds are prefetched; the
+    ordered pass then installs them from the cache (and fetches any whose
+    condition only became true along the way). Failures are left for the
+    ordered pass to report.
+
+    Returns:
+        Number of URLs prefetched
+    """
+    urls: dict[str, str | None] = {}
+    for config in operations:
+        if config.get("type") == "download" and DownloadOp(config, ctx).needs_fetch():
+            urls.setdefault(config["url"], config.get("sha256"))
+
+    # A single download gains nothing from a pool
+    if len(urls) < 2:
+        return 0
+
+    def fetch(item: tuple[str, str | None]) -> None:
+        try:
+            ctx.download_cache.fetch(*item)
+        except DownloadError as e:
+            logger.debug(f"Prefetch failed: {e}", extra={"url": item[0]})
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        list(pool.map(fetch, urls.items()))
+
+    logger.debug("Prefetched downloads", extra={"service": ctx.service, "count": len(urls)})
+    return len(urls)
+
+
 def execute_operation(config: dict[str, Any], ctx: OperationContext) -> bool:
     """Execute a single operation from manifest config."""
     op_type = config.get("type", "")
@@ -1,7 +1,7 @@
 """Port interfaces (Protocols) for dependency injection."""
 
-from ports.http import HttpClient
+from ports.http import AsyncHttpClient, HttpClient
 from ports.command import CommandExecutor, CommandResult
-from ports.docker import DockerExecutor
+from ports.docker import ContainerLister, DockerExecutor
 
-__all__ = ["HttpClient", "CommandExecutor", "CommandResult", "DockerExecutor"]
+__all__ = ["HttpClient", "AsyncHttpClient", "CommandExecutor", "CommandResult", "DockerExecutor", "ContainerLister"]
@@ -23,3 +23,19 @@ class DockerExecutor(Protocol):
             Tuple of (returncode, stdout, stderr)
         """
         ...
+
+
+class ContainerLister(Protocol):
+    """Protocol for listing containers through the Docker Engine API."""
+
+    def list_containers(self, all: bool = True) -> list[dict]:
+        """List containers in a single API call.
+
+        Args:
+            all: Include stopped containers
+
+        Returns:
+            Container summaries as returned by GET /containers/json
+            (Names, State, Status, Labels, and Health on newer engines)
+        """
+        ...
@@ -27,3 +27,44 @@ class HttpClient(Protocol):
             Tuple of (status_code, response_body)
         """
         ...
+
+    def request_with_headers(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        data: bytes | None = None,
+        timeout: float = 30,
+    ) -> tuple[int, dict[str, str], bytes]:
+        """Make HTTP request, also returning the response headers.
+
+        Returns:
+            Tuple of (status_code, response_headers, response_body)
+        """
+        ...
+
+
+class AsyncHttpClient(Protocol):
+    """Protocol for HTTP operations from asyncio code."""
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        data: bytes | None = None,
+        timeout: float = 30,
+    ) -> tuple[int, bytes]:
+        """Make HTTP request without blocking the event loop.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE, etc.)
+            url: Full URL to request
+            headers: Optional request headers
+            data: Optional request body
+            timeout: Request timeout in seconds
+
+        Returns:
+            Tuple of (status_code, response_body)
+        """
+        ...
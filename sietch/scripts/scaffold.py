@@ -27,15 +27,26 @@ Output mapping:
 import argparse
 import fnmatch
 import os
-import re
 import secrets
 import shutil
 import string
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from compose_model import ComposeModel
 from logging_config import get_logger, setup_logging
+from scaffold_stamps import STALE, BuildStamps, Stamp, hash_bytes, hash_env
+from scaffold_templates import (
+    Variable,
+    compile_template,
+    find_empty_assignments,
+    is_password_var,
+)
 
 if TYPE_CHECKING:
     from ports.command import CommandExecutor
@@ -83,7 +94,8 @@ except ImportError:
 
 # Import operations module for manifest execution
 try:
-    from operations import OperationContext, execute_operation
+    from manifest_plan import StepPreview, compile_plan, execute_plan, preview_plan
+    from operations import OperationContext, prefetch_downloads
 
     OPERATIONS_AVAILABLE = True
 except ImportError:
@@ -98,6 +110,21 @@ IGNORE_PATTERNS = [
 ]
 
 
+@dataclass
+class ScaffoldTree:
+    """Classified contents of one services-scaffold/<service>/ directory."""
+
+    templates: list[Path] = field(default_factory=list)
+    statics: list[Path] = field(default_factory=list)
+    ignored: list[Path] = field(default_factory=list)
+    manifest: Path | None = None
+    message: Path | None = None
+
+    def is_empty(self) -> bool:
+        """True when there is nothing to render, copy or execute."""
+        return not (self.templates or self.statics or self.manifest)
+
+
 class Scaffolder:
     """Handles scaffolding operations for services."""
 
@@ -114,8 +141,18 @@ class Scaffolder:
         self.etc_dir = self.base_dir / "etc"
         self.force = force
 
-        # Track created files/directories for rollback on failure
-        self._created_files: list[Path] = []
+        # Content-hash stamps of generated files for incremental rebuilds
+        self.stamps = BuildStamps(self.etc_dir / ".scaffold_stamps.json", self.base_dir)
+
+        # Parsed service/override compose files (bind mounts for etc/ volumes)
+        self.compose = ComposeModel(self.base_dir)
+
+        # Scaffold directory contents, discovered once per service
+        self._scaffold_trees: dict[str, ScaffoldTree] = {}
+
+        # Track created files/directories for rollback on failure.
+        # Tracking is per-thread so parallel builds roll back independently.
+        self._local = threading.local()
 
         # Use injected executor or create default
         if executor is not None:
@@ -125,6 +162,22 @@ class Scaffolder:
 
             self._executor = SubprocessCommandExecutor()
 
+    @property
+    def _created_files(self) -> list[Path]:
+        """Files/directories created by the build running on this thread."""
+        created = getattr(self._local, "created_files", None)
+        if created is None:
+            created = self._local.created_files = []
+        return created
+
+    @property
+    def _pending_stamps(self) -> dict[Path, Stamp]:
+        """Stamps for outputs written by the build running on this thread."""
+        pending = getattr(self._local, "pending_stamps", None)
+        if pending is None:
+            pending = self._local.pending_stamps = {}
+        return pending
+
     def _track_created(self, path: Path) -> None:
         """Track a created file or directory for potential rollback."""
         self._created_files.append(path)
@@ -132,6 +185,63 @@ class Scaffolder:
     def _clear_tracking(self) -> None:
         """Clear the tracking list (after successful build)."""
         self._created_files.clear()
+        self._pending_stamps.clear()
+
+    def _record_stamp(
+        self, dest: Path, source: Path, source_hash: str, env_hash: str = ""
+    ) -> None:
+        """Stamp a written output; committed only if the build succeeds."""
+        try:
+            self._pending_stamps[dest] = self.stamps.make(
+                dest, source, source_hash, env_hash
+            )
+        except OSError as e:
+            logger.debug(f"Could not stamp output: {e}", extra={"path": str(dest)})
+
+    def _commit_stamps(self, service: str) -> None:
+        """Persist stamps of a successful build and report what was written."""
+        written = sorted(
+            (
+                str(dest.relative_to(self.base_dir))
+                if dest.is_relative_to(self.base_dir)
+                else str(dest)
+            )
+            for dest in self._pending_stamps
+        )
+        self.stamps.update(self._pending_stamps)
+        self.stamps.save()
+        if written:
+            logger.info(
+                f"Regenerated {len(written)} file(s): {', '.join(written)}",
+                extra={"service": service, "files": written},
+            )
+        else:
+            logger.info("Scaffold outputs up to date", extra={"service": service})
+
+    def _should_regenerate(
+        self, dest: Path, source_hash: str, env_hash: str = "", secrets: bool = False
+    ) -> bool:
+        """Decide whether an existing output should be rewritten.
+
+        Only outputs previously written by scaffold, left untouched since, and
+        whose source or referenced env values changed are regenerated. Outputs
+        that would get freshly generated secrets are never rewritten, since that
+        would silently rotate passwords a running service already uses.
+        """
+        try:
+            status = self.stamps.status(dest, source_hash, env_hash)
+        except OSError:
+            return False
+        if status != STALE:
+            return False
+        if secrets:
+            logger.warning(
+                "Template changed but output holds generated secrets, not regenerating"
+                " (delete the file to regenerate it)",
+                extra={"path": str(dest)},
+            )
+            return False
+        return True
 
     def rollback(self) -> None:
         """Rollback created files and directories.
@@ -162,6 +272,7 @@ class Scaffolder:
                 )
 
         self._created_files.clear()
+        self._pending_stamps.clear()
 
     def _should_ignore(self, path: Path) -> bool:
         """Check if a file should be ignored (not copied)."""
@@ -171,33 +282,89 @@ class Scaffolder:
                 return True
         return False
 
-    def find_scaffold_files(self, service: str) -> tuple[list[Path], list[Path]]:
-        """Find all template and static files for a service."""
-        service_scaffold = self.scaffold_dir / service
-        if not service_scaffold.exists():
-            return [], []
+    def scan_scaffold(self, service: str) -> ScaffoldTree:
+        """Classify every file in services-scaffold/<service>/ in one walk.
 
-        templates = list(service_scaffold.rglob("*.template"))
+        The result is cached on the instance, so find_scaffold_files(),
+        find_manifest(), has_scaffold() and build() share a single traversal.
+        """
+        tree = self._scaffold_trees.get(service)
+        if tree is None:
+            tree = self._walk_scaffold(self.scaffold_dir / service)
+            self._scaffold_trees[service] = tree
+        return tree
+
+    def invalidate_scaffold_cache(self, service: str | None = None) -> None:
+        """Forget cached scaffold trees (all services if service is None)."""
+        if service is None:
+            self._scaffold_trees.clear()
+        else:
+            self._scaffold_trees.pop(service, None)
+
+    def _walk_scaffold(self, root: Path) -> ScaffoldTree:
+        """Walk a scaffold directory with os.scandir and classify its files."""
+        tree = ScaffoldTree()
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                    continue
+                if not entry.is_file():
+                    continue
 
-        # Static files: everything except templates and ignored patterns
-        statics = [
-            f
-            for f in service_scaffold.rglob("*")
-            if f.is_file() and f.suffix != ".template" and not self._should_ignore(f)
-        ]
+                path = Path(entry.path)
+                if path.suffix == ".template":
+                    tree.templates.append(path)
+                elif directory == root and entry.name == "scaffold.yml":
+                    tree.manifest = path
+                elif directory == root and entry.name == "MESSAGE.txt":
+                    tree.message = path
+                elif self._should_ignore(path):
+                    tree.ignored.append(path)
+                else:
+                    tree.statics.append(path)
+
+        tree.templates.sort()
+        tree.statics.sort()
+        tree.ignored.sort()
+        return tree
 
-        return templates, statics
+    def find_scaffold_files(self, service: str) -> tuple[list[Path], list[Path]]:
+        """Find all template and static files for a service."""
+        tree = self.scan_scaffold(service)
+        return tree.templates, tree.statics
 
     def find_manifest(self, service: str) -> Path | None:
         """Find scaffold.yml manifest for a service."""
-        manifest = self.scaffold_dir / service / "scaffold.yml"
-        return manifest if manifest.exists() else None
+        return self.scan_scaffold(service).manifest
 
     def has_scaffold(self, service: str) -> bool:
         """Check if a service has scaffold files or manifest."""
-        templates, statics = self.find_scaffold_files(service)
-        manifest = self.find_manifest(service)
-        return bool(templates or statics or manifest)
+        return not self.scan_scaffold(service).is_empty()
+
+    def scaffold_overview(self) -> list[dict]:
+        """Summarize the scaffold of every service in services-scaffold/."""
+        overview = []
+        for service in self.list_scaffolds():
+            tree = self.scan_scaffold(service)
+            overview.append(
+                {
+                    "service": service,
+                    "templates": len(tree.templates),
+                    "statics": len(tree.statics),
+                    "has_manifest": tree.manifest is not None,
+                    "has_message": tree.message is not None,
+                }
+            )
+        return overview
 
     def etc_has_content(self, service: str) -> bool:
         """Check if etc/<service>/ directory exists and has content.
@@ -248,20 +415,20 @@ class Scaffolder:
 
     def _is_password_var(self, var_name: str) -> bool:
         """Check if a variable name looks like a password/secret."""
-        password_patterns = (
-            "_PASS",
-            "_PASSWORD",
-            "_SECRET",
-            "_KEY",
-            "_TOKEN",
-            "PASS_",
-            "PASSWORD_",
-            "SECRET_",
-            "KEY_",
-            "TOKEN_",
+        return is_password_var(var_name)
+
+    def _template_variables(self, content: str) -> set[str]:
+        """Return the names of all variables a template references."""
+        return set(compile_template(content).variables)
+
+    def _generates_secrets(self, content: str) -> bool:
+        """Return whether rendering would generate random password values."""
+        return any(
+            variable.sensitive
+            and variable.default is None
+            and not os.environ.get(variable.name)
+            for variable in compile_template(content).references
         )
-        upper_name = var_name.upper()
-        return any(pattern in upper_name for pattern in password_patterns)
 
     def _render_template_string(self, content: str) -> str:
         """
@@ -269,77 +436,73 @@ class Scaffolder:
 
         For password-like variables that are unset, generates secure random values.
         """
-        # Pattern matches ${VAR} or ${VAR:-default} or ${VAR:?error}
-        pattern = re.compile(r"\$\{([A-Z][A-Z0-9_]*)(?::-([^}]*)|:\?([^}]*))?\}")
-
         generated_passwords = {}
 
-        def replace_var(match: re.Match) -> str:
-            var_name = match.group(1)
-            default_value = match.group(2)  # From ${VAR:-default}
-            error_msg = match.group(3)  # From ${VAR:?error}
-
+        def resolve(variable: Variable) -> str:
             # Check environment first
-            env_value = os.environ.get(var_name)
+            env_value = os.environ.get(variable.name)
 
             if env_value is not None and env_value != "":
                 return env_value
 
-            # If there's a default, use it
-            if default_value is not None:
-                return default_value
+            # If there's a default, use it (${VAR:-default})
+            if variable.default is not None:
+                return variable.default
 
             # For password-like variables, generate a secure value
-            if self._is_password_var(var_name):
-                if var_name not in generated_passwords:
-                    generated_passwords[var_name] = self._generate_secure_password()
+            if variable.sensitive:
+                if variable.name not in generated_passwords:
+                    generated_passwords[variable.name] = (
+                        self._generate_secure_password()
+                    )
                     logger.info(
                         "Generated secure value for variable",
-                        extra={"variable": var_name},
+                        extra={"variable": variable.name},
                     )
-                return generated_passwords[var_name]
+                return generated_passwords[variable.name]
 
             # For error syntax ${VAR:?msg}, return empty (user must set it)
-            if error_msg is not None:
+            if variable.error is not None:
                 logger.warning(
                     "Variable not set",
-                    extra={"variable": var_name, "reason": error_msg},
+                    extra={"variable": variable.name, "reason": variable.error},
                 )
                 return ""
 
             # Variable not set and no default - return empty
             return ""
 
-        return pattern.sub(replace_var, content)
+        return compile_template(content).render(resolve)
 
     def _parse_required_vars(self, template_content: str) -> list[str]:
         """Parse '# required: VAR_NAME' comments from template content.
 
         Returns a list of variable names declared as required.
         """
-        required = []
-        for line in template_content.splitlines():
-            match = re.match(r"^#\s*required:\s*(\w+)", line)
-            if match:
-                required.append(match.group(1))
-        return required
-
-    def _check_required_vars(self, dest: Path, required_vars: list[str]) -> None:
-        """Check rendered env file for empty required variables and warn."""
-        if not required_vars or not dest.exists():
-            return
+        return list(compile_template(template_content).required)
 
-        try:
-            content = dest.read_text()
-        except Exception:
+    def _check_required_vars(
+        self, dest: Path, required_vars: list[str], content: str | None = None
+    ) -> None:
+        """Check rendered env content for empty required variables and warn.
+
+        Args:
+            dest: Rendered file (read only when content is not given)
+            required_vars: Variable names declared as required
+            content: Rendered content already in memory
+        """
+        if not required_vars:
             return
 
-        missing = []
-        for var in required_vars:
-            # Match VAR= or VAR= (with only whitespace after =)
-            pattern = re.compile(rf"^{re.escape(var)}\s*=\s*$", re.MULTILINE)
-            if pattern.search(content):
-                missing.append(var)
+        if content is None:
+            try:
+                content = dest.read_text()
+            except Exception:
+                return
+
+        # Match VAR= or VAR= (with only whitespace after =)
+        empty = find_empty_assignments(content)
+        missing = [var for var in required_vars if var in empty]
 
         if missing:
             logger.warning(
@@ -360,13 +523,7 @@ class Scaffolder:
         except ValueError:
             pass
 
-        variable_pattern = re.compile(
-            r"\$\{([A-Z][A-Z0-9_]*)(?::-([^}]*)|:\?([^}]*))?\}"
-        )
-        return any(
-            self._is_password_var(match.group(1))
-            for match in variable_pattern.finditer(template_content)
-        )
+        return compile_template(template_content).sensitive
 
     @staticmethod
     def _write_private_text(dest: Path, content: str) -> None:
@@ -392,26 +549,40 @@ class Scaffolder:
     ) -> bool:
         """Render a template file using Python string substitution.
 
+        Existing outputs are kept unless build stamps show they were written by
+        scaffold, are unmodified, and their template or env inputs changed.
+
         Args:
             source: Template file path
             dest: Output file path
             skip_if_exists: If True, don't overwrite existing files (default: True)
         """
         try:
+            with open(source, "r") as f:
+                template_content = f.read()
+
+            # Parsed once; rendering, stamping and checks share the plan
+            plan = compile_template(template_content)
+            required_vars = list(plan.required)
+            env_hash = hash_env(plan.variables)
+
             # Skip if destination exists (don't overwrite user configs)
-            if skip_if_exists and dest.exists():
+            if (
+                skip_if_exists
+                and dest.exists()
+                and not self._should_regenerate(
+                    dest,
+                    plan.source_hash,
+                    env_hash,
+                    secrets=self._generates_secrets(template_content),
+                )
+            ):
                 logger.debug("Skipped existing file", extra={"path": str(dest)})
                 # Still check required vars on existing files
-                with open(source, "r") as f:
-                    required_vars = self._parse_required_vars(f.read())
                 self._check_required_vars(dest, required_vars)
                 return True
 
             dest.parent.mkdir(parents=True, exist_ok=True)
-            with open(source, "r") as f:
-                template_content = f.read()
-
-            required_vars = self._parse_required_vars(template_content)
             rendered_content = self._render_template_string(template_content)
 
             if self._is_sensitive_output(dest, template_content):
@@ -420,10 +591,11 @@ class Scaffolder:
                 with open(dest, "w") as f:
                     f.write(rendered_content)
 
+            self._record_stamp(dest, source, plan.source_hash, env_hash)
             logger.info(
                 "Rendered template", extra={"source": source.name, "dest": str(dest)}
             )
-            self._check_required_vars(dest, required_vars)
+            self._check_required_vars(dest, required_vars, rendered_content)
             return True
         except Exception as e:
             logger.error(
@@ -434,12 +606,18 @@ class Scaffolder:
             return False
 
     def copy_static(self, source: Path, dest: Path) -> bool:
-        """Copy a static file without modification."""
+        """Copy a static file without modification.
+
+        Existing files are only replaced when build stamps show scaffold wrote
+        them, they are unmodified, and the source file changed.
+        """
         try:
             dest.parent.mkdir(parents=True, exist_ok=True)
+            source_hash = hash_bytes(source.read_bytes())
             # Only copy if dest doesn't exist (no-clobber behavior)
-            if not dest.exists():
+            if not dest.exists() or self._should_regenerate(dest, source_hash):
                 shutil.copy2(source, dest)
+                self._record_stamp(dest, source, source_hash)
                 logger.info(
                     "Copied static file",
                     extra={"source": source.name, "dest": str(dest)},
@@ -458,124 +636,103 @@ class Scaffolder:
     def create_etc_volumes(
         self, service: str, scaffold_statics: list[Path] = None
     ) -> bool:
-        """Create etc/ volume directories/files from service YAML.
+        """Create etc/ volume directories/files from the service's bind mounts.
 
-        Parses the docker-compose YAML to find volume mounts pointing to
-        ./etc/<service>/* and creates the necessary directories or files.
+        Bind mounts come from the compose model (the service YAML plus all
+        enabled overrides, each parsed once). Mounts under ./etc/<service>/
+        are validated, then every missing path is created in a single pass
+        (parents before children), tracking only what was actually created.
 
         Args:
             service: Service name
             scaffold_statics: List of static files from scaffold that will be copied
         """
-        import re
+        if not YAML_AVAILABLE:
+            logger.warning(
+                "pyyaml not installed, skipping etc/ volume creation",
+                extra={"service": service},
+            )
+            return True
 
         # Build set of paths that scaffold will provide (relative to etc/<service>/)
         scaffold_provides = set()
         if scaffold_statics:
             service_scaffold = self.scaffold_dir / service
             for static in scaffold_statics:
-                relative = static.relative_to(service_scaffold)
-                # Convert to what the output path would be
-                scaffold_provides.add(str(relative))
-
-        # Find service YAML (check enabled first, then available)
-        service_yml = self.services_enabled / f"{service}.yml"
-        if not service_yml.exists():
-            service_yml = self.services_available / f"{service}.yml"
-            if not service_yml.exists():
-                # No service YAML, nothing to do
-                return True
+                scaffold_provides.add(static.relative_to(service_scaffold).as_posix())
 
-        try:
-            with open(service_yml, "r") as f:
-                content = f.read()
-        except Exception as e:
-            logger.error(
-                f"Failed to read service YAML: {e}",
-                extra={"file": str(service_yml)},
-                exc_info=True,
-            )
-            return False
+        service_etc = Path(os.path.normpath(self.etc_dir / service))
+        resolved_etc = self.etc_dir.resolve()
 
-        # Pattern to match ./etc/<service>/* volume mounts
-        # Matches: ./etc/service/path or ./etc/service/file.ext
-        # Use [^\s:}]* to match path chars but stop at whitespace, colon, or closing brace
-        pattern = rf"\./etc/{re.escape(service)}[^\s:}}]*"
-        matches = re.findall(pattern, content)
+        # Wanted volume paths -> whether each is a directory
+        wanted: dict[Path, bool] = {}
+        for mount in self.compose.bind_mounts(service):
+            abs_path = mount.resolve(self.base_dir)
+            if abs_path is None:
+                continue
 
-        if not matches:
-            return True
+            # SECURITY: Validate path stays within etc/<service>/
+            if abs_path != service_etc and service_etc not in abs_path.parents:
+                if (
+                    mount.host_path.startswith("./etc/")
+                    and ".." in Path(mount.host_path).parts
+                ):
+                    logger.warning(
+                        "Skipped path traversal attempt",
+                        extra={"path": mount.host_path},
+                    )
+                continue
 
-        logger.debug(
-            "Creating etc/ volumes", extra={"service": service, "count": len(matches)}
-        )
+            remainder = abs_path.relative_to(service_etc).as_posix()
 
-        for match in matches:
-            # Remove everything after : (the container path)
-            volume_path = match.split(":")[0]
+            # Skip if scaffold will provide this file
+            if remainder in scaffold_provides:
+                logger.debug("Skipped - scaffold provides", extra={"path": remainder})
+                continue
 
-            # Convert to absolute path
-            abs_path = self.base_dir / volume_path.lstrip("./")
+            wanted[abs_path] = abs_path == service_etc or self._is_volume_directory(
+                service, remainder, abs_path
+            )
 
-            # SECURITY: Validate path stays within etc/<service>/
-            # Resolve the path to handle any .. traversal attempts
-            try:
-                # For paths that don't exist yet, we need to check the normalized path
-                # Use os.path.normpath to resolve .. without requiring the path to exist
-                normalized = Path(os.path.normpath(abs_path))
+        if not wanted:
+            return True
 
-                # Check it's under the etc directory
-                if not str(normalized).startswith(str(self.etc_dir)):
-                    logger.warning(
-                        "Skipped path traversal attempt", extra={"path": volume_path}
-                    )
-                    continue
+        logger.debug(
+            "Creating etc/ volumes", extra={"service": service, "count": len(wanted)}
+        )
 
-                # For existing paths, also check resolved path (handles symlinks)
-                if abs_path.exists() and not validate_path_within_base(
-                    abs_path, self.etc_dir
-                ):
-                    logger.warning(
-                        "Skipped path escaping via symlink", extra={"path": volume_path}
-                    )
-                    continue
-            except Exception as e:
+        known_dirs: set[Path] = set()
+
+        def ensure_dir(directory: Path) -> None:
+            missing = []
+            while directory not in known_dirs and not directory.is_dir():
+                missing.append(directory)
+                directory = directory.parent
+            for path in reversed(missing):
+                path.mkdir(exist_ok=True)
+                self._track_created(path)
+                logger.info("Created directory", extra={"path": str(path)})
+            known_dirs.update(missing)
+            known_dirs.add(directory)
+
+        # Parents sort before children, so each directory is checked once
+        for abs_path, is_directory in sorted(wanted.items()):
+            # SECURITY: Existing components must not escape etc/ via symlinks
+            if not abs_path.resolve().is_relative_to(resolved_etc):
                 logger.warning(
-                    f"Skipped path validation error: {e}", extra={"path": volume_path}
+                    "Skipped path escaping via symlink",
+                    extra={"path": str(abs_path)},
                 )
                 continue
 
-            # Check if path relative to etc/<service>/ is provided by scaffold
-            relative_to_service = str(abs_path).split(f"/etc/{service}/", 1)
-            if len(relative_to_service) > 1:
-                remainder = relative_to_service[1]
-
-                # Skip if scaffold will provide this file
-                if remainder in scaffold_provides:
-                    logger.debug(
-                        "Skipped - scaffold provides", extra={"path": remainder}
-                    )
-                    continue
-
-                # Determine if this is a file or directory
-                is_directory = self._is_volume_directory(service, remainder, abs_path)
-
-                if is_directory:
-                    abs_path.mkdir(parents=True, exist_ok=True)
-                    self._track_created(abs_path)
-                    logger.info("Created directory", extra={"path": str(abs_path)})
-                else:
-                    # It's a file - create parent dir and touch file
-                    abs_path.parent.mkdir(parents=True, exist_ok=True)
-                    if not abs_path.exists():
-                        abs_path.touch()
-                        self._track_created(abs_path)
-                        logger.info("Created file", extra={"path": str(abs_path)})
-            else:
-                # Just the service directory
-                abs_path.mkdir(parents=True, exist_ok=True)
+            if is_directory:
+                ensure_dir(abs_path)
+            elif not abs_path.exists():
+                # It's a file - create parent dir and touch file
+                ensure_dir(abs_path.parent)
+                abs_path.touch()
                 self._track_created(abs_path)
-                logger.info("Created directory", extra={"path": str(abs_path)})
+                logger.info("Created file", extra={"path": str(abs_path)})
 
         return True
 
@@ -625,8 +782,8 @@ class Scaffolder:
 
     def _display_message(self, service: str) -> None:
         """Display post-enable message if MESSAGE.txt exists."""
-        message_file = self.scaffold_dir / service / "MESSAGE.txt"
-        if message_file.exists():
+        message_file = self.scan_scaffold(service).message
+        if message_file is not None:
             logger.info("=" * 60)
             logger.info(f"POST-ENABLE INSTRUCTIONS FOR {service.upper()}")
             logger.info("=" * 60)
@@ -634,8 +791,48 @@ class Scaffolder:
             logger.info(content.strip())
             logger.info("=" * 60)
 
+    def _operation_context(self, service: str) -> "OperationContext":
+        """Create the context shared by a manifest's operations."""
+        return OperationContext(
+            service=service,
+            base_dir=self.base_dir,
+            scaffold_dir=self.scaffold_dir,
+            etc_dir=self.etc_dir,
+            services_enabled=self.services_enabled,
+            command_executor=self._executor,
+        )
+
+    def _load_manifest(self, manifest_path: Path, service: str) -> dict | None:
+        """Read and validate a scaffold.yml manifest (None on error)."""
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = yaml.safe_load(f)
+        except Exception as e:
+            logger.error(
+                f"Failed to read manifest: {e}",
+                extra={"path": str(manifest_path)},
+                exc_info=True,
+            )
+            return None
+
+        # Validate version
+        version = manifest.get("version", "1")
+        if version != "1":
+            logger.error(
+                "Unsupported manifest version",
+                extra={"version": version, "service": service},
+            )
+            return None
+
+        return manifest
+
     def execute_manifest(self, service: str) -> bool:
-        """Execute operations from scaffold.yml manifest."""
+        """Execute operations from scaffold.yml manifest.
+
+        Operations are compiled into a dependency plan (see manifest_plan.py):
+        operations that touch overlapping paths keep their manifest order,
+        independent ones run in parallel.
+        """
         manifest_path = self.find_manifest(service)
         if not manifest_path:
             return True  # No manifest is not an error
@@ -655,48 +852,88 @@ class Scaffolder:
 
         logger.debug("Executing manifest operations", extra={"service": service})
 
-        try:
-            with open(manifest_path, "r") as f:
-                manifest = yaml.safe_load(f)
-        except Exception as e:
-            logger.error(
-                f"Failed to read manifest: {e}",
-                extra={"path": str(manifest_path)},
-                exc_info=True,
-            )
+        manifest = self._load_manifest(manifest_path, service)
+        if manifest is None:
             return False
 
-        # Validate version
-        version = manifest.get("version", "1")
-        if version != "1":
+        # Create context (share executor with operations)
+        ctx = self._operation_context(service)
+
+        # Execute operations by plan stage, with downloads fetched up front
+        operations = manifest.get("operations", [])
+        prefetch_downloads(operations, ctx)
+        if not execute_plan(compile_plan(operations, ctx), ctx):
+            return False
+
+        if ctx.metadata.changed or ctx.metadata.skipped:
+            logger.info(
+                "Applied ownership and permissions",
+                extra={
+                    "service": service,
+                    "changed": ctx.metadata.changed,
+                    "skipped": ctx.metadata.skipped,
+                },
+            )
+
+        return True
+
+    def plan_manifest(self, service: str) -> "list[StepPreview] | None":
+        """Preview a service's manifest plan without executing it.
+
+        Returns:
+            Step previews in manifest order ([] if there is no manifest),
+            or None if the manifest cannot be read
+        """
+        manifest_path = self.find_manifest(service)
+        if not manifest_path:
+            return []
+
+        if not YAML_AVAILABLE or not OPERATIONS_AVAILABLE:
             logger.error(
-                "Unsupported manifest version",
-                extra={"version": version, "service": service},
+                "pyyaml and the operations module are required to plan manifests",
+                extra={"service": service},
             )
-            return False
+            return None
 
-        # Create context (share executor with operations)
-        ctx = OperationContext(
-            service=service,
-            base_dir=self.base_dir,
-            scaffold_dir=self.scaffold_dir,
-            etc_dir=self.etc_dir,
-            services_enabled=self.services_enabled,
-            command_executor=self._executor,
-        )
+        manifest = self._load_manifest(manifest_path, service)
+        if manifest is None:
+            return None
 
-        # Execute operations in order
-        operations = manifest.get("operations", [])
-        for i, op_config in enumerate(operations, 1):
-            op_type = op_config.get("type", "unknown")
-            if not execute_operation(op_config, ctx):
-                logger.error(
-                    "Manifest operation failed",
-                    extra={"operation_num": i, "type": op_type, "service": service},
+        ctx = self._operation_context(service)
+        return preview_plan(compile_plan(manifest.get("operations", []), ctx))
+
+    def log_plan(self, service: str, previews: "list[StepPreview]") -> None:
+        """Log a manifest plan as printed by `scaffold.py plan`."""
+        if not previews:
+            logger.info("No manifest operations", extra={"service": service})
+            return
+
+        stage_count = max(preview.step.stage for preview in previews) + 1
+        logger.info(
+            f"Manifest plan for {service}: {len(previews)} operation(s) "
+            f"in {stage_count} stage(s)"
+        )
+        for stage in range(stage_count):
+            logger.info(f"Stage {stage + 1}:")
+            for preview in previews:
+                step = preview.step
+                if step.stage != stage:
+                    continue
+                action = "run" if preview.would_run else "skip"
+                if preview.deferred:
+                    action = "run?"
+                after = (
+                    f" (after {', '.join(map(str, sorted(step.depends_on)))})"
+                    if step.depends_on
+                    else ""
+                )
+                logger.info(
+                    f"  [{step.index}] {step.op_type} {step.target} "
+                    f"- {action}: {preview.detail}{after}"
                 )
-                return False
 
-        return True
+        skipped = sum(not preview.would_run for preview in previews)
+        logger.info(f"{len(previews) - skipped} to run, {skipped} skipped")
 
     def build(self, service: str) -> bool:
         """Build scaffold for a service.
@@ -730,7 +967,8 @@ class Scaffolder:
                 skip_etc = True
 
         # Get scaffold files first (needed for volume creation check)
-        templates, statics = self.find_scaffold_files(service)
+        tree = self.scan_scaffold(service)
+        templates, statics = tree.templates, tree.statics
 
         # Phase 0: Create etc/ volume directories from service YAML
         # Pass statics so it knows what scaffold will provide
@@ -739,7 +977,7 @@ class Scaffolder:
             success = False
 
         # Check if we have scaffold files (may have none, just volume creation)
-        if not templates and not statics and not self.find_manifest(service):
+        if tree.is_empty():
             logger.debug("No scaffold templates found", extra={"service": service})
             # Auto-generate minimal .env if none exists (for env_file: directive in YAML)
             if service != "onramp" and self.services_enabled.exists():
@@ -818,7 +1056,8 @@ class Scaffolder:
             )
             self.rollback()
         else:
-            # Success - clear tracking and display message
+            # Success - persist stamps, clear tracking and display message
+            self._commit_stamps(service)
             self._clear_tracking()
             self._display_message(service)
             logger.info(
@@ -850,29 +1089,86 @@ class Scaffolder:
         logger.info("Teardown completed", extra={"service": service})
         return True
 
-    def build_all_enabled(self) -> bool:
-        """Build scaffolds for all enabled services."""
-        success = True
+    def _build_timed(self, service: str) -> tuple[str, bool, float]:
+        """Build a service and return (service, success, elapsed seconds)."""
+        start = time.perf_counter()
+        try:
+            success = self.build(service)
+        except Exception as e:
+            logger.error(
+                f"Unexpected build error: {e}",
+                extra={"service": service},
+                exc_info=True,
+            )
+            self.rollback()
+            success = False
+        return service, success, time.perf_counter() - start
+
+    def build_all_enabled(self, jobs: int | None = None) -> bool:
+        """Build scaffolds for all enabled services.
+
+        The onramp global scaffold is built first on its own since it writes
+        the shared services-enabled/.env files. Every other service only writes
+        to etc/<service>/ and services-enabled/<service>.env, so they are built
+        concurrently on a thread pool. Rollback tracking is per-thread, so a
+        failing service only rolls back its own files.
+
+        Args:
+            jobs: Maximum parallel builds (None = pool default, 1 = serial)
+        """
+        results: list[tuple[str, bool, float]] = []
 
         # Always build onramp globals first
         if self.has_scaffold("onramp"):
-            if not self.build("onramp"):
-                success = False
-
-        # Build for each enabled service
-        for service_yml in self.services_enabled.glob("*.yml"):
-            service = service_yml.stem
-            if self.has_scaffold(service):
-                if not self.build(service):
-                    success = False
+            results.append(self._build_timed("onramp"))
 
-        return success
+        services = sorted(
+            service_yml.stem
+            for service_yml in self.services_enabled.glob("*.yml")
+            if service_yml.stem != "onramp"
+        )
+        services = [service for service in services if self.has_scaffold(service)]
+
+        if (jobs is not None and jobs <= 1) or len(services) <= 1:
+            results.extend(self._build_timed(service) for service in services)
+        elif services:
+            with ThreadPoolExecutor(
+                max_workers=jobs, thread_name_prefix="scaffold"
+            ) as pool:
+                results.extend(pool.map(self._build_timed, services))
+
+        self._log_build_summary(results)
+        return all(success for _, success, _ in results)
+
+    def _log_build_summary(self, results: list[tuple[str, bool, float]]) -> None:
+        """Log per-service build timings, slowest first."""
+        if not results:
+            return
+
+        logger.info("Scaffold build summary:")
+        width = max(len(service) for service, _, _ in results)
+        for service, success, elapsed in sorted(
+            results, key=lambda result: result[2], reverse=True
+        ):
+            status = "ok" if success else "FAILED"
+            logger.info(
+                f"  {service:<{width}}  {status:<6}  {elapsed:6.2f}s",
+                extra={"service": service, "duration_ms": round(elapsed * 1000)},
+            )
+
+        failed = sum(1 for _, success, _ in results if not success)
+        logger.info(
+            f"Built {len(results)} scaffold(s), {failed} failed",
+            extra={"built": len(results), "failed": failed},
+        )
 
     def list_scaffolds(self) -> list[str]:
         """List all available scaffolds."""
-        if not self.scaffold_dir.exists():
+        try:
+            with os.scandir(self.scaffold_dir) as it:
+                return sorted(entry.name for entry in it if entry.is_dir())
+        except FileNotFoundError:
             return []
-        return sorted(d.name for d in self.scaffold_dir.iterdir() if d.is_dir())
 
 
 def main():
@@ -883,28 +1179,37 @@ def main():
 Examples:
   scaffold.py build adguard        Build scaffold for adguard
   scaffold.py build --all          Build scaffolds for all enabled services
+  scaffold.py build --all -j 1     Build all enabled services one at a time
   scaffold.py teardown adguard     Remove service env file (preserve etc/)
   scaffold.py nuke adguard         Remove service env and etc/ directory
   scaffold.py list                 List available scaffolds
   scaffold.py check adguard        Check if service has scaffold files
+  scaffold.py plan radarr          Show manifest plan and what would be skipped
         """,
     )
 
     parser.add_argument(
         "action",
-        choices=["build", "teardown", "nuke", "list", "check"],
+        choices=["build", "teardown", "nuke", "list", "check", "plan"],
         help="Action to perform",
     )
     parser.add_argument(
         "service",
         nargs="?",
-        help="Service name (required for build/teardown/nuke/check)",
+        help="Service name (required for build/teardown/nuke/check/plan)",
     )
     parser.add_argument(
         "--all",
         action="store_true",
         help="Build scaffolds for all enabled services",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Parallel builds for --all (default: thread pool size, 1 = serial)",
+    )
     parser.add_argument(
         "--force",
         action="store_true",
@@ -934,10 +1239,13 @@ Examples:
         return 0
 
     if args.action == "build" and args.all:
-        success = scaffolder.build_all_enabled()
+        success = scaffolder.build_all_enabled(jobs=args.jobs)
         return 0 if success else 1
 
-    if args.action in ("build", "teardown", "nuke", "check") and not args.service:
+    if (
+        args.action in ("build", "teardown", "nuke", "check", "plan")
+        and not args.service
+    ):
         parser.error(f"Service name required for '{args.action}' action")
 
     if args.action == "check":
@@ -951,6 +1259,13 @@ Examples:
             )
             return 1
 
+    if args.action == "plan":
+        previews = scaffolder.plan_manifest(args.service)
+        if previews is None:
+            return 1
+        scaffolder.log_plan(args.service, previews)
+        return 0
+
     if args.action == "build":
         success = scaffolder.build(args.service)
         return 0 if success else 1
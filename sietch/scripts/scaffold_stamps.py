@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+"""
+scaffold_stamps.py - Content-hash build stamps for incremental scaffolding
+
+Records, for every file the scaffolder writes, the hash of its source file,
+a hash of the environment values the source references, and the hash of the
+output that was written. On the next build this lets the scaffolder tell:
+
+- current:  inputs unchanged, output untouched -> nothing to do
+- stale:    inputs changed, output untouched -> safe to regenerate
+- modified: output edited since it was written -> leave it alone
+- unknown:  output exists but was never stamped -> leave it alone
+
+Environment values are stored as a single digest, never in plain text, since
+templates routinely reference passwords and tokens.
+
+Stamps live in etc/.scaffold_stamps.json next to the other scaffold state.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+STAMP_VERSION = 1
+
+CURRENT = "current"
+STALE = "stale"
+MODIFIED = "modified"
+UNKNOWN = "unknown"
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the sha256 hex digest of data."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_env(names: list[str] | set[str]) -> str:
+    """Return a digest of the current values of the given env vars."""
+    digest = hashlib.sha256()
+    for name in sorted(set(names)):
+        digest.update(f"{name}={os.environ.get(name, '')}\0".encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class Stamp:
+    """Inputs and output fingerprint of one generated file."""
+
+    source: str
+    source_hash: str
+    env_hash: str
+    output_hash: str
+    output_size: int
+    output_mtime_ns: int
+
+
+class BuildStamps:
+    """Thread-safe stamp database keyed by output path relative to base_dir."""
+
+    def __init__(self, path: Path, base_dir: Path):
+        self.path = path
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+        self._stamps: dict[str, Stamp] | None = None
+        self._dirty = False
+
+    def _key(self, dest: Path) -> str:
+        try:
+            return str(dest.relative_to(self.base_dir))
+        except ValueError:
+            return str(dest)
+
+    def _load(self) -> dict[str, Stamp]:
+        if self._stamps is None:
+            self._stamps = {}
+            try:
+                data = json.loads(self.path.read_text())
+                if data.get("version") == STAMP_VERSION:
+                    self._stamps = {
+                        key: Stamp(**value)
+                        for key, value in data.get("outputs", {}).items()
+                    }
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(
+                    f"Ignoring unreadable build stamps: {e}",
+                    extra={"path": str(self.path)},
+                )
+        return self._stamps
+
+    def get(self, dest: Path) -> Stamp | None:
+        """Return the stamp recorded for dest, if any."""
+        with self._lock:
+            return self._load().get(self._key(dest))
+
+    def status(self, dest: Path, source_hash: str, env_hash: str = "") -> str:
+        """Compare an existing output against its recorded inputs.
+
+        Args:
+            dest: Output path (must exist)
+            source_hash: Hash of the source file as it is now
+            env_hash: Hash of the referenced env values as they are now
+
+        Returns:
+            One of CURRENT, STALE, MODIFIED or UNKNOWN
+        """
+        stamp = self.get(dest)
+        if stamp is None:
+            return UNKNOWN
+
+        # Fast path: an untouched output keeps the size and mtime we recorded
+        st = dest.stat()
+        if (st.st_size, st.st_mtime_ns) != (stamp.output_size, stamp.output_mtime_ns):
+            if hash_bytes(dest.read_bytes()) != stamp.output_hash:
+                return MODIFIED
+
+        if stamp.source_hash == source_hash and stamp.env_hash == env_hash:
+            return CURRENT
+        return STALE
+
+    def make(self, dest: Path, source: Path, source_hash: str, env_hash: str) -> Stamp:
+        """Build a stamp for an output that was just written."""
+        st = dest.stat()
+        return Stamp(
+            source=self._key(source),
+            source_hash=source_hash,
+            env_hash=env_hash,
+            output_hash=hash_bytes(dest.read_bytes()),
+            output_size=st.st_size,
+            output_mtime_ns=st.st_mtime_ns,
+        )
+
+    def update(self, stamps: dict[Path, Stamp]) -> None:
+        """Record stamps for outputs written by a successful build."""
+        if not stamps:
+            return
+        with self._lock:
+            outputs = self._load()
+            for dest, stamp in stamps.items():
+                outputs[self._key(dest)] = stamp
+            self._dirty = True
+
+    def save(self) -> None:
+        """Atomically write the stamp database if it changed."""
+        with self._lock:
+            if not self._dirty or self._stamps is None:
+                return
+            data = {
+                "version": STAMP_VERSION,
+                "outputs": {
+                    key: asdict(stamp) for key, stamp in sorted(self._stamps.items())
+                },
+            }
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(data, indent=2))
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(
+                    f"Could not save build stamps: {e}", extra={"path": str(self.path)}
+                )
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+scaffold_templates.py - Compiled ${VAR} templates for scaffold rendering
+
+A template is parsed once into a TemplatePlan holding:
+- literal segments interleaved with variable references
+- each reference's ${VAR:-default} default and ${VAR:?error} message
+- the '# required: VAR' declarations
+- whether any referenced variable looks like a password/secret
+- the content hash used by build stamps
+
+Plans are cached by template content, so rendering, sensitivity checks,
+required-var parsing and stamping all share a single parse. Rendering is a
+join of the literal segments with the resolved variable values.
+"""
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from scaffold_stamps import hash_bytes
+
+# Matches ${VAR}, ${VAR:-default} and ${VAR:?error}
+VARIABLE_PATTERN = re.compile(r"\$\{([A-Z][A-Z0-9_]*)(?::-([^}]*)|:\?([^}]*))?\}")
+
+# Matches '# required: VAR_NAME' declarations
+REQUIRED_PATTERN = re.compile(r"^#\s*required:\s*(\w+)", re.MULTILINE)
+
+# Matches 'VAR=' lines with no value in rendered env files
+EMPTY_ASSIGNMENT_PATTERN = re.compile(r"^(\w+)\s*=\s*$", re.MULTILINE)
+
+PASSWORD_PATTERNS = (
+    "_PASS",
+    "_PASSWORD",
+    "_SECRET",
+    "_KEY",
+    "_TOKEN",
+    "PASS_",
+    "PASSWORD_",
+    "SECRET_",
+    "KEY_",
+    "TOKEN_",
+)
+
+
+def is_password_var(var_name: str) -> bool:
+    """Check if a variable name looks like a password/secret."""
+    upper_name = var_name.upper()
+    return any(pattern in upper_name for pattern in PASSWORD_PATTERNS)
+
+
+@dataclass(frozen=True)
+class Variable:
+    """One ${VAR} reference in a template."""
+
+    name: str
+    default: str | None = None
+    error: str | None = None
+    sensitive: bool = False
+
+
+@dataclass(frozen=True)
+class TemplatePlan:
+    """Parsed form of a template, ready to render against the environment."""
+
+    segments: tuple[str | Variable, ...]
+    references: tuple[Variable, ...]
+    variables: frozenset[str]
+    required: tuple[str, ...]
+    sensitive: bool
+    source_hash: str
+
+    def render(self, resolve: Callable[[Variable], str]) -> str:
+        """Join literal segments with resolved variable values."""
+        return "".join(
+            segment if isinstance(segment, str) else resolve(segment)
+            for segment in self.segments
+        )
+
+
+@lru_cache(maxsize=1024)
+def compile_template(content: str) -> TemplatePlan:
+    """Parse template content into a cached TemplatePlan."""
+    segments: list[str | Variable] = []
+    references: dict[Variable, None] = {}
+    position = 0
+
+    for match in VARIABLE_PATTERN.finditer(content):
+        if match.start() > position:
+            segments.append(content[position : match.start()])
+        variable = Variable(
+            name=match.group(1),
+            default=match.group(2),
+            error=match.group(3),
+            sensitive=is_password_var(match.group(1)),
+        )
+        segments.append(variable)
+        references[variable] = None
+        position = match.end()
+
+    if position < len(content):
+        segments.append(content[position:])
+
+    return TemplatePlan(
+        segments=tuple(segments),
+        references=tuple(references),
+        variables=frozenset(variable.name for variable in references),
+        required=tuple(REQUIRED_PATTERN.findall(content)),
+        sensitive=any(variable.sensitive for variable in references),
+        source_hash=hash_bytes(content.encode()),
+    )
+
+
+def find_empty_assignments(content: str) -> set[str]:
+    """Return names assigned an empty value ('VAR=') in rendered content."""
+    return set(EMPTY_ASSIGNMENT_PATTERN.findall(content))
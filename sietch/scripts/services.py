@@ -20,6 +20,7 @@ import shutil
 import sys
 from pathlib import Path
 
+from compose_model import OverrideIndex
 from logging_config import get_logger, setup_logging
 
 logger = get_logger(__name__)
@@ -37,6 +38,7 @@ class ServiceManager:
         self.games_dir = self.services_available / "games"
         self.external_dir = self.base_dir / "external-available"
         self.archive_dir = self.services_enabled / "archive"
+        self.override_index = OverrideIndex(self.overrides_available)
 
     def _strip_extension(self, filename: str) -> str:
         """Remove .yml extension from filename."""
@@ -125,6 +127,16 @@ class ServiceManager:
                 overrides.append(self._strip_extension(f.name))
         return sorted(overrides)
 
+    def get_overrides(self, service: str) -> list[dict]:
+        """Overrides that apply to a service ({service}*.yml), with enabled status."""
+        return [
+            {
+                "name": name,
+                "enabled": (self.overrides_enabled / f"{name}.yml").exists(),
+            }
+            for name in self.override_index.names_for(service)
+        ]
+
     def list_external(self) -> list[str]:
         """List all available external services."""
         if not self.external_dir.exists():
@@ -341,14 +353,15 @@ def main():
     parser.add_argument("--fix", action="store_true", help="Auto-fix issues where possible")
     parser.add_argument("--min-version", type=int, help="Minimum required config version")
     parser.add_argument("--outdated", action="store_true", help="List services with outdated config versions")
+    parser.add_argument("--format", choices=["text", "json", "sarif"], default="text", help="Output format for 'lint --all'")
     parser.add_argument(
         "--base-dir", default="/app", help="Base directory (default: /app)"
     )
 
     args = parser.parse_args()
 
-    # Setup logging
-    setup_logging(level="INFO", enable_colors=True)
+    # Setup logging; JSON and SARIF reports own stdout, so logs go to stderr
+    setup_logging(level="INFO", enable_colors=True, stream=sys.stderr if args.format != "text" else None)
 
     mgr = ServiceManager(args.base_dir)
 
@@ -507,7 +520,7 @@ def main():
             logger.error("pyyaml not installed")
             return 1
 
-        from services_linter import ServiceLinter
+        from services_linter import ServiceLinter, results_to_json, results_to_sarif
         linter = ServiceLinter(args.base_dir)
 
         if args.service:
@@ -528,37 +541,35 @@ def main():
 
             return 0 if is_valid else 1
 
-        elif args.all or args.outdated:
-            # Lint all services or only outdated ones
-            services = mgr.list_available()
-            failed = []
+        elif args.outdated:
+            # List services still on the v1 config format
             outdated = []
+            for service in mgr.list_available():
+                metadata = mgr._parse_metadata(mgr.services_available / f"{service}.yml")
+                if metadata.get("config_version", 1) < 2:
+                    outdated.append(service)
 
-            for service in services:
-                yml_path = mgr.services_available / f"{service}.yml"
-                metadata = mgr._parse_metadata(yml_path)
-                version = metadata.get("config_version", 1)
+            if outdated:
+                logger.info("Services with outdated config (v1):", extra={"count": len(outdated)})
+                for service in outdated:
+                    logger.info(f"  - {service}")
+            else:
+                logger.info("All services are up-to-date!")
+            return 0
 
-                if args.outdated and version >= 2:
-                    continue  # Skip up-to-date services
+        elif args.all:
+            # Lint all services (in parallel, reusing results for unchanged files)
+            services = mgr.list_available()
+            results = linter.lint_many(services, strict=args.strict)
 
-                if args.outdated:
-                    outdated.append(service)
-                    continue
-
-                is_valid, errors, warnings = linter.lint(service, strict=args.strict, auto_fix=args.fix)
-                if not is_valid:
-                    failed.append((service, errors, warnings))
-
-            if args.outdated:
-                if outdated:
-                    logger.info("Services with outdated config (v1):", extra={"count": len(outdated)})
-                    for service in outdated:
-                        logger.info(f"  - {service}")
-                else:
-                    logger.info("All services are up-to-date!")
-                return 0
+            if args.format == "json":
+                print(results_to_json(results))
+                return 0 if all(r.is_valid for r in results) else 1
+            if args.format == "sarif":
+                print(results_to_sarif(results))
+                return 0 if all(r.is_valid for r in results) else 1
 
+            failed = [(r.service, r.errors, r.warnings) for r in results if not r.is_valid]
             if failed:
                 logger.error(f"{len(failed)} services failed validation:", extra={"failed_count": len(failed)})
                 for service, errors, warnings in failed:
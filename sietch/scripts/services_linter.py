@@ -3,16 +3,30 @@
 services_linter.py - Service configuration linter for OnRamp
 
 Validates service YAML files against OnRamp standards and best practices.
+
+lint_all() only re-lints services whose file changed since the last run
+(results are cached in etc/.cache/lint.json, keyed by a hash of the file
+and of the linter itself) and spreads the remaining work over a process
+pool. Results can be reported as text, JSON or SARIF.
 """
 
 from logging_config import get_logger, setup_logging
 logger = get_logger(__name__)
 
+import functools
+import hashlib
+import json
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from compose_model import ComposeFile, ComposeModel
+
 # Try to import yaml, but don't fail at import time
 yaml = None
 try:
@@ -21,6 +35,232 @@ except ImportError:
     pass
 
 
+LINT_CACHE_VERSION = 1
+
+# Below this many services to lint, a process pool costs more than it saves
+PARALLEL_THRESHOLD = 8
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
+@dataclass
+class LintResult:
+    """Outcome of linting one service."""
+
+    service: str
+    path: str  # Relative to the base directory
+    is_valid: bool
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    cached: bool = False
+
+
+@functools.cache
+def _linter_fingerprint() -> str:
+    """Hash of this module, so cached results expire when the rules change."""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def _file_digest(path: Path) -> str | None:
+    """Cache key for a service file (None if it cannot be read)."""
+    try:
+        content = path.read_bytes()
+    except OSError:
+        return None
+    return hashlib.sha256(_linter_fingerprint().encode() + content).hexdigest()
+
+
+class LintCache:
+    """Lint results keyed by service, valid while the file digest matches."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self.dirty = False
+        try:
+            data = json.loads(path.read_text())
+            if data.get("version") == LINT_CACHE_VERSION:
+                self.entries = data.get("services", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def get(self, service: str, digest: str, strict: bool) -> Optional[LintResult]:
+        entry = self.entries.get(service)
+        if not entry or entry.get("digest") != digest or entry.get("strict") != strict:
+            return None
+        return LintResult(
+            service, entry["path"], entry["is_valid"], entry["errors"], entry["warnings"], cached=True
+        )
+
+    def put(self, result: LintResult, digest: str, strict: bool) -> None:
+        entry = asdict(result)
+        entry.pop("cached")
+        entry.update(digest=digest, strict=strict)
+        self.entries[result.service] = entry
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty or not self.path.parent.parent.is_dir():
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"version": LINT_CACHE_VERSION, "services": self.entries}))
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError as e:
+            logger.debug(f"Could not save lint cache: {e}", extra={"path": str(self.path)})
+
+
+@dataclass(frozen=True)
+class TextRule:
+    """A pattern looked for in the raw file text (comments included).
+
+    Every rule starts at a literal trigger. The combined regex begins with
+    a character class of the triggers' first characters, which lets the
+    regex engine skip straight to candidate positions instead of trying
+    every rule at every character.
+
+    pattern is matched right after the trigger. lead, if set, must match
+    the text just before the trigger and is captured as the first value.
+    """
+
+    name: str
+    trigger: str
+    pattern: str = ""
+    lead: str | None = None
+
+
+@dataclass(frozen=True)
+class LabelRule:
+    """A label every service (or every web service) must define.
+
+    Satisfied when any label key contains one of any_of.
+    """
+
+    any_of: tuple[str, ...]
+    severity: str  # "error" or "warning"
+    message: str
+    web_only: bool = False
+
+
+# All text rules are compiled into one regex and found in a single pass
+TEXT_RULES = (
+    TextRule("config_version", "# config_version:", r"[ \t]*(\S*)"),
+    TextRule("description", "# description:"),
+    TextRule("url", "# ", r"(?i:http)"),
+    # "service.${HOST_DOMAIN}" should be "${SERVICE_CONTAINER_NAME:-service}.${HOST_DOMAIN}"
+    TextRule("hardcoded_host", ".${HOST_DOMAIN}", lead=r"(?<![a-z])[a-z][a-z0-9-]+"),
+)
+
+# How far back a lead pattern may reach (a DNS label is at most 63 characters)
+LEAD_WINDOW = 256
+
+LABEL_RULES = (
+    LabelRule(("joyride.host.name",), "error", "Web service missing joyride.host.name label", web_only=True),
+    LabelRule(("traefik.http.routers",), "error", "Missing Traefik router configuration", web_only=True),
+    LabelRule(
+        ("traefik.http.services", "loadbalancer.server.port"),
+        "error",
+        "Missing Traefik loadbalancer port configuration",
+        web_only=True,
+    ),
+    LabelRule(("autoheal",), "warning", "Missing autoheal label"),
+    LabelRule(("watchtower.enable",), "warning", "Missing watchtower.enable label"),
+)
+
+
+@dataclass(frozen=True)
+class _CompiledRule:
+    name: str
+    group: int
+    inner_groups: int
+    lead: re.Pattern | None
+
+
+def _compile_text_rules(rules: tuple[TextRule, ...]) -> tuple[re.Pattern, dict[str, _CompiledRule]]:
+    """Combine rules into one regex.
+
+    The result looks like `[#.](?:(?<=#) (?:(?P<a>...)|(?P<b>...))|...)`:
+    the first character is consumed by the class, and each branch checks it
+    with a lookbehind before matching the rest of its trigger.
+    """
+    by_trigger: dict[str, list[TextRule]] = {}
+    for rule in rules:
+        by_trigger.setdefault(rule.trigger, []).append(rule)
+
+    branches = []
+    for trigger, trigger_rules in by_trigger.items():
+        alternatives = "|".join(f"(?P<{rule.name}>{rule.pattern})" for rule in trigger_rules)
+        branches.append(f"(?<={re.escape(trigger[0])}){re.escape(trigger[1:])}(?:{alternatives})")
+    first_chars = "".join(sorted({re.escape(trigger[0]) for trigger in by_trigger}))
+    pattern = re.compile(f"[{first_chars}](?:{'|'.join(branches)})")
+
+    compiled = {
+        rule.name: _CompiledRule(
+            rule.name,
+            pattern.groupindex[rule.name],
+            re.compile(rule.pattern).groups,
+            re.compile(f"(?:{rule.lead})\\Z") if rule.lead else None,
+        )
+        for rule in rules
+    }
+    return pattern, compiled
+
+
+_TEXT_PATTERN, _TEXT_RULES = _compile_text_rules(TEXT_RULES)
+
+
+@dataclass
+class TextFacts:
+    """Matches of every text rule, from one scan of a file."""
+
+    # Rule name -> captured groups of each match, in file order
+    hits: dict[str, list[tuple[str, ...]]]
+
+    @property
+    def config_version(self) -> int:
+        """Version from the first '# config_version:' comment (default 1)."""
+        for (value,) in self.hits["config_version"][:1]:
+            try:
+                return int(value)
+            except ValueError:
+                return 1
+        return 1
+
+    @property
+    def hardcoded_hosts(self) -> list[str]:
+        hosts = dict.fromkeys(host for (host,) in self.hits["hardcoded_host"])
+        return [f"Hardcoded hostname: {host}.${{HOST_DOMAIN}} (should use variable)" for host in hosts]
+
+
+def scan_text(content: str) -> TextFacts:
+    """Run all TEXT_RULES over content in a single regex pass."""
+    hits: dict[str, list[tuple[str, ...]]] = {rule.name: [] for rule in TEXT_RULES}
+    for match in _TEXT_PATTERN.finditer(content):
+        rule = _TEXT_RULES[match.lastgroup]
+        values = tuple(match.group(i) for i in range(rule.group + 1, rule.group + 1 + rule.inner_groups))
+        if rule.lead is not None:
+            trigger_start = match.start()
+            lead = rule.lead.search(content, max(0, trigger_start - LEAD_WINDOW), trigger_start)
+            if lead is None:
+                continue
+            values = (lead.group(),) + values
+        hits[match.lastgroup].append(values)
+    return TextFacts(hits)
+
+
+_worker_linter: Optional["ServiceLinter"] = None
+
+
+def _lint_in_worker(base_dir: str, service: str, strict: bool) -> tuple[bool, list[str], list[str]]:
+    """Process pool entry point; reuses one linter per worker process."""
+    global _worker_linter
+    if _worker_linter is None or str(_worker_linter.base_dir) != base_dir:
+        _worker_linter = ServiceLinter(base_dir)
+    return _worker_linter.lint(service, strict=strict)
+
+
 class ServiceLinter:
     """Lints service configurations against OnRamp standards."""
     
@@ -54,7 +294,8 @@ class ServiceLinter:
     
     def __init__(self, base_dir: str = "/app"):
         self.base_dir = Path(base_dir)
-        self.services_available = self.base_dir / "services-available"
+        self.model = ComposeModel(self.base_dir)
+        self.services_available = self.model.services_available
     
     def lint(self, service: str, strict: bool = False, auto_fix: bool = False) -> tuple[bool, list[str], list[str]]:
         """
@@ -72,57 +313,43 @@ class ServiceLinter:
         if not service_file.exists():
             return False, [f"Service file not found: {service_file}"], []
         
-        # Read file content
-        with open(service_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Parse YAML
+        # Parse YAML (cached across tools and runs)
         try:
-            config = yaml.safe_load(content)
+            compose_file = self.model.read(service_file)
         except yaml.YAMLError as e:
             return False, [f"Invalid YAML: {e}"], []
+        config = compose_file.data
+        content = compose_file.text
         
         if not config or 'services' not in config:
             return False, ["Invalid service configuration: missing 'services' section"], []
         
+        facts = scan_text(content)
+
         # Check config version
-        version = self._get_config_version(content)
+        version = facts.config_version
         if version < self.CURRENT_VERSION:
             errors.append(f"Outdated config version: v{version} (current standard: v{self.CURRENT_VERSION})")
         
         # Check documentation
-        if not self._has_description(content):
+        if not facts.hits["description"]:
             errors.append("Missing '# description:' comment")
         
-        if not self._has_url(content):
+        if not facts.hits["url"]:
             warnings.append("No URL references found (recommend adding GitHub or Docker Hub links)")
         
-        # Check network configuration
-        if not self._has_traefik_network(config):
-            # Some services may use network_mode: host
-            if not self._uses_host_network(config):
-                warnings.append("Missing 'traefik' network definition (unless using network_mode: host)")
+        # Check each service definition (single walk over the parsed tree)
+        service_errors, service_warnings, uses_host_network = self._walk_services(compose_file, service)
         
-        # Check each service definition
-        for svc_name, svc_config in config.get('services', {}).items():
-            # Check environment variables
-            env_issues = self._check_env_vars(svc_name, svc_config, service)
-            errors.extend(env_issues.get("errors", []))
-            warnings.extend(env_issues.get("warnings", []))
-            
-            # Check labels
-            label_issues = self._check_labels(svc_name, svc_config, service)
-            errors.extend(label_issues.get("errors", []))
-            warnings.extend(label_issues.get("warnings", []))
-            
-            # Check volumes
-            volume_issues = self._check_volumes(svc_name, svc_config)
-            warnings.extend(volume_issues)
+        # Check network configuration (some services may use network_mode: host)
+        if not self._has_traefik_network(config) and not uses_host_network:
+            warnings.append("Missing 'traefik' network definition (unless using network_mode: host)")
+        
+        errors.extend(service_errors)
+        warnings.extend(service_warnings)
         
         # Check for hardcoded values
-        hardcoded = self._find_hardcoded_values(content)
-        if hardcoded:
-            warnings.extend([f"Hardcoded value detected: {h}" for h in hardcoded])
+        warnings.extend(f"Hardcoded value detected: {h}" for h in facts.hardcoded_hosts)
         
         is_valid = len(errors) == 0
         if strict:
@@ -130,208 +357,190 @@ class ServiceLinter:
         
         return is_valid, errors, warnings
     
-    def _get_config_version(self, content: str) -> int:
-        """Extract config version from YAML comments."""
-        for line in content.split('\n'):
-            if line.strip().startswith('# config_version:'):
-                try:
-                    return int(line.split(':', 1)[1].strip())
-                except (ValueError, IndexError):
-                    return 1
-        return 1  # Default to v1 if not specified
-    
-    def _has_description(self, content: str) -> bool:
-        """Check if service has description comment."""
-        return '# description:' in content
-    
-    def _has_url(self, content: str) -> bool:
-        """Check if service has URL references."""
-        return '# http' in content.lower()
-    
     def _has_traefik_network(self, config: dict) -> bool:
         """Check if traefik network is defined."""
-        networks = config.get('networks', {})
-        return 'traefik' in networks and networks['traefik'].get('external') == True
-    
-    def _uses_host_network(self, config: dict) -> bool:
-        """Check if any service uses network_mode: host."""
-        for svc_config in config.get('services', {}).values():
-            if svc_config.get('network_mode') == 'host':
-                return True
-        return False
+        networks = config.get('networks') or {}
+        return isinstance(networks.get('traefik'), dict) and networks['traefik'].get('external') == True
     
-    def _check_env_vars(self, svc_name: str, svc_config: dict, service: str) -> dict:
-        """Check environment variable patterns."""
+    def _walk_services(self, compose_file: ComposeFile, service: str) -> tuple[list[str], list[str], bool]:
+        """Apply every per-service rule in one pass over the services.
+        
+        Returns (errors, warnings, uses_host_network)
+        """
         errors = []
         warnings = []
+        uses_host_network = False
+        check_user_ids = service not in self.INFRASTRUCTURE_SERVICES
         
-        env = svc_config.get('environment', [])
-        env_dict = {}
-        
-        # Convert env list/dict to dict for easier checking
-        if isinstance(env, list):
-            for item in env:
-                if isinstance(item, str) and '=' in item:
-                    key, val = item.split('=', 1)
-                    env_dict[key] = val
-                elif isinstance(item, str):
-                    # Format like "- KEY" without value
-                    env_dict[item.strip('- ')] = None
-        elif isinstance(env, dict):
-            env_dict = env
-        
-        # Check for PUID/PGID (skip for infrastructure services)
-        if service not in self.INFRASTRUCTURE_SERVICES:
-            has_puid = any('PUID' in k for k in env_dict.keys())
-            has_pgid = any('PGID' in k for k in env_dict.keys())
-            has_uid = any(k in ['UID', 'USER_ID'] for k in env_dict.keys())
-            has_gid = any(k in ['GID', 'GROUP_ID'] for k in env_dict.keys())
+        for svc_name, svc in compose_file.services.items():
+            if svc.config.get('network_mode') == 'host':
+                uses_host_network = True
             
-            # Check if using user: directive instead
-            has_user_directive = 'user' in svc_config
+            env = svc.environment
+            labels = svc.labels
+            # Rules match on key substrings; joined keys make each check one scan
+            env_keys = "\n".join(env)
+            label_keys = "\n".join(labels)
             
-            if has_uid or has_gid:
-                warnings.append(f"{svc_name}: Uses UID/GID instead of PUID/PGID (recommend standardizing)")
-            elif not has_puid and not has_pgid and not has_user_directive:
-                warnings.append(f"{svc_name}: Missing PUID/PGID environment variables")
-        
-        # Check for TZ
-        if not any('TZ' in k for k in env_dict.keys()):
-            warnings.append(f"{svc_name}: Missing TZ environment variable")
-        
-        return {"errors": errors, "warnings": warnings}
-    
-    def _check_labels(self, svc_name: str, svc_config: dict, service: str) -> dict:
-        """Check service labels."""
-        errors = []
-        warnings = []
-        
-        labels = svc_config.get('labels', [])
-        label_dict = {}
-        
-        # Convert labels to dict
-        if isinstance(labels, list):
-            for label in labels:
-                if isinstance(label, str):
-                    # Handle both "key=value" and "key: value" formats
-                    if '=' in label:
-                        k, v = label.split('=', 1)
-                        label_dict[k.strip('- ')] = v
-                    elif ':' in label and not label.startswith('-'):
-                        parts = label.split(':', 1)
-                        if len(parts) == 2:
-                            label_dict[parts[0].strip('- ')] = parts[1].strip()
-        elif isinstance(labels, dict):
-            label_dict = labels
-        
-        # Check if this is a web service
-        traefik_enable = label_dict.get('traefik.enable', '').strip()
-        is_web_service = traefik_enable and 'true' in traefik_enable.lower()
-        
-        if is_web_service:
-            # Check required web service labels
-            if not any('joyride.host.name' in k for k in label_dict.keys()):
-                errors.append(f"{svc_name}: Web service missing joyride.host.name label")
+            # Environment variables
+            if check_user_ids:
+                if any(k in ('UID', 'USER_ID', 'GID', 'GROUP_ID') for k in env):
+                    warnings.append(f"{svc_name}: Uses UID/GID instead of PUID/PGID (recommend standardizing)")
+                elif 'PUID' not in env_keys and 'PGID' not in env_keys and 'user' not in svc.config:
+                    warnings.append(f"{svc_name}: Missing PUID/PGID environment variables")
+            if 'TZ' not in env_keys:
+                warnings.append(f"{svc_name}: Missing TZ environment variable")
             
-            if not any('traefik.http.routers' in k for k in label_dict.keys()):
-                errors.append(f"{svc_name}: Missing Traefik router configuration")
+            # Labels
+            is_web_service = 'true' in (labels.get('traefik.enable') or '').strip().lower()
+            for rule in LABEL_RULES:
+                if rule.web_only and not is_web_service:
+                    continue
+                if not any(key in label_keys for key in rule.any_of):
+                    (errors if rule.severity == "error" else warnings).append(f"{svc_name}: {rule.message}")
+            if 'true' in (labels.get('autoheal') or '').lower() and svc.healthcheck is None:
+                errors.append(f"{svc_name}: autoheal=true without healthcheck (autoheal won't work)")
             
-            if not any('traefik.http.services' in k or 'loadbalancer.server.port' in str(label_dict) for k in label_dict.keys()):
-                errors.append(f"{svc_name}: Missing Traefik loadbalancer port configuration")
-        
-        # Check autoheal (required for all services)
-        if not any('autoheal' in k for k in label_dict.keys()):
-            warnings.append(f"{svc_name}: Missing autoheal label")
-        else:
-            # Check if autoheal=true but no healthcheck
-            autoheal_val = label_dict.get('autoheal', '')
-            if 'true' in str(autoheal_val).lower():
-                if 'healthcheck' not in svc_config:
-                    errors.append(f"{svc_name}: autoheal=true without healthcheck (autoheal won't work)")
-        
-        # Check watchtower
-        if not any('watchtower.enable' in k for k in label_dict.keys()):
-            warnings.append(f"{svc_name}: Missing watchtower.enable label")
-        
-        return {"errors": errors, "warnings": warnings}
-    
-    def _check_volumes(self, svc_name: str, svc_config: dict) -> list[str]:
-        """Check volume mounts."""
-        warnings = []
-        
-        volumes = svc_config.get('volumes', [])
-        environment = svc_config.get('environment', [])
-        
-        # Check if TZ is set
-        has_tz = False
-        if isinstance(environment, list):
-            has_tz = any('TZ' in str(item) for item in environment)
-        elif isinstance(environment, dict):
-            has_tz = 'TZ' in environment
-        
-        # Check if /etc/localtime is mounted
-        has_localtime = any('/etc/localtime' in str(v) for v in volumes)
-        
-        if has_tz and not has_localtime:
-            warnings.append(f"{svc_name}: Has TZ env var but missing /etc/localtime:/etc/localtime:ro volume mount")
-        
-        return warnings
-    
-    def _find_hardcoded_values(self, content: str) -> list[str]:
-        """Find hardcoded hostnames and values that should be variables."""
-        hardcoded = []
-        
-        # Look for patterns like "service.${HOST_DOMAIN}" where service is hardcoded
-        # This should be "${SERVICE_CONTAINER_NAME:-service}.${HOST_DOMAIN}"
-        pattern = r'([a-z][a-z0-9-]+)\.\$\{HOST_DOMAIN\}'
-        matches = re.findall(pattern, content)
+            # Volumes
+            if 'TZ' in env_keys and not any('/etc/localtime' in str(v) for v in svc.volumes):
+                warnings.append(f"{svc_name}: Has TZ env var but missing /etc/localtime:/etc/localtime:ro volume mount")
         
-        for match in matches:
-            # Check if it appears to be a hardcoded service name (not a variable)
-            if match and not match.startswith('${'):
-                hardcoded.append(f"Hardcoded hostname: {match}.${{HOST_DOMAIN}} (should use variable)")
-        
-        return list(set(hardcoded))  # Remove duplicates
+        return errors, warnings, uses_host_network
 
-    def lint_all(self, enabled_only: bool = False) -> dict:
+    def lint_all(
+        self, enabled_only: bool = False, strict: bool = False, jobs: Optional[int] = None, use_cache: bool = True
+    ) -> dict:
         """Lint all services.
 
         Args:
             enabled_only: Only lint enabled services
+            strict: Treat warnings as errors
+            jobs: Worker processes (default: CPU count; 1 lints serially)
+            use_cache: Reuse results for services whose file is unchanged
 
         Returns:
-            Dict with 'passed', 'failed', 'all_errors', 'all_warnings'
+            Dict with 'passed', 'failed', 'all_errors', 'all_warnings' and
+            'results' (list of LintResult)
         """
-        services_enabled = self.base_dir / "services-enabled"
-        enabled = set()
-        if services_enabled.exists():
-            for yml in services_enabled.glob("*.yml"):
-                enabled.add(yml.stem)
+        enabled = self.model.enabled_names()
+        services = [
+            yml_file.stem
+            for yml_file in sorted(self.services_available.glob("*.yml"))
+            if not enabled_only or yml_file.stem in enabled
+        ]
 
         results = {
             "passed": [],
             "failed": [],
             "all_errors": [],
             "all_warnings": [],
+            "results": self.lint_many(services, strict=strict, jobs=jobs, use_cache=use_cache),
         }
 
-        for yml_file in sorted(self.services_available.glob("*.yml")):
-            service = yml_file.stem
+        for result in results["results"]:
+            if result.is_valid:
+                results["passed"].append(result.service)
+            else:
+                results["failed"].append(result.service)
 
-            if enabled_only and service not in enabled:
-                continue
+            results["all_errors"].extend(result.errors)
+            results["all_warnings"].extend(result.warnings)
 
-            is_valid, errors, warnings = self.lint(service)
+        return results
 
-            if is_valid:
-                results["passed"].append(service)
-            else:
-                results["failed"].append(service)
+    def lint_many(
+        self, services: list[str], strict: bool = False, jobs: Optional[int] = None, use_cache: bool = True
+    ) -> list[LintResult]:
+        """Lint several services, in parallel when there are enough to lint.
 
-            results["all_errors"].extend(errors)
-            results["all_warnings"].extend(warnings)
+        Returns one LintResult per service, in the order given.
+        """
+        cache = LintCache(self.base_dir / "etc" / ".cache" / "lint.json") if use_cache else None
+        results: dict[str, LintResult] = {}
+        digests: dict[str, str | None] = {}
+
+        for service in services:
+            digests[service] = _file_digest(self.services_available / f"{service}.yml")
+            cached = cache.get(service, digests[service], strict) if cache and digests[service] else None
+            if cached:
+                results[service] = cached
+
+        stale = [service for service in services if service not in results]
+        for service, (is_valid, errors, warnings) in zip(stale, self._lint_stale(stale, strict, jobs)):
+            result = LintResult(
+                service, f"services-available/{service}.yml", is_valid, errors, warnings
+            )
+            results[service] = result
+            if cache and digests[service]:
+                cache.put(result, digests[service], strict)
+
+        if cache:
+            cache.save()
+
+        logger.debug(
+            "Linted services",
+            extra={"linted": len(stale), "cached": len(services) - len(stale)},
+        )
+        return [results[service] for service in services]
+
+    def _lint_stale(
+        self, services: list[str], strict: bool, jobs: Optional[int]
+    ) -> list[tuple[bool, list[str], list[str]]]:
+        workers = min(jobs or os.cpu_count() or 1, len(services))
+        if workers > 1 and len(services) >= PARALLEL_THRESHOLD:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    return list(
+                        pool.map(
+                            _lint_in_worker,
+                            [str(self.base_dir)] * len(services),
+                            services,
+                            [strict] * len(services),
+                            chunksize=max(1, len(services) // (workers * 4)),
+                        )
+                    )
+            except (OSError, NotImplementedError, BrokenProcessPool) as e:
+                logger.warning(f"Parallel lint unavailable, linting serially: {e}")
+
+        return [self.lint(service, strict=strict) for service in services]
+
+
+def results_to_json(results: list[LintResult]) -> str:
+    """Serialize lint results as JSON."""
+    return json.dumps(
+        {
+            "passed": sum(1 for r in results if r.is_valid),
+            "failed": sum(1 for r in results if not r.is_valid),
+            "results": [asdict(r) for r in results],
+        },
+        indent=2,
+    )
 
-        return results
+
+def results_to_sarif(results: list[LintResult]) -> str:
+    """Serialize lint results as a SARIF 2.1.0 log (for code scanning UIs)."""
+    sarif_results = []
+    for result in results:
+        location = {"physicalLocation": {"artifactLocation": {"uri": result.path}}}
+        for level, messages in (("error", result.errors), ("warning", result.warnings)):
+            for message in messages:
+                sarif_results.append(
+                    {"level": level, "message": {"text": message}, "locations": [location]}
+                )
+
+    return json.dumps(
+        {
+            "$schema": SARIF_SCHEMA,
+            "version": "2.1.0",
+            "runs": [
+                {
+                    "tool": {"driver": {"name": "onramp-services-linter", "informationUri": "https://github.com/traefikturkey/onramp"}},
+                    "results": sarif_results,
+                }
+            ],
+        },
+        indent=2,
+    )
 
 
 def main():
@@ -347,6 +556,7 @@ Examples:
   services_linter.py --all          # Lint all services
   services_linter.py --enabled      # Lint only enabled services
   services_linter.py --strict plex  # Fail on warnings too
+  services_linter.py --all --format=sarif > lint.sarif
         """,
     )
 
@@ -370,6 +580,23 @@ Examples:
         action="store_true",
         help="Treat warnings as errors",
     )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json", "sarif"],
+        default="text",
+        help="Output format (default: text)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for --all/--enabled (default: CPU count)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-lint services even if unchanged since the last run",
+    )
     parser.add_argument(
         "--base-dir",
         default="/app",
@@ -378,13 +605,27 @@ Examples:
 
     args = parser.parse_args()
     
-    # Setup logging
-    setup_logging(level="INFO", enable_colors=True)
+    # Setup logging; reports own stdout, so logs go to stderr
+    setup_logging(level="INFO", enable_colors=True, stream=sys.stderr if args.format != "text" else None)
 
     linter = ServiceLinter(args.base_dir)
 
+    if args.format != "text":
+        if args.all or args.enabled:
+            results = linter.lint_all(
+                enabled_only=args.enabled, strict=args.strict, jobs=args.jobs, use_cache=not args.no_cache
+            )["results"]
+        elif args.service:
+            results = linter.lint_many([args.service], strict=args.strict, use_cache=not args.no_cache)
+        else:
+            parser.error("Either --all, --enabled, or a service name is required")
+        print(results_to_sarif(results) if args.format == "sarif" else results_to_json(results))
+        return 0 if all(result.is_valid for result in results) else 1
+
     if args.all or args.enabled:
-        results = linter.lint_all(enabled_only=args.enabled)
+        results = linter.lint_all(
+            enabled_only=args.enabled, strict=args.strict, jobs=args.jobs, use_cache=not args.no_cache
+        )
 
         logger.info(f"Passed: {len(results['passed'])}")
         logger.info(f"Failed: {len(results['failed'])}")
@@ -1,27 +1,41 @@
 #!/usr/bin/env python
 """
-traefik_hosts.py - Extract Traefik external Host() rules for Joyride DNS
+traefik_hosts.py - Extract Traefik Host() rules for Joyride DNS
 
-Parses external-enabled/*.yml files, extracts Host() rules, resolves environment
-variables, and generates a hosts file for Joyride DNS ingestion.
+Parses the router rules of external-enabled/*.yml files and of the
+traefik.http.routers.*.rule labels in services-enabled/*.yml, resolves
+environment variables, and generates a hosts file for Joyride DNS
+ingestion. The same host index (HostIndex, with each host's source files)
+feeds `cloudflare.py dns sync` and the dashboard.
 
 Commands:
-  sync    Parse externals and update Joyride hosts file
+  sync            Parse externals and services, update Joyride hosts file
+  sync --watch    Keep running, re-syncing whenever inputs or .env change
 
 Features:
 - Early exit if Joyride service is not enabled
 - Excludes middleware-only YAML files
-- Resolves {{env "VAR"}} Go template syntax
+- Any number of Host()/HostHeader() matchers and arguments per rule;
+  HostRegexp() counts when it can only match one name
+- Resolves {{env "VAR"}} Go template syntax and compose ${VAR:-default}
 - FQDN-based deduplication (new entries override existing)
 - Preserves existing host entries and comments
+- Incremental: router rules are cached per file by mtime and size in
+  etc/.cache/traefik_hosts.json, and the hosts file is only replaced
+  (atomically) when its content changes, so Joyride reloads only then
 """
 
 import argparse
+import json
 import os
 import re
 import sys
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from compose_model import ComposeFile, ComposeModel
+from env_files import LayeredEnv, read_env_file
 from logging_config import get_logger, setup_logging
 
 logger = get_logger(__name__)
@@ -37,13 +51,153 @@ MIDDLEWARE_ONLY_FILES = frozenset(
     }
 )
 
-# Regex to extract Host() rules from Traefik dynamic config
-# Matches: Host(`{{env "VAR"}}.{{env "HOST_DOMAIN"}}`) or Host(`hostname.domain`)
-HOST_RULE_PATTERN = re.compile(r'rule:\s*"Host\(`([^`]+)`\)"')
+# Regex to extract router rules from Traefik dynamic config
+# Matches: rule: "Host(`{{env "VAR"}}.{{env "HOST_DOMAIN"}}`) || Host(`alias.domain`)"
+ROUTER_RULE_PATTERN = re.compile(r"^\s*rule:\s*(.+?)\s*$", re.MULTILINE)
 
 # Regex to extract {{env "VAR"}} Go template syntax
 ENV_TEMPLATE_PATTERN = re.compile(r'\{\{env\s+"([^"]+)"\}\}')
 
+# Router rule labels of compose services, e.g. traefik.http.routers.app.rule
+ROUTER_RULE_LABEL_PATTERN = re.compile(r"^traefik\.http\.routers\.[^.]+\.rule$")
+
+# Host matchers inside a router rule, each with one or more `arguments`:
+# Host(`a`), Host(`a`, `b`), HostHeader(`a`), HostRegexp(`{sub:[a-z]+}.b`)
+HOST_MATCHER_PATTERN = re.compile(r"\b(Host|HostHeader|HostRegexp)\(\s*((?:`[^`]*`\s*,?\s*)+)\)")
+MATCHER_ARG_PATTERN = re.compile(r"`([^`]*)`")
+
+# Regex syntax that makes a HostRegexp match more than one name
+REGEXP_SYNTAX = re.compile(r"[{}\[\]()*+?|\\]")
+
+# Innermost compose ${VAR}, ${VAR-default} or ${VAR:-default} reference
+COMPOSE_VAR_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)(?:(:?-)([^${}]*))?\}")
+
+# Bumped when the cached per-file extraction changes shape
+HOSTS_CACHE_VERSION = 2
+
+# Seconds between checks for changes in watch mode
+WATCH_INTERVAL = 0.5
+
+
+def parse_host_rule(rule: str) -> list[tuple[str, str]]:
+    """Split a Traefik router rule into (matcher, argument) pairs.
+
+    Example:
+        Host(`a.example.com`, `b.example.com`) || HostRegexp(`{x:.+}.example.com`)
+        -> [("Host", "a.example.com"), ("Host", "b.example.com"),
+            ("HostRegexp", "{x:.+}.example.com")]
+    """
+    pairs = []
+    for match in HOST_MATCHER_PATTERN.finditer(rule):
+        matcher = "Host" if match.group(1) == "HostHeader" else match.group(1)
+        pairs += [(matcher, arg) for arg in MATCHER_ARG_PATTERN.findall(match.group(2))]
+    return pairs
+
+
+def regexp_literal(pattern: str) -> str | None:
+    """The one host a HostRegexp pattern matches, or None if it matches many.
+
+    Accepts escaped dots and ^...$ anchors, e.g. ^app\\.example\\.com$.
+    """
+    literal = pattern.removeprefix("^").removesuffix("$").replace("\\.", ".")
+    if REGEXP_SYNTAX.search(literal):
+        return None
+    return literal
+
+
+def _unquote(value: str) -> str:
+    """Strip YAML quotes from a scalar taken from a rule: line."""
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+@dataclass
+class HostIndex:
+    """Hosts found in externals and service labels, deduplicated by FQDN.
+
+    Shared by the Joyride sync, `cloudflare.py dns sync` and the dashboard.
+    """
+
+    # FQDN -> source files declaring it (relative to the base directory)
+    hosts: dict[str, list[str]] = field(default_factory=dict)
+    # HostRegexp pattern -> source files; not resolvable to DNS records
+    patterns: dict[str, list[str]] = field(default_factory=dict)
+
+    def add(self, source: str, hosts: list[str], patterns: list[str] = ()) -> None:
+        """Record the hosts and patterns of one source file."""
+        for fqdn in hosts:
+            sources = self.hosts.setdefault(fqdn, [])
+            if source not in sources:
+                sources.append(source)
+        for pattern in patterns:
+            sources = self.patterns.setdefault(pattern, [])
+            if source not in sources:
+                sources.append(source)
+
+    def fqdns(self) -> list[str]:
+        """Every host, sorted."""
+        return sorted(self.hosts)
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form, for the dashboard API."""
+        return {
+            "hosts": [{"fqdn": fqdn, "sources": self.hosts[fqdn]} for fqdn in self.fqdns()],
+            "patterns": [{"pattern": p, "sources": sources} for p, sources in sorted(self.patterns.items())],
+        }
+
+
+class HostRuleCache:
+    """Router rules of external files, keyed by file mtime and size.
+
+    Rules are cached unresolved, so a change to .env alone still
+    re-resolves every host without re-reading the external files.
+    """
+
+    def __init__(self, path: Path | None):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self._seen: set[str] = set()
+        self._dirty = False
+        if path is None:
+            return
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == HOSTS_CACHE_VERSION:
+            self.entries = data.get("files", {})
+
+    def get(self, name: str, st: os.stat_result) -> list[str] | None:
+        """Cached rules for a file, if it is unchanged."""
+        self._seen.add(name)
+        entry = self.entries.get(name)
+        if entry and (entry["mtime_ns"], entry["size"]) == (st.st_mtime_ns, st.st_size):
+            return entry["rules"]
+        return None
+
+    def put(self, name: str, st: os.stat_result, rules: list[str]) -> None:
+        self._seen.add(name)
+        self.entries[name] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "rules": rules}
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache, dropping files not looked up since the last save."""
+        stale = set(self.entries) - self._seen
+        for name in stale:
+            del self.entries[name]
+        self._seen = set()
+        if not (self._dirty or stale) or self.path is None or not self.path.parent.parent.is_dir():
+            return
+        self._dirty = False
+        try:
+            self.path.parent.mkdir(exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"version": HOSTS_CACHE_VERSION, "files": self.entries}))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.debug(f"Could not save hosts cache: {e}", extra={"path": str(self.path)})
+
 
 class TraefikHostsExtractor:
     """Extract Host() rules from Traefik external configs for Joyride DNS."""
@@ -61,11 +215,16 @@ class TraefikHostsExtractor:
         """
         self.base_dir = base_dir or Path("/app")
         self.env_vars = env_vars if env_vars is not None else dict(os.environ)
+        self._base_env = dict(self.env_vars)
+        self._overrides: dict[str, str] | None = None
 
         # Paths
         self.services_enabled = self.base_dir / "services-enabled"
         self.external_enabled = self.base_dir / "external-enabled"
         self.hosts_file = self.base_dir / "etc" / "joyride" / "hosts.d" / "hosts"
+        self.cache = HostRuleCache(self.base_dir / "etc" / ".cache" / "traefik_hosts.json")
+        # The files docker gets as GLOBAL_ENV_FILES, parsed once per change
+        self.env = LayeredEnv(self.base_dir, global_only=True)
 
     def check_joyride_enabled(self) -> bool:
         """Check if Joyride service is enabled.
@@ -76,55 +235,42 @@ class TraefikHostsExtractor:
         joyride_yml = self.services_enabled / "joyride.yml"
         return joyride_yml.exists()
 
+    def env_files(self) -> list[Path]:
+        """The .env files variables are loaded from, lowest priority first."""
+        return self.env.files()
+
     def load_env_files(self) -> None:
-        """Load environment variables from .env and .env.external files."""
-        env_file = self.services_enabled / ".env"
-        env_external = self.services_enabled / ".env.external"
+        """Load environment variables from .env and .env.* files.
 
-        for env_path in [env_file, env_external]:
-            if env_path.exists():
-                self._parse_env_file(env_path)
+        Safe to call again after the files change: env_vars is rebuilt from
+        the environment given at construction plus the files' current
+        content.
+        """
+        file_vars = self.env.as_dict()
 
-    def _parse_env_file(self, path: Path) -> None:
-        """Parse a .env file and add to env_vars.
+        if self._overrides is None:
+            # Existing env vars win over the files (allows CLI override),
+            # unless they only repeat the files' values as docker --env-file
+            # does; those follow later edits to the files.
+            self._overrides = {k: v for k, v in self._base_env.items() if file_vars.get(k) != v}
+        self.env_vars = {**self._base_env, **file_vars, **self._overrides}
 
-        Args:
-            path: Path to .env file
-        """
-        with open(path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                # Skip empty lines and comments
-                if not line or line.startswith("#"):
-                    continue
-                # Parse KEY=VALUE
-                if "=" in line:
-                    key, _, value = line.partition("=")
-                    key = key.strip()
-                    value = value.strip()
-                    # Remove quotes if present
-                    if value.startswith('"') and value.endswith('"'):
-                        value = value[1:-1]
-                    elif value.startswith("'") and value.endswith("'"):
-                        value = value[1:-1]
-                    # Don't override existing env vars (allows CLI override)
-                    if key not in self.env_vars:
-                        self.env_vars[key] = value
-
-    def resolve_template(self, template: str) -> str | None:
+    def resolve_template(self, template: str, env_vars: dict[str, str] | None = None) -> str | None:
         """Resolve {{env "VAR"}} templates in a string.
 
         Args:
             template: String containing {{env "VAR"}} patterns
+            env_vars: Variables to resolve with (default: self.env_vars)
 
         Returns:
             Resolved string, or None if any required variable is empty/missing
         """
+        env_vars = self.env_vars if env_vars is None else env_vars
         result = template
 
         for match in ENV_TEMPLATE_PATTERN.finditer(template):
             var_name = match.group(1)
-            var_value = self.env_vars.get(var_name, "")
+            var_value = env_vars.get(var_name, "")
 
             if not var_value:
                 return None
@@ -133,6 +279,82 @@ class TraefikHostsExtractor:
 
         return result
 
+    def resolve_host(self, template: str, env_vars: dict[str, str] | None = None) -> str | None:
+        """Resolve both {{env "VAR"}} and compose ${VAR} references in a host.
+
+        Returns:
+            Resolved host, or None if a referenced variable is unset
+        """
+        resolved = self.resolve_compose_vars(template, env_vars)
+        if resolved is None:
+            return None
+        return self.resolve_template(resolved, env_vars)
+
+    def hosts_from_rule(
+        self, rule: str, env_vars: dict[str, str] | None = None
+    ) -> tuple[list[str], list[str], list[str]]:
+        """Resolve the host matchers of a router rule.
+
+        Handles any number of Host()/HostHeader()/HostRegexp() matchers,
+        each with one or more arguments. A HostRegexp that can only match
+        one name counts as a host.
+
+        Args:
+            rule: Traefik router rule
+            env_vars: Variables to resolve with (default: self.env_vars)
+
+        Returns:
+            Tuple of (hosts, patterns, unresolved): lowercase FQDNs,
+            HostRegexp patterns matching more than one name, and templates
+            referencing unset variables
+        """
+        hosts: list[str] = []
+        patterns: list[str] = []
+        unresolved: list[str] = []
+
+        for matcher, template in parse_host_rule(rule):
+            resolved = self.resolve_host(template, env_vars)
+            if not resolved:
+                unresolved.append(template)
+                continue
+            if matcher == "HostRegexp":
+                literal = regexp_literal(resolved)
+                if literal is None:
+                    patterns.append(resolved)
+                    continue
+                resolved = literal
+            hosts.append(resolved.lower().rstrip("."))
+
+        return hosts, patterns, unresolved
+
+    def _missing_vars(self, template: str, env_vars: dict[str, str]) -> list[str]:
+        """Variables a template needs that are not set."""
+        names = ENV_TEMPLATE_PATTERN.findall(template) + [
+            match.group(1) for match in COMPOSE_VAR_PATTERN.finditer(template) if not match.group(2)
+        ]
+        return [name for name in dict.fromkeys(names) if not env_vars.get(name)]
+
+    def _external_file_hosts(self, yaml_path: Path) -> tuple[list[str], list[str]]:
+        """(hosts, patterns) of a Traefik external config file."""
+        hosts: list[str] = []
+        patterns: list[str] = []
+
+        rules = self._file_rules(yaml_path)
+        if rules is None:
+            return hosts, patterns
+
+        for rule in rules:
+            found, found_patterns, unresolved = self.hosts_from_rule(rule)
+            hosts += found
+            patterns += found_patterns
+            for template in unresolved:
+                # Identify which variable is missing
+                missing_vars = self._missing_vars(template, self.env_vars)
+                if missing_vars:
+                    logger.warning(f"Skipped {yaml_path.stem}: {', '.join(missing_vars)} not set")
+
+        return hosts, patterns
+
     def extract_hosts_from_file(self, yaml_path: Path) -> list[tuple[str, str]]:
         """Extract Host() rules from a Traefik external config file.
 
@@ -142,36 +364,126 @@ class TraefikHostsExtractor:
         Returns:
             List of (fqdn, source_file) tuples
         """
-        hosts: list[tuple[str, str]] = []
         source_name = yaml_path.stem  # e.g., "homeassistant" from "homeassistant.yml"
+        hosts, _ = self._external_file_hosts(yaml_path)
+        return [(fqdn, source_name) for fqdn in hosts]
+
+    def _file_rules(self, yaml_path: Path) -> list[str] | None:
+        """Unresolved router rules of a file (cached by mtime and size).
 
+        Returns:
+            Rules in file order, or None if the file can't be read
+        """
         try:
-            content = yaml_path.read_text(encoding="utf-8")
+            st = yaml_path.stat()
+            rules = self.cache.get(yaml_path.name, st)
+            if rules is None:
+                content = yaml_path.read_text(encoding="utf-8")
+                rules = [_unquote(match.group(1)) for match in ROUTER_RULE_PATTERN.finditer(content)]
+                self.cache.put(yaml_path.name, st, rules)
         except OSError as e:
             logger.warning(f"Could not read {yaml_path}: {e}")
-            return hosts
+            return None
+        return rules
 
-        for match in HOST_RULE_PATTERN.finditer(content):
-            host_template = match.group(1)
-            resolved = self.resolve_template(host_template)
+    def resolve_compose_vars(
+        self, template: str, env_vars: dict[str, str] | None = None
+    ) -> str | None:
+        """Resolve compose ${VAR} / ${VAR:-default} references in a string.
 
-            if resolved:
-                hosts.append((resolved, source_name))
-            else:
-                # Identify which variable is missing
-                missing_vars = []
-                for env_match in ENV_TEMPLATE_PATTERN.finditer(host_template):
-                    var_name = env_match.group(1)
-                    if not self.env_vars.get(var_name):
-                        missing_vars.append(var_name)
+        Args:
+            template: String containing compose variable references
+            env_vars: Variables to resolve with (default: self.env_vars)
 
-                if missing_vars:
-                    logger.warning(
-                        f"Skipped {source_name}: {', '.join(missing_vars)} not set"
-                    )
+        Returns:
+            Resolved string, or None if a variable without a default is unset
+        """
+        env_vars = self.env_vars if env_vars is None else env_vars
+        result = template
+
+        while match := COMPOSE_VAR_PATTERN.search(result):
+            name, operator, default = match.groups()
+            value = env_vars.get(name)
+            if operator == ":-" and not value or operator == "-" and value is None:
+                value = default
+            if value is None:
+                return None
+            # Substituted values are not interpolated again
+            value = value.replace("$", "\0")
+            result = result[: match.start()] + value + result[match.end() :]
+
+        return result.replace("\0", "$")
+
+    def _service_file_hosts(self, compose_file: ComposeFile) -> tuple[list[str], list[str]]:
+        """(hosts, patterns) of the router labels in an enabled compose file."""
+        hosts: list[str] = []
+        patterns: list[str] = []
+        source_name = compose_file.path.stem
+        env_file = self.services_enabled / f"{source_name}.env"
+        env_vars = self.env_vars
+        if env_file.exists():
+            env_vars = {**self.env_vars, **read_env_file(env_file)}
+
+        for service in compose_file.services.values():
+            labels = service.labels
+            if str(labels.get("traefik.enable", "")).lower() == "false":
+                continue
+
+            for key, rule in labels.items():
+                if not rule or not ROUTER_RULE_LABEL_PATTERN.match(key):
+                    continue
+                found, found_patterns, unresolved = self.hosts_from_rule(rule, env_vars)
+                hosts += found
+                patterns += found_patterns
+                for template in unresolved:
+                    logger.warning(f"Skipped {source_name}: unresolved host {template}")
 
+        return hosts, patterns
+
+    def extract_service_hosts(self) -> list[tuple[str, str]]:
+        """Extract Host() rules from router labels of enabled services.
+
+        Variables resolve from the service's own .env file first, then
+        env_vars. Services with traefik.enable=false are skipped.
+
+        Returns:
+            List of (fqdn, service) tuples
+        """
+        hosts: list[tuple[str, str]] = []
+        for compose_file in ComposeModel(self.base_dir).enabled_services():
+            found, _ = self._service_file_hosts(compose_file)
+            hosts += [(fqdn, compose_file.path.stem) for fqdn in found]
         return hosts
 
+    def build_host_index(self, services: bool = True, externals: bool = True) -> HostIndex:
+        """Index the hosts of externals and enabled services in one pass.
+
+        Call load_env_files() first to resolve variables from .env files.
+
+        Args:
+            services: Include router labels of services-enabled/*.yml
+            externals: Include external-enabled/*.yml
+
+        Returns:
+            HostIndex with each host's source files (relative to base_dir)
+        """
+        index = HostIndex()
+
+        if externals:
+            for yaml_path in self.get_external_files():
+                source = f"{self.external_enabled.name}/{yaml_path.name}"
+                hosts, patterns = self._external_file_hosts(yaml_path)
+                index.add(source, hosts, patterns)
+            self.cache.save()
+
+        if services:
+            for compose_file in ComposeModel(self.base_dir).enabled_services():
+                source = f"{self.services_enabled.name}/{compose_file.path.name}"
+                hosts, patterns = self._service_file_hosts(compose_file)
+                index.add(source, hosts, patterns)
+
+        return index
+
     def get_external_files(self) -> list[Path]:
         """Get list of external config files to process.
 
@@ -221,23 +533,20 @@ class TraefikHostsExtractor:
 
         return comments, entries
 
-    def write_hosts_file(
+    def render_hosts_file(
         self,
         comments: list[str],
         entries: dict[str, str],
-    ) -> int:
-        """Write hosts file with updated entries.
+    ) -> str:
+        """Render hosts file content.
 
         Args:
             comments: Comment lines to preserve
             entries: FQDN -> line mapping
 
         Returns:
-            Number of entries written
+            File content
         """
-        # Ensure directory exists
-        self.hosts_file.parent.mkdir(parents=True, exist_ok=True)
-
         lines = []
 
         # Add preserved comments first
@@ -251,14 +560,47 @@ class TraefikHostsExtractor:
         for fqdn in sorted(entries.keys()):
             lines.append(entries[fqdn])
 
-        # Write file
-        self.hosts_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return "\n".join(lines) + "\n"
+
+    def write_hosts_file(
+        self,
+        comments: list[str],
+        entries: dict[str, str],
+    ) -> bool:
+        """Write hosts file with updated entries, if its content changed.
+
+        The file is replaced atomically, so Joyride never reads a partial
+        file, and left untouched (no reload) when already up to date.
+
+        Args:
+            comments: Comment lines to preserve
+            entries: FQDN -> line mapping
+
+        Returns:
+            True if the file was written
+        """
+        content = self.render_hosts_file(comments, entries)
+        try:
+            if self.hosts_file.read_text(encoding="utf-8") == content:
+                return False
+        except OSError:
+            pass
+
+        # Ensure directory exists
+        self.hosts_file.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = self.hosts_file.with_name(f".{self.hosts_file.name}.tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, self.hosts_file)
 
-        return len(entries)
+        return True
 
-    def sync(self) -> int:
+    def sync(self, services: bool = True) -> int:
         """Main sync operation.
 
+        Args:
+            services: Include hosts from router labels of enabled services
+
         Returns:
             Exit code (0 = success, 1 = error)
         """
@@ -285,36 +627,36 @@ class TraefikHostsExtractor:
             logger.error("HOST_DOMAIN not set in environment")
             return 1
 
-        # Get external files to process
-        external_files = self.get_external_files()
+        # Extract hosts from externals and enabled services
+        index = self.build_host_index(services=services)
 
-        if not external_files:
-            logger.info("No external configs found in external-enabled/")
+        if not index.hosts:
+            logger.info("No hosts found in external-enabled/ or services-enabled/")
             return 0
 
         # Read existing hosts file
         comments, entries = self.read_existing_hosts()
 
-        # Extract hosts from each file
         added: list[str] = []
         updated: list[str] = []
 
-        for yaml_path in external_files:
-            hosts = self.extract_hosts_from_file(yaml_path)
+        for fqdn in index.fqdns():
+            new_line = f"{hostip} {fqdn}"
 
-            for fqdn, source in hosts:
-                new_line = f"{hostip} {fqdn}"
-
-                if fqdn in entries:
-                    if entries[fqdn] != new_line:
-                        updated.append(fqdn)
-                else:
-                    added.append(fqdn)
+            if fqdn in entries:
+                if entries[fqdn] != new_line:
+                    updated.append(fqdn)
+            else:
+                added.append(fqdn)
 
-                entries[fqdn] = new_line
+            entries[fqdn] = new_line
 
         # Write updated hosts file
-        total = self.write_hosts_file(comments, entries)
+        try:
+            written = self.write_hosts_file(comments, entries)
+        except OSError as e:
+            logger.error(f"Could not write {self.hosts_file}: {e}")
+            return 1
 
         # Print summary
         if added:
@@ -322,15 +664,68 @@ class TraefikHostsExtractor:
         if updated:
             logger.info(f"Updated: {', '.join(updated)}")
 
-        logger.info(f"Wrote {total} host entries to {self.hosts_file}")
+        if written:
+            logger.info(f"Wrote {len(entries)} host entries to {self.hosts_file}")
+        else:
+            logger.info(f"Hosts file unchanged ({len(entries)} entries)")
 
         return 0
 
+    def _watch_state(self) -> tuple:
+        """Cheap fingerprint of every input to sync()."""
+        paths = [*self.env_files(), *self.get_external_files()]
+        if self.services_enabled.is_dir():
+            # Compose files and per-service .env files
+            paths += sorted(self.services_enabled.iterdir())
+        state = []
+        for path in paths:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            state.append((str(path), st.st_mtime_ns, st.st_size))
+        return tuple(state)
+
+    def watch(
+        self, interval: float = WATCH_INTERVAL, cycles: int | None = None, sleep=time.sleep, services: bool = True
+    ) -> int:
+        """Sync now, then again whenever externals, services or .env files change.
+
+        Polls the inputs' mtimes every interval seconds, which needs no
+        inotify support from the host or bind mount.
+
+        Args:
+            interval: Seconds between checks
+            cycles: Stop after this many checks (default: run until interrupted)
+            sleep: Sleep function (for tests)
+            services: Include hosts from router labels of enabled services
+
+        Returns:
+            Exit code of the last sync
+        """
+        state = self._watch_state()
+        result = self.sync(services=services)
+        logger.info(f"Watching {self.external_enabled}, {self.services_enabled} and .env files for changes")
+
+        checks = 0
+        try:
+            while cycles is None or checks < cycles:
+                sleep(interval)
+                checks += 1
+                current = self._watch_state()
+                if current != state:
+                    state = current
+                    result = self.sync(services=services)
+        except KeyboardInterrupt:
+            pass
+
+        return result
+
 
 def main() -> int:
     """Command-line entry point."""
     parser = argparse.ArgumentParser(
-        description="Extract Traefik external Host() rules for Joyride DNS",
+        description="Extract Traefik Host() rules for Joyride DNS",
     )
     parser.add_argument(
         "command",
@@ -343,6 +738,22 @@ def main() -> int:
         default=None,
         help="Repository root directory (default: /app)",
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-sync when externals, services or .env files change",
+    )
+    parser.add_argument(
+        "--externals-only",
+        action="store_true",
+        help="Only sync hosts from external-enabled/, not service labels",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=WATCH_INTERVAL,
+        help=f"Seconds between checks in watch mode (default: {WATCH_INTERVAL})",
+    )
 
     args = parser.parse_args()
 
@@ -352,7 +763,10 @@ def main() -> int:
     extractor = TraefikHostsExtractor(base_dir=args.base_dir)
 
     if args.command == "sync":
-        return extractor.sync()
+        services = not args.externals_only
+        if args.watch:
+            return extractor.watch(interval=args.interval, services=services)
+        return extractor.sync(services=services)
 
     return 0
 
@@ -0,0 +1,65 @@
+"""Tests for config API endpoints."""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+
+@pytest.fixture
+def config_client(service_manager):
+    """Client for an app with the config router."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from dashboard.api import config
+
+    app = FastAPI()
+    app.state.services = service_manager
+    app.include_router(config.router, prefix="/api/config")
+    return TestClient(app)
+
+
+class TestEffectiveEnvAPI:
+    """Tests for /api/config/effective."""
+
+    def test_values_with_sources(self, config_client, temp_services_dir):
+        services_enabled = temp_services_dir / "services-enabled"
+        (services_enabled / ".env").write_text("HOST_DOMAIN=example.com\nTZ=UTC\n")
+        (services_enabled / "app.env").write_text(
+            "TZ=Europe/Paris\nURL=app.${HOST_DOMAIN}\n"
+        )
+
+        response = config_client.get("/api/config/effective")
+
+        assert response.status_code == 200
+        variables = {v["name"]: v for v in response.json()["variables"]}
+        assert variables["TZ"] == {
+            "name": "TZ",
+            "value": "Europe/Paris",
+            "raw": "Europe/Paris",
+            "source": "services-enabled/app.env",
+            "shadowed": ["services-enabled/.env"],
+        }
+        assert variables["URL"]["value"] == "app.example.com"
+
+
+class TestServiceVariablesAPI:
+    """Tests for /api/config/service/{name}/variables."""
+
+    def test_template_variables(self, config_client, temp_services_dir):
+        scaffold = temp_services_dir / "services-scaffold" / "app"
+        scaffold.mkdir(parents=True)
+        (scaffold / "env.template").write_text(
+            "# App settings\nAPP_SECRET=\nAPP_PORT=${APP_PORT:-8080}\n"
+        )
+
+        response = config_client.get("/api/config/service/app/variables")
+
+        assert response.json()["variables"] == [
+            {"name": "APP_SECRET", "default": "", "required": True},
+            {"name": "APP_PORT", "default": "${APP_PORT:-8080}", "required": False},
+        ]
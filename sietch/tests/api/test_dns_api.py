@@ -0,0 +1,136 @@
+"""Tests for DNS API endpoints."""
+
+from contextlib import asynccontextmanager
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+
+@pytest.fixture
+def dns_app(local_cloudflare_server, tmp_path):
+    """App with the DNS router and a shared Cloudflare client, as in production."""
+    from fastapi import FastAPI
+
+    from dashboard.api import dns
+    from dashboard.core.cloudflare_client import create_cloudflare_client
+
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.cloudflare = create_cloudflare_client(
+            tmp_path,
+            api_token="test-token",
+            domain="example.com",
+            base_url=local_cloudflare_server.base_url,
+        )
+        yield
+        await app.state.cloudflare.aclose()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(dns.router, prefix="/api/dns")
+    return app
+
+
+@pytest.fixture
+def dns_client(dns_app):
+    """Client running the app's lifespan on one event loop."""
+    from fastapi.testclient import TestClient
+
+    with TestClient(dns_app) as client:
+        yield client
+
+
+class TestDnsRecordsAPI:
+    """Tests for /api/dns/zones endpoints."""
+
+    def test_list_zones(self, dns_client):
+        response = dns_client.get("/api/dns/zones")
+
+        assert response.status_code == 200
+        assert response.json()["zones"][0]["id"] == "zone123"
+
+    def test_create_list_delete(self, dns_client, local_cloudflare_server):
+        response = dns_client.post(
+            "/api/dns/zones/zone123/records",
+            json={"type": "A", "name": "app.example.com", "content": "192.0.2.1"},
+        )
+        assert response.status_code == 200
+        record_id = response.json()["record"]["id"]
+
+        response = dns_client.get("/api/dns/zones/zone123/records?type=A")
+        assert response.json()["count"] == 1
+
+        response = dns_client.delete(f"/api/dns/zones/zone123/records/{record_id}")
+        assert response.json() == {"success": True, "deleted": record_id}
+        assert local_cloudflare_server.records == {}
+
+    def test_requests_share_one_connection(self, dns_client, local_cloudflare_server):
+        for _ in range(5):
+            dns_client.get("/api/dns/zones/zone123/records")
+
+        assert len(local_cloudflare_server.requests) == 5
+        assert len(local_cloudflare_server.connections) == 1
+
+    def test_api_error(self, dns_client):
+        response = dns_client.delete("/api/dns/zones/zone123/records/missing")
+
+        assert response.status_code == 500
+        assert "Record does not exist" in response.json()["detail"]
+
+    def test_not_configured(self, monkeypatch):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from dashboard.api import dns
+        from dashboard.core.cloudflare_client import create_cloudflare_client
+
+        monkeypatch.delenv("CF_DNS_API_TOKEN", raising=False)
+        app = FastAPI()
+        app.state.cloudflare = create_cloudflare_client(Path("/nonexistent"))
+        app.include_router(dns.router, prefix="/api/dns")
+
+        response = TestClient(app).get("/api/dns/zones")
+
+        assert response.status_code == 503
+
+
+class TestHostsAPI:
+    """Tests for /api/dns/hosts."""
+
+    def test_lists_hosts_with_sources(
+        self, temp_services_dir, service_manager, monkeypatch
+    ):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from dashboard.api import dns
+
+        monkeypatch.setenv("HOST_DOMAIN", "example.com")
+        (temp_services_dir / "services-enabled" / "app.yml").write_text(
+            "services:\n"
+            "  app:\n"
+            "    labels:\n"
+            "      - traefik.http.routers.app.rule=Host(`app.${HOST_DOMAIN}`)"
+            " || HostRegexp(`{sub:[a-z]+}.${HOST_DOMAIN}`)\n"
+        )
+        app = FastAPI()
+        app.state.services = service_manager
+        app.include_router(dns.router, prefix="/api/dns")
+
+        response = TestClient(app).get("/api/dns/hosts")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "hosts": [
+                {"fqdn": "app.example.com", "sources": ["services-enabled/app.yml"]}
+            ],
+            "patterns": [
+                {
+                    "pattern": "{sub:[a-z]+}.example.com",
+                    "sources": ["services-enabled/app.yml"],
+                }
+            ],
+        }
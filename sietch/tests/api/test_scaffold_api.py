@@ -0,0 +1,58 @@
+"""Tests for scaffold API endpoints."""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+
+@pytest.fixture
+def scaffold_client(service_manager):
+    """Client for an app with the scaffold router."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from dashboard.api import scaffold
+
+    app = FastAPI()
+    app.state.services = service_manager
+    app.include_router(scaffold.router, prefix="/api/scaffold")
+    return TestClient(app)
+
+
+class TestScaffoldInfoAPI:
+    """Tests for /api/scaffold/{name}."""
+
+    def test_file_types(self, scaffold_client, temp_services_dir):
+        scaffold = temp_services_dir / "services-scaffold" / "app"
+        (scaffold / "conf").mkdir(parents=True)
+        (scaffold / "env.template").write_text("APP_PORT=8080\n")
+        (scaffold / "scaffold.yml").write_text("operations: []\n")
+        (scaffold / "MESSAGE.txt").write_text("Hello\n")
+        (scaffold / "README.md").write_text("# App\n")
+        (scaffold / "conf" / "app.conf").write_text("port 8080\n")
+        (scaffold / "conf" / "scaffold.yml").write_text("operations: []\n")
+        (scaffold / "conf" / "MESSAGE.txt").write_text("Nested\n")
+
+        response = scaffold_client.get("/api/scaffold/app")
+
+        data = response.json()
+        assert {f["path"]: f["type"] for f in data["files"]} == {
+            "MESSAGE.txt": "message",
+            "README.md": "static",
+            "conf/MESSAGE.txt": "message",
+            "conf/app.conf": "static",
+            "conf/scaffold.yml": "manifest",
+            "env.template": "template",
+            "scaffold.yml": "manifest",
+        }
+        assert data["has_manifest"] is True
+        assert data["message"] == "Hello\n"
+
+    def test_missing_scaffold(self, scaffold_client):
+        response = scaffold_client.get("/api/scaffold/missing")
+
+        assert response.json()["exists"] is False
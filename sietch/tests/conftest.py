@@ -25,6 +25,26 @@ def find_log_record(caplog):
     return find
 
 
+@pytest.fixture
+def local_http_server():
+    """Real HTTP server on 127.0.0.1 for exercising HTTP clients."""
+    from tests.mocks.http_server import LocalHttpServer
+
+    server = LocalHttpServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def local_cloudflare_server():
+    """Local stand-in for the Cloudflare DNS API on 127.0.0.1."""
+    from tests.mocks.cloudflare_server import LocalCloudflareServer
+
+    server = LocalCloudflareServer().start()
+    yield server
+    server.stop()
+
+
 # =============================================================================
 # Mock Docker Client
 # =============================================================================
@@ -1,9 +1,13 @@
 """Tests for dashboard icon resolution."""
 
+import json
+import os
+
 import pytest
 
 from dashboard.core.icons import (
     FALLBACK_ICON,
+    get_icon_href,
     get_icon_url,
     resolve_icon_filename,
 )
@@ -56,3 +60,51 @@ class TestGetIconUrl:
     def test_strips_whitespace(self):
         """Should strip whitespace from service name."""
         assert get_icon_url("  plex  ") == "/static/icons/plex.svg"
+
+
+class TestGetIconHref:
+    """Tests for get_icon_href."""
+
+    @pytest.fixture
+    def icons_dir(self, tmp_path):
+        (tmp_path / "sprite.json").write_text(
+            json.dumps(
+                {
+                    "sprite": "sprite.0123456789ab.svg",
+                    "icons": {"docker": "docker", "plex": "plex", "whoami": "docker"},
+                }
+            )
+        )
+        return tmp_path
+
+    def test_symbol_in_sprite(self, icons_dir):
+        """Should reference the icon's symbol in the hashed sprite."""
+        href = get_icon_href("/static/icons/whoami.svg", icons_dir)
+        assert href == "/static/icons/sprite.0123456789ab.svg#docker"
+
+    def test_missing_icon_uses_fallback_symbol(self, icons_dir):
+        """Should use the fallback symbol for icons without a file."""
+        href = get_icon_href("/static/icons/unknown.svg", icons_dir)
+        assert href == "/static/icons/sprite.0123456789ab.svg#docker"
+
+    def test_icon_left_out_of_sprite(self, icons_dir):
+        """Should return None for icons with a file but no symbol."""
+        (icons_dir / "app.svg").write_text("<svg/>")
+        assert get_icon_href("/static/icons/app.svg", icons_dir) is None
+
+    def test_no_sprite(self, tmp_path):
+        """Should return None when no sprite has been built."""
+        assert get_icon_href("/static/icons/plex.svg", tmp_path) is None
+
+    def test_manifest_reloaded_when_changed(self, icons_dir):
+        """Should pick up a rebuilt sprite."""
+        get_icon_href("/static/icons/plex.svg", icons_dir)
+        manifest = icons_dir / "sprite.json"
+        manifest.write_text(
+            json.dumps({"sprite": "sprite.ba9876543210.svg", "icons": {"plex": "plex"}})
+        )
+        stat = manifest.stat()
+        os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        href = get_icon_href("/static/icons/plex.svg", icons_dir)
+        assert href == "/static/icons/sprite.ba9876543210.svg#plex"
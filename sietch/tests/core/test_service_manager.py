@@ -214,6 +214,26 @@ class TestServiceManagerGetServiceInfo:
         assert info is None
 
 
+class TestServiceManagerGetOverrides:
+    """Tests for get_overrides method."""
+
+    def test_get_overrides(self, service_manager, temp_services_dir):
+        """Should list overrides for the service with enabled status."""
+        (temp_services_dir / "overrides-available").mkdir()
+        (temp_services_dir / "overrides-enabled").mkdir()
+        (temp_services_dir / "overrides-available" / "plex-nfs.yml").touch()
+        (temp_services_dir / "overrides-available" / "sonarr-nfs.yml").touch()
+        (temp_services_dir / "overrides-enabled" / "plex-nfs.yml").touch()
+
+        overrides = service_manager.get_overrides("plex")
+
+        assert overrides == [{"name": "plex-nfs", "enabled": True}]
+
+    def test_get_overrides_none(self, service_manager):
+        """Should return an empty list when no overrides exist."""
+        assert service_manager.get_overrides("plex") == []
+
+
 class TestServiceManagerValidate:
     """Tests for validate_service method (on underlying scripts.services.ServiceManager)."""
 
@@ -0,0 +1,49 @@
+"""Tests for static file cache headers."""
+
+import pytest
+
+
+@pytest.fixture
+def static_client(tmp_path):
+    """Client for an app serving tmp_path as /static."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from dashboard.core.static_files import CachedStaticFiles
+
+    (tmp_path / "styles.css").write_text("body {}")
+    (tmp_path / "sprite.0123456789ab.svg").write_text("<svg/>")
+    app = FastAPI()
+    app.mount("/static", CachedStaticFiles(directory=tmp_path), name="static")
+    return TestClient(app)
+
+
+class TestCacheHeaders:
+    """Tests for CachedStaticFiles."""
+
+    def test_hashed_file_immutable(self, static_client):
+        """Should let browsers keep content-hashed files for good."""
+        response = static_client.get("/static/sprite.0123456789ab.svg")
+
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+        assert response.headers["ETag"]
+
+    def test_other_files_revalidated(self, static_client):
+        """Should make browsers revalidate files that keep their name."""
+        response = static_client.get("/static/styles.css")
+
+        assert response.headers["Cache-Control"] == "no-cache"
+
+    def test_not_modified(self, static_client):
+        """Should answer a matching ETag with 304 and the same headers."""
+        etag = static_client.get("/static/styles.css").headers["ETag"]
+
+        response = static_client.get(
+            "/static/styles.css", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert response.headers["ETag"] == etag
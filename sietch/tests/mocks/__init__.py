@@ -1,7 +1,16 @@
 """Mock implementations for testing."""
 
 from tests.mocks.http import MockHttpClient
+from tests.mocks.http_server import LocalHttpServer
+from tests.mocks.cloudflare_server import LocalCloudflareServer
 from tests.mocks.command import MockCommandExecutor
-from tests.mocks.docker import MockDockerExecutor
+from tests.mocks.docker import MockContainerLister, MockDockerExecutor
 
-__all__ = ["MockHttpClient", "MockCommandExecutor", "MockDockerExecutor"]
+__all__ = [
+    "MockHttpClient",
+    "LocalHttpServer",
+    "LocalCloudflareServer",
+    "MockCommandExecutor",
+    "MockDockerExecutor",
+    "MockContainerLister",
+]
@@ -0,0 +1,226 @@
+"""Local stand-in for the Cloudflare v4 DNS API, for end-to-end tests."""
+
+import itertools
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ZONE_PATH = re.compile(r"^/client/v4/zones/([^/]+)(/dns_records(?:/([^/]+))?)?$")
+
+
+class LocalCloudflareServer:
+    """Threaded HTTP server emulating the zone and DNS record endpoints.
+
+    Holds one zone in memory. Supports zone lookup by name, paginated
+    record listing, create/patch/delete, and the batch endpoint (applied
+    atomically: a failing operation leaves the zone unchanged). Speaks
+    HTTP/1.1 keep-alive. Records every request as (method, path), and the
+    client address of every connection, for later assertion.
+    """
+
+    def __init__(self, domain: str = "example.com", token: str = "test-token"):
+        self.domain = domain
+        self.token = token
+        self.zone_id = "zone123"
+        self.records: dict[str, dict] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.connections: list[tuple[str, int]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    def start(self) -> "LocalCloudflareServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread.is_alive():
+            self._server.shutdown()
+            self._server.server_close()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/client/v4"
+
+    def add_record(self, record_type: str, name: str, content: str, **fields) -> dict:
+        """Seed a record into the zone."""
+        record = {
+            "id": f"rec{next(self._ids)}",
+            "type": record_type,
+            "name": name,
+            "content": content,
+            "proxied": False,
+            "ttl": 1,
+            "comment": None,
+            **fields,
+        }
+        self.records[record["id"]] = record
+        return record
+
+    def by_name(self) -> dict[str, dict]:
+        """Current records keyed by name (last one wins)."""
+        return {r["name"]: r for r in self.records.values()}
+
+    def _create(self, records: dict[str, dict], body: dict) -> dict:
+        if any(r["name"] == body.get("name") for r in records.values()):
+            raise ValueError("An identical record already exists.")
+        record = {"id": f"rec{next(self._ids)}", "proxied": False, "ttl": 1, **body}
+        records[record["id"]] = record
+        return record
+
+    def _patch(self, records: dict[str, dict], record_id: str, body: dict) -> dict:
+        if record_id not in records:
+            raise ValueError("Record does not exist.")
+        records[record_id] = {**records[record_id], **body, "id": record_id}
+        return records[record_id]
+
+    def _delete(self, records: dict[str, dict], record_id: str) -> dict:
+        if records.pop(record_id, None) is None:
+            raise ValueError("Record does not exist.")
+        return {"id": record_id}
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                server.connections.append(self.client_address)
+
+            def _reply(self, status: int, payload: dict) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _error(self, status: int, message: str) -> None:
+                self._reply(
+                    status,
+                    {
+                        "success": False,
+                        "errors": [{"message": message}],
+                        "result": None,
+                    },
+                )
+
+            def _body(self) -> dict:
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def _handle(self, method: str) -> None:
+                server.requests.append((method, self.path))
+                if self.headers.get("Authorization") != f"Bearer {server.token}":
+                    self._error(403, "Invalid API token")
+                    return
+
+                url = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if method == "GET" and url.path == "/client/v4/zones":
+                    zones = [{"id": server.zone_id, "name": server.domain}]
+                    if query.get("name", server.domain) != server.domain:
+                        zones = []
+                    self._reply(200, {"success": True, "result": zones})
+                    return
+
+                match = ZONE_PATH.match(url.path)
+                if not match or match.group(1) != server.zone_id:
+                    self._error(404, "Invalid zone identifier")
+                    return
+
+                with server._lock:
+                    try:
+                        self._zone(method, match.group(2), match.group(3), query)
+                    except ValueError as e:
+                        self._error(400, str(e))
+
+            def _zone(self, method, records_path, record_id, query) -> None:
+                records = server.records
+                if records_path is None:
+                    self._reply(
+                        200,
+                        {
+                            "success": True,
+                            "result": {"id": server.zone_id, "name": server.domain},
+                        },
+                    )
+                elif method == "GET" and record_id is None:
+                    matching = [
+                        r
+                        for r in records.values()
+                        if query.get("type", r["type"]) == r["type"]
+                        and query.get("name", r["name"]) == r["name"]
+                    ]
+                    per_page = int(query.get("per_page", 100))
+                    page = int(query.get("page", 1))
+                    total_pages = max(1, -(-len(matching) // per_page))
+                    self._reply(
+                        200,
+                        {
+                            "success": True,
+                            "result": matching[(page - 1) * per_page : page * per_page],
+                            "result_info": {
+                                "page": page,
+                                "per_page": per_page,
+                                "total_count": len(matching),
+                                "total_pages": total_pages,
+                            },
+                        },
+                    )
+                elif method == "POST" and record_id == "batch":
+                    body = self._body()
+                    staged = dict(records)
+                    result = {
+                        "deletes": [
+                            server._delete(staged, op["id"])
+                            for op in body.get("deletes", [])
+                        ],
+                        "patches": [
+                            server._patch(staged, op["id"], op)
+                            for op in body.get("patches", [])
+                        ],
+                        "posts": [
+                            server._create(staged, op) for op in body.get("posts", [])
+                        ],
+                    }
+                    server.records = staged
+                    self._reply(200, {"success": True, "result": result})
+                elif method == "POST" and record_id is None:
+                    record = server._create(records, self._body())
+                    self._reply(200, {"success": True, "result": record})
+                elif method == "PATCH" and record_id:
+                    record = server._patch(records, record_id, self._body())
+                    self._reply(200, {"success": True, "result": record})
+                elif method == "DELETE" and record_id:
+                    self._reply(
+                        200,
+                        {"success": True, "result": server._delete(records, record_id)},
+                    )
+                else:
+                    self._error(405, "Method not allowed")
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_PATCH(self):
+                self._handle("PATCH")
+
+            def do_DELETE(self):
+                self._handle("DELETE")
+
+        return Handler
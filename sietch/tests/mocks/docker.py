@@ -75,3 +75,16 @@ class MockDockerExecutor:
     def reset(self) -> None:
         """Clear all recorded calls."""
         self.calls.clear()
+
+
+class MockContainerLister:
+    """Mock container lister returning preconfigured container summaries."""
+
+    def __init__(self, containers: list[dict] | None = None):
+        self.containers: list[dict] = containers or []
+        self.calls: list[bool] = []
+
+    def list_containers(self, all: bool = True) -> list[dict]:
+        """Return the configured summaries and record the call."""
+        self.calls.append(all)
+        return self.containers
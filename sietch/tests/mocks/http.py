@@ -10,8 +10,16 @@ class MockHttpClient:
         self.responses: dict[tuple[str, str], tuple[int, bytes]] = {}
         self.calls: list[tuple[str, str, dict | None, bytes | None]] = []
         self.default_response: tuple[int, bytes] = (404, b'{"error": "not found"}')
+        self.response_headers: dict[tuple[str, str], dict[str, str]] = {}
 
-    def set_response(self, method: str, url: str, status: int, body: bytes | dict) -> None:
+    def set_response(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        body: bytes | dict,
+        headers: dict[str, str] | None = None,
+    ) -> None:
         """Configure a response for a specific method/url combination.
 
         Args:
@@ -19,10 +27,12 @@ class MockHttpClient:
             url: Full URL or URL pattern
             status: HTTP status code to return
             body: Response body (bytes or dict to be JSON-encoded)
+            headers: Response headers returned by request_with_headers
         """
         if isinstance(body, dict):
             body = json.dumps(body).encode()
         self.responses[(method, url)] = (status, body)
+        self.response_headers[(method, url)] = headers or {}
 
     def set_default_response(self, status: int, body: bytes | dict) -> None:
         """Set the default response for unmatched requests."""
@@ -55,6 +65,21 @@ class MockHttpClient:
 
         return self.default_response
 
+    def request_with_headers(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        data: bytes | None = None,
+        timeout: float = 30,
+    ) -> tuple[int, dict[str, str], bytes]:
+        """Mock HTTP request that also returns the configured response headers."""
+        status, body = self.request(method, url, headers, data, timeout)
+        for (m, u), response_headers in self.response_headers.items():
+            if m == method and u in url:
+                return status, response_headers, body
+        return status, {}, body
+
     def assert_called_once(self) -> None:
         """Assert that exactly one request was made."""
         assert len(self.calls) == 1, f"Expected 1 call, got {len(self.calls)}"
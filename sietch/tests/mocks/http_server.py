@@ -0,0 +1,168 @@
+"""Local HTTP server for tests that exercise real HTTP clients."""
+
+import gzip
+import socket
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass
+class StaticFile:
+    """A file served by LocalHttpServer."""
+
+    body: bytes
+    etag: str = ""
+    last_modified: str = ""
+    # Close the connection after this many body bytes (simulates a drop)
+    truncate_at: int | None = None
+    # Send gzip-encoded when the client accepts it
+    compress: bool = False
+    # (status, headers) answered, in order, before the file is served
+    failures: list[tuple[int, dict[str, str]]] = field(default_factory=list)
+    # Requests read and then dropped without an answer, as a server closing
+    # a kept-alive connection after processing a request
+    drops: int = 0
+    # Extra response headers
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class LocalHttpServer:
+    """Threaded HTTP server on 127.0.0.1 serving registered files.
+
+    Supports conditional requests (If-None-Match / If-Modified-Since),
+    single byte-range requests guarded by If-Range, gzip encoding and
+    HTTP/1.1 keep-alive. Records every request, and the client address of
+    every connection, for later assertion.
+    """
+
+    def __init__(self):
+        self.files: dict[str, StaticFile] = {}
+        self.requests: list[tuple[str, str, dict[str, str]]] = []
+        self.connections: list[tuple[str, int]] = []
+        self._sockets: list[socket.socket] = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    def start(self) -> "LocalHttpServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread.is_alive():
+            self._server.shutdown()
+            self._server.server_close()
+            # Kept-alive connections would otherwise go on being served
+            for sock in self._sockets:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def url(self, path: str) -> str:
+        """Return the full URL for a path on this server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def add_file(self, path: str, body: bytes, **kwargs) -> StaticFile:
+        """Serve body at path (kwargs: any StaticFile field)."""
+        self.files[path] = StaticFile(body, **kwargs)
+        return self.files[path]
+
+    def requests_for(self, path: str) -> list[dict[str, str]]:
+        """Return the headers of every request made for path."""
+        return [headers for _, p, headers in self.requests if p == path]
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                server.connections.append(self.client_address)
+                server._sockets.append(self.connection)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self.do_GET("POST")
+
+            def do_GET(self, method="GET"):
+                server.requests.append((method, self.path, dict(self.headers)))
+                file = server.files.get(self.path)
+                if file is None:
+                    self.send_error(404)
+                    return
+
+                if file.drops:
+                    file.drops -= 1
+                    self.close_connection = True
+                    return
+
+                if file.failures:
+                    status, headers = file.failures.pop(0)
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                validators = {file.etag, file.last_modified} - {""}
+                if (
+                    self.headers.get("If-None-Match") in validators
+                    or self.headers.get("If-Modified-Since") in validators
+                ):
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+
+                body, status, start = file.body, 200, 0
+                range_header = self.headers.get("Range", "")
+                if range_header.startswith("bytes=") and self.headers.get(
+                    "If-Range"
+                ) in (validators or {None}):
+                    start = int(range_header[6:].split("-")[0])
+                    if start >= len(body):
+                        self.send_error(416)
+                        return
+                    status = 206
+
+                encode = (
+                    file.compress
+                    and status == 200
+                    and "gzip" in self.headers.get("Accept-Encoding", "")
+                )
+                if encode:
+                    body = gzip.compress(body)
+
+                self.send_response(status)
+                if encode:
+                    self.send_header("Content-Encoding", "gzip")
+                if file.etag:
+                    self.send_header("ETag", file.etag)
+                if file.last_modified:
+                    self.send_header("Last-Modified", file.last_modified)
+                for name, value in file.headers.items():
+                    self.send_header(name, value)
+                if status == 206:
+                    self.send_header(
+                        "Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}"
+                    )
+                self.send_header("Content-Length", str(len(body) - start))
+                self.end_headers()
+
+                payload = body[start:]
+                if file.truncate_at is not None:
+                    payload = payload[: file.truncate_at]
+                    file.truncate_at = None
+                    self.close_connection = True
+                self.wfile.write(payload)
+
+        return Handler
@@ -1,5 +1,9 @@
 """Tests for cloudflare.py with mocked HTTP client."""
 
+import asyncio
+import json
+import time
+
 import pytest
 import sys
 from pathlib import Path
@@ -7,7 +11,16 @@ from pathlib import Path
 # Add scripts to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
-from cloudflare import CloudflareAPI
+import cloudflare
+from cloudflare import (
+    DNS_MANAGED_COMMENT,
+    AsyncCloudflareAPI,
+    CloudflareAPI,
+    ZoneCache,
+    apply_dns_plan,
+    desired_dns_records,
+    plan_dns_sync,
+)
 from tests.mocks.http import MockHttpClient
 
 
@@ -490,3 +503,492 @@ class TestRequestErrorHandling:
 
         with pytest.raises(RuntimeError, match="HTTP 500"):
             api._request("GET", "/zones")
+
+
+ZONE_RESPONSE = {"success": True, "result": [{"id": "zone123"}]}
+
+
+def record(n: int) -> dict:
+    return {
+        "id": f"rec{n}",
+        "type": "A",
+        "name": f"h{n}.example.com",
+        "content": "1.2.3.4",
+    }
+
+
+class TestZoneIdCache:
+    """Tests for zone ID caching in memory and on disk."""
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+        (tmp_path / "etc").mkdir()
+        return tmp_path / "etc" / ".cache" / "cloudflare_zones.json"
+
+    @pytest.fixture
+    def mock_http(self):
+        http = MockHttpClient()
+        http.set_response("GET", "/zones?name=example.com", 200, ZONE_RESPONSE)
+        http.set_response(
+            "GET",
+            "dns_records?type=CNAME&name=test.example.com",
+            200,
+            {"success": True, "result": [{"id": "rec456"}]},
+        )
+        http.set_response("DELETE", "/dns_records/rec456", 200, {"success": True})
+        return http
+
+    def make_api(self, mock_http, cache_path):
+        return CloudflareAPI(
+            api_token="test-token",
+            domain="example.com",
+            http_client=mock_http,
+            zone_cache_path=cache_path,
+        )
+
+    def test_zone_looked_up_once_per_instance(self, mock_http, cache_path):
+        api = self.make_api(mock_http, cache_path)
+
+        api.delete_dns_record("test")
+        assert len(mock_http.calls) == 3
+        mock_http.reset()
+        api.delete_dns_record("test")
+
+        assert [m for m, *_ in mock_http.calls] == ["GET", "DELETE"]
+
+    def test_zone_id_persisted_between_instances(self, mock_http, cache_path):
+        self.make_api(mock_http, cache_path).get_zone_id()
+        mock_http.reset()
+
+        assert self.make_api(mock_http, cache_path).get_zone_id() == "zone123"
+        assert mock_http.calls == []
+        assert json.loads(cache_path.read_text())["example.com"]["id"] == "zone123"
+
+    def test_expired_entry_ignored(self, mock_http, cache_path):
+        cache_path.parent.mkdir()
+        cache_path.write_text(
+            json.dumps({"example.com": {"id": "old", "expires": time.time() - 1}})
+        )
+
+        assert self.make_api(mock_http, cache_path).get_zone_id() == "zone123"
+        mock_http.assert_called_once()
+
+    def test_not_written_outside_onramp_tree(self, mock_http, tmp_path):
+        cache_path = tmp_path / "missing" / ".cache" / "zones.json"
+
+        self.make_api(mock_http, cache_path).get_zone_id()
+
+        assert not cache_path.exists()
+
+    def test_stale_cached_zone_refreshed(self, mock_http, cache_path):
+        ZoneCache(cache_path).put("example.com", "oldzone")
+        mock_http.set_response(
+            "GET",
+            "/zones/oldzone",
+            400,
+            {"success": False, "errors": [{"message": "Invalid zone identifier"}]},
+        )
+        mock_http.set_response(
+            "GET",
+            "/zones/zone123",
+            200,
+            {"success": True, "result": {"name": "example.com"}},
+        )
+
+        info = self.make_api(mock_http, cache_path).get_zone_info()
+
+        assert info["name"] == "example.com"
+        assert ZoneCache(cache_path).get("example.com") == "zone123"
+
+
+class TestIterDnsRecords:
+    """Tests for paginated and streamed DNS record listing."""
+
+    @pytest.fixture
+    def mock_http(self):
+        http = MockHttpClient()
+        http.set_response("GET", "/zones?name=example.com", 200, ZONE_RESPONSE)
+        return http
+
+    @pytest.fixture
+    def api(self, mock_http):
+        return CloudflareAPI(
+            api_token="test-token",
+            domain="example.com",
+            http_client=mock_http,
+            zone_cache_path=None,
+        )
+
+    def set_pages(self, mock_http, records, per_page):
+        pages = [records[i : i + per_page] for i in range(0, len(records), per_page)]
+        for number, page in enumerate(pages, 1):
+            mock_http.set_response(
+                "GET",
+                f"&page={number}",
+                200,
+                {
+                    "success": True,
+                    "result": page,
+                    "result_info": {
+                        "page": number,
+                        "per_page": per_page,
+                        "total_pages": len(pages),
+                    },
+                },
+            )
+
+    def test_follows_every_page(self, api, mock_http):
+        self.set_pages(mock_http, [record(n) for n in range(5)], per_page=2)
+
+        records = list(api.iter_dns_records(per_page=2))
+
+        assert [r["id"] for r in records] == [f"rec{n}" for n in range(5)]
+        assert len(mock_http.calls) == 4  # zone + 3 pages
+
+    def test_list_uses_large_pages(self, api, mock_http):
+        self.set_pages(mock_http, [record(n) for n in range(150)], per_page=5000)
+
+        assert len(api.list_dns_records()) == 150
+        mock_http.assert_called_with(
+            "GET", "/zones/zone123/dns_records?per_page=5000&page=1"
+        )
+        assert len(mock_http.calls) == 2
+
+    def test_streams_lazily(self, api, mock_http):
+        self.set_pages(mock_http, [record(n) for n in range(6)], per_page=2)
+
+        first = next(api.iter_dns_records(per_page=2))
+
+        assert first["id"] == "rec0"
+        assert len(mock_http.calls) == 2
+
+    def test_follows_cursors(self, api, mock_http):
+        mock_http.set_response(
+            "GET",
+            "&page=1",
+            200,
+            {
+                "success": True,
+                "result": [record(0)],
+                "result_info": {"cursors": {"after": "c1"}},
+            },
+        )
+        mock_http.set_response(
+            "GET",
+            "cursor=c1",
+            200,
+            {"success": True, "result": [record(1)], "result_info": {"cursors": {}}},
+        )
+
+        records = api.list_dns_records()
+
+        assert [r["id"] for r in records] == ["rec0", "rec1"]
+
+
+def managed(record_type: str, name: str, content: str, **fields) -> dict:
+    return {
+        "type": record_type,
+        "name": name,
+        "content": content,
+        "proxied": True,
+        "comment": DNS_MANAGED_COMMENT,
+        **fields,
+    }
+
+
+class TestAsyncCloudflareAPI:
+    """Tests for AsyncCloudflareAPI against a local Cloudflare stand-in."""
+
+    @pytest.fixture
+    async def api(self, local_cloudflare_server, tmp_path):
+        (tmp_path / "etc").mkdir()
+        api = AsyncCloudflareAPI(
+            api_token="test-token",
+            domain="example.com",
+            zone_cache_path=tmp_path / "etc" / ".cache" / "zones.json",
+            base_url=local_cloudflare_server.base_url,
+        )
+        yield api
+        await api.aclose()
+
+    def zone_lookups(self, server):
+        return [
+            path for _, path in server.requests if path.startswith("/client/v4/zones?")
+        ]
+
+    async def test_concurrent_requests_share_zone_lookup(
+        self, api, local_cloudflare_server
+    ):
+        local_cloudflare_server.add_record("A", "a.example.com", "192.0.2.1")
+
+        results = await asyncio.gather(*(api.list_dns_records() for _ in range(5)))
+
+        assert all(len(records) == 1 for records in results)
+        assert len(self.zone_lookups(local_cloudflare_server)) == 1
+
+    async def test_reuses_connection(self, api, local_cloudflare_server):
+        for _ in range(3):
+            await api.get_zone_info()
+
+        assert len(local_cloudflare_server.requests) == 4
+        assert len(local_cloudflare_server.connections) == 1
+
+    async def test_follows_every_page(self, api, local_cloudflare_server):
+        for n in range(5):
+            local_cloudflare_server.add_record("A", f"h{n}.example.com", "192.0.2.1")
+
+        records = [r async for r in api.iter_dns_records(per_page=2)]
+
+        assert [r["name"] for r in records] == [f"h{n}.example.com" for n in range(5)]
+        assert len(local_cloudflare_server.requests) == 4
+
+    async def test_explicit_zone_skips_lookup(self, api, local_cloudflare_server):
+        record = await api.create_dns_record(
+            {"type": "A", "name": "new.example.com", "content": "192.0.2.1"},
+            zone_id="zone123",
+        )
+        await api.delete_dns_record_by_id(record["id"], zone_id="zone123")
+
+        assert local_cloudflare_server.records == {}
+        assert self.zone_lookups(local_cloudflare_server) == []
+
+    async def test_list_zones(self, api):
+        zones = await api.list_zones()
+
+        assert zones == [{"id": "zone123", "name": "example.com"}]
+
+    async def test_stale_cached_zone_refreshed(self, api, local_cloudflare_server):
+        api.zone_cache.put("example.com", "oldzone")
+
+        info = await api.get_zone_info()
+
+        assert info["id"] == "zone123"
+        assert api.zone_cache.get("example.com") == "zone123"
+
+    async def test_api_error_raises(self, api):
+        with pytest.raises(RuntimeError, match="Record does not exist"):
+            await api.delete_dns_record_by_id("missing")
+
+
+class TestPlanDnsSync:
+    """Tests for desired_dns_records() and plan_dns_sync()."""
+
+    TARGET = "home.example.com"
+
+    def desired(self, *hosts):
+        return desired_dns_records(list(hosts), "example.com", self.TARGET)
+
+    def test_desired_records(self, find_log_record):
+        desired = self.desired("App.example.com", "home.example.com", "other.org")
+
+        assert list(desired) == ["app.example.com"]
+        assert desired["app.example.com"]["type"] == "CNAME"
+        assert desired["app.example.com"]["comment"] == DNS_MANAGED_COMMENT
+        find_log_record("Skipped other.org: not in zone example.com")
+
+    def test_ip_target_makes_a_records(self):
+        desired = desired_dns_records(["app.example.com"], "example.com", "203.0.113.5")
+
+        assert desired["app.example.com"]["type"] == "A"
+
+    def test_creates_updates_deletes(self):
+        current = [
+            managed("CNAME", "same.example.com", self.TARGET, id="r1"),
+            managed("CNAME", "moved.example.com", "old.example.com", id="r2"),
+            managed("CNAME", "gone.example.com", self.TARGET, id="r3"),
+            {
+                "id": "r4",
+                "type": "MX",
+                "name": "example.com",
+                "content": "mx",
+                "comment": None,
+            },
+        ]
+
+        plan = plan_dns_sync(
+            self.desired("same.example.com", "moved.example.com", "new.example.com"),
+            current,
+        )
+
+        assert [c.describe() for c in plan.changes] == [
+            f"update moved.example.com CNAME {self.TARGET}",
+            f"create new.example.com CNAME {self.TARGET}",
+            "delete gone.example.com",
+        ]
+        assert plan.unchanged == ["same.example.com"]
+
+    def test_unmanaged_records_are_not_touched(self):
+        current = [
+            {"id": "r1", "type": "A", "name": "nas.example.com", "content": "10.0.0.2"},
+            {
+                "id": "r2",
+                "type": "CNAME",
+                "name": "ok.example.com",
+                "content": self.TARGET,
+            },
+        ]
+
+        plan = plan_dns_sync(self.desired("nas.example.com", "ok.example.com"), current)
+
+        assert plan.changes == []
+        assert plan.conflicts == ["nas.example.com"]
+        assert plan.unchanged == ["ok.example.com"]
+
+    def test_type_change_replaces_record(self):
+        current = [managed("A", "app.example.com", "10.0.0.2", id="r1")]
+
+        plan = plan_dns_sync(self.desired("app.example.com"), current)
+
+        assert [c.action for c in plan.changes] == ["delete", "create"]
+
+
+class TestApplyDnsPlan:
+    """Tests for apply_dns_plan() against a local Cloudflare stand-in."""
+
+    TARGET = "home.example.com"
+
+    @pytest.fixture
+    def server(self, local_cloudflare_server):
+        server = local_cloudflare_server
+        server.add_record(
+            "CNAME",
+            "keep.example.com",
+            self.TARGET,
+            proxied=True,
+            comment=DNS_MANAGED_COMMENT,
+        )
+        server.add_record(
+            "CNAME",
+            "moved.example.com",
+            "old.example.com",
+            proxied=True,
+            comment=DNS_MANAGED_COMMENT,
+        )
+        server.add_record(
+            "CNAME", "gone.example.com", self.TARGET, comment=DNS_MANAGED_COMMENT
+        )
+        server.add_record("A", "example.com", "203.0.113.5")
+        return server
+
+    @pytest.fixture
+    def api(self, server):
+        from adapters.urllib_http import UrllibHttpClient
+
+        return CloudflareAPI(
+            api_token="test-token",
+            domain="example.com",
+            http_client=UrllibHttpClient(),
+            zone_cache_path=None,
+            base_url=server.base_url,
+        )
+
+    def plan(self, api):
+        hosts = ["keep.example.com", "moved.example.com"] + [
+            f"app{n}.example.com" for n in range(5)
+        ]
+        desired = desired_dns_records(hosts, "example.com", self.TARGET)
+        return plan_dns_sync(desired, list(api.iter_dns_records()))
+
+    def assert_reconciled(self, server):
+        records = server.by_name()
+        assert "gone.example.com" not in records
+        assert records["moved.example.com"]["content"] == self.TARGET
+        assert records["app4.example.com"]["comment"] == DNS_MANAGED_COMMENT
+        assert records["example.com"]["content"] == "203.0.113.5"
+        assert len(records) == 8
+
+    def test_batch(self, api, server, monkeypatch):
+        monkeypatch.setattr(cloudflare, "DNS_BATCH_SIZE", 4)
+        plan = self.plan(api)
+        server.requests.clear()
+
+        assert apply_dns_plan(api, plan) == (7, 0)
+
+        self.assert_reconciled(server)
+        assert [m for m, _ in server.requests] == ["POST", "POST"]
+
+    def test_worker_pool(self, api, server):
+        plan = self.plan(api)
+
+        assert apply_dns_plan(api, plan, batch=False, jobs=3) == (7, 0)
+
+        self.assert_reconciled(server)
+
+    def test_failed_batch_applies_nothing(self, api, server, find_log_record):
+        plan = self.plan(api)
+        server.add_record("TXT", "app0.example.com", "taken")
+
+        assert apply_dns_plan(api, plan) == (0, 7)
+
+        assert "gone.example.com" in server.by_name()
+        find_log_record("DNS batch failed")
+
+    def test_second_sync_is_a_no_op(self, api, server):
+        apply_dns_plan(api, self.plan(api))
+
+        plan = self.plan(api)
+
+        assert plan.changes == []
+        assert len(plan.unchanged) == 7
+
+
+class TestDnsSyncCommand:
+    """Tests for `cloudflare.py dns sync` end to end."""
+
+    @pytest.fixture
+    def onramp(self, tmp_path):
+        for name in ("services-enabled", "external-enabled"):
+            (tmp_path / name).mkdir()
+        (tmp_path / "services-enabled" / "app.yml").write_text(
+            "services:\n"
+            "  app:\n"
+            "    labels:\n"
+            "      - traefik.enable=true\n"
+            "      - traefik.http.routers.app.rule=Host(`${APP_HOST_NAME:-app}.${HOST_DOMAIN}`)\n"
+        )
+        (tmp_path / "services-enabled" / ".env").write_text("HOST_NAME=home\n")
+        (tmp_path / "external-enabled" / "nas.yml").write_text(
+            'http:\n  routers:\n    nas:\n      rule: "Host(`nas.{{env "HOST_DOMAIN"}}`)"\n'
+        )
+        return tmp_path
+
+    def run(self, monkeypatch, server, onramp, *args):
+        monkeypatch.setenv("CF_DNS_API_TOKEN", "test-token")
+        monkeypatch.setenv("HOST_DOMAIN", "example.com")
+        real_init = CloudflareAPI.__init__
+
+        def init(self, *a, **kw):
+            kw.update(base_url=server.base_url, zone_cache_path=None)
+            real_init(self, *a, **kw)
+
+        monkeypatch.setattr(CloudflareAPI, "__init__", init)
+        # Keep pytest's log capture in place
+        monkeypatch.setattr(cloudflare, "setup_logging", lambda **kwargs: None)
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            ["cloudflare.py", "dns", "sync", "--base-dir", str(onramp), *args],
+        )
+        return cloudflare.main()
+
+    def test_dry_run(
+        self, monkeypatch, local_cloudflare_server, onramp, find_log_record
+    ):
+        assert self.run(monkeypatch, local_cloudflare_server, onramp, "--dry-run") == 0
+
+        assert local_cloudflare_server.records == {}
+        find_log_record("create app.example.com CNAME home.example.com")
+        find_log_record("create nas.example.com CNAME home.example.com")
+        find_log_record("2 change(s), 0 unchanged, 0 conflict(s)")
+
+    def test_sync(self, monkeypatch, local_cloudflare_server, onramp, find_log_record):
+        assert self.run(monkeypatch, local_cloudflare_server, onramp) == 0
+
+        assert set(local_cloudflare_server.by_name()) == {
+            "app.example.com",
+            "nas.example.com",
+        }
+        find_log_record("Applied 2 change(s), 0 failed")
+        # Zone lookup, listing and batch share one kept-alive connection
+        assert len(local_cloudflare_server.requests) == 3
+        assert len(local_cloudflare_server.connections) == 1
@@ -0,0 +1,383 @@
+"""Tests for compose_model.py - parsed compose files and bind mounts."""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import compose_model
+from compose_model import BindMount, ComposeModel, OverrideIndex, interpolate_defaults
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """OnRamp tree with one enabled service and one enabled override."""
+    for name in ("services-available", "services-enabled", "overrides-enabled"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "services-enabled" / "app.yml").write_text("""
+services:
+  app:
+    image: app
+    volumes:
+      - /etc/localtime:/etc/localtime:ro
+      - ./etc/app:/config
+      - ${APP_DATA:-./etc/app/data}:/data
+      - app-cache:/cache
+      - /anonymous
+      - type: bind
+        source: ./etc/app/conf.d
+        target: /etc/app/conf.d
+        read_only: true
+      - type: volume
+        source: named
+        target: /named
+      # - ./etc/app/commented:/commented
+""")
+    (tmp_path / "overrides-enabled" / "app-nfs.yml").write_text("""
+services:
+  app:
+    volumes:
+      - ${APP_MEDIA:-./etc/app/media}:/media
+""")
+    return tmp_path
+
+
+class TestInterpolateDefaults:
+    """Tests for interpolate_defaults()."""
+
+    def test_colon_dash_default(self):
+        assert interpolate_defaults("${X:-./etc/app}") == "./etc/app"
+
+    def test_dash_default(self):
+        assert interpolate_defaults("${X-./etc/app}/sub") == "./etc/app/sub"
+
+    def test_nested_default(self):
+        assert interpolate_defaults("${A:-${B:-./etc/b}}") == "./etc/b"
+
+    def test_no_default_kept(self):
+        assert interpolate_defaults("${DATA_DIR}/app") == "${DATA_DIR}/app"
+
+    def test_plain_text(self):
+        assert interpolate_defaults("./etc/app") == "./etc/app"
+
+
+class TestBindMounts:
+    """Tests for ComposeModel.bind_mounts()."""
+
+    def test_extracts_short_and_long_syntax(self, tree):
+        mounts = ComposeModel(tree).bind_mounts("app")
+
+        sources = [mount.host_path for mount in mounts]
+        assert sources == [
+            "/etc/localtime",
+            "./etc/app",
+            "./etc/app/data",
+            "app-cache",
+            "./etc/app/conf.d",
+            "./etc/app/media",
+        ]
+        assert mounts[0].read_only is True
+        assert mounts[4].read_only is True
+        assert mounts[5].file.name == "app-nfs.yml"
+
+    def test_resolve_skips_named_volumes(self, tree):
+        mount = BindMount(Path("x.yml"), "app", "app-cache", "/cache")
+
+        assert mount.resolve(tree) is None
+
+    def test_resolve_normalizes(self, tree):
+        mount = BindMount(Path("x.yml"), "app", "./etc/app/../other", "/x")
+
+        assert mount.resolve(tree) == tree / "etc" / "other"
+
+    def test_falls_back_to_services_available(self, tree):
+        (tree / "services-available" / "other.yml").write_text(
+            "services:\n  other:\n    volumes:\n      - ./etc/other:/config\n"
+        )
+
+        mounts = ComposeModel(tree).bind_mounts("other")
+
+        assert [m.host_path for m in mounts][0] == "./etc/other"
+
+    def test_all_enabled(self, tree):
+        assert len(ComposeModel(tree).bind_mounts()) == 6
+
+
+class TestParseCache:
+    """Tests for the mtime/size parse cache."""
+
+    @pytest.fixture
+    def parses(self, monkeypatch):
+        """Count YAML parses."""
+        calls = []
+        real_parse = compose_model._parse_yaml
+        monkeypatch.setattr(
+            compose_model,
+            "_parse_yaml",
+            lambda text: calls.append(1) or real_parse(text),
+        )
+        return calls
+
+    def test_parses_each_file_once(self, tree, parses):
+        cache = tree / "cache.pickle"
+
+        for _ in range(3):
+            ComposeModel(tree, cache_path=cache).bind_mounts("app")
+
+        assert len(parses) == 2
+
+    def test_persists_between_processes(self, tree, parses):
+        cache = tree / "cache.pickle"
+        ComposeModel(tree, cache_path=cache).bind_mounts("app")
+        ComposeModel(tree, cache_path=cache).save()
+
+        # A fresh process starts with an empty in-memory cache
+        compose_model._caches.pop(cache)
+        mounts = ComposeModel(tree, cache_path=cache).bind_mounts("app")
+
+        assert len(parses) == 2
+        assert len(mounts) == 6
+
+    def test_reparses_changed_file(self, tree):
+        model = ComposeModel(tree, cache_path=tree / "cache.pickle")
+        path = tree / "services-enabled" / "app.yml"
+        model.load(path)
+
+        path.write_text("services:\n  app:\n    image: changed-image-name\n")
+
+        assert model.load(path).services["app"].image == "changed-image-name"
+
+    def test_ignores_corrupt_cache(self, tree):
+        cache = tree / "cache.pickle"
+        cache.write_bytes(b"not a pickle")
+
+        mounts = ComposeModel(tree, cache_path=cache).bind_mounts("app")
+
+        assert len(mounts) == 6
+
+    def test_invalid_yaml_is_skipped(self, tree, find_log_record):
+        (tree / "services-enabled" / "bad.yml").write_text("services: [unclosed")
+
+        files = ComposeModel(tree).enabled_services()
+
+        assert [f.path.name for f in files] == ["app.yml"]
+        find_log_record("Failed to parse compose file")
+
+
+class TestAccessors:
+    """Tests for ComposeService / ComposeFile typed accessors."""
+
+    def _file(self, tmp_path, text):
+        path = tmp_path / "svc.yml"
+        path.write_text(text)
+        return ComposeModel(tmp_path, cache_path=tmp_path / "c.pickle").read(path)
+
+    def test_labels_and_environment_list_syntax(self, tmp_path):
+        compose_file = self._file(
+            tmp_path,
+            """
+services:
+  app:
+    environment:
+      - PUID=${PUID}
+      - PASSTHROUGH
+    labels:
+      - traefik.enable=true
+      - autoheal=true
+""",
+        )
+
+        service = compose_file.services["app"]
+        assert service.environment == {"PUID": "${PUID}", "PASSTHROUGH": None}
+        assert service.labels == {"traefik.enable": "true", "autoheal": "true"}
+
+    def test_labels_and_environment_mapping_syntax(self, tmp_path):
+        compose_file = self._file(
+            tmp_path,
+            """
+services:
+  app:
+    environment:
+      TZ: UTC
+      EMPTY:
+    labels:
+      autoheal: true
+""",
+        )
+
+        service = compose_file.services["app"]
+        assert service.environment == {"TZ": "UTC", "EMPTY": None}
+        assert service.labels == {"autoheal": "True"}
+
+    def test_healthcheck_and_named_volumes(self, tmp_path):
+        compose_file = self._file(
+            tmp_path,
+            """
+volumes:
+  data: {}
+services:
+  app:
+    healthcheck:
+      test: ["CMD", "true"]
+  sidecar:
+    image: busybox
+""",
+        )
+
+        assert compose_file.services["app"].healthcheck == {"test": ["CMD", "true"]}
+        assert compose_file.services["sidecar"].healthcheck is None
+        assert list(compose_file.named_volumes) == ["data"]
+
+    def test_variable_references(self, tmp_path):
+        compose_file = self._file(
+            tmp_path,
+            """
+# ${COMMENTED:-x}
+services:
+  app:
+    image: app:${APP_DOCKER_TAG:-latest}
+    volumes:
+      - ${APP_DATA:-${DATA_DIR}/app}:/data
+""",
+        )
+
+        assert compose_file.variables == [
+            ("COMMENTED", "x"),
+            ("APP_DOCKER_TAG", "latest"),
+            ("APP_DATA", "${DATA_DIR}/app"),
+            ("DATA_DIR", None),
+        ]
+
+    def test_variable_operators(self):
+        from compose_model import variable_references
+
+        text = "${A:?set A} ${B-b} ${C:+on} ${D SPACE} ${E:-${F}.${G:-g}}"
+
+        assert variable_references(text) == [
+            ("A", None),
+            ("B", "b"),
+            ("C", None),
+            ("E", "${F}.${G:-g}"),
+            ("F", None),
+            ("G", "g"),
+        ]
+
+
+class TestSharedAcrossTools:
+    """The linter, audit and env extraction share one parse per file."""
+
+    def test_one_parse_per_file(self, tree, monkeypatch):
+        from extract_env import EnvExtractor
+        from healthcheck_audit import audit_services
+        from services_linter import ServiceLinter
+
+        (tree / "etc").mkdir()
+        (tree / "services-available" / "app.yml").write_text("""
+# description: App
+services:
+  app:
+    image: app:${APP_DOCKER_TAG:-latest}
+    healthcheck:
+      test: ["CMD", "true"]
+    labels:
+      - autoheal=true
+""")
+        parses = []
+        real_parse = compose_model._parse_yaml
+        monkeypatch.setattr(
+            compose_model,
+            "_parse_yaml",
+            lambda text: parses.append(text) or real_parse(text),
+        )
+
+        ServiceLinter(str(tree)).lint("app")
+        results, stats = audit_services(tree)
+        ok, template = EnvExtractor(base_dir=tree).create_scaffold_env(
+            "app", dry_run=True
+        )
+
+        assert len(parses) == 1
+        assert results[0]["has_autoheal"] and results[0]["has_healthcheck"]
+        assert stats["autoheal_no_healthcheck"] == 0
+        assert ok and "APP_DOCKER_TAG=${APP_DOCKER_TAG:-latest}" in template
+
+    def test_audit_ignores_commented_healthcheck(self, tree):
+        from healthcheck_audit import parse_service_yaml
+
+        path = tree / "services-available" / "app.yml"
+        path.write_text("""
+services:
+  app:
+    image: app
+    # healthcheck:
+    #   test: ["CMD", "true"]
+    labels:
+      autoheal: "true"
+""")
+
+        result = parse_service_yaml(path)
+
+        assert result["has_healthcheck"] is False
+        assert result["autoheal_value"] == "true"
+        assert result["services"] == ["app"]
+
+
+class TestOverrideIndex:
+    """Tests for OverrideIndex - service to overrides lookup."""
+
+    @pytest.fixture
+    def overrides(self, tmp_path):
+        directory = tmp_path / "overrides-available"
+        directory.mkdir()
+        for name in ("plex", "plex-nfs", "plex-nfs-extra", "plexinc", "sonarr-nfs"):
+            (directory / f"{name}.yml").write_text("services: {}\n")
+        (directory / ".plex-hidden.yml").write_text("")
+        (directory / "plex-notes.txt").write_text("")
+        return directory
+
+    def test_matches_glob_semantics(self, overrides):
+        index = OverrideIndex(overrides)
+
+        for service in ("plex", "plex-nfs", "sonarr", "radarr", "p"):
+            expected = sorted(overrides.glob(f"{service}*.yml"))
+            assert index.paths_for(service) == expected
+
+    def test_games_prefix_ignored(self, overrides):
+        (overrides / "minecraft-bedrock.yml").write_text("")
+
+        paths = OverrideIndex(overrides).paths_for("games-minecraft")
+
+        assert paths == [overrides / "minecraft-bedrock.yml"]
+
+    def test_lists_directory_once(self, overrides, monkeypatch):
+        index = OverrideIndex(overrides)
+        index.names_for("plex")
+        # Pretend the last change is old enough to trust the listing
+        monkeypatch.setattr(compose_model, "RACY_WINDOW_NS", 0)
+        index.names_for("plex")
+        scans = []
+        real_scandir = compose_model.os.scandir
+        monkeypatch.setattr(
+            compose_model.os,
+            "scandir",
+            lambda path: scans.append(path) or real_scandir(path),
+        )
+
+        for service in ("plex", "sonarr", "radarr"):
+            index.names_for(service)
+
+        assert scans == []
+
+    def test_rebuilt_when_directory_changes(self, overrides):
+        index = OverrideIndex(overrides)
+        assert index.names_for("radarr") == []
+
+        (overrides / "radarr-nfs.yml").write_text("")
+
+        assert index.names_for("radarr") == ["radarr-nfs"]
+
+    def test_missing_directory(self, tmp_path):
+        assert OverrideIndex(tmp_path / "missing").names_for("plex") == []
@@ -0,0 +1,135 @@
+"""Tests for download_cache.py with mocked HTTP client."""
+
+import hashlib
+import http.client
+import sys
+from pathlib import Path
+from urllib.error import URLError
+
+import pytest
+
+# Add scripts to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from download_cache import DownloadCache, DownloadError
+from tests.mocks.http import MockHttpClient
+
+URL = "https://example.com/files/tool.tar.gz"
+BODY = b"tool archive " * 100
+
+
+class InterruptedHttpClient(MockHttpClient):
+    """Mock HTTP client whose next request is cut short."""
+
+    def __init__(self, partial: bytes, headers: dict[str, str]):
+        super().__init__()
+        self.partial = partial
+        self.partial_headers = headers
+
+    def request_with_headers(self, method, url, headers=None, data=None, timeout=30):
+        if self.partial is None:
+            return super().request_with_headers(method, url, headers, data, timeout)
+        self.calls.append((method, url, headers, data))
+        e = http.client.IncompleteRead(self.partial, len(BODY) - len(self.partial))
+        e.headers = self.partial_headers
+        self.partial = None
+        raise URLError(e)
+
+
+class OfflineHttpClient(MockHttpClient):
+    """Mock HTTP client that cannot reach the server."""
+
+    def request_with_headers(self, method, url, headers=None, data=None, timeout=30):
+        self.calls.append((method, url, headers, data))
+        raise URLError("unreachable")
+
+
+@pytest.fixture
+def http_client():
+    client = MockHttpClient()
+    client.set_response("GET", URL, 200, BODY, headers={"ETag": '"v1"'})
+    return client
+
+
+@pytest.fixture
+def cache(tmp_path, http_client):
+    return DownloadCache(tmp_path / "downloads", http_client=http_client)
+
+
+class TestDownloadCacheFetch:
+    """Tests for DownloadCache.fetch()."""
+
+    def test_downloads_through_http_client(self, cache, http_client):
+        """Should fetch the body through the injected client."""
+        path = cache.fetch(URL)
+
+        assert path.read_bytes() == BODY
+        http_client.assert_called_once()
+        method, url, headers, _ = http_client.calls[0]
+        assert (method, url) == ("GET", URL)
+        assert headers["Accept-Encoding"] == "identity"
+
+    def test_revalidates_with_etag(self, cache, http_client):
+        """Should send If-None-Match and reuse the body on 304."""
+        first = cache.fetch(URL)
+        http_client.set_response("GET", URL, 304, b"")
+
+        assert cache.fetch(URL) == first
+        assert first.read_bytes() == BODY
+        assert http_client.calls[1][2]["If-None-Match"] == '"v1"'
+
+    def test_pinned_hit_skips_request(self, cache, http_client):
+        """Should not ask the server again for a pinned, cached body."""
+        sha256 = hashlib.sha256(BODY).hexdigest()
+        cache.fetch(URL, sha256)
+        http_client.reset()
+
+        cache.fetch(URL, sha256)
+
+        assert http_client.calls == []
+
+    def test_sha256_mismatch_raises(self, cache):
+        """Should reject a body that does not match the pin."""
+        with pytest.raises(DownloadError, match="sha256 mismatch"):
+            cache.fetch(URL, "0" * 64)
+
+    def test_error_status_raises(self, cache, http_client):
+        """Should raise DownloadError for an error status."""
+        http_client.set_response("GET", URL, 404, b"not found")
+
+        with pytest.raises(DownloadError, match="HTTP 404"):
+            cache.fetch(URL)
+
+    def test_falls_back_to_cached_copy(self, tmp_path, http_client):
+        """Should serve the cached copy when the server is unreachable."""
+        cache = DownloadCache(tmp_path / "downloads", http_client=http_client)
+        path = cache.fetch(URL)
+
+        cache = DownloadCache(tmp_path / "downloads", http_client=OfflineHttpClient())
+
+        assert cache.fetch(URL) == path
+        assert path.read_bytes() == BODY
+
+    def test_resumes_interrupted_download(self, tmp_path):
+        """Should keep a cut-short body and request only the rest."""
+        http_client = InterruptedHttpClient(BODY[:500], {"ETag": '"v1"'})
+        http_client.set_response(
+            "GET",
+            URL,
+            206,
+            BODY[500:],
+            headers={
+                "ETag": '"v1"',
+                "Content-Range": f"bytes 500-{len(BODY) - 1}/{len(BODY)}",
+            },
+        )
+        cache = DownloadCache(tmp_path / "downloads", http_client=http_client)
+
+        with pytest.raises(DownloadError):
+            cache.fetch(URL)
+        path = cache.fetch(URL, hashlib.sha256(BODY).hexdigest())
+
+        assert path.read_bytes() == BODY
+        headers = http_client.calls[1][2]
+        assert headers["Range"] == "bytes=500-"
+        assert headers["If-Range"] == '"v1"'
@@ -0,0 +1,416 @@
+"""Tests for download_icons.py - Parallel, revalidating icon downloads."""
+
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import download_icons
+
+SVG = (
+    b'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">'
+    b'<rect x="10" y="10" width="20" height="20"/></svg>'
+)
+OTHER_SVG = SVG.replace(b'width="20"', b'width="40"')
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Repository root with a few services and an etc/ for the manifest."""
+    services_available = tmp_path / "services-available"
+    services_available.mkdir()
+    for name in ("plex", "frigate-cpu", "frigate-nvidia", "nosvg", "unknown"):
+        (services_available / f"{name}.yml").write_text("services: {}\n")
+    (tmp_path / "etc").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def upstream(local_http_server):
+    """selfhst/icons index and SVGs served locally."""
+    index = [
+        {"Reference": "plex", "SVG": "Yes"},
+        {"Reference": "frigate", "SVG": "Yes"},
+        {"Reference": "docker", "SVG": "Yes"},
+        {"Reference": "nosvg", "SVG": "No"},
+    ]
+    local_http_server.add_file("/index.json", json.dumps(index).encode(), etag='"i1"')
+    for name in ("plex", "frigate", "docker"):
+        local_http_server.add_file(f"/svg/{name}.svg", SVG, etag=f'"{name}-1"')
+    return local_http_server
+
+
+@pytest.fixture
+def run(repo, upstream):
+    """Run the downloader against the local server."""
+
+    def run(*args: str) -> int:
+        return download_icons.main(
+            [
+                "--repo-root",
+                str(repo),
+                "--index-url",
+                upstream.url("/index.json"),
+                "--cdn-url",
+                upstream.url("/svg"),
+                "--workers",
+                "4",
+                *args,
+            ]
+        )
+
+    return run
+
+
+def icons_dir(repo: Path) -> Path:
+    return repo / "sietch" / "dashboard" / "static" / "icons"
+
+
+def mtimes(repo: Path) -> dict[str, int]:
+    """Modification times of the service icons (not the sprite)."""
+    return {
+        p.name: p.stat().st_mtime_ns
+        for p in icons_dir(repo).glob("*.svg")
+        if not download_icons.SPRITE_FILE.fullmatch(p.name)
+    }
+
+
+class TestFirstRun:
+    """Tests for a run without a manifest."""
+
+    def test_downloads_and_normalizes(self, run, repo):
+        assert run() == 0
+
+        icons = icons_dir(repo)
+        assert b"<g transform" in (icons / "plex.svg").read_bytes()
+        assert (icons / "frigate-cpu.svg").read_bytes() == (
+            icons / "frigate-nvidia.svg"
+        ).read_bytes()
+        for service in ("nosvg", "unknown", "traefik"):
+            assert (icons / f"{service}.svg").read_bytes() == (
+                icons / "docker.svg"
+            ).read_bytes()
+
+    def test_shared_icon_fetched_once(self, run, upstream):
+        run()
+
+        assert len(upstream.requests_for("/svg/frigate.svg")) == 1
+
+    def test_keeps_connections_alive(self, run, upstream):
+        run()
+
+        assert len(upstream.connections) <= 4
+
+    def test_writes_manifest(self, run, repo, upstream):
+        run()
+
+        manifest = json.loads((repo / "etc" / ".cache" / "icons.json").read_text())
+        entry = manifest["icons"][upstream.url("/svg/plex.svg")]
+        assert entry["etag"] == '"plex-1"'
+        assert manifest["index"]["etag"] == '"i1"'
+
+    def test_no_manifest_without_etc(self, run, repo):
+        (repo / "etc").rmdir()
+
+        assert run() == 0
+        assert not (repo / "etc").exists()
+
+
+class TestRevalidation:
+    """Tests for re-runs against the manifest."""
+
+    def test_rerun_only_revalidates(self, run, repo, upstream):
+        run()
+        before = mtimes(repo)
+        upstream.requests.clear()
+
+        assert run() == 0
+
+        for _, path, headers in upstream.requests:
+            assert headers["If-None-Match"], path
+        assert mtimes(repo) == before
+
+    def test_changed_icon_redownloaded(self, run, repo, upstream):
+        run()
+        before = mtimes(repo)
+        upstream.add_file("/svg/plex.svg", OTHER_SVG, etag='"plex-2"')
+
+        run()
+
+        after = mtimes(repo)
+        assert after["plex.svg"] != before["plex.svg"]
+        assert {k for k in after if after[k] != before[k]} == {"plex.svg"}
+
+    def test_new_etag_same_body_not_rewritten(self, run, repo, upstream):
+        run()
+        before = mtimes(repo)
+        upstream.add_file("/svg/plex.svg", SVG, etag='"plex-2"')
+
+        run()
+        upstream.requests.clear()
+        run()
+
+        assert mtimes(repo) == before
+        headers = upstream.requests_for("/svg/plex.svg")[0]
+        assert headers["If-None-Match"] == '"plex-2"'
+
+    def test_locally_changed_icon_restored(self, run, repo, upstream):
+        run()
+        plex = icons_dir(repo) / "plex.svg"
+        expected = plex.read_bytes()
+        plex.write_text("edited")
+        upstream.requests.clear()
+
+        run()
+
+        assert plex.read_bytes() == expected
+        assert "If-None-Match" not in upstream.requests_for("/svg/plex.svg")[0]
+
+    def test_force_ignores_manifest(self, run, upstream):
+        run()
+        upstream.requests.clear()
+
+        run("--force")
+
+        assert "If-None-Match" not in upstream.requests_for("/svg/plex.svg")[0]
+
+
+class TestFailures:
+    """Tests for unreachable or missing upstream files."""
+
+    def test_missing_icon_uses_fallback(self, run, repo, upstream):
+        del upstream.files["/svg/plex.svg"]
+
+        assert run() == 1
+        icons = icons_dir(repo)
+        assert (icons / "plex.svg").read_bytes() == (icons / "docker.svg").read_bytes()
+
+    def test_failed_revalidation_keeps_icon(self, run, repo, upstream):
+        run()
+        plex = icons_dir(repo) / "plex.svg"
+        expected = plex.read_bytes()
+        del upstream.files["/svg/plex.svg"]
+
+        assert run() == 1
+        assert plex.read_bytes() == expected
+
+    def test_cached_index_used_when_unreachable(self, run, repo, upstream):
+        run()
+        del upstream.files["/index.json"]
+
+        assert run() == 0
+
+
+ARTWORK = """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 200 200">
+  <g transform="translate(10 20) scale(2)">
+    <path d="M10 10 h20 v20 a10 5 30 0 1 -15 5 c-5 0 -8 -3 -8 -8 z"/>
+    <circle cx="50" cy="50" r="5"/>
+  </g>
+  <g transform="matrix(0.5 0.2 -0.2 0.5 100 30)">
+    <rect x="0" y="0" width="40" height="20"/>
+    <polygon points="0,0 30,40 -10,25"/>
+    <g transform="scale(1.5)"><ellipse cx="10" cy="10" rx="8" ry="3"/></g>
+  </g>
+  <line x1="150" y1="150" x2="190" y2="170"/>
+</svg>"""
+
+
+class TestArtworkBounds:
+    """Tests for the NumPy and pure-Python bounds engines."""
+
+    def test_python_bounds(self):
+        root = download_icons.ET.fromstring(
+            '<svg xmlns="http://www.w3.org/2000/svg">'
+            '<g transform="translate(5 5)"><rect x="0" y="0" width="10" height="4"/>'
+            "</g></svg>"
+        )
+
+        assert download_icons.svg_artwork_bounds(root, use_numpy=False) == (
+            5.0,
+            5.0,
+            15.0,
+            9.0,
+        )
+
+    def test_numpy_matches_python(self):
+        pytest.importorskip("numpy")
+        root = download_icons.ET.fromstring(ARTWORK)
+
+        expected = download_icons.svg_artwork_bounds(root, use_numpy=False)
+        actual = download_icons.svg_artwork_bounds(root, use_numpy=True)
+
+        assert actual == pytest.approx(expected)
+
+    def test_numpy_arc_samples_match(self):
+        pytest.importorskip("numpy")
+        args = (0.0, 0.0, 10.0, 5.0, 30.0, 1.0, 0.0, 12.0, 4.0)
+
+        expected = download_icons.arc_sample_points(*args)
+        actual = download_icons.arc_sample_points_numpy(*args)
+
+        assert actual.ravel().tolist() == pytest.approx(
+            [value for point in expected for value in point]
+        )
+
+    def test_numpy_path_points_match(self):
+        np = pytest.importorskip("numpy")
+        paths = [
+            "M10 10 h20 v20 H5 V2 z m5 5 l1 2 3 4 Z",
+            "m1 1 c1 2 3 4 5 6 7 8 9 10 11 12 s1 1 2 2 q1 1 3 3 t1 1",
+            "M0 0 A10 5 30 0 1 12 4 a5 5 0 1 0 -3 -3 L1-2.5.5.5",
+            "",
+            "M0 0 L3 3 z l1 1",
+        ]
+
+        points, owner = download_icons.path_points_numpy(paths)
+
+        for i, d in enumerate(paths):
+            expected = np.array(download_icons.path_points(d)).reshape(-1, 2)
+            actual = points[owner == i]
+            assert np.sort(actual, axis=0) == pytest.approx(np.sort(expected, axis=0))
+
+    def test_engine_chosen_by_size(self, monkeypatch):
+        pytest.importorskip("numpy")
+        calls = []
+        monkeypatch.setattr(
+            download_icons,
+            "_artwork_bounds_numpy",
+            lambda root: calls.append(root) or (0.0, 0.0, 1.0, 1.0),
+        )
+        small = download_icons.ET.fromstring(ARTWORK)
+        large = download_icons.ET.fromstring(
+            '<svg xmlns="http://www.w3.org/2000/svg"><path d="M0 0 %s"/></svg>'
+            % ("l1 1 " * download_icons.NUMPY_MIN_PATH_DATA)
+        )
+
+        download_icons.svg_artwork_bounds(small)
+        download_icons.svg_artwork_bounds(large)
+
+        assert calls == [large]
+
+    def test_no_artwork(self):
+        root = download_icons.ET.fromstring('<svg xmlns="http://www.w3.org/2000/svg"/>')
+
+        assert download_icons.svg_artwork_bounds(root, use_numpy=False) is None
+        if download_icons.NUMPY_AVAILABLE:
+            assert download_icons.svg_artwork_bounds(root, use_numpy=True) is None
+
+
+class TestNormalizeIcons:
+    """Tests for normalizing icons across a process pool."""
+
+    def make_icons(self, tmp_path, count):
+        paths = []
+        for i in range(count):
+            path = tmp_path / f"icon{i}.svg"
+            path.write_bytes(SVG.replace(b'x="10"', f'x="{i}"'.encode()))
+            paths.append(path)
+        return paths
+
+    def test_parallel_matches_serial(self, tmp_path):
+        (tmp_path / "parallel").mkdir()
+        (tmp_path / "serial").mkdir()
+        parallel = self.make_icons(tmp_path / "parallel", 10)
+        serial = self.make_icons(tmp_path / "serial", 10)
+
+        assert download_icons.normalize_icons(parallel, jobs=2) == [True] * 10
+        assert download_icons.normalize_icons(serial, jobs=1) == [True] * 10
+        assert [p.read_bytes() for p in parallel] == [p.read_bytes() for p in serial]
+
+    def test_falls_back_to_serial(self, tmp_path, monkeypatch, capsys):
+        def unavailable(*args, **kwargs):
+            raise OSError("no processes")
+
+        monkeypatch.setattr(download_icons, "ProcessPoolExecutor", unavailable)
+        paths = self.make_icons(tmp_path, 10)
+
+        assert download_icons.normalize_icons(paths, jobs=4) == [True] * 10
+        assert "normalizing serially" in capsys.readouterr().out
+
+    def test_invalid_svg_not_normalized(self, tmp_path):
+        path = tmp_path / "broken.svg"
+        path.write_text("<svg")
+
+        assert download_icons.normalize_icons([path]) == [False]
+
+
+STYLED_SVG = b"""<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10" fill="none">
+<defs><linearGradient id="g"><stop offset="0"/></linearGradient></defs>
+<style>.a{fill:red}.b,.c{stroke:blue}</style>
+<rect class="a b" style="opacity:.5" fill="url(#g)" width="5" height="5"/>
+</svg>"""
+
+
+def sprite_manifest(icons: Path) -> dict:
+    return json.loads((icons / "sprite.json").read_text())
+
+
+class TestIconSprite:
+    """Tests for build_icon_sprite."""
+
+    @pytest.fixture
+    def icons(self, tmp_path):
+        (tmp_path / "docker.svg").write_bytes(SVG)
+        (tmp_path / "whoami.svg").write_bytes(SVG)
+        (tmp_path / "plex.svg").write_bytes(OTHER_SVG)
+        return tmp_path
+
+    def test_symbols_shared_by_identical_icons(self, icons):
+        sprite = download_icons.build_icon_sprite(icons)
+
+        assert sprite_manifest(icons) == {
+            "sprite": sprite.name,
+            "icons": {"docker": "docker", "plex": "plex", "whoami": "docker"},
+        }
+        root = download_icons.ET.fromstring(sprite.read_bytes())
+        symbols = {s.get("id"): s for s in root}
+        assert sorted(symbols) == ["docker", "plex"]
+        assert symbols["plex"].get("viewBox") == "0 0 100 100"
+
+    def test_name_follows_content(self, icons):
+        first = download_icons.build_icon_sprite(icons)
+        assert download_icons.build_icon_sprite(icons) == first
+
+        (icons / "plex.svg").write_bytes(SVG)
+        second = download_icons.build_icon_sprite(icons)
+
+        assert second != first
+        assert not first.exists()
+        assert sprite_manifest(icons)["sprite"] == second.name
+
+    def test_styles_inlined_and_ids_prefixed(self, icons):
+        (icons / "app.svg").write_bytes(STYLED_SVG)
+
+        sprite = download_icons.build_icon_sprite(icons)
+
+        root = download_icons.ET.fromstring(sprite.read_bytes())
+        symbol = next(s for s in root if s.get("id") == "app")
+        rect = symbol.find(f"{{{download_icons.SVG_NS}}}rect")
+        assert symbol.get("fill") == "none"
+        assert rect.get("style") == "fill:red;stroke:blue;opacity:.5"
+        assert rect.get("fill") == "url(#app-g)"
+        assert symbol.find(".//*[@id='app-g']") is not None
+        assert b"<style" not in sprite.read_bytes()
+
+    def test_unsupported_icon_left_out(self, icons, capsys):
+        (icons / "app.svg").write_bytes(STYLED_SVG.replace(b".a{", b"rect.a{"))
+        (icons / "broken.svg").write_bytes(b"<svg")
+
+        download_icons.build_icon_sprite(icons)
+
+        assert "app" not in sprite_manifest(icons)["icons"]
+        assert "broken" not in sprite_manifest(icons)["icons"]
+        assert "app.svg left out of the sprite" in capsys.readouterr().out
+
+    def test_built_by_download(self, run, repo):
+        run()
+
+        icons = icons_dir(repo)
+        manifest = sprite_manifest(icons)
+        assert (icons / manifest["sprite"]).is_file()
+        assert manifest["icons"]["frigate-cpu"] == manifest["icons"]["frigate-nvidia"]
+        assert manifest["icons"]["unknown"] == "docker"
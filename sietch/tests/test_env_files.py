@@ -0,0 +1,237 @@
+"""Tests for env_files.py - Shared env file parsing and layered resolution."""
+
+import os
+import time
+
+from scripts import env_files
+from scripts.env_files import (
+    LayeredEnv,
+    interpolate,
+    parse_env_file,
+    parse_env_text,
+    read_env_file,
+)
+
+
+def write_aged(path, content, age=10):
+    """Write a file with an mtime outside the racy window."""
+    path.write_text(content)
+    past = time.time() - age
+    os.utime(path, (past, past))
+
+
+class TestParseEnvText:
+    """Tests for line parsing."""
+
+    def test_line_kinds(self):
+        lines = parse_env_text("# comment\n\nFOO=bar\nnot an assignment\n")
+
+        assert [line.kind for line in lines] == ["comment", "empty", "var", "comment"]
+        assert lines[2].name == "FOO"
+        assert lines[3].text == "not an assignment"
+
+    def test_whitespace_around_key_and_value(self):
+        (line,) = parse_env_text("  FOO =  bar  ")
+
+        assert (line.name, line.value, line.raw) == ("FOO", "bar", "bar")
+
+    def test_bare_value_inline_comment(self):
+        (line,) = parse_env_text("FOO=bar # note")
+
+        assert line.value == "bar"
+        assert line.raw == "bar # note"
+
+    def test_hash_without_space_is_kept(self):
+        (line,) = parse_env_text("COLOR=#fff")
+
+        assert line.value == "#fff"
+
+    def test_double_quotes_with_escapes(self):
+        (line,) = parse_env_text('FOO="a \\"b\\"\\nc # not a comment"')
+
+        assert line.value == 'a "b"\nc # not a comment'
+        assert line.quoted == '"'
+
+    def test_single_quotes_are_literal(self):
+        (line,) = parse_env_text("FOO='a\\n${B}'")
+
+        assert line.value == "a\\n${B}"
+        assert line.quoted == "'"
+
+    def test_empty_value(self):
+        (line,) = parse_env_text("FOO=")
+
+        assert line.kind == "var"
+        assert line.value == ""
+
+
+class TestParseEnvFile:
+    """Tests for file parsing and its cache."""
+
+    def test_missing_file(self, tmp_path):
+        assert parse_env_file(tmp_path / "missing.env") == []
+
+    def test_reuses_unchanged_file(self, tmp_path, monkeypatch):
+        path = tmp_path / ".env"
+        write_aged(path, "FOO=bar\n")
+        calls = []
+        real_parse = env_files.parse_env_text
+        monkeypatch.setattr(
+            env_files,
+            "parse_env_text",
+            lambda text: calls.append(text) or real_parse(text),
+        )
+
+        parse_env_file(path)
+        parse_env_file(path)
+
+        assert len(calls) == 1
+
+    def test_rereads_changed_file(self, tmp_path):
+        path = tmp_path / ".env"
+        write_aged(path, "FOO=bar\n", age=20)
+        assert read_env_file(path) == {"FOO": "bar"}
+
+        write_aged(path, "FOO=baz\n")
+
+        assert read_env_file(path) == {"FOO": "baz"}
+
+    def test_rereads_recent_file(self, tmp_path):
+        path = tmp_path / ".env"
+        path.write_text("FOO=bar\n")
+        assert read_env_file(path) == {"FOO": "bar"}
+
+        # Same size and, on coarse clocks, the same mtime
+        path.write_text("FOO=baz\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert read_env_file(path) == {"FOO": "baz"}
+
+    def test_last_definition_wins(self, tmp_path):
+        path = tmp_path / ".env"
+        path.write_text("FOO=a\nFOO=b\n")
+
+        assert read_env_file(path) == {"FOO": "b"}
+
+
+class TestInterpolate:
+    """Tests for ${VAR} substitution."""
+
+    def test_reference(self):
+        assert interpolate("${A}/x", {"A": "a"}.get) == "a/x"
+
+    def test_unset_is_empty(self):
+        assert interpolate("${A}/x", {}.get) == "/x"
+
+    def test_colon_default_applies_to_empty(self):
+        assert interpolate("${A:-d}", {"A": ""}.get) == "d"
+        assert interpolate("${A:-d}", {}.get) == "d"
+
+    def test_dash_default_applies_to_unset_only(self):
+        assert interpolate("${A-d}", {"A": ""}.get) == ""
+        assert interpolate("${A-d}", {}.get) == "d"
+
+    def test_nested_default(self):
+        assert interpolate("${A:-${B}}", {"B": "b"}.get) == "b"
+
+
+class TestLayeredEnv:
+    """Tests for layering, provenance and resolution."""
+
+    def make_tree(self, tmp_path, files):
+        services_enabled = tmp_path / "services-enabled"
+        services_enabled.mkdir()
+        for name, content in files.items():
+            write_aged(services_enabled / name, content)
+        return services_enabled
+
+    def test_makefile_order(self, tmp_path):
+        services_enabled = self.make_tree(
+            tmp_path,
+            {
+                "app.env": "",
+                ".env": "",
+                ".env.nfs": "",
+                ".env.external": "",
+                "notes.txt": "",
+            },
+        )
+
+        assert LayeredEnv(tmp_path).files() == [
+            services_enabled / ".env",
+            services_enabled / ".env.external",
+            services_enabled / ".env.nfs",
+            services_enabled / "app.env",
+        ]
+        assert LayeredEnv(tmp_path, global_only=True).files() == [
+            services_enabled / ".env",
+            services_enabled / ".env.external",
+            services_enabled / ".env.nfs",
+        ]
+
+    def test_later_files_win_and_shadowed_recorded(self, tmp_path):
+        services_enabled = self.make_tree(
+            tmp_path,
+            {
+                ".env": "TZ=UTC\nHOST_DOMAIN=example.com\n",
+                "app.env": "TZ=Europe/Paris\n",
+            },
+        )
+
+        values = LayeredEnv(tmp_path).values()
+
+        assert values["TZ"].value == "Europe/Paris"
+        assert values["TZ"].source == services_enabled / "app.env"
+        assert values["TZ"].shadowed == [services_enabled / ".env"]
+        assert values["HOST_DOMAIN"].source == services_enabled / ".env"
+
+    def test_references_across_files(self, tmp_path):
+        self.make_tree(
+            tmp_path,
+            {
+                ".env": "HOST_DOMAIN=example.com\n",
+                "app.env": "APP_URL=https://app.${HOST_DOMAIN}\nAPP_PORT=${APP_PORT_OVERRIDE:-8080}\n",
+            },
+        )
+
+        env = LayeredEnv(tmp_path)
+
+        assert env.get("APP_URL") == "https://app.example.com"
+        assert env.get("APP_PORT") == "8080"
+
+    def test_single_quoted_not_interpolated(self, tmp_path):
+        self.make_tree(tmp_path, {".env": "A=a\nPASSWORD='p$${A}'\n"})
+
+        assert LayeredEnv(tmp_path).get("PASSWORD") == "p$${A}"
+
+    def test_overrides_win(self, tmp_path):
+        self.make_tree(
+            tmp_path, {".env": "HOST_DOMAIN=example.com\nURL=${HOST_DOMAIN}\n"}
+        )
+
+        env = LayeredEnv(tmp_path, overrides={"HOST_DOMAIN": "example.org"})
+
+        assert env.get("URL") == "example.org"
+        assert env.source("HOST_DOMAIN") is None
+
+    def test_cycle_warns(self, tmp_path, find_log_record):
+        self.make_tree(tmp_path, {".env": "A=${B}\nB=x${A}\nC=${A}c\n"})
+
+        env = LayeredEnv(tmp_path)
+
+        assert env.get("C") == "xc"
+        assert find_log_record("Variable cycle: A -> B -> A")
+
+    def test_recomputes_when_files_change(self, tmp_path):
+        services_enabled = self.make_tree(tmp_path, {".env": "A=1\n"})
+        env = LayeredEnv(tmp_path)
+        assert env.get("A") == "1"
+
+        write_aged(services_enabled / "app.env", "A=2\n")
+
+        assert env.get("A") == "2"
+        assert env.source("A") == services_enabled / "app.env"
+
+    def test_missing_services_enabled(self, tmp_path):
+        assert LayeredEnv(tmp_path).values() == {}
@@ -0,0 +1,176 @@
+"""Tests for generate_service_docs.py - incremental documentation builds."""
+
+import os
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import generate_service_docs
+from generate_service_docs import ServiceDocGenerator
+
+
+@pytest.fixture
+def onramp(tmp_path):
+    """Tree with two services, one env template and one override."""
+    for name in ("services-available", "overrides-available", "etc"):
+        (tmp_path / name).mkdir()
+    for service in ("alpha", "beta"):
+        (tmp_path / "services-available" / f"{service}.yml").write_text(
+            f"# description: {service} service\n"
+            f"services:\n  {service}:\n    image: example/{service}\n"
+        )
+    scaffold = tmp_path / "services-scaffold" / "alpha"
+    scaffold.mkdir(parents=True)
+    (scaffold / "env.template").write_text("# General\nALPHA_PORT=8080\n")
+    (tmp_path / "overrides-available" / "alpha-nfs.yml").write_text(
+        "services:\n  alpha:\n    volumes:\n      - media:/media\n"
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    """Record which services generate_markdown() runs for."""
+    calls = []
+    real_generate = ServiceDocGenerator.generate_markdown
+    monkeypatch.setattr(
+        ServiceDocGenerator,
+        "generate_markdown",
+        lambda self, name, path: calls.append(name) or real_generate(self, name, path),
+    )
+    return calls
+
+
+class TestIncrementalGeneration:
+    """Tests for generate_all_docs() input tracking."""
+
+    def test_first_run_generates_all(self, onramp, generated):
+        ServiceDocGenerator(onramp).generate_all_docs()
+
+        assert generated == ["alpha", "beta"]
+        assert (onramp / "services-docs" / "alpha.md").exists()
+        assert (onramp / "etc" / ".cache" / "service_docs.json").exists()
+
+    def test_no_manifest_without_etc(self, onramp, generated):
+        (onramp / "etc").rmdir()
+
+        ServiceDocGenerator(onramp).generate_all_docs()
+
+        assert generated == ["alpha", "beta"]
+        assert not (onramp / "etc").exists()
+
+    def test_unchanged_inputs_are_skipped(self, onramp, generated):
+        ServiceDocGenerator(onramp).generate_all_docs()
+        ServiceDocGenerator(onramp).generate_all_docs()
+
+        assert generated == ["alpha", "beta"]
+
+    @pytest.mark.parametrize(
+        "changed",
+        [
+            "services-available/alpha.yml",
+            "services-scaffold/alpha/env.template",
+            "overrides-available/alpha-nfs.yml",
+        ],
+    )
+    def test_changed_input_regenerates_only_its_doc(self, onramp, generated, changed):
+        ServiceDocGenerator(onramp).generate_all_docs()
+        with open(onramp / changed, "a") as f:
+            f.write("# changed\n")
+
+        ServiceDocGenerator(onramp).generate_all_docs()
+
+        assert generated == ["alpha", "beta", "alpha"]
+
+    def test_new_override_regenerates_its_service(self, onramp, generated):
+        ServiceDocGenerator(onramp).generate_all_docs()
+        (onramp / "overrides-available" / "beta-extra.yml").write_text(
+            "services:\n  beta:\n    environment:\n      - EXTRA=1\n"
+        )
+
+        ServiceDocGenerator(onramp).generate_all_docs()
+
+        assert generated == ["alpha", "beta", "beta"]
+        assert "beta-extra" in (onramp / "services-docs" / "beta.md").read_text()
+
+    def test_deleted_doc_is_regenerated(self, onramp, generated):
+        ServiceDocGenerator(onramp).generate_all_docs()
+        (onramp / "services-docs" / "beta.md").unlink()
+
+        ServiceDocGenerator(onramp).generate_all_docs()
+
+        assert generated == ["alpha", "beta", "beta"]
+
+    def test_force(self, onramp, generated):
+        ServiceDocGenerator(onramp).generate_all_docs()
+        ServiceDocGenerator(onramp).generate_all_docs(force=True)
+
+        assert generated == ["alpha", "beta", "alpha", "beta"]
+
+
+class TestWriteIfChanged:
+    """Tests for write_if_changed()."""
+
+    def test_identical_content_not_rewritten(self, onramp):
+        generator = ServiceDocGenerator(onramp)
+        output = onramp / "services-docs" / "doc.md"
+        generator.write_if_changed(output, "content")
+        os.utime(output, ns=(0, 0))
+
+        assert generator.write_if_changed(output, "content") is False
+        assert output.stat().st_mtime_ns == 0
+
+    def test_changed_content_written(self, onramp):
+        generator = ServiceDocGenerator(onramp)
+        output = onramp / "services-docs" / "doc.md"
+        generator.write_if_changed(output, "old")
+
+        assert generator.write_if_changed(output, "new") is True
+        assert output.read_text() == "new"
+
+
+class TestParallelGeneration:
+    """Tests for render_many() and the override index."""
+
+    def test_pool_output_matches_serial(self, onramp, monkeypatch):
+        for i in range(10):
+            (onramp / "services-available" / f"svc{i}.yml").write_text(
+                f"services:\n  svc{i}:\n    image: example/svc{i}\n"
+            )
+        generator = ServiceDocGenerator(onramp)
+        services = generator.service_files()
+
+        parallel = generator.render_many(services, jobs=2)
+        monkeypatch.setattr(generate_service_docs, "PARALLEL_THRESHOLD", 10**6)
+        serial = generator.render_many(services, jobs=2)
+
+        assert parallel == serial
+        assert len(parallel) == 12
+        assert all(markdown for markdown, _ in parallel)
+
+    def test_render_reports_errors(self, onramp, monkeypatch):
+        def fail(self, name, path):
+            raise ValueError("broken")
+
+        monkeypatch.setattr(ServiceDocGenerator, "generate_markdown", fail)
+        ServiceDocGenerator(onramp).generate_all_docs()
+
+        assert not (onramp / "services-docs" / "alpha.md").exists()
+        assert ServiceDocGenerator(onramp).load_manifest() == {}
+
+    def test_overrides_from_index(self, onramp):
+        (onramp / "overrides-available" / "alphabet.yml").write_text("services: {}\n")
+        (onramp / "overrides-available" / "beta-vpn.yml").write_text("services: {}\n")
+        generator = ServiceDocGenerator(onramp)
+
+        assert [p.name for p in generator.find_service_overrides("alpha")] == [
+            "alpha-nfs.yml",
+            "alphabet.yml",
+        ]
+        assert [p.name for p in generator.find_service_overrides("beta")] == [
+            "beta-vpn.yml"
+        ]
@@ -0,0 +1,210 @@
+"""Tests for healthcheck_audit.py - static and runtime health check audit."""
+
+import json
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from adapters.docker_api import DockerApiClient, DockerApiError
+from healthcheck_audit import (
+    audit_runtime,
+    audit_services,
+    parse_container,
+    runtime_audit,
+)
+from tests.mocks import MockContainerLister
+
+
+def container(name, state="running", status="Up 1 hour", **labels):
+    """Build a GET /containers/json entry."""
+    return {
+        "Id": f"{name}-id",
+        "Names": [f"/{name}"],
+        "State": state,
+        "Status": status,
+        "Labels": {"com.docker.compose.service": name, **labels},
+    }
+
+
+@pytest.fixture
+def onramp(tmp_path):
+    """Tree with an enabled service that has a healthcheck and one without."""
+    available = tmp_path / "services-available"
+    available.mkdir()
+    (tmp_path / "services-enabled").mkdir()
+    (available / "web.yml").write_text(
+        "services:\n"
+        "  web:\n"
+        "    healthcheck:\n"
+        "      test: ['CMD', 'true']\n"
+        "    labels:\n"
+        "      - autoheal=true\n"
+        "  web-worker:\n"
+        "    image: worker\n"
+    )
+    (available / "db.yml").write_text("services:\n  db:\n    image: db\n")
+    (available / "idle.yml").write_text("services:\n  idle:\n    image: idle\n")
+    for name in ("web", "db", "idle"):
+        (tmp_path / "services-enabled" / f"{name}.yml").touch()
+    return tmp_path
+
+
+class TestParseContainer:
+    """Tests for parse_container()."""
+
+    def test_health_from_status(self):
+        parsed = parse_container(container("a", status="Up 2 hours (unhealthy)"))
+
+        assert parsed.name == "a"
+        assert parsed.health == "unhealthy"
+
+    def test_starting_health(self):
+        parsed = parse_container(
+            container("a", status="Up 1 second (health: starting)")
+        )
+
+        assert parsed.health == "starting"
+
+    def test_health_field_preferred(self):
+        summary = container("a", status="Up 1 hour")
+        summary["Health"] = {"Status": "healthy", "FailingStreak": 0}
+
+        parsed = parse_container(summary)
+
+        assert parsed.health == "healthy"
+        assert parsed.failing_streak == 0
+
+    def test_no_healthcheck(self):
+        assert parse_container(container("a")).health is None
+
+    def test_restart_loop(self):
+        restarting = parse_container(
+            container("a", state="restarting", status="Restarting (1) 3 seconds ago")
+        )
+        counted = parse_container({**container("b"), "Restarts": 5})
+
+        assert restarting.restart_looping
+        assert counted.restart_count == 5
+        assert counted.restart_looping
+
+    def test_autoheal_label(self):
+        assert parse_container(container("a", autoheal="true")).autoheal
+        assert not parse_container(container("a", autoheal="false")).autoheal
+
+
+class TestAuditRuntime:
+    """Tests for joining live containers with static results."""
+
+    def test_joins_and_reports_gaps(self, onramp):
+        results, _ = audit_services(onramp)
+        containers = [
+            container("web", status="Up 1 hour (unhealthy)", autoheal="true"),
+            container("web-worker", status="Up 1 hour (healthy)"),
+            container("db", state="restarting", autoheal="true"),
+        ]
+
+        rows, stats = audit_runtime(results, containers)
+
+        by_name = {row["name"]: row for row in rows}
+        assert by_name["web"]["file"] == "web.yml"
+        assert by_name["web"]["issues"] == ["unhealthy"]
+        assert by_name["web-worker"]["file"] == "web.yml"
+        assert by_name["web-worker"]["issues"] == ["healthcheck_without_autoheal"]
+        assert by_name["db"]["issues"] == ["restart_loop", "not_running"]
+        assert stats["unhealthy"] == 1
+        assert stats["healthy"] == 1
+        assert stats["restart_looping"] == 1
+        assert stats["autoheal_gaps"] == 1
+        assert stats["not_running"] == 1
+        assert stats["enabled_not_running"] == ["db", "idle"]
+
+    def test_stopped_container_not_health_checked(self, onramp):
+        results, _ = audit_services(onramp)
+        containers = [
+            container(
+                "db", state="exited", status="Exited (0) 1 hour ago", autoheal="true"
+            ),
+            container("web", state="created", status="Created"),
+        ]
+
+        rows, stats = audit_runtime(results, containers)
+
+        assert [row["issues"] for row in rows] == [["not_running"], ["not_running"]]
+        assert stats["autoheal_gaps"] == 0
+        assert stats["no_healthcheck"] == 0
+        assert stats["not_running"] == 2
+        assert stats["enabled_not_running"] == ["db", "idle", "web"]
+
+    def test_unmanaged_container(self):
+        rows, stats = audit_runtime([], [container("adhoc")])
+
+        assert rows[0]["file"] is None
+        assert stats["containers"] == 1
+
+    def test_single_list_call(self, onramp):
+        results, _ = audit_services(onramp)
+        lister = MockContainerLister([container("web"), container("db")])
+
+        rows, _ = runtime_audit(results, lister)
+
+        assert lister.calls == [True]
+        assert len(rows) == 2
+
+
+class TestDockerApiClient:
+    """Tests for the Engine API adapter over a Unix socket."""
+
+    @pytest.fixture
+    def docker_socket(self, tmp_path):
+        requests = []
+        payload = {"status": 200, "body": json.dumps([container("web")]).encode()}
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def address_string(self):
+                return "unix"
+
+            def do_GET(self):
+                requests.append(self.path)
+                self.send_response(payload["status"])
+                self.send_header("Content-Length", str(len(payload["body"])))
+                self.end_headers()
+                self.wfile.write(payload["body"])
+
+        path = tmp_path / "docker.sock"
+        server = socketserver.ThreadingUnixStreamServer(str(path), Handler)
+        thread = threading.Thread(
+            target=server.serve_forever, args=(0.05,), daemon=True
+        )
+        thread.start()
+        yield f"unix://{path}", requests, payload
+        server.shutdown()
+        server.server_close()
+
+    def test_lists_containers(self, docker_socket):
+        host, requests, _ = docker_socket
+
+        containers = DockerApiClient(host).list_containers()
+
+        assert containers[0]["Names"] == ["/web"]
+        assert requests == ["/containers/json?all=1"]
+
+    def test_error_status(self, docker_socket):
+        host, _, payload = docker_socket
+        payload.update(status=500, body=b'{"message": "boom"}')
+
+        with pytest.raises(DockerApiError):
+            DockerApiClient(host).list_containers()
+
+    def test_unreachable(self, tmp_path):
+        with pytest.raises(OSError):
+            DockerApiClient(f"unix://{tmp_path}/missing.sock").list_containers()
@@ -0,0 +1,96 @@
+"""Tests for adapters/httpx_http.py - async keep-alive HTTP client."""
+
+import asyncio
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from adapters.httpx_http import HttpxAsyncHttpClient
+from urllib.error import URLError
+
+
+@pytest.fixture
+def sleeps():
+    """Record backoff delays instead of sleeping."""
+    return []
+
+
+@pytest.fixture
+async def client(sleeps):
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    async with HttpxAsyncHttpClient(sleep=sleep) as client:
+        yield client
+
+
+class TestConnectionReuse:
+    """Tests for keep-alive connection pooling."""
+
+    async def test_reuses_one_connection(self, client, local_http_server):
+        local_http_server.add_file("/a", b"alpha")
+
+        results = [
+            await client.request("GET", local_http_server.url("/a")) for _ in range(5)
+        ]
+
+        assert results == [(200, b"alpha")] * 5
+        assert len(local_http_server.connections) == 1
+
+    async def test_concurrent_requests_bounded(self, local_http_server):
+        local_http_server.add_file("/a", b"alpha")
+
+        async with HttpxAsyncHttpClient(max_connections=3) as client:
+            results = await asyncio.gather(
+                *(client.request("GET", local_http_server.url("/a")) for _ in range(30))
+            )
+
+        assert results == [(200, b"alpha")] * 30
+        assert len(local_http_server.connections) <= 3
+
+    async def test_decodes_gzip(self, client, local_http_server):
+        body = b"x" * 10_000
+        local_http_server.add_file("/big", body, compress=True)
+
+        assert await client.request("GET", local_http_server.url("/big")) == (
+            200,
+            body,
+        )
+
+    async def test_network_error_raises_urlerror(self, client):
+        with pytest.raises(URLError):
+            await client.request("GET", "http://127.0.0.1:9/unreachable", timeout=2)
+
+
+class TestRetries:
+    """Tests for retry with backoff on 429/5xx."""
+
+    async def test_retries_5xx_with_backoff(self, client, local_http_server, sleeps):
+        local_http_server.add_file("/a", b"ok", failures=[(503, {}), (502, {})])
+
+        assert await client.request("GET", local_http_server.url("/a")) == (200, b"ok")
+        assert sleeps == [0.5, 1.0]
+
+    async def test_honors_retry_after(self, client, local_http_server, sleeps):
+        local_http_server.add_file("/a", b"ok", failures=[(429, {"Retry-After": "7"})])
+
+        status, _ = await client.request(
+            "POST", local_http_server.url("/a"), data=b"{}"
+        )
+
+        assert status == 200
+        assert sleeps == [7.0]
+
+    async def test_post_not_retried_on_5xx(self, client, local_http_server, sleeps):
+        local_http_server.add_file("/a", b"ok", failures=[(500, {})])
+
+        status, _ = await client.request(
+            "POST", local_http_server.url("/a"), data=b"{}"
+        )
+
+        assert status == 500
+        assert sleeps == []
@@ -0,0 +1,233 @@
+"""Tests for manifest_plan.py - manifest DAG planning and execution."""
+
+import threading
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from manifest_plan import compile_plan, execute_plan, paths_overlap, preview_plan
+from operations import OPERATIONS, MkdirOp, OperationContext
+from scaffold import Scaffolder
+from tests.mocks.command import MockCommandExecutor
+
+RADARR_MANIFEST = [
+    {"type": "mkdir", "path": "custom-services.d/"},
+    {"type": "mkdir", "path": "custom-cont-init.d/"},
+    {
+        "type": "download",
+        "url": "http://127.0.0.1:9/scripts_init.bash",
+        "output": "custom-cont-init.d/scripts_init.bash",
+        "condition": {"type": "dir_empty", "path": "custom-services.d/"},
+    },
+    {"type": "chown", "path": "./", "user": "${PUID}", "recursive": True},
+]
+
+
+@pytest.fixture
+def ctx(tmp_path):
+    """Create a standard OperationContext for tests."""
+    etc_dir = tmp_path / "etc"
+    etc_dir.mkdir()
+    return OperationContext(
+        service="testservice",
+        base_dir=tmp_path,
+        scaffold_dir=tmp_path / "services-scaffold",
+        etc_dir=etc_dir,
+        services_enabled=tmp_path / "services-enabled",
+        command_executor=MockCommandExecutor(),
+    )
+
+
+class TestPathsOverlap:
+    """Tests for paths_overlap()."""
+
+    def test_same_path(self):
+        assert paths_overlap({Path("/a/b")}, {Path("/a/b")})
+
+    def test_ancestor(self):
+        assert paths_overlap({Path("/a")}, {Path("/a/b/c")})
+        assert paths_overlap({Path("/a/b/c")}, {Path("/a")})
+
+    def test_siblings(self):
+        assert not paths_overlap({Path("/a/b")}, {Path("/a/c")})
+        assert not paths_overlap({Path("/a/b")}, {Path("/a/bc")})
+
+
+class TestCompilePlan:
+    """Tests for compile_plan() - dependency stages."""
+
+    def test_radarr_manifest(self, ctx):
+        """Sibling mkdirs run together; download and chown wait."""
+        plan = compile_plan(RADARR_MANIFEST, ctx)
+
+        assert [[step.index for step in stage] for stage in plan.stages] == [
+            [1, 2],
+            [3],
+            [4],
+        ]
+        assert plan.steps[2].depends_on == {1, 2}
+        assert plan.steps[3].depends_on == {1, 2, 3}
+
+    def test_independent_operations_share_a_stage(self, ctx):
+        operations = [
+            {"type": "generate_random", "output": "a.key"},
+            {"type": "generate_random", "output": "b.key"},
+            {"type": "touch", "path": "c.txt"},
+        ]
+
+        plan = compile_plan(operations, ctx)
+
+        assert len(plan.stages) == 1
+
+    def test_condition_read_orders_after_write(self, ctx):
+        """A condition on a path must wait for the operation creating it."""
+        operations = [
+            {"type": "touch", "path": "marker"},
+            {
+                "type": "generate_random",
+                "output": "secret",
+                "condition": {"type": "file_not_exists", "path": "marker"},
+            },
+        ]
+
+        plan = compile_plan(operations, ctx)
+
+        assert plan.steps[1].depends_on == {1}
+
+    def test_write_waits_for_earlier_condition_read(self, ctx):
+        """An operation may not change a path an earlier condition reads."""
+        operations = [
+            {
+                "type": "touch",
+                "path": "a",
+                "condition": {"type": "file_exists", "path": "flag"},
+            },
+            {"type": "touch", "path": "flag"},
+        ]
+
+        plan = compile_plan(operations, ctx)
+
+        assert plan.steps[1].depends_on == {1}
+
+    def test_unknown_type_is_barrier(self, ctx):
+        operations = [
+            {"type": "touch", "path": "a"},
+            {"type": "bogus"},
+            {"type": "touch", "path": "b"},
+        ]
+
+        plan = compile_plan(operations, ctx)
+
+        assert len(plan.stages) == 3
+
+
+class TestExecutePlan:
+    """Tests for execute_plan()."""
+
+    def test_runs_stage_in_parallel(self, ctx, monkeypatch):
+        """Operations in one stage should overlap in time."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        class WaitingMkdir(MkdirOp):
+            def execute(self):
+                barrier.wait()
+                return super().execute()
+
+        monkeypatch.setitem(OPERATIONS, "mkdir", WaitingMkdir)
+        operations = [
+            {"type": "mkdir", "path": "a"},
+            {"type": "mkdir", "path": "b"},
+        ]
+
+        assert execute_plan(compile_plan(operations, ctx), ctx) is True
+        assert (ctx.etc_dir / ctx.service / "a").is_dir()
+        assert (ctx.etc_dir / ctx.service / "b").is_dir()
+
+    def test_stops_after_failed_stage(self, ctx, find_log_record):
+        operations = [
+            {"type": "chmod", "path": ".", "mode": "bogus"},
+            {"type": "touch", "path": "after"},
+        ]
+        (ctx.etc_dir / ctx.service).mkdir()
+
+        assert execute_plan(compile_plan(operations, ctx), ctx) is False
+        assert not (ctx.etc_dir / ctx.service / "after").exists()
+        assert find_log_record("Manifest operation failed").operation_num == 1
+
+
+class TestPreviewPlan:
+    """Tests for preview_plan() - dry run."""
+
+    def test_fresh_radarr_manifest(self, ctx):
+        previews = preview_plan(compile_plan(RADARR_MANIFEST, ctx))
+
+        assert [(p.would_run, p.deferred) for p in previews] == [
+            (True, False),
+            (True, False),
+            (True, True),
+            (True, True),
+        ]
+        assert previews[0].detail == "create"
+        assert previews[2].detail.startswith("fetch ")
+
+    def test_reports_skips(self, ctx):
+        service_dir = ctx.etc_dir / ctx.service
+        service_dir.mkdir()
+        (service_dir / "existing.key").write_text("key")
+        operations = [
+            {"type": "generate_random", "output": "existing.key"},
+            {
+                "type": "touch",
+                "path": "a",
+                "condition": {"type": "file_exists", "path": "missing"},
+            },
+            {"type": "delete", "path": "missing"},
+        ]
+
+        previews = preview_plan(compile_plan(operations, ctx))
+
+        assert [(p.would_run, p.detail) for p in previews] == [
+            (False, "output exists"),
+            (False, "condition not met"),
+            (False, "path not found"),
+        ]
+
+    def test_preview_does_not_modify(self, ctx):
+        preview_plan(compile_plan(RADARR_MANIFEST, ctx))
+
+        assert list(ctx.etc_dir.iterdir()) == []
+
+
+class TestScaffolderPlan:
+    """Tests for Scaffolder.plan_manifest() and the plan command."""
+
+    def test_plan_manifest(self, tmp_path, find_log_record):
+        scaffold_dir = tmp_path / "services-scaffold" / "radarr"
+        scaffold_dir.mkdir(parents=True)
+        (scaffold_dir / "scaffold.yml").write_text(
+            'version: "1"\n'
+            "operations:\n"
+            "  - type: mkdir\n"
+            "    path: a/\n"
+            "  - type: mkdir\n"
+            "    path: b/\n"
+        )
+        scaffolder = Scaffolder(str(tmp_path))
+
+        previews = scaffolder.plan_manifest("radarr")
+        scaffolder.log_plan("radarr", previews)
+
+        assert len(previews) == 2
+        find_log_record("Manifest plan for radarr: 2 operation(s) in 1 stage(s)")
+        find_log_record("[2] mkdir b/ - run: create")
+        find_log_record("2 to run, 0 skipped")
+        assert not (tmp_path / "etc" / "radarr").exists()
+
+    def test_no_manifest(self, tmp_path):
+        scaffolder = Scaffolder(str(tmp_path))
+
+        assert scaffolder.plan_manifest("plex") == []
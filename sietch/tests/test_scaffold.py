@@ -1,5 +1,6 @@
 """Tests for scaffold.py - path resolution and file filtering."""
 
+import os
 from pathlib import Path
 import sys
 
@@ -7,6 +8,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
 from scaffold import Scaffolder, IGNORE_PATTERNS
+from scaffold_templates import Variable, compile_template
 from tests.mocks.command import MockCommandExecutor
 from ports.command import CommandResult
 
@@ -277,6 +279,94 @@ class TestHasScaffold:
         assert scaffolder.has_scaffold("nonexistent") is False
 
 
+class TestScanScaffold:
+    """Tests for scan_scaffold() - single-pass scaffold discovery."""
+
+    def test_classifies_all_files_in_one_walk(self, tmp_path):
+        scaffold_dir = tmp_path / "services-scaffold" / "plex"
+        (scaffold_dir / "conf").mkdir(parents=True)
+        (scaffold_dir / "env.template").write_text("VAR=${VALUE}")
+        (scaffold_dir / "conf" / "app.yml.template").write_text("a: 1")
+        (scaffold_dir / "conf" / "static.conf").write_text("static")
+        (scaffold_dir / "scaffold.yml").write_text("version: '1'")
+        (scaffold_dir / "MESSAGE.txt").write_text("hello")
+        (scaffold_dir / "README.md").write_text("docs")
+
+        tree = Scaffolder(str(tmp_path)).scan_scaffold("plex")
+
+        assert tree.templates == [
+            scaffold_dir / "conf" / "app.yml.template",
+            scaffold_dir / "env.template",
+        ]
+        assert tree.statics == [scaffold_dir / "conf" / "static.conf"]
+        assert tree.ignored == [scaffold_dir / "README.md"]
+        assert tree.manifest == scaffold_dir / "scaffold.yml"
+        assert tree.message == scaffold_dir / "MESSAGE.txt"
+
+    def test_caches_tree_per_service(self, tmp_path, monkeypatch):
+        """Discovery helpers should share one traversal per directory."""
+        import scaffold
+
+        scaffold_dir = tmp_path / "services-scaffold" / "plex"
+        (scaffold_dir / "conf").mkdir(parents=True)
+        (scaffold_dir / "conf" / "app.conf").write_text("static")
+
+        calls = []
+        real_scandir = os.scandir
+
+        def counting_scandir(path):
+            calls.append(Path(path))
+            return real_scandir(path)
+
+        monkeypatch.setattr(scaffold.os, "scandir", counting_scandir)
+        scaffolder = Scaffolder(str(tmp_path))
+
+        scaffolder.has_scaffold("plex")
+        scaffolder.find_scaffold_files("plex")
+        scaffolder.find_manifest("plex")
+
+        assert sorted(calls) == [scaffold_dir, scaffold_dir / "conf"]
+
+    def test_invalidate_rescans(self, tmp_path):
+        scaffold_dir = tmp_path / "services-scaffold" / "plex"
+        scaffold_dir.mkdir(parents=True)
+        scaffolder = Scaffolder(str(tmp_path))
+        assert scaffolder.has_scaffold("plex") is False
+
+        (scaffold_dir / "config.conf").write_text("content")
+        assert scaffolder.has_scaffold("plex") is False
+
+        scaffolder.invalidate_scaffold_cache("plex")
+        assert scaffolder.has_scaffold("plex") is True
+
+    def test_scaffold_overview(self, tmp_path):
+        scaffold_base = tmp_path / "services-scaffold"
+        (scaffold_base / "plex").mkdir(parents=True)
+        (scaffold_base / "plex" / "env.template").write_text("VAR=${VALUE}")
+        (scaffold_base / "radarr").mkdir()
+        (scaffold_base / "radarr" / "scaffold.yml").write_text("version: '1'")
+        (scaffold_base / "radarr" / "extended.conf").write_text("conf")
+
+        overview = Scaffolder(str(tmp_path)).scaffold_overview()
+
+        assert overview == [
+            {
+                "service": "plex",
+                "templates": 1,
+                "statics": 0,
+                "has_manifest": False,
+                "has_message": False,
+            },
+            {
+                "service": "radarr",
+                "templates": 0,
+                "statics": 1,
+                "has_manifest": True,
+                "has_message": False,
+            },
+        ]
+
+
 class TestListScaffolds:
     """Tests for list_scaffolds() - available scaffold listing."""
 
@@ -654,6 +744,193 @@ class TestBuild:
         assert env_file.read_text() == "CUSTOM_VAR=custom_value"
 
 
+class TestBuildAllEnabled:
+    """Tests for build_all_enabled() - parallel builds of enabled services."""
+
+    def _enable(self, tmp_path, service: str, manifest: str | None = None):
+        scaffold_dir = tmp_path / "services-scaffold" / service
+        scaffold_dir.mkdir(parents=True)
+        (scaffold_dir / "config.conf").write_text(f"{service} config")
+        if manifest is not None:
+            (scaffold_dir / "scaffold.yml").write_text(manifest)
+        (tmp_path / "services-enabled" / f"{service}.yml").write_text(
+            f"services:\n  {service}:\n    image: test\n"
+        )
+
+    def test_builds_all_services_in_parallel(self, tmp_path):
+        """Should build onramp and every enabled service with a thread pool."""
+        (tmp_path / "services-enabled").mkdir()
+        onramp = tmp_path / "services-scaffold" / "onramp"
+        onramp.mkdir(parents=True)
+        (onramp / ".env.template").write_text("HOST_DOMAIN=${HOST_DOMAIN:-local}")
+        for service in ("alpha", "beta", "gamma"):
+            self._enable(tmp_path, service)
+
+        scaffolder = Scaffolder(str(tmp_path), executor=MockCommandExecutor())
+        result = scaffolder.build_all_enabled(jobs=3)
+
+        assert result is True
+        assert (tmp_path / "services-enabled" / ".env").exists()
+        for service in ("alpha", "beta", "gamma"):
+            assert (tmp_path / "etc" / service / "config.conf").exists()
+            assert (tmp_path / "services-enabled" / f"{service}.env").exists()
+
+    def test_failure_rolls_back_only_failing_service(self, tmp_path):
+        """A failing service should not roll back files of other services."""
+        (tmp_path / "services-enabled").mkdir()
+        self._enable(tmp_path, "good")
+        self._enable(tmp_path, "bad", manifest='version: "2"\noperations: []\n')
+
+        scaffolder = Scaffolder(str(tmp_path), executor=MockCommandExecutor())
+        result = scaffolder.build_all_enabled(jobs=2)
+
+        assert result is False
+        assert (tmp_path / "etc" / "good" / "config.conf").exists()
+        assert not (tmp_path / "etc" / "bad" / "config.conf").exists()
+
+    def test_logs_timing_summary(self, tmp_path, find_log_record):
+        """Should log a per-service timing summary."""
+        (tmp_path / "services-enabled").mkdir()
+        self._enable(tmp_path, "alpha")
+
+        scaffolder = Scaffolder(str(tmp_path), executor=MockCommandExecutor())
+        scaffolder.build_all_enabled(jobs=1)
+
+        find_log_record("Scaffold build summary")
+        record = find_log_record("alpha")
+        assert record.service == "alpha"
+        assert record.duration_ms >= 0
+        find_log_record("Built 1 scaffold(s), 0 failed")
+
+
+class TestIncrementalBuild:
+    """Tests for content-hash build stamps - incremental rebuilds."""
+
+    def _scaffold(self, tmp_path, files: dict[str, str]) -> Scaffolder:
+        scaffold_dir = tmp_path / "services-scaffold" / "plex"
+        scaffold_dir.mkdir(parents=True, exist_ok=True)
+        for name, content in files.items():
+            (scaffold_dir / name).write_text(content)
+        (tmp_path / "services-enabled").mkdir(exist_ok=True)
+        return Scaffolder(str(tmp_path), executor=MockCommandExecutor())
+
+    def test_rebuild_without_changes_is_noop(self, tmp_path, find_log_record):
+        """Unchanged inputs should not rewrite any output."""
+        scaffolder = self._scaffold(tmp_path, {"config.yml.template": "a: 1\n"})
+        assert scaffolder.build("plex") is True
+        output = tmp_path / "etc" / "plex" / "config.yml"
+        mtime = output.stat().st_mtime_ns
+
+        # etc/ has content now, so force past the container-content guard
+        scaffolder = Scaffolder(
+            str(tmp_path), executor=MockCommandExecutor(), force=True
+        )
+        assert scaffolder.build("plex") is True
+
+        assert output.stat().st_mtime_ns == mtime
+        find_log_record("Scaffold outputs up to date")
+
+    def test_regenerates_when_template_changes(self, tmp_path, find_log_record):
+        """A changed template should regenerate its untouched output."""
+        scaffolder = self._scaffold(tmp_path, {"config.yml.template": "a: 1\n"})
+        scaffolder.build("plex")
+
+        self._scaffold(tmp_path, {"config.yml.template": "a: 2\n"})
+        scaffolder = Scaffolder(
+            str(tmp_path), executor=MockCommandExecutor(), force=True
+        )
+        scaffolder.build("plex")
+
+        assert (tmp_path / "etc" / "plex" / "config.yml").read_text() == "a: 2\n"
+        record = find_log_record("Regenerated 1 file(s)")
+        assert record.files == ["etc/plex/config.yml"]
+
+    def test_regenerates_when_env_value_changes(self, tmp_path, monkeypatch):
+        """A changed env value referenced by the template should regenerate."""
+        monkeypatch.setenv("HOST_DOMAIN", "one.example")
+        scaffolder = self._scaffold(
+            tmp_path, {"config.yml.template": "host: ${HOST_DOMAIN}\n"}
+        )
+        scaffolder.build("plex")
+
+        monkeypatch.setenv("HOST_DOMAIN", "two.example")
+        scaffolder = Scaffolder(
+            str(tmp_path), executor=MockCommandExecutor(), force=True
+        )
+        scaffolder.build("plex")
+
+        output = tmp_path / "etc" / "plex" / "config.yml"
+        assert output.read_text() == "host: two.example\n"
+
+    def test_preserves_locally_modified_output(self, tmp_path):
+        """Outputs edited since they were written should never be replaced."""
+        scaffolder = self._scaffold(tmp_path, {"config.yml.template": "a: 1\n"})
+        scaffolder.build("plex")
+        output = tmp_path / "etc" / "plex" / "config.yml"
+        output.write_text("a: custom\n")
+
+        self._scaffold(tmp_path, {"config.yml.template": "a: 2\n"})
+        scaffolder = Scaffolder(
+            str(tmp_path), executor=MockCommandExecutor(), force=True
+        )
+        scaffolder.build("plex")
+
+        assert output.read_text() == "a: custom\n"
+
+    def test_preserves_unstamped_output(self, tmp_path):
+        """Outputs that predate build stamps should never be replaced."""
+        output = tmp_path / "etc" / "plex" / "config.yml"
+        output.parent.mkdir(parents=True)
+        output.write_text("a: existing\n")
+        scaffolder = self._scaffold(tmp_path, {"config.yml.template": "a: 2\n"})
+        scaffolder.force = True
+
+        scaffolder.build("plex")
+
+        assert output.read_text() == "a: existing\n"
+
+    def test_does_not_rotate_generated_secrets(self, tmp_path, find_log_record):
+        """Templates that generate passwords should not be re-rendered."""
+        scaffolder = self._scaffold(
+            tmp_path, {"env.template": "DB_PASSWORD=${PLEX_DB_PASSWORD}\n"}
+        )
+        scaffolder.build("plex")
+        env_file = tmp_path / "services-enabled" / "plex.env"
+        original = env_file.read_text()
+
+        self._scaffold(
+            tmp_path, {"env.template": "DB_PASSWORD=${PLEX_DB_PASSWORD}\nX=1\n"}
+        )
+        scaffolder = Scaffolder(str(tmp_path), executor=MockCommandExecutor())
+        scaffolder.build("plex")
+
+        assert env_file.read_text() == original
+        find_log_record("holds generated secrets")
+
+    def test_recopies_changed_static_file(self, tmp_path):
+        """A changed static source should replace its untouched copy."""
+        scaffolder = self._scaffold(tmp_path, {"settings.json": "{}"})
+        scaffolder.build("plex")
+
+        self._scaffold(tmp_path, {"settings.json": '{"a": 1}'})
+        scaffolder = Scaffolder(
+            str(tmp_path), executor=MockCommandExecutor(), force=True
+        )
+        scaffolder.build("plex")
+
+        assert (tmp_path / "etc" / "plex" / "settings.json").read_text() == '{"a": 1}'
+
+    def test_failed_build_does_not_record_stamps(self, tmp_path):
+        """Stamps should only be committed for successful builds."""
+        scaffolder = self._scaffold(
+            tmp_path,
+            {"config.yml.template": "a: 1\n", "scaffold.yml": 'version: "2"\n'},
+        )
+
+        assert scaffolder.build("plex") is False
+        assert not (tmp_path / "etc" / ".scaffold_stamps.json").exists()
+
+
 class TestTeardown:
     """Tests for teardown() - scaffold removal."""
 
@@ -902,6 +1179,101 @@ services:
         find_log_record("path traversal")
 
 
+class TestCreateEtcVolumes:
+    """Tests for create_etc_volumes() - bind mount pre-creation."""
+
+    def _scaffolder(self, tmp_path, compose):
+        for name in ("services-available", "services-enabled", "etc"):
+            (tmp_path / name).mkdir(exist_ok=True)
+        (tmp_path / "services-enabled" / "app.yml").write_text(compose)
+        return Scaffolder(str(tmp_path), executor=MockCommandExecutor())
+
+    def test_creates_directories_and_files(self, tmp_path):
+        scaffolder = self._scaffolder(
+            tmp_path,
+            """
+services:
+  app:
+    volumes:
+      - ./etc/app/config:/config
+      - ${APP_DATA:-./etc/app/data}:/data
+      - ./etc/app/app.conf:/etc/app.conf:ro
+      # - ./etc/app/commented:/commented
+""",
+        )
+
+        assert scaffolder.create_etc_volumes("app") is True
+
+        etc = tmp_path / "etc" / "app"
+        assert (etc / "config").is_dir()
+        assert (etc / "data").is_dir()
+        assert (etc / "app.conf").is_file()
+        assert not (etc / "commented").exists()
+
+    def test_includes_enabled_overrides(self, tmp_path):
+        scaffolder = self._scaffolder(tmp_path, "services:\n  app:\n    image: app\n")
+        (tmp_path / "overrides-enabled").mkdir()
+        (tmp_path / "overrides-enabled" / "app-nfs.yml").write_text(
+            "services:\n  app:\n    volumes:\n      - ./etc/app/extra:/extra\n"
+        )
+
+        scaffolder.create_etc_volumes("app")
+
+        assert (tmp_path / "etc" / "app" / "extra").is_dir()
+
+    def test_ignores_other_services_paths(self, tmp_path):
+        scaffolder = self._scaffolder(
+            tmp_path,
+            "services:\n  app:\n    volumes:\n"
+            "      - ./etc/appmeta:/meta\n      - ./etc/other:/other\n",
+        )
+
+        scaffolder.create_etc_volumes("app")
+
+        assert list((tmp_path / "etc").iterdir()) == []
+
+    def test_tracks_only_created_paths(self, tmp_path):
+        scaffolder = self._scaffolder(
+            tmp_path, "services:\n  app:\n    volumes:\n      - ./etc/app/a/b:/b\n"
+        )
+        (tmp_path / "etc" / "app").mkdir()
+
+        scaffolder.create_etc_volumes("app")
+
+        assert scaffolder._created_files == [
+            tmp_path / "etc" / "app" / "a",
+            tmp_path / "etc" / "app" / "a" / "b",
+        ]
+
+    def test_skips_scaffold_provided_files(self, tmp_path):
+        scaffolder = self._scaffolder(
+            tmp_path,
+            "services:\n  app:\n    volumes:\n      - ./etc/app/app.conf:/app.conf\n",
+        )
+        static = tmp_path / "services-scaffold" / "app" / "app.conf"
+        static.parent.mkdir(parents=True)
+        static.write_text("x")
+
+        scaffolder.create_etc_volumes("app", [static])
+
+        assert not (tmp_path / "etc" / "app" / "app.conf").exists()
+
+    def test_rejects_symlink_escape(self, tmp_path, find_log_record):
+        scaffolder = self._scaffolder(
+            tmp_path,
+            "services:\n  app:\n    volumes:\n      - ./etc/app/link/x:/x\n",
+        )
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (tmp_path / "etc" / "app").mkdir()
+        (tmp_path / "etc" / "app" / "link").symlink_to(outside)
+
+        scaffolder.create_etc_volumes("app")
+
+        assert not (outside / "x").exists()
+        find_log_record("Skipped path escaping via symlink")
+
+
 class TestRollbackOnFailure:
     """Tests for rollback when scaffold operations fail."""
 
@@ -948,8 +1320,12 @@ class TestRollbackOnFailure:
         # Should be cleaned up
         assert not nested_dir.exists()
 
-    def test_build_rolls_back_on_manifest_failure(self, tmp_path, capsys):
+    def test_build_rolls_back_on_manifest_failure(self, tmp_path, capsys, monkeypatch):
         """Should rollback created files when manifest operation fails."""
+        import operations
+
+        # Use the openssl CLI path so the mocked failure applies
+        monkeypatch.setattr(operations, "CRYPTOGRAPHY_AVAILABLE", False)
         mock_exec = MockCommandExecutor()
         # Make openssl fail for key generation
         mock_exec.set_response("openssl", CommandResult(1, "", "openssl error"))
@@ -990,6 +1366,63 @@ operations:
         # (This tests the rollback behavior)
 
 
+class TestCompiledTemplates:
+    """Tests for compile_template() - cached template plans."""
+
+    def test_plan_splits_literals_and_variables(self):
+        plan = compile_template("A=${A}\nB=${B:-x}\nC=${C:?set C}\n")
+
+        assert plan.segments == (
+            "A=",
+            Variable("A"),
+            "\nB=",
+            Variable("B", default="x"),
+            "\nC=",
+            Variable("C", error="set C"),
+            "\n",
+        )
+        assert plan.variables == {"A", "B", "C"}
+        assert plan.sensitive is False
+
+    def test_plan_records_required_and_sensitive(self):
+        plan = compile_template("# required: DB_HOST\nDB_PASSWORD=${APP_DB_PASSWORD}\n")
+
+        assert plan.required == ("DB_HOST",)
+        assert plan.sensitive is True
+        assert plan.references[0].sensitive is True
+
+    def test_plans_are_cached_by_content(self):
+        content = "HOST=${HOST_DOMAIN}\n"
+        same_content = "".join(["HOST=", "${HOST_DOMAIN}\n"])
+        assert compile_template(content) is compile_template(same_content)
+
+    def test_render_matches_substitution_rules(self, monkeypatch):
+        monkeypatch.setenv("HOST_DOMAIN", "example.com")
+        monkeypatch.delenv("UNSET_VAR", raising=False)
+        scaffolder = Scaffolder.__new__(Scaffolder)
+
+        result = scaffolder._render_template_string(
+            "host=${HOST_DOMAIN} tag=${TAG_UNSET:-latest} empty=${UNSET_VAR}"
+        )
+
+        assert result == "host=example.com tag=latest empty="
+
+    def test_required_check_uses_rendered_content(self, tmp_path, find_log_record):
+        """Required vars should be checked without re-reading the output."""
+        scaffolder = Scaffolder(str(tmp_path))
+        source = tmp_path / "services-scaffold" / "nfs" / "env.template"
+        source.parent.mkdir(parents=True)
+        source.write_text(
+            "# required: NFS_SERVER_ADDR\nNFS_SERVER_ADDR=${NFS_SERVER_ADDR}\n"
+        )
+        dest = tmp_path / "services-enabled" / "nfs.env"
+
+        assert scaffolder.render_template(source, dest) is True
+
+        record = find_log_record("Required variables not set")
+        assert record.missing_vars == "NFS_SERVER_ADDR"
+
+
 class TestRequiredVars:
     """Tests for # required: VAR_NAME convention in env templates."""
 
@@ -342,3 +342,28 @@ class TestGetServiceInfo:
         info = mgr.get_service_info("nonexistent")
 
         assert info is None
+
+
+class TestGetOverrides:
+    """Tests for get_overrides() - overrides applying to a service."""
+
+    def test_lists_matching_overrides_with_status(self, tmp_path):
+        overrides_available = tmp_path / "overrides-available"
+        overrides_available.mkdir()
+        overrides_enabled = tmp_path / "overrides-enabled"
+        overrides_enabled.mkdir()
+        for name in ("plex-nfs", "plex-transcode", "sonarr-nfs"):
+            (overrides_available / f"{name}.yml").write_text("services:\n")
+        (overrides_enabled / "plex-nfs.yml").write_text("services:\n")
+
+        mgr = ServiceManager(str(tmp_path))
+
+        assert mgr.get_overrides("plex") == [
+            {"name": "plex-nfs", "enabled": True},
+            {"name": "plex-transcode", "enabled": False},
+        ]
+
+    def test_no_overrides_dir(self, tmp_path):
+        mgr = ServiceManager(str(tmp_path))
+
+        assert mgr.get_overrides("plex") == []
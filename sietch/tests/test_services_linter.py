@@ -0,0 +1,289 @@
+"""Tests for services_linter.py - parallel, cached linting and reports."""
+
+import importlib
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import services_linter
+from services_linter import (
+    LintResult,
+    ServiceLinter,
+    TextRule,
+    _compile_text_rules,
+    results_to_json,
+    results_to_sarif,
+    scan_text,
+)
+
+VALID_SERVICE = """# description: {name}
+# https://github.com/example/{name}
+# config_version: 2
+networks:
+  traefik:
+    external: true
+services:
+  {name}:
+    image: example/{name}
+    environment:
+      - PUID=${{PUID}}
+      - PGID=${{PGID}}
+      - TZ=${{TZ}}
+    volumes:
+      - /etc/localtime:/etc/localtime:ro
+    healthcheck:
+      test: ["CMD", "true"]
+    labels:
+      - autoheal=true
+      - com.centurylinklabs.watchtower.enable=true
+"""
+
+
+@pytest.fixture
+def onramp(tmp_path):
+    """OnRamp tree with one valid and one invalid service."""
+    for name in ("services-available", "services-enabled", "etc"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "services-available" / "good.yml").write_text(
+        VALID_SERVICE.format(name="good")
+    )
+    (tmp_path / "services-available" / "bad.yml").write_text(
+        "services:\n  bad:\n    image: bad\n"
+    )
+    return tmp_path
+
+
+class TestScanText:
+    """Tests for the combined text rule pass."""
+
+    def test_finds_every_rule(self):
+        facts = scan_text(
+            "# config_version: 2\n"
+            "# description: Example\n"
+            "# HTTPS://example.com\n"
+            "host: app.${HOST_DOMAIN}\n"
+        )
+
+        assert facts.config_version == 2
+        assert facts.hits["description"] == [()]
+        assert facts.hits["url"] == [()]
+        assert facts.hardcoded_hosts == [
+            "Hardcoded hostname: app.${HOST_DOMAIN} (should use variable)"
+        ]
+
+    def test_defaults_when_missing(self):
+        facts = scan_text("services: {}\n")
+
+        assert facts.config_version == 1
+        assert facts.hits["description"] == []
+        assert facts.hardcoded_hosts == []
+
+    def test_invalid_config_version(self):
+        assert scan_text("# config_version: two\n").config_version == 1
+
+    def test_hostname_lead(self):
+        facts = scan_text(
+            "a: 9my-app.${HOST_DOMAIN}\n"
+            "b: ${APP_HOST_NAME:-app}.${HOST_DOMAIN}\n"
+            "c: my-app.${HOST_DOMAIN}\n"
+        )
+
+        # Duplicates are reported once, in file order
+        assert [h.split()[2] for h in facts.hardcoded_hosts] == [
+            "my-app.${HOST_DOMAIN}",
+        ]
+
+    def test_rules_share_one_regex(self):
+        rules = (
+            TextRule("description", "# description:"),
+            TextRule("todo", "# ", r"TODO"),
+            TextRule("latest", ":latest"),
+        )
+
+        pattern, compiled = _compile_text_rules(rules)
+
+        assert set(compiled) == {"description", "todo", "latest"}
+        assert {m.lastgroup for m in pattern.finditer("# TODO\nimage: x:latest")} == {
+            "todo",
+            "latest",
+        }
+
+
+class TestServiceRules:
+    """Tests for the per-service tree rules."""
+
+    def lint(self, tmp_path, services_yaml, name="app"):
+        (tmp_path / "services-available").mkdir(exist_ok=True)
+        (tmp_path / "services-available" / f"{name}.yml").write_text(
+            "# description: x\n# config_version: 2\n" + services_yaml
+        )
+        return ServiceLinter(str(tmp_path)).lint(name)
+
+    def test_web_service_labels(self, tmp_path):
+        is_valid, errors, _ = self.lint(
+            tmp_path,
+            "services:\n  app:\n    labels:\n      - traefik.enable=true\n",
+        )
+
+        assert not is_valid
+        assert errors == [
+            "app: Web service missing joyride.host.name label",
+            "app: Missing Traefik router configuration",
+            "app: Missing Traefik loadbalancer port configuration",
+        ]
+
+    def test_autoheal_without_healthcheck(self, tmp_path):
+        _, errors, _ = self.lint(
+            tmp_path, "services:\n  app:\n    labels:\n      autoheal: true\n"
+        )
+
+        assert errors == [
+            "app: autoheal=true without healthcheck (autoheal won't work)"
+        ]
+
+    def test_host_network_needs_no_traefik_network(self, tmp_path):
+        _, _, warnings = self.lint(
+            tmp_path, "services:\n  app:\n    network_mode: host\n"
+        )
+
+        assert not any("traefik' network" in w for w in warnings)
+
+    def test_infrastructure_services_skip_puid(self, tmp_path):
+        _, _, warnings = self.lint(
+            tmp_path, "services:\n  redis:\n    image: redis\n", name="redis"
+        )
+
+        assert "redis: Missing PUID/PGID environment variables" not in warnings
+        assert "redis: Missing TZ environment variable" in warnings
+
+
+class TestLintAll:
+    """Tests for ServiceLinter.lint_all()."""
+
+    def test_collects_results(self, onramp):
+        results = ServiceLinter(str(onramp)).lint_all()
+
+        assert results["passed"] == ["good"]
+        assert results["failed"] == ["bad"]
+        assert "Missing '# description:' comment" in results["all_errors"]
+        assert [r.service for r in results["results"]] == ["bad", "good"]
+
+    def test_enabled_only(self, onramp):
+        (onramp / "services-enabled" / "good.yml").touch()
+
+        results = ServiceLinter(str(onramp)).lint_all(enabled_only=True)
+
+        assert [r.service for r in results["results"]] == ["good"]
+
+    def test_parallel_matches_serial(self, onramp):
+        for i in range(services_linter.PARALLEL_THRESHOLD):
+            name = f"svc{i}"
+            (onramp / "services-available" / f"{name}.yml").write_text(
+                VALID_SERVICE.format(name=name)
+            )
+        linter = ServiceLinter(str(onramp))
+
+        parallel = linter.lint_all(jobs=2, use_cache=False)["results"]
+        serial = linter.lint_all(jobs=1, use_cache=False)["results"]
+
+        assert parallel == serial
+        assert len(parallel) == services_linter.PARALLEL_THRESHOLD + 2
+
+
+class TestLintCache:
+    """Tests for the result cache in etc/.cache/lint.json."""
+
+    @pytest.fixture
+    def lint_calls(self, monkeypatch):
+        calls = []
+        real_lint = ServiceLinter.lint
+        monkeypatch.setattr(
+            ServiceLinter,
+            "lint",
+            lambda self, service, **kw: calls.append(service)
+            or real_lint(self, service, **kw),
+        )
+        return calls
+
+    def test_unchanged_services_are_not_relinted(self, onramp, lint_calls):
+        first = ServiceLinter(str(onramp)).lint_all()
+        second = ServiceLinter(str(onramp)).lint_all()
+
+        assert lint_calls == ["bad", "good"]
+        assert all(r.cached for r in second["results"])
+        assert second["failed"] == first["failed"]
+        assert second["all_errors"] == first["all_errors"]
+
+    def test_changed_service_is_relinted(self, onramp, lint_calls):
+        ServiceLinter(str(onramp)).lint_all()
+        (onramp / "services-available" / "bad.yml").write_text(
+            VALID_SERVICE.format(name="bad")
+        )
+
+        results = ServiceLinter(str(onramp)).lint_all()
+
+        assert lint_calls == ["bad", "good", "bad"]
+        assert results["failed"] == []
+
+    def test_strict_is_cached_separately(self, onramp, lint_calls):
+        linter = ServiceLinter(str(onramp))
+        linter.lint_all()
+        linter.lint_all(strict=True)
+
+        assert lint_calls == ["bad", "good", "bad", "good"]
+
+    def test_no_cache(self, onramp, lint_calls):
+        linter = ServiceLinter(str(onramp))
+        linter.lint_all()
+        linter.lint_all(use_cache=False)
+
+        assert len(lint_calls) == 4
+
+
+class TestReports:
+    """Tests for JSON and SARIF output."""
+
+    RESULTS = [
+        LintResult("bad", "services-available/bad.yml", False, ["no desc"], ["no tz"]),
+        LintResult("good", "services-available/good.yml", True),
+    ]
+
+    def test_json(self):
+        report = json.loads(results_to_json(self.RESULTS))
+
+        assert report["passed"] == 1
+        assert report["failed"] == 1
+        assert report["results"][0]["errors"] == ["no desc"]
+
+    def test_sarif(self):
+        report = json.loads(results_to_sarif(self.RESULTS))
+
+        assert report["version"] == "2.1.0"
+        results = report["runs"][0]["results"]
+        assert [(r["level"], r["message"]["text"]) for r in results] == [
+            ("error", "no desc"),
+            ("warning", "no tz"),
+        ]
+        location = results[0]["locations"][0]["physicalLocation"]
+        assert location["artifactLocation"]["uri"] == "services-available/bad.yml"
+
+    @pytest.mark.parametrize("output_format", ["json", "sarif"])
+    @pytest.mark.parametrize("script", ["services_linter", "services"])
+    def test_cli_stdout_is_the_report(
+        self, onramp, monkeypatch, capsys, script, output_format
+    ):
+        module = importlib.import_module(script)
+        args = ["--all", f"--format={output_format}", f"--base-dir={onramp}"]
+        if script == "services":
+            args.insert(0, "lint")
+        monkeypatch.setattr(sys, "argv", [f"{script}.py", *args])
+
+        assert module.main() == 1
+
+        report = json.loads(capsys.readouterr().out)
+        assert report["passed" if output_format == "json" else "version"]
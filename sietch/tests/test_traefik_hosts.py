@@ -1,12 +1,20 @@
 """Tests for traefik_hosts.py - Traefik external Host() rule extraction."""
 
+import os
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add scripts to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
-from traefik_hosts import TraefikHostsExtractor
+from traefik_hosts import (
+    HostIndex,
+    TraefikHostsExtractor,
+    parse_host_rule,
+    regexp_literal,
+)
 
 
 # Helper function to create Traefik YAML with proper formatting
@@ -465,3 +473,307 @@ class TestFullSync:
         # Check output
         find_log_record("Added:")
         find_log_record("Wrote 2 host entries")
+
+
+class TestComposeVarResolution:
+    """Tests for resolve_compose_vars() - compose ${VAR} syntax."""
+
+    def test_default_used_when_unset(self):
+        extractor = TraefikHostsExtractor(env_vars={"HOST_DOMAIN": "example.com"})
+
+        assert (
+            extractor.resolve_compose_vars("${APP:-app}.${HOST_DOMAIN}")
+            == "app.example.com"
+        )
+
+    def test_value_overrides_default(self):
+        extractor = TraefikHostsExtractor(env_vars={"APP": "web"})
+
+        assert extractor.resolve_compose_vars("${APP:-app}") == "web"
+
+    def test_empty_value_with_dash_default(self):
+        extractor = TraefikHostsExtractor(env_vars={"APP": ""})
+
+        assert extractor.resolve_compose_vars("${APP:-app}") == "app"
+        assert extractor.resolve_compose_vars("${APP-app}") == ""
+
+    def test_nested_default(self):
+        extractor = TraefikHostsExtractor(env_vars={"B": "b"})
+
+        assert extractor.resolve_compose_vars("${A:-${B}}") == "b"
+
+    def test_unset_without_default(self):
+        extractor = TraefikHostsExtractor(env_vars={})
+
+        assert extractor.resolve_compose_vars("${HOST_DOMAIN}") is None
+
+    def test_values_not_reinterpolated(self):
+        extractor = TraefikHostsExtractor(env_vars={"A": "${A}"})
+
+        assert extractor.resolve_compose_vars("${A}") == "${A}"
+
+
+class TestServiceHostExtraction:
+    """Tests for extract_service_hosts() - router labels of enabled services."""
+
+    def test_extracts_router_hosts(self, tmp_path, find_log_record):
+        services_enabled = tmp_path / "services-enabled"
+        services_enabled.mkdir()
+        (services_enabled / "app.yml").write_text(
+            "services:\n"
+            "  app:\n"
+            "    labels:\n"
+            "      - traefik.enable=true\n"
+            "      - traefik.http.routers.app.rule=Host(`${APP_HOST:-app}.${HOST_DOMAIN}`)\n"
+            "      - traefik.http.routers.api.rule=Host(`api.${HOST_DOMAIN}`) && PathPrefix(`/v1`)\n"
+            "      - traefik.http.routers.bad.rule=Host(`${MISSING}.${HOST_DOMAIN}`)\n"
+        )
+        (services_enabled / "app.env").write_text("APP_HOST=web\n")
+        (services_enabled / "off.yml").write_text(
+            "services:\n"
+            "  off:\n"
+            "    labels:\n"
+            "      traefik.enable: false\n"
+            "      traefik.http.routers.off.rule: Host(`off.example.com`)\n"
+        )
+
+        extractor = TraefikHostsExtractor(
+            base_dir=tmp_path, env_vars={"HOST_DOMAIN": "example.com"}
+        )
+
+        assert extractor.extract_service_hosts() == [
+            ("web.example.com", "app"),
+            ("api.example.com", "app"),
+        ]
+        find_log_record("Skipped app: unresolved host")
+
+
+@pytest.fixture
+def joyride_tree(tmp_path):
+    """OnRamp tree with Joyride enabled and one external."""
+    services_enabled = tmp_path / "services-enabled"
+    services_enabled.mkdir()
+    (services_enabled / "joyride.yml").write_text("# enabled")
+    (services_enabled / ".env").write_text(
+        "HOSTIP=192.168.1.10\nHOST_DOMAIN=lab.local\n"
+    )
+    (services_enabled / ".env.external").write_text("SVC_HOST_NAME=svc\n")
+    (tmp_path / "external-enabled").mkdir()
+    (tmp_path / "external-enabled" / "service.yml").write_text(
+        traefik_yaml("svc", "SVC_HOST_NAME")
+    )
+    (tmp_path / "etc").mkdir()
+    return tmp_path
+
+
+class TestIncrementalSync:
+    """Tests for cached extraction and change-only writes."""
+
+    def hosts_file(self, tree):
+        return tree / "etc" / "joyride" / "hosts.d" / "hosts"
+
+    def test_unchanged_hosts_file_not_rewritten(self, joyride_tree, find_log_record):
+        TraefikHostsExtractor(base_dir=joyride_tree, env_vars={}).sync()
+        hosts_file = self.hosts_file(joyride_tree)
+        os.utime(hosts_file, ns=(0, 0))
+
+        assert TraefikHostsExtractor(base_dir=joyride_tree, env_vars={}).sync() == 0
+
+        assert hosts_file.stat().st_mtime_ns == 0
+        find_log_record("Hosts file unchanged (1 entries)")
+
+    def test_changed_hosts_file_replaced_atomically(self, joyride_tree):
+        TraefikHostsExtractor(base_dir=joyride_tree, env_vars={}).sync()
+        hosts_file = self.hosts_file(joyride_tree)
+        inode = hosts_file.stat().st_ino
+
+        TraefikHostsExtractor(
+            base_dir=joyride_tree, env_vars={"HOSTIP": "10.0.0.2"}
+        ).sync()
+
+        assert hosts_file.read_text() == "10.0.0.2 svc.lab.local\n"
+        assert hosts_file.stat().st_ino != inode
+        assert list(hosts_file.parent.iterdir()) == [hosts_file]
+
+    def test_unchanged_externals_not_reread(self, joyride_tree, monkeypatch):
+        TraefikHostsExtractor(base_dir=joyride_tree, env_vars={}).sync()
+        reads = []
+        real_read_text = Path.read_text
+        monkeypatch.setattr(
+            Path,
+            "read_text",
+            lambda self, *a, **kw: reads.append(self.name)
+            or real_read_text(self, *a, **kw),
+        )
+        (joyride_tree / "services-enabled" / ".env.external").write_text(
+            "SVC_HOST_NAME=renamed\n"
+        )
+
+        TraefikHostsExtractor(base_dir=joyride_tree, env_vars={}).sync()
+
+        assert "service.yml" not in reads
+        assert "renamed.lab.local" in self.hosts_file(joyride_tree).read_text()
+
+    def test_edited_external_reread(self, joyride_tree):
+        extractor = TraefikHostsExtractor(base_dir=joyride_tree, env_vars={})
+        extractor.sync()
+
+        (joyride_tree / "external-enabled" / "service.yml").write_text(
+            'http:\n  routers:\n    svc:\n      rule: "Host(`fixed.lab.local`)"\n'
+        )
+        extractor.sync()
+
+        content = self.hosts_file(joyride_tree).read_text()
+        assert "192.168.1.10 fixed.lab.local" in content
+
+    def test_reload_follows_env_file_edits(self, joyride_tree):
+        # As with docker --env-file, the environment repeats the .env values
+        extractor = TraefikHostsExtractor(
+            base_dir=joyride_tree,
+            env_vars={"HOST_DOMAIN": "lab.local", "HOSTIP": "10.0.0.1"},
+        )
+        extractor.load_env_files()
+
+        (joyride_tree / "services-enabled" / ".env").write_text(
+            "HOSTIP=192.168.1.10\nHOST_DOMAIN=home.lan\n"
+        )
+        extractor.load_env_files()
+
+        assert extractor.env_vars["HOST_DOMAIN"] == "home.lan"
+        # An explicit override still wins
+        assert extractor.env_vars["HOSTIP"] == "10.0.0.1"
+
+
+class TestWatch:
+    """Tests for watch mode."""
+
+    def test_resyncs_on_change(self, joyride_tree):
+        extractor = TraefikHostsExtractor(base_dir=joyride_tree, env_vars={})
+        syncs = []
+        real_sync = extractor.sync
+        extractor.sync = lambda **kw: syncs.append(1) or real_sync(**kw)
+
+        def sleep(interval):
+            if len(syncs) == 1:
+                (joyride_tree / "services-enabled" / ".env.external").write_text(
+                    "SVC_HOST_NAME=svc\nNEW_HOST_NAME=new\n"
+                )
+                (joyride_tree / "external-enabled" / "new.yml").write_text(
+                    traefik_yaml("new", "NEW_HOST_NAME")
+                )
+
+        assert extractor.watch(cycles=3, sleep=sleep) == 0
+
+        assert len(syncs) == 2
+        content = (joyride_tree / "etc" / "joyride" / "hosts.d" / "hosts").read_text()
+        assert "new.lab.local" in content
+
+    def test_idle_without_changes(self, joyride_tree):
+        extractor = TraefikHostsExtractor(base_dir=joyride_tree, env_vars={})
+        syncs = []
+        real_sync = extractor.sync
+        extractor.sync = lambda **kw: syncs.append(1) or real_sync(**kw)
+        sleeps = []
+
+        extractor.watch(interval=0.25, cycles=4, sleep=sleeps.append)
+
+        assert len(syncs) == 1
+        assert sleeps == [0.25] * 4
+
+
+class TestHostRuleParsing:
+    """Tests for parse_host_rule() and regexp_literal()."""
+
+    def test_multiple_matchers_and_arguments(self):
+        rule = (
+            "Host(`a.example.com`, `b.example.com`) || "
+            "(HostHeader(`c.example.com`) && PathPrefix(`/api`)) || "
+            "HostRegexp(`{sub:[a-z]+}.example.com`)"
+        )
+
+        assert parse_host_rule(rule) == [
+            ("Host", "a.example.com"),
+            ("Host", "b.example.com"),
+            ("Host", "c.example.com"),
+            ("HostRegexp", "{sub:[a-z]+}.example.com"),
+        ]
+
+    def test_ignores_other_matchers(self):
+        assert parse_host_rule("HostSNI(`*`) || PathPrefix(`/x`)") == []
+
+    def test_regexp_literal(self):
+        assert regexp_literal("^app\\.example\\.com$") == "app.example.com"
+        assert regexp_literal("^.+\\.example\\.com$") is None
+        assert regexp_literal("{sub:[a-z]+}.example.com") is None
+
+
+class TestHostIndex:
+    """Tests for the combined externals + services host index."""
+
+    @pytest.fixture
+    def tree(self, joyride_tree):
+        (joyride_tree / "external-enabled" / "multi.yml").write_text(
+            "http:\n"
+            "  routers:\n"
+            "    multi:\n"
+            '      rule: "Host(`{{env "SVC_HOST_NAME"}}.{{env "HOST_DOMAIN"}}`)'
+            ' || Host(`alias.${HOST_DOMAIN}`)"\n'
+            "    wild:\n"
+            "      rule: 'HostRegexp(`^.+\\.lab\\.local$`)'\n"
+        )
+        (joyride_tree / "services-enabled" / "app.yml").write_text(
+            "services:\n"
+            "  app:\n"
+            "    labels:\n"
+            "      - traefik.http.routers.app.rule=Host(`${APP_HOST_NAME:-app}.${HOST_DOMAIN}`,"
+            " `SVC.lab.local`)\n"
+        )
+        return joyride_tree
+
+    def build(self, tree):
+        extractor = TraefikHostsExtractor(base_dir=tree, env_vars={})
+        extractor.load_env_files()
+        return extractor.build_host_index()
+
+    def test_deduplicates_with_sources(self, tree):
+        index = self.build(tree)
+
+        assert index.hosts == {
+            "svc.lab.local": [
+                "external-enabled/multi.yml",
+                "external-enabled/service.yml",
+                "services-enabled/app.yml",
+            ],
+            "alias.lab.local": ["external-enabled/multi.yml"],
+            "app.lab.local": ["services-enabled/app.yml"],
+        }
+        assert index.patterns == {"^.+\\.lab\\.local$": ["external-enabled/multi.yml"]}
+
+    def test_to_dict(self):
+        index = HostIndex()
+        index.add("b.yml", ["b.example.com", "a.example.com"])
+        index.add("a.yml", ["a.example.com"], ["{x:.+}.example.com"])
+
+        assert index.to_dict() == {
+            "hosts": [
+                {"fqdn": "a.example.com", "sources": ["b.yml", "a.yml"]},
+                {"fqdn": "b.example.com", "sources": ["b.yml"]},
+            ],
+            "patterns": [{"pattern": "{x:.+}.example.com", "sources": ["a.yml"]}],
+        }
+
+    def test_sync_includes_service_hosts(self, tree):
+        TraefikHostsExtractor(base_dir=tree, env_vars={}).sync()
+
+        content = (tree / "etc" / "joyride" / "hosts.d" / "hosts").read_text()
+        assert content == (
+            "192.168.1.10 alias.lab.local\n"
+            "192.168.1.10 app.lab.local\n"
+            "192.168.1.10 svc.lab.local\n"
+        )
+
+    def test_sync_externals_only(self, tree):
+        TraefikHostsExtractor(base_dir=tree, env_vars={}).sync(services=False)
+
+        content = (tree / "etc" / "joyride" / "hosts.d" / "hosts").read_text()
+        assert "app.lab.local" not in content